@@ -0,0 +1,113 @@
+"""Evaluation time of 'ASPEvaluation' (admissible_set) before and after precomputing the valid children and the
+lookup tables once per (dimension, weight), and replacing the per-child Python checks of the greedy search by
+array masks (the extant elements are bitsets). The 'before' implementation below is the previous 'evaluate',
+it is also used to check that both implementations return the same score. 'batched' calls the priority once on
+the vectors of all the valid children ('batch_priority=True').
+The 'before' implementation is skipped for dimensions above '--max_before_dimension', it checks each surviving
+child against each extant element in Python.
+
+Usage:
+    python benchmark_admissible_set.py --settings 12,7 15,10 21,15 24,17
+"""
+import argparse
+import itertools
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.admissible_set import ASPEvaluation
+
+TRIPLES = [(0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 1, 2), (0, 2, 1), (1, 1, 1), (2, 2, 2)]
+INT_TO_WEIGHT = [0, 1, 1, 2, 2, 3, 3]
+BAD_TRIPLES = {(0, 0, 0), (0, 1, 1), (0, 2, 2), (0, 3, 3), (0, 4, 4), (0, 5, 5), (0, 6, 6), (1, 1, 1), (1, 1, 2),
+               (1, 2, 2), (1, 2, 3), (1, 2, 4), (1, 3, 3), (1, 4, 4), (1, 5, 5), (1, 6, 6), (2, 2, 2), (2, 3, 3),
+               (2, 4, 4), (2, 5, 5), (2, 6, 6), (3, 3, 3), (3, 3, 4), (3, 4, 4), (3, 4, 5), (3, 4, 6), (3, 5, 5),
+               (3, 6, 6), (4, 4, 4), (4, 5, 5), (4, 6, 6), (5, 5, 5), (5, 5, 6), (5, 6, 6), (6, 6, 6)}
+
+
+def priority_abs(el: tuple, n: int, w: int) -> float:
+    """The example of the task."""
+    return sum([abs(i) for i in el]) / n
+
+
+def priority_positions(el: tuple, n: int, w: int) -> float:
+    """Weighs the entries by their positions."""
+    score = 0.
+    for i, x in enumerate(el):
+        score += (x * (i + 1) ** 1.5) % 3.7
+    return score
+
+
+def get_surviving_children_before(extant_elements, new_element, valid_children):
+    valid_indices = []
+    for index, child in enumerate(valid_children):
+        if all(INT_TO_WEIGHT[x] <= INT_TO_WEIGHT[y] for x, y in zip(new_element, child)):
+            continue
+        if all(INT_TO_WEIGHT[x] >= INT_TO_WEIGHT[y] for x, y in zip(new_element, child)):
+            continue
+        is_invalid = False
+        for extant_element in extant_elements:
+            if all(tuple(sorted((x, y, z))) in BAD_TRIPLES for x, y, z in zip(extant_element, new_element, child)):
+                is_invalid = True
+                break
+        if is_invalid:
+            continue
+        valid_indices.append(index)
+    return valid_indices
+
+
+def evaluate_before(evaluation: ASPEvaluation, priority: callable) -> int:
+    num_groups = evaluation.dimension // 3
+    valid_children = []
+    for child in itertools.product(range(7), repeat=num_groups):
+        weight = sum(INT_TO_WEIGHT[x] for x in child)
+        if weight == evaluation.weight:
+            valid_children.append(np.array(child, dtype=np.int32))
+    valid_scores = np.array([
+        priority(sum([TRIPLES[x] for x in xs], ()), evaluation.dimension, evaluation.weight) for xs in valid_children])
+    pre_admissible_set = np.empty((0, num_groups), dtype=np.int32)
+    while valid_children:
+        max_index = np.argmax(valid_scores)
+        max_child = valid_children[max_index]
+        surviving_indices = get_surviving_children_before(pre_admissible_set, max_child, valid_children)
+        valid_children = [valid_children[i] for i in surviving_indices]
+        valid_scores = valid_scores[surviving_indices]
+        pre_admissible_set = np.concatenate([pre_admissible_set, max_child[None]], axis=0)
+    admissible_set = np.array(evaluation.expand_admissible_set(pre_admissible_set))
+    return len(admissible_set) - evaluation.Optimal_Set_Length[f'n{evaluation.dimension}w{evaluation.weight}']
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--settings', nargs='+', default=['12,7', '15,10', '21,15', '24,17'])
+    parser.add_argument('--max_before_dimension', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f'{"n,w":>8}{"priority":>12}{"score":>10}{"before (s)":>12}{"after (s)":>11}{"batched (s)":>13}{"speedup":>10}')
+    for setting in args.settings:
+        dimension, weight = map(int, setting.split(','))
+        (evaluation, batched_evaluation), tables_time = timed(lambda: (
+            ASPEvaluation(dimension=dimension, weight=weight),
+            ASPEvaluation(dimension=dimension, weight=weight, batch_priority=True)))
+        print(f'# n={dimension}, w={weight}: {len(evaluation._tables["children"])} valid children, '
+              f'tables {tables_time:.2f}s')
+        for name, priority in [('abs', priority_abs), ('positions', priority_positions)]:
+            score, after = timed(lambda: evaluation.evaluate(priority))
+            batched_score, batched = timed(lambda: batched_evaluation.evaluate(priority))
+            assert score == batched_score, (setting, name, score, batched_score)
+            if dimension <= args.max_before_dimension:
+                before_score, before = timed(lambda: evaluate_before(evaluation, priority))
+                assert before_score == score, (setting, name, before_score, score)
+                before = f'{before:>12.2f}{after:>11.3f}{batched:>13.3f}{before / after:>9.0f}x'
+            else:
+                before = f'{"-":>12}{after:>11.3f}{batched:>13.3f}{"-":>10}'
+            print(f'{setting:>8}{name:>12}{score:>10}{before}')
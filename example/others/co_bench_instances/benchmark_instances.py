@@ -0,0 +1,82 @@
+"""Startup and per-evaluation cost of the CO-Bench instance layer ('CoBenchInstances').
+- startup: constructing the evaluation from text files (parse + write the parsed cache) and from the parsed cache.
+- per evaluation: re-parsing all instance texts (the previous behaviour of 'evaluate()') and copying the
+  preparsed instances.
+
+The benchmark runs offline on synthetic job shop instances (Taillard format) written to a temporary
+'data_dir'. Pass '--data_dir' to use a local copy of the CO-Bench dataset instead.
+
+Usage:
+    python benchmark_instances.py --num_files 8 --instances_per_file 10 --n_jobs 50 --n_machines 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.co_bench.job_shop_scheduling_co_bench import JSSEvaluationCB
+from llm4ad.task.optimization.co_bench.utils import load_subdir_text_files
+
+
+def write_instances(data_dir: str, num_files: int, instances_per_file: int, n_jobs: int, n_machines: int):
+    task_dir = os.path.join(data_dir, 'Job shop scheduling')
+    os.makedirs(task_dir, exist_ok=True)
+    rng = np.random.default_rng(2024)
+    for k in range(num_files):
+        lines = []
+        for _ in range(instances_per_file):
+            times = rng.integers(1, 100, size=(n_jobs, n_machines))
+            machines = np.array([rng.permutation(n_machines) + 1 for _ in range(n_jobs)])
+            lines.append('Nb of jobs, Nb of Machines, Time seed, Machine seed, Upper bound, Lower bound')
+            lines.append(f'{n_jobs} {n_machines} 0 0 {times.sum()} {times.sum(0).max()}')
+            lines.append('Times')
+            lines += [' '.join(map(str, row)) for row in times]
+            lines.append('Machines')
+            lines += [' '.join(map(str, row)) for row in machines]
+        with open(os.path.join(task_dir, f'tai{n_jobs}_{n_machines}_{k}.txt'), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data_dir', default=None)
+    parser.add_argument('--num_files', type=int, default=8)
+    parser.add_argument('--instances_per_file', type=int, default=10)
+    parser.add_argument('--n_jobs', type=int, default=50)
+    parser.add_argument('--n_machines', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = os.path.join(tmp_dir, 'data')
+            write_instances(data_dir, args.num_files, args.instances_per_file, args.n_jobs, args.n_machines)
+        cache_dir = os.path.join(tmp_dir, 'cache')
+
+        start = time.perf_counter()
+        evaluation = JSSEvaluationCB(data_dir=data_dir, cache_dir=cache_dir)
+        print(f'startup (parse + write cache): {time.perf_counter() - start:.3f}s')
+        start = time.perf_counter()
+        evaluation = JSSEvaluationCB(data_dir=data_dir, cache_dir=cache_dir)
+        print(f'startup (parsed cache)       : {time.perf_counter() - start:.3f}s')
+
+        texts = list(load_subdir_text_files('Job shop scheduling', data_dir=data_dir).values())
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            reparsed = [evaluation.load_data(text) for text in texts]
+        reparse_time = (time.perf_counter() - start) / args.repeats
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            preparsed = evaluation._instances.parsed()
+        copy_time = (time.perf_counter() - start) / args.repeats
+        assert reparsed == preparsed
+
+        print(f'per evaluation (re-parse)    : {reparse_time * 1000:.2f}ms')
+        print(f'per evaluation (preparsed)   : {copy_time * 1000:.2f}ms ({reparse_time / copy_time:.1f}x faster)')
+        print(evaluation._instances.summary())
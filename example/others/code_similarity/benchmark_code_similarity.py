@@ -0,0 +1,106 @@
+"""Cost of the pairwise CodeBLEU matrices used by the PartEvo clustering ('ast' features) and the MEoH selection,
+before (one 'calc_codebleu' / 'calc_syntax_match' per pair, as in the previous 'individual_feature' and
+'Population._dominated_counts') and after 'llm4ad.base.CodeSimilarity' (each program is parsed once, the pairs are
+computed from the cached counts). The matrices of both implementations are checked to be identical.
+
+The 'incremental' column adds 10% new programs to a population whose programs are already cached, which is the
+situation of a re-clustering or of a MEoH survival.
+
+Usage:
+    python benchmark_code_similarity.py --sizes 20 50 100 200 --num_workers 1
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from codebleu import calc_codebleu
+from codebleu.syntax_match import calc_syntax_match
+
+from llm4ad.base import CodeSimilarity
+
+
+def make_codes(num: int, seed: int):
+    rng = np.random.RandomState(seed)
+    codes = []
+    for i in range(num):
+        lines = ['import numpy as np', '', 'def priority(item, bins):', '    """Returns the priority of the bins."""']
+        for j in range(rng.randint(3, 12)):
+            op = ['+', '-', '*'][rng.randint(3)]
+            lines.append(f'    v{j} = item {op} {rng.rand():.3f} * bins[{j % 3}]')
+            if rng.rand() < 0.3:
+                lines.append(f'    if v{j} > {rng.rand():.2f}:\n        v{j} = np.maximum(v{j}, bins) * 2')
+            if rng.rand() < 0.2:
+                lines.append(f'    for k in range(len(bins)):\n        v{j} = v{j} + bins[k] / (k + 1)  # decay')
+        lines.append(f'    return v0 + {i}')
+        codes.append('\n'.join(lines) + '\n')
+    return codes
+
+
+def before_partevo(codes):
+    n = len(codes)
+    ast = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i, n):
+            if i == j:
+                score = 1.0
+            else:
+                try:
+                    cal_result = calc_codebleu([codes[i]], [codes[j]], lang='python',
+                                               weights=(0.25, 0.25, 0.25, 0.25), tokenizer=None)
+                    score = 0.5 * cal_result['syntax_match_score'] + 0.5 * cal_result['dataflow_match_score']
+                except Exception:
+                    score = 0.0
+            ast[i, j] = score
+            ast[j, i] = score
+    return ast
+
+
+def after_partevo(similarity, codes):
+    codes = [code.strip() for code in codes]
+    hybrid = 0.5 * similarity.syntax_match_matrix(codes) + 0.5 * similarity.dataflow_match_matrix(codes)
+    ast = np.triu(hybrid, k=1)
+    ast = ast + ast.T
+    np.fill_diagonal(ast, 1.0)
+    return ast
+
+
+def before_syntax(codes):
+    return np.array([[calc_syntax_match([r], c, 'python') for c in codes] for r in codes])
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100, 200])
+    parser.add_argument('--num_workers', type=int, default=1)
+    parser.add_argument('--before_max_size', type=int, default=100, help='the largest size of the "before" runs.')
+    args = parser.parse_args()
+
+    print(f'{"matrix":>8} {"size":>5} {"before (s)":>11} {"after (s)":>10} {"incremental (s)":>16}')
+    for size in args.sizes:
+        codes = make_codes(size, seed=size)
+        new_codes = make_codes(max(1, size // 10), seed=size + 1000)
+        for name, before, after in [
+            ('PartEvo', before_partevo, after_partevo),
+            ('MEoH', before_syntax, lambda s, c: s.syntax_match_matrix(c)),
+        ]:
+            similarity = CodeSimilarity(num_workers=args.num_workers)
+            after_time, after_matrix = timed(after, similarity, codes)
+            incremental_time, _ = timed(after, similarity, codes[len(new_codes):] + new_codes)
+            similarity.close()
+            if size <= args.before_max_size:
+                before_time, before_matrix = timed(before, codes)
+                assert np.array_equal(before_matrix, after_matrix), 'the matrices are different'
+                before_time = f'{before_time:.3f}'
+            else:
+                before_time = '-'
+            print(f'{name:>8} {size:>5} {before_time:>11} {after_time:>10.3f} {incremental_time:>16.3f}')
@@ -0,0 +1,60 @@
+"""Compare the per-call fork path of 'SecureEvaluator' with the persistent worker pool.
+Each setting evaluates the same programs on a cheap task (online bin packing with few items),
+so the process creation/teardown cost dominates the wall time.
+
+Usage:
+    python benchmark_worker_pool.py --num_programs 200 --num_evaluators 4
+"""
+import argparse
+import concurrent.futures
+import sys
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import SecureEvaluator
+from llm4ad.task.optimization.online_bin_packing import OBPEvaluation
+
+program = '''
+import numpy as np
+
+def priority(item: float, bins: np.ndarray) -> np.ndarray:
+    """Best fit."""
+    return -(bins - item)
+'''
+
+
+def run(evaluator: SecureEvaluator, num_programs: int, num_evaluators: int):
+    start = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_evaluators) as executor:
+        scores = list(executor.map(evaluator.evaluate_program, [program] * num_programs))
+    elapsed = time.time() - start
+    assert all(s == scores[0] for s in scores) and scores[0] is not None
+    return elapsed, scores[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_programs', type=int, default=200)
+    parser.add_argument('--num_evaluators', type=int, default=4)
+    parser.add_argument('--n_items', type=int, default=100)
+    args = parser.parse_args()
+
+    task = OBPEvaluation(n_items=args.n_items, n_instances=5, timeout_seconds=20)
+
+    per_call = SecureEvaluator(task)
+    elapsed_fork, score = run(per_call, args.num_programs, args.num_evaluators)
+
+    pooled = SecureEvaluator(task, use_worker_pool=True, num_pool_workers=args.num_evaluators)
+    elapsed_pool, score_pool = run(pooled, args.num_programs, args.num_evaluators)
+    pooled.close()
+
+    assert score == score_pool
+    print(f'Programs: {args.num_programs}, evaluators: {args.num_evaluators}, score: {score}')
+    print(f'per-call process: {elapsed_fork:.2f}s ({args.num_programs / elapsed_fork:.1f} programs/s)')
+    print(f'worker pool     : {elapsed_pool:.2f}s ({args.num_programs / elapsed_pool:.1f} programs/s)')
+    print(f'speedup         : {elapsed_fork / elapsed_pool:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Throughput of 'ProgramsDatabase.get_prompt()' with many registered programs, before and after keeping the
+cluster scores and program lengths in incrementally updated arrays (with cached sampling probabilities) and
+rendering the prompts without deep copies. The 'before' implementation below is the previous 'Island'/'Cluster',
+it is also used to check that both implementations produce the same prompts under the same random seed.
+
+Usage:
+    python benchmark_get_prompt.py --num_programs 10000 50000 --num_scores 2000 --num_prompts 2000
+"""
+import argparse
+import copy
+import dataclasses
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import ModifyCode, TextFunctionProgramConverter
+from llm4ad.method.funsearch import programs_database
+from llm4ad.method.funsearch.config import ProgramsDatabaseConfig
+from llm4ad.method.funsearch.programs_database import ProgramsDatabase, _softmax
+
+TEMPLATE = '''
+import numpy as np
+
+def priority(item: float, bins: np.ndarray) -> np.ndarray:
+    """Returns priority with which we want to add item to each bin."""
+    return -(bins - item)
+'''
+
+
+class BeforeIsland(programs_database.Island):
+    """The previous implementation, which rebuilds the arrays and deep copies the implementations for every prompt."""
+
+    def register_function(self, function, score):
+        signature = score
+        if signature not in self._clusters:
+            self._clusters[signature] = BeforeCluster(score, function)
+        else:
+            self._clusters[signature].register_program(function)
+        self._num_programs += 1
+
+    def get_prompt(self):
+        signatures = list(self._clusters.keys())
+        cluster_scores = np.array(
+            [self._clusters[signature].score for signature in signatures])
+        max_abs_score = float(np.abs(cluster_scores).max())
+        if max_abs_score > 1:
+            cluster_scores = cluster_scores.astype(float) / max_abs_score
+        period = self._cluster_sampling_temperature_period
+        temperature = self._cluster_sampling_temperature_init * (
+                1 - (self._num_programs % period) / period)
+        probabilities = _softmax(cluster_scores, temperature)
+        functions_per_prompt = min(len(self._clusters), self._functions_per_prompt)
+        idx = np.random.choice(
+            len(signatures), size=functions_per_prompt, p=probabilities)
+        chosen_signatures = [signatures[i] for i in idx]
+        implementations = []
+        scores = []
+        for signature in chosen_signatures:
+            cluster = self._clusters[signature]
+            implementations.append(cluster.sample_program())
+            scores.append(cluster.score)
+        indices = np.argsort(scores)
+        sorted_implementations = [implementations[i] for i in indices]
+        version_generated = len(sorted_implementations) + 1
+        return self._generate_prompt(sorted_implementations), version_generated
+
+    def _generate_prompt(self, implementations):
+        implementations = copy.deepcopy(implementations)
+        versioned_functions = []
+        for i, implementation in enumerate(implementations):
+            new_function_name = f'{self._function_to_evolve}_v{i}'
+            implementation.name = new_function_name
+            if i >= 1:
+                implementation.docstring = (
+                    f'Improved version of `{self._function_to_evolve}_v{i - 1}`.')
+            implementation = ModifyCode.rename_function(
+                str(implementation), self._function_to_evolve, new_function_name)
+            versioned_functions.append(
+                TextFunctionProgramConverter.text_to_function(implementation)
+            )
+        next_version = len(implementations)
+        new_function_name = f'{self._function_to_evolve}_v{next_version}'
+        header = dataclasses.replace(
+            implementations[-1],
+            name=new_function_name,
+            body='',
+            docstring=('Improved version of '
+                       f'`{self._function_to_evolve}_v{next_version - 1}`.'),
+        )
+        versioned_functions.append(header)
+        prompt = dataclasses.replace(self._template, functions=versioned_functions)
+        return str(prompt)
+
+
+class BeforeCluster(programs_database.Cluster):
+    def __init__(self, score, implementation):
+        self._score = score
+        self._programs = [implementation]
+        self._lengths = [len(str(implementation))]
+
+    def register_program(self, program):
+        self._programs.append(program)
+        self._lengths.append(len(str(program)))
+
+    def sample_program(self):
+        normalized_lengths = (np.array(self._lengths) - min(self._lengths)) / (
+                max(self._lengths) + 1e-6)
+        probabilities = _softmax(-normalized_lengths, temperature=1.0)
+        return np.random.choice(self._programs, p=probabilities)  # noqa
+
+
+def make_function(i: int, rng: np.random.RandomState):
+    lines = [f'    w{j} = {rng.rand():.4f} * item + {j}' for j in range(rng.randint(1, 8))]
+    if i % 10 == 0:
+        # recursive functions are renamed in the prompts
+        lines.append('    if item > 1e9:\n        return priority(item / 2, bins)')
+    lines.append(f'    return -(bins - item) * {i}')
+    docstring = '    """Priority of the bins."""\n' if i % 3 == 0 else ''
+    return TextFunctionProgramConverter.text_to_function(
+        f'def priority(item: float, bins: np.ndarray) -> np.ndarray:\n{docstring}' + '\n'.join(lines) + '\n'
+    )
+
+
+def build_database(island_cls, num_programs: int, num_scores: int, seed: int = 2025) -> ProgramsDatabase:
+    config = ProgramsDatabaseConfig()
+    template = TextFunctionProgramConverter.text_to_program(TEMPLATE)
+    db = ProgramsDatabase(config, template, 'priority')
+    db._islands = [
+        island_cls(template, 'priority', config.functions_per_prompt,
+                   config.cluster_sampling_temperature_init, config.cluster_sampling_temperature_period)
+        for _ in range(config.num_islands)
+    ]
+    rng = np.random.RandomState(seed)
+    scores = -rng.uniform(200, 2000, size=num_scores).round(2)
+    for i in range(num_programs):
+        db.register_function(make_function(i, rng), i % config.num_islands, float(scores[rng.randint(num_scores)]))
+    return db
+
+
+def prompts_per_second(db: ProgramsDatabase, num_prompts: int, seed: int = 0):
+    np.random.seed(seed)
+    prompts = []
+    start = time.perf_counter()
+    for _ in range(num_prompts):
+        prompts.append(db.get_prompt())
+    return num_prompts / (time.perf_counter() - start), prompts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_programs', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--num_scores', type=int, default=2000, help='number of distinct scores (clusters).')
+    parser.add_argument('--num_prompts', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'{"programs":>9} {"clusters":>9} {"before (prompts/s)":>19} {"after (prompts/s)":>18} {"speedup":>8}')
+    for num_programs in args.num_programs:
+        before_db = build_database(BeforeIsland, num_programs, args.num_scores)
+        after_db = build_database(programs_database.Island, num_programs, args.num_scores)
+        before, before_prompts = prompts_per_second(before_db, args.num_prompts)
+        after, after_prompts = prompts_per_second(after_db, args.num_prompts)
+        assert before_prompts == after_prompts, 'the prompts are different'
+        num_clusters = sum(len(island.clusters) for island in after_db.islands)
+        print(f'{num_programs:>9} {num_clusters:>9} {before:>19.1f} {after:>18.1f} {after / before:>7.1f}x')
@@ -0,0 +1,129 @@
+"""Samples per second of 'ShardedFunSearch' with 1, 2, 4, ... shards on a single host.
+
+The LLM and the evaluation below are CPU-bound and run in the threads of each shard (the evaluation is not sandboxed),
+so that a single 'FunSearch' process is limited by the GIL. The total budget grows with the number of shards
+(--samples_per_shard), so ideally the throughput grows linearly with the number of shards, up to the number of cores.
+On a single core it does not scale (1 / 2 / 4 shards: 18.7 / 14.5 / 14.5 samples/s, 32 samples per shard), since
+the shards share the core and pay the cost of the extra processes; a multi-core measurement is still to be recorded.
+With --check, each run with 2+ shards is also checked: all shard processes sample and exit cleanly, the best program
+migrates between the shards, and the checkpointed islands of all shards load back into a 'ProgramsDatabase'.
+
+Usage:
+    python benchmark_sharded.py --num_shards 1 2 4 --samples_per_shard 64
+    python benchmark_sharded.py --num_shards 2 4 --samples_per_shard 32 --check
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import LLM, Evaluation, TextFunctionProgramConverter
+from llm4ad.method.funsearch import ShardedFunSearch, ProgramsDatabaseConfig
+from llm4ad.method.funsearch.profiler import FunSearchProfiler
+from llm4ad.method.funsearch.resume import _get_latest_db_json, _resume_db
+
+TEMPLATE = '''
+def priority(x: int) -> float:
+    """Returns the priority of x."""
+    return x * 0.5
+'''
+
+
+def busy(n: int) -> int:
+    """Pure Python work which holds the GIL."""
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+class CPUBoundLLM(LLM):
+    def __init__(self, work: int):
+        super().__init__()
+        self._work = work
+
+    def draw_sample(self, prompt, *args, **kwargs) -> str:
+        busy(self._work)
+        return f'def priority(x: int) -> float:\n    return x * {random.random():.4f}\n'
+
+
+class CPUBoundEvaluation(Evaluation):
+    def __init__(self, work: int):
+        super().__init__(template_program=TEMPLATE, task_description='', timeout_seconds=30, safe_evaluate=False)
+        self.work = work
+
+    def evaluate_program(self, program_str: str, callable_func: callable):
+        busy(self.work)
+        return sum(callable_func(x) for x in range(100)) / 100
+
+
+def check_run(method: ShardedFunSearch, log_dir: str, num_shards: int):
+    """Asserts that the shards sampled and exited, the best program migrated, and the checkpoint round-trips."""
+    metrics = method.metrics()
+    assert all(n > 0 for n in metrics['samples_per_shard']), f'a shard did not sample: {metrics["samples_per_shard"]}'
+    assert all(m is not None for m in metrics['shards']), 'a shard did not report its metrics'
+    for process in method._processes:  # noqa
+        assert not process.is_alive() and process.exitcode == 0, f'shard exit code: {process.exitcode}'
+    assert metrics['num_migrations'] > 0, 'no migration happened, lower --migration_period'
+
+    # the last checkpoint holds the islands of all shards, in the global island order
+    path, _ = _get_latest_db_json(log_dir)
+    with open(path) as f:
+        saved = json.load(f)
+    db_config = ProgramsDatabaseConfig()
+    assert len(saved) == db_config.num_islands, f'{len(saved)} islands saved, expected {db_config.num_islands}'
+    template = TextFunctionProgramConverter.text_to_program(TEMPLATE)
+    function_name = TextFunctionProgramConverter.text_to_function(TEMPLATE).name
+    restored = _resume_db(log_dir, db_config, template, function_name).snapshot()
+    for island, restored_island in zip(saved, restored):
+        scores = sorted(c['score'] for c in island)
+        assert scores == sorted(c['score'] for c in restored_island), 'the restored clusters differ'
+        assert (sum(len(c['functions']) for c in island)
+                == sum(len(c['functions']) for c in restored_island)), 'the restored programs differ'
+    print(f'check passed ({num_shards} shards): samples per shard {metrics["samples_per_shard"]}, '
+          f'{metrics["num_migrations"]} migrations, {len(saved)} islands restored from {os.path.basename(path)}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_shards', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--samples_per_shard', type=int, default=64)
+    parser.add_argument('--llm_work', type=int, default=200_000, help='iterations of busy work per LLM sample.')
+    parser.add_argument('--eval_work', type=int, default=400_000, help='iterations of busy work per evaluation.')
+    parser.add_argument('--check', action='store_true', help='check the shards, the migration and the checkpoint.')
+    parser.add_argument('--migration_period', type=float, default=0.5, help='seconds between migrations.')
+    args = parser.parse_args()
+    assert not args.check or min(args.num_shards) >= 2, '--check needs 2+ shards'
+
+    print(f'cores: {os.cpu_count()}')
+    print(f'{"shards":>6} {"samples":>8} {"time (s)":>9} {"samples/s":>10} {"speedup":>8}')
+    base = None
+    for num_shards in args.num_shards:
+        log_dir = tempfile.mkdtemp(prefix='sharded_') if args.check else None
+        method = ShardedFunSearch(
+            llm=CPUBoundLLM(args.llm_work),
+            evaluation=CPUBoundEvaluation(args.eval_work),
+            profiler=FunSearchProfiler(log_dir, log_style='simple', create_random_path=False) if args.check else None,
+            num_shards=num_shards,
+            num_samplers=2,
+            num_evaluators=2,
+            samples_per_prompt=4,
+            max_sample_nums=args.samples_per_shard * num_shards,
+            migration_period=args.migration_period,
+            checkpoint_interval=args.samples_per_shard,
+            mp_context='fork',
+        )
+        start = time.perf_counter()
+        method.run()
+        elapsed = time.perf_counter() - start
+        num_samples = method.metrics()['num_samples']
+        throughput = num_samples / elapsed
+        base = base or throughput
+        print(f'{num_shards:>6} {num_samples:>8} {elapsed:>9.2f} {throughput:>10.1f} {throughput / base:>7.2f}x')
+        if args.check:
+            check_run(method, log_dir, num_shards)
@@ -0,0 +1,115 @@
+"""Early termination and the episode cache of the scoring-only 'moon_lander' evaluation.
+
+1. A set of candidate policies (variants of the gymnasium heuristic with different gains, and the template)
+   is evaluated on all seeds, and against a threshold (the score of the k-th best candidate, i.e., the worst
+   member of a population of size k) with the 'bound' and the 'racing' rule. For each rule, we report the wall
+   time, the number of played episodes, and the number of wrong decisions (a candidate that reaches the threshold
+   with all seeds but was stopped). The 'bound' rule never makes wrong decisions as long as the reward bound holds.
+2. The candidates are evaluated on the first half of the seeds, then on all seeds with an 'EpisodeCache'.
+   The second evaluation only plays the new seeds, and its scores are checked to be identical to step 1.
+
+Usage:
+    python benchmark_early_stopping.py --num_seeds 32 --pop_size 4
+"""
+import argparse
+import sys
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import TextFunctionProgramConverter
+from llm4ad.task.machine_learning.early_stopping import EarlyStopping
+from llm4ad.task.machine_learning.episode_cache import EpisodeCache
+from llm4ad.task.machine_learning.moon_lander.evaluation import MoonLanderEvaluation
+
+HEURISTIC = '''
+import numpy as np
+
+def choose_action(s: list, last_action: int, s_pre: list) -> int:
+    """The heuristic of gymnasium with the gains ({angle_gain}, {hover_gain})."""
+    angle_targ = np.clip(s[0] * 0.5 + s[2] * 1.0, -0.4, 0.4)
+    hover_targ = 0.55 * np.abs(s[0])
+    angle_todo = (angle_targ - s[4]) * {angle_gain} - s[5] * 1.0
+    hover_todo = (hover_targ - s[1]) * {hover_gain} - s[3] * 0.5
+    if s[6] or s[7]:
+        angle_todo = 0
+        hover_todo = -s[3] * 0.5
+    if hover_todo > np.abs(angle_todo) and hover_todo > 0.05:
+        return 2
+    if angle_todo < -0.05:
+        return 3
+    if angle_todo > 0.05:
+        return 1
+    return 0
+'''
+
+
+def candidate_programs(evaluation):
+    programs = [HEURISTIC.format(angle_gain=a, hover_gain=h)
+                for a, h in [(0.5, 0.5), (0.6, 0.5), (0.4, 0.6), (0.8, 0.3), (0.2, 0.5), (0.1, 0.1), (1.5, 0.1)]]
+    return programs + [evaluation.template_program]
+
+
+def score(evaluation, program_str, ins_ids=None, threshold=None):
+    program = TextFunctionProgramConverter.text_to_program(program_str)
+    function_name = TextFunctionProgramConverter.text_to_function(program_str).name
+    namespace = {}
+    exec(str(program), namespace)
+    return evaluation.evaluate_program(str(program), namespace[function_name],
+                                       ins_to_be_evaluated_id=ins_ids, threshold=threshold)
+
+
+def make_evaluation(seeds, **kwargs):
+    instances = {i: s for i, s in enumerate(seeds)}
+    return MoonLanderEvaluation(whocall='mles', scoring_only=True, instance_set=instances, ins_to_be_solve_set=instances,
+                                **kwargs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_seeds', type=int, default=32)
+    parser.add_argument('--pop_size', type=int, default=4, help='the threshold is the score of the k-th best candidate.')
+    parser.add_argument('--interval', type=int, default=4)
+    args = parser.parse_args()
+    seeds = list(range(2024, 2024 + args.num_seeds))
+
+    # 1. early termination
+    evaluation = make_evaluation(seeds)
+    programs = candidate_programs(evaluation)
+    start = time.perf_counter()
+    full = [score(evaluation, p) for p in programs]
+    full_time = time.perf_counter() - start
+    full_scores = [r['score'] for r in full]
+    threshold = sorted(full_scores, reverse=True)[args.pop_size - 1]
+    print(f'scores: {", ".join(f"{s:.3f}" for s in full_scores)}, threshold: {threshold:.3f}')
+    print(f'{"rule":>8} {"time (s)":>9} {"episodes":>9} {"stopped":>8} {"wrong":>6}')
+    print(f'{"none":>8} {full_time:>9.3f} {len(programs) * len(seeds):>9} {0:>8} {0:>6}')
+    for rule in ['bound', 'racing']:
+        evaluation.early_stopping = EarlyStopping(rule, interval=args.interval,
+                                                  episode_score_bound=evaluation.early_stopping.episode_score_bound)
+        start = time.perf_counter()
+        results = [score(evaluation, p, threshold=threshold) for p in programs]
+        elapsed = time.perf_counter() - start
+        stopped = [r['early_stopped'] for r in results]
+        wrong = sum(s and f >= threshold for s, f in zip(stopped, full_scores))
+        for r, f in zip(results, full_scores):
+            if not r['early_stopped']:
+                assert r['score'] == f, 'the score of a complete evaluation is different'
+        print(f'{rule:>8} {elapsed:>9.3f} {sum(r["num_evaluated"] for r in results):>9} {sum(stopped):>8} {wrong:>6}')
+        if rule == 'bound':
+            assert wrong == 0, 'the bound rule stopped a policy which reaches the threshold'
+
+    # 2. episode cache, first on half of the seeds, then on all seeds
+    cache = EpisodeCache()
+    evaluation = make_evaluation(seeds, episode_cache=cache)
+    half = list(range(len(seeds) // 2))
+    start = time.perf_counter()
+    for p in programs:
+        score(evaluation, p, ins_ids=half)
+    half_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cached_scores = [score(evaluation, p)['score'] for p in programs]
+    superset_time = time.perf_counter() - start
+    assert cached_scores == full_scores, 'the scores with cached episodes are different'
+    print(f'cache: first half {half_time:.3f} s, all seeds {superset_time:.3f} s (full evaluation {full_time:.3f} s), '
+          f'{cache.stats()["hits"]} cached episodes reused')
@@ -0,0 +1,55 @@
+"""Evaluation time of the template policies of 'moon_lander' and 'car_racing' with the rich (MLES) output and in the
+scoring-only mode (no rendering, canvas blending, PNG/base64 encoding or observation strings). The scores of both
+modes are checked to be identical.
+
+Usage:
+    python benchmark_scoring_only.py --num_instances 5
+"""
+import argparse
+import sys
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import TextFunctionProgramConverter
+
+
+def compile_template(evaluation):
+    program = TextFunctionProgramConverter.text_to_program(evaluation.template_program)
+    function_name = TextFunctionProgramConverter.text_to_function(evaluation.template_program).name
+    namespace = {}
+    exec(str(program), namespace)
+    return namespace[function_name]
+
+
+def run(evaluation, num_repeats: int):
+    policy = compile_template(evaluation)
+    results = {}
+    for scoring_only in [False, True]:
+        start = time.perf_counter()
+        for _ in range(num_repeats):
+            result = evaluation.evaluate_program('', policy, scoring_only=scoring_only)
+        results[scoring_only] = (time.perf_counter() - start) / num_repeats, result
+    (rich_time, rich), (fast_time, fast) = results[False], results[True]
+    assert rich['score'] == fast['score'] and rich['list_performance'] == fast['list_performance'], 'different scores'
+    assert rich['image'] is not None and fast['image'] is None
+    return rich_time, fast_time
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_instances', type=int, default=5)
+    parser.add_argument('--num_repeats', type=int, default=1)
+    parser.add_argument('--tasks', nargs='+', default=['moon_lander', 'car_racing'])
+    args = parser.parse_args()
+
+    instances = {i: 2024 + i for i in range(args.num_instances)}
+    print(f'{"task":>12} {"rich (s)":>9} {"scoring-only (s)":>17} {"speedup":>8}')
+    for task in args.tasks:
+        if task == 'moon_lander':
+            from llm4ad.task.machine_learning.moon_lander.evaluation import MoonLanderEvaluation as Eval
+        else:
+            from llm4ad.task.machine_learning.car_racing.evaluation import RacingCarEvaluation as Eval
+        evaluation = Eval(whocall='mles', instance_set=instances, ins_to_be_solve_set=instances)
+        rich_time, fast_time = run(evaluation, args.num_repeats)
+        print(f'{task:>12} {rich_time:>9.3f} {fast_time:>17.3f} {rich_time / fast_time:>7.1f}x')
@@ -0,0 +1,89 @@
+"""Per-candidate wall time of the scoring-only evaluation of 'moon_lander' and 'acrobot' with 16+ seeds:
+serial (a fresh 'gym.make' per seed for moon_lander), and 'VectorRollout' in 'sync' / 'async' mode, with
+per-observation or batched policy calls. The per-seed rewards of all modes are checked to be identical to the
+serial path. The envs of the vector modes are created once (as in the evaluators) and are not timed.
+The acrobot template samples random actions, so a deterministic (energy pumping) policy is used instead.
+The 'sync' mode steps the envs one by one, so it is expected to be on par with serial (measured 0.94-0.99x,
+0.7-1.12x with batched policy calls, depending on the run), and 'async' to be slower (~0.2x) since the envs
+are cheap to step.
+
+Usage:
+    python benchmark_vector_rollout.py --num_seeds 16 32 --num_repeats 3
+"""
+import argparse
+import sys
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import TextFunctionProgramConverter
+from llm4ad.task.machine_learning.acrobot.evaluation import AcrobotEvaluation
+from llm4ad.task.machine_learning.moon_lander.evaluation import MoonLanderEvaluation
+
+
+ACROBOT_POLICY = '''
+import numpy as np
+
+def choose_action(ct1: float, st1: float, ct2: float, st2: float, avt1: float, avt2: float, last_action: int) -> int:
+    """Applies the torque in the direction of the angular velocity of the lower link."""
+    return np.where(avt1 + 0.5 * avt2 > 0, 2, 0)
+'''
+
+
+def compile_policy(program_str):
+    program = TextFunctionProgramConverter.text_to_program(program_str)
+    function_name = TextFunctionProgramConverter.text_to_function(program_str).name
+    namespace = {}
+    exec(str(program), namespace)
+    return namespace[function_name]
+
+
+def moon_lander_rewards(evaluation, policy, seeds):
+    if evaluation.vectorization_mode is None:
+        return [evaluation.evaluate_single(policy, seed, render=False)[0]['episode_reward'] for seed in seeds]
+    return [infos['episode_reward'] for infos, _ in evaluation.evaluate_vectorized(policy, seeds)]
+
+
+def acrobot_rewards(evaluation, policy, seeds):
+    return evaluation.evaluate_seeds(policy)
+
+
+def timed(fn, num_repeats):
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        result = fn()
+    return (time.perf_counter() - start) / num_repeats, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_seeds', type=int, nargs='+', default=[16, 32])
+    parser.add_argument('--num_repeats', type=int, default=3)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'sync+batch', 'async'])
+    args = parser.parse_args()
+
+    print(f'{"task":>12} {"seeds":>6} {"mode":>11} {"time (s)":>9} {"speedup":>8}')
+    for num_seeds in args.num_seeds:
+        seeds = list(range(2024, 2024 + num_seeds))
+        instances = {i: s for i, s in enumerate(seeds)}
+        for task in ['moon_lander', 'acrobot']:
+            serial_time = serial_rewards = None
+            for mode in ['serial'] + args.modes:
+                kwargs = {'vectorization_mode': None if mode == 'serial' else mode.split('+')[0],
+                          'batch_policy': mode.endswith('+batch'), 'num_envs': num_seeds}
+                if task == 'moon_lander':
+                    evaluation = MoonLanderEvaluation(instance_set=instances, ins_to_be_solve_set=instances, **kwargs)
+                    rewards_fn = moon_lander_rewards
+                else:
+                    evaluation = AcrobotEvaluation(seeds=seeds, **kwargs)
+                    rewards_fn = acrobot_rewards
+                policy = compile_policy(evaluation.template_program if task == 'moon_lander' else ACROBOT_POLICY)
+                if evaluation._rollout is not None:
+                    evaluation._rollout.warm_up()
+                elapsed, rewards = timed(lambda: rewards_fn(evaluation, policy, seeds), args.num_repeats)
+                if evaluation._rollout is not None:
+                    evaluation._rollout.close()
+                if mode == 'serial':
+                    serial_time, serial_rewards = elapsed, rewards
+                assert rewards == serial_rewards, f'the rewards of {task} ({mode}) are different'
+                print(f'{task:>12} {num_seeds:>6} {mode:>11} {elapsed:>9.3f} {serial_time / elapsed:>7.2f}x')
@@ -0,0 +1,89 @@
+"""Evaluation time of 'JSSPEvaluation' (jssp_construct) before and after replacing the list scan of
+'schedule_jobs' (which checks all the unscheduled operations in Python, and removes the scheduled one with
+'list.remove') by a mask of the unscheduled operations and a vectorized feasibility check. The 'before'
+implementation below is the previous 'schedule_jobs', it is also used to check that the makespans are the same.
+The heuristic gets all the feasible operations in every step (often hundreds), so the evaluation time of
+the heuristics which look at all of them is dominated by the heuristic itself.
+
+Usage:
+    python benchmark_jssp_construct.py --sizes 50x10 50x20 100x20 --n_instance 16
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.jssp_construct import JSSPEvaluation
+
+
+def first(current_status, feasible_operations):
+    """Measures the cost of the scheduler itself."""
+    return feasible_operations[0]
+
+
+def shortest_processing_time(current_status, feasible_operations):
+    """The template of the task."""
+    return min(feasible_operations, key=lambda op: op[2])
+
+
+def earliest_start(current_status, feasible_operations):
+    """The operation which can start first, ties are broken by the longest processing time."""
+    machine_status, job_status = current_status['machine_status'], current_status['job_status']
+    return min(feasible_operations, key=lambda op: (max(machine_status[op[1]], job_status[op[0]]), -op[2]))
+
+
+def schedule_jobs_before(processing_times, n_jobs, n_machines, eva):
+    machine_status = [0] * n_machines
+    job_status = [0] * n_jobs
+    all_operations = []
+    for job_id in range(n_jobs):
+        for machine_id in range(n_machines):
+            all_operations.append((job_id, machine_id, processing_times[job_id][machine_id]))
+    while all_operations:
+        feasible_operations = []
+        for operation in all_operations:
+            job_id, machine_id, processing_time = operation
+            if job_status[job_id] <= machine_status[machine_id]:
+                feasible_operations.append(operation)
+        if len(feasible_operations) == 0:
+            next_operation = all_operations[0]
+        else:
+            next_operation = eva({'machine_status': machine_status, 'job_status': job_status}, feasible_operations)
+        job_id, machine_id, processing_time = next_operation
+        start_time = max(job_status[job_id], machine_status[machine_id])
+        end_time = start_time + processing_time
+        machine_status[machine_id] = end_time
+        job_status[job_id] = end_time
+        all_operations.remove(next_operation)
+    return max(job_status)
+
+
+def evaluate_before(evaluation: JSSPEvaluation, eva) -> float:
+    makespans = [schedule_jobs_before(p, n1, n2, eva) for p, n1, n2 in evaluation._datasets[:evaluation.n_instance]]
+    return -np.mean(makespans)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', default=['50x10', '50x20', '100x20'])
+    parser.add_argument('--n_instance', type=int, default=16)
+    args = parser.parse_args()
+
+    print(f'{"jobs x machines":>16}{"heuristic":>18}{"before (s)":>12}{"after (s)":>11}{"speedup":>10}')
+    for size in args.sizes:
+        n_jobs, n_machines = map(int, size.split('x'))
+        evaluation = JSSPEvaluation(n_instance=args.n_instance, n_jobs=n_jobs, n_machines=n_machines)
+        for name, heuristic in [('first', first), ('shortest', shortest_processing_time), ('earliest_start', earliest_start)]:
+            before_score, before = timed(lambda: evaluate_before(evaluation, heuristic))
+            after_score, after = timed(lambda: evaluation.evaluate(heuristic))
+            assert before_score == after_score, (size, name, before_score, after_score)
+            print(f'{size:>16}{name:>18}{before:>12.2f}{after:>11.2f}{before / after:>9.1f}x')
@@ -0,0 +1,74 @@
+"""Startup cost of 'import llm4ad' measured with 'python -X importtime' in fresh processes.
+
+'eager' imports every task and method module listed in the registry manifest after 'import llm4ad', which is
+what 'llm4ad/task/__init__.py' and 'llm4ad/method/__init__.py' did before the lazy registry. 'lazy' is a plain
+'import llm4ad', and 'lazy + 1 task' also accesses one evaluation class. For each setting, we report the cumulative
+import time of the top-level modules (median of the repeats), the number of imported modules, and which heavy
+third-party packages are imported. Pass '--output' to append the results to a JSONL file to track them over time.
+
+Usage:
+    python benchmark_import_time.py --repeats 5 --output import_time.jsonl
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../'))
+HEAVY_PACKAGES = ['gymnasium', 'matplotlib', 'pymoo', 'datasets', 'httpx', 'torch', 'scipy', 'numba', 'pandas']
+
+SETTINGS = {
+    'eager': '''
+import importlib, llm4ad
+from llm4ad import _registry_manifest as m
+for module in sorted(set(m.TASK_CLASSES.values()) | set(m.METHOD_CLASSES.values())):
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        pass
+''',
+    'lazy': 'import llm4ad',
+    'lazy + 1 task': 'import llm4ad.task\nllm4ad.task.OBPEvaluation',
+}
+
+REPORT = '''
+import sys, json
+print('@@' + json.dumps({{'num_modules': len(sys.modules),
+                         'heavy': [p for p in {heavy!r} if p in sys.modules]}}))
+'''
+
+
+def measure(code):
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-X', 'importtime', '-c',
+                          code + REPORT.format(heavy=HEAVY_PACKAGES)],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    # the top-level modules have no indentation in the 'module' column
+    total_us = sum(int(line.split('|')[1]) for line in out.stderr.splitlines()
+                   if line.startswith('import time:') and line.split('|')[1].strip().isdigit()
+                   and not line.split('|')[2].startswith('  '))
+    report = json.loads(next(line[2:] for line in out.stdout.splitlines() if line.startswith('@@')))
+    return total_us / 1e6, report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', type=str, default=None, help='a JSONL file the results are appended to.')
+    args = parser.parse_args()
+
+    results = {}
+    print(f'{"setting":>14} {"import (s)":>11} {"modules":>8}  heavy packages')
+    for name, code in SETTINGS.items():
+        runs = [measure(code) for _ in range(args.repeats)]
+        seconds = statistics.median(r[0] for r in runs)
+        report = runs[-1][1]
+        results[name] = {'seconds': seconds, **report}
+        print(f'{name:>14} {seconds:>11.3f} {report["num_modules"]:>8}  {", ".join(report["heavy"]) or "-"}')
+
+    if args.output is not None:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps({'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': sys.version.split()[0],
+                                'results': results}) + '\n')
@@ -0,0 +1,186 @@
+"""Survival and parent selection cost of the NSGA-II and MEoH populations at population sizes 20-500, before and
+after the incremental Pareto archive (elitist), the cached parent lists/probabilities, and the cached pairwise
+syntax match of MEoH. The 'before' implementations below are the previous 'register_function'/'selection', they are
+also used to check that both implementations give the same populations (and for MEoH, the same parents) under the
+same seed. The NSGA-II survival breaks crowding ties with pymoo's 'randomized_argsort', which is not seeded by numpy,
+so the order of its population (and therefore its parents) is not reproducible.
+
+MEoH 'before' computes the syntax match of all dominating pairs in every selection, so it is only measured up to
+'--before_max_size'.
+
+Usage:
+    python benchmark_population.py --sizes 20 50 100 200 500 --before_max_size 100
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from codebleu.syntax_match import calc_syntax_match
+from pymoo.operators.survival.rank_and_crowding.metrics import get_crowding_function
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+from pymoo.util.randomized_argsort import randomized_argsort
+
+from llm4ad.base import TextFunctionProgramConverter
+from llm4ad.method.meoh.population import Population as MEoHPopulation
+from llm4ad.method.nsga2.population import Population as NSGA2Population
+
+
+class BeforeNSGA2Population(NSGA2Population):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._elitist = []
+
+    @property
+    def elitist(self):
+        return self._elitist
+
+    def register_function(self, func):
+        if func.score is None:
+            return
+        if not self.has_duplicate_function(func):
+            self._next_gen_pop.append(func)
+            self._fingerprint_index.setdefault(self._fingerprint(func), []).append((True, len(self._next_gen_pop) - 1))
+        if len(self._next_gen_pop) >= self._pop_size or (len(self._next_gen_pop) >= self._pop_size // 5 and self._generation == 0):
+            pop = self._population + self._next_gen_pop
+            pop_elitist = pop + self._elitist
+            objs_array = -np.array([ind.score for ind in pop_elitist])
+            nondom_idx = NonDominatedSorting().do(objs_array, only_non_dominated_front=True)
+            self._elitist = [pop_elitist[idx] for idx in nondom_idx.tolist()]
+            F = -np.array([ind.score for ind in pop])
+            survivors = []
+            fronts = NonDominatedSorting().do(F, n_stop_if_ranked=self._pop_size)
+            for k, front in enumerate(fronts):
+                I = np.arange(len(front))
+                if len(survivors) + len(I) > self._pop_size // 5:
+                    n_remove = len(survivors) + len(front) - self._pop_size // 5
+                    crowding_of_front = get_crowding_function("cd").do(F[front, :], n_remove=n_remove)
+                    I = randomized_argsort(crowding_of_front, order='descending', method='numpy')
+                    I = I[:-n_remove]
+                else:
+                    crowding_of_front = get_crowding_function("cd").do(F[front, :], n_remove=0)
+                for j, i in enumerate(front):
+                    pop[i].rank = k
+                    pop[i].crowding = crowding_of_front[j]
+                survivors.extend(front[I])
+            self._population = [pop[i] for i in survivors]
+            self._next_gen_pop = []
+            self._generation += 1
+            self._rebuild_index()
+
+    def selection(self):
+        funcs = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
+        if len(funcs) > 1:
+            parents = np.random.choice(funcs, size=2, replace=False)
+            if parents[0].rank < parents[1].rank:
+                return parents[0]
+            elif parents[0].rank > parents[1].rank:
+                return parents[1]
+            elif parents[0].crowding > parents[1].crowding:
+                return parents[0]
+            else:
+                return parents[1]
+        return funcs[0]
+
+
+def before_dominated_counts(funcs):
+    n = len(funcs)
+    dominated_counts = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            if (np.array(funcs[i].score) >= np.array(funcs[j].score)).all():
+                dominated_counts[i, j] = -calc_syntax_match([funcs[i].entire_code], funcs[j].entire_code, 'python')
+            elif (np.array(funcs[j].score) >= np.array(funcs[i].score)).all():
+                dominated_counts[j, i] = -calc_syntax_match([funcs[j].entire_code], funcs[i].entire_code, 'python')
+    return dominated_counts.sum(0)
+
+
+class BeforeMEoHPopulation(MEoHPopulation):
+    def register_function(self, func):
+        if func.score is None:
+            return
+        if not self.has_duplicate_function(func):
+            self._next_gen_pop.append(func)
+            self._fingerprint_index.setdefault(self._fingerprint(func), []).append((True, len(self._next_gen_pop) - 1))
+        if len(self._next_gen_pop) >= self._pop_size or (len(self._next_gen_pop) >= self._pop_size // 4 and self._generation == 0):
+            pop = self._population + self._next_gen_pop
+            dominated_counts_ = before_dominated_counts(pop)
+            self._population = [pop[i] for i in np.argsort(-dominated_counts_)[:self._pop_size]]
+            self._next_gen_pop = []
+            self._generation += 1
+            self._rebuild_index()
+
+    def selection(self):
+        funcs = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
+        dominated_counts_ = before_dominated_counts(funcs)
+        p = np.exp(dominated_counts_) / np.exp(dominated_counts_).sum()
+        return np.random.choice(funcs, p=p, replace=False)
+
+
+def make_functions(num: int, seed: int):
+    rng = np.random.RandomState(seed)
+    funcs = []
+    for i in range(num):
+        lines = []
+        for j in range(rng.randint(3, 12)):
+            op = ['+', '-', '*'][rng.randint(3)]
+            lines.append(f'    v{j} = item {op} {rng.rand():.3f} * bins[{j % 3}]')
+            if rng.rand() < 0.3:
+                lines.append(f'    if v{j} > {rng.rand():.2f}:\n        v{j} = v{j} * 2')
+        lines.append(f'    return v0 + {i}')
+        func = TextFunctionProgramConverter.text_to_function(
+            'def priority(item, bins):\n' + '\n'.join(lines) + '\n'
+        )
+        func.entire_code = 'import numpy as np\n\n' + str(func)
+        # two objectives with a trade-off, and some noise so that there are several fronts
+        x = rng.rand()
+        func.score = [round(-x - 0.3 * rng.rand(), 4), round(-(1 - x) - 0.3 * rng.rand(), 4)]
+        funcs.append(func)
+    return funcs
+
+
+def run(population_cls, size: int, num_selections: int, seed: int = 0):
+    """Registers two generations, then one more generation (timed survival) followed by timed selections."""
+    np.random.seed(seed)
+    pop = population_cls(pop_size=size)
+    funcs = make_functions(4 * size, seed)
+    for f in funcs[:3 * size]:
+        pop.register_function(f)
+    survival_time = 0.
+    for f in funcs[3 * size:]:
+        start = time.perf_counter()
+        pop.register_function(f)
+        survival_time += time.perf_counter() - start
+    start = time.perf_counter()
+    parents = [pop.selection() for _ in range(num_selections)]
+    selection_time = (time.perf_counter() - start) / num_selections
+    return survival_time, selection_time, [str(f) for f in pop.population], [str(f) for f in parents]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 50, 100, 200, 500])
+    parser.add_argument('--num_selections', type=int, default=50)
+    parser.add_argument('--before_max_size', type=int, default=100, help='the largest size of the MEoH "before" runs.')
+    args = parser.parse_args()
+
+    print(f'{"method":>6} {"size":>5} {"survival before (ms)":>21} {"after (ms)":>11} '
+          f'{"selection before (ms)":>22} {"after (ms)":>11}')
+    for name, before_cls, after_cls, max_size in [
+        ('NSGA-II', BeforeNSGA2Population, NSGA2Population, max(args.sizes)),
+        ('MEoH', BeforeMEoHPopulation, MEoHPopulation, args.before_max_size),
+    ]:
+        for size in args.sizes:
+            after = run(after_cls, size, args.num_selections)
+            if size <= max_size:
+                before = run(before_cls, size, args.num_selections)
+                assert sorted(before[2]) == sorted(after[2]), 'the populations are different'
+                if name == 'MEoH':
+                    assert before[2] == after[2] and before[3] == after[3], 'the selected parents are different'
+                before_str = f'{before[0] * 1e3:>21.2f} {after[0] * 1e3:>11.2f} {before[1] * 1e3:>22.3f} {after[1] * 1e3:>11.3f}'
+            else:
+                before_str = f'{"-":>21} {after[0] * 1e3:>11.2f} {"-":>22} {after[1] * 1e3:>11.3f}'
+            print(f'{name:>6} {size:>5} {before_str}')
@@ -0,0 +1,77 @@
+"""Evaluation time of 'OBPEvaluation' (online_bin_packing) with the reference 'full' engine, which scores every
+bin (including the empty ones) for each item, and with the open-bin 'frontier' engine, which only scores the
+open bins and a single empty bin. Both engines must use the same number of bins for position-independent
+heuristics. The 'full' engine is skipped for sizes above '--max_full_items' (it is O(n^2)), the frontier engine
+makes the 100k-item Weibull instances feasible.
+The last part shows the 'verify' engine on a heuristic which depends on the other bins.
+
+Usage:
+    python benchmark_obp_frontier.py --n_items 1000 5000 20000 100000 --n_instances 5
+"""
+import argparse
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.online_bin_packing import OBPEvaluation
+
+
+def best_fit(item: float, bins: np.ndarray) -> np.ndarray:
+    return -bins
+
+
+def worst_fit(item: float, bins: np.ndarray) -> np.ndarray:
+    return bins - item
+
+
+def funsearch(item: float, bins: np.ndarray) -> np.ndarray:
+    """The heuristic discovered by FunSearch for Weibull instances."""
+    score = 1000 * np.ones(bins.shape)
+    score -= bins * (bins - item)
+    index = np.argmin(bins)
+    score[index] *= item
+    score[index] -= (bins[index] - item) ** 4
+    return score
+
+
+def closest_to_mean(item: float, bins: np.ndarray) -> np.ndarray:
+    """Depends on all the bins which fit the item, so it is not position-independent."""
+    return -np.abs(bins - np.mean(bins))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_items', type=int, nargs='+', default=[1000, 5000, 20000, 100000])
+    parser.add_argument('--n_instances', type=int, default=5)
+    parser.add_argument('--max_full_items', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f'{"items":>8}{"heuristic":>12}{"bins":>10}{"full (s)":>11}{"frontier (s)":>14}{"speedup":>10}')
+    for n_items in args.n_items:
+        evaluation = OBPEvaluation(n_instances=args.n_instances, n_items=n_items, packing_engine='frontier')
+        for name, heuristic in [('best_fit', best_fit), ('worst_fit', worst_fit), ('funsearch', funsearch)]:
+            frontier_bins, frontier_time = timed(lambda: evaluation.count_bins(heuristic, 'frontier'))
+            if n_items <= args.max_full_items:
+                full_bins, full_time = timed(lambda: evaluation.count_bins(heuristic, 'full'))
+                assert np.array_equal(full_bins, frontier_bins), (name, full_bins, frontier_bins)
+                full = f'{full_time:>11.2f}{frontier_time:>14.2f}{full_time / frontier_time:>9.1f}x'
+            else:
+                full = f'{"-":>11}{frontier_time:>14.2f}{"-":>10}'
+            print(f'{n_items:>8}{name:>12}{np.mean(frontier_bins):>10.1f}{full}')
+
+    evaluation = OBPEvaluation(n_instances=args.n_instances, n_items=1000, packing_engine='verify')
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        score = evaluation.evaluate(closest_to_mean)
+    print(f'# verify, closest_to_mean: score {score} (of the full engine), {len(caught)} warning(s): '
+          f'{caught[0].message if caught else None}')
@@ -0,0 +1,74 @@
+"""Compare the startup cost of the science discovery evaluations when the datasets are loaded from
+the Python literal modules (the previous behaviour: import the module, then 'pd.DataFrame') and when they
+are memory-mapped from the converted '.npy' files. Each setting runs in a fresh interpreter, and the
+'cold' settings use an empty bytecode cache, which is the cost paid by a new installation / container.
+
+Usage:
+    python benchmark_startup.py --repeats 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.science_discovery.binary_data import BinaryDataset
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../'))
+
+LITERAL = '''
+import numpy as np, pandas as pd
+from llm4ad.task.science_discovery.{task} import {split}
+data = np.array(pd.DataFrame({split}.data))
+'''
+
+BINARY = '''
+from llm4ad.task.science_discovery.binary_data import BinaryDataset
+data = BinaryDataset.load_table('llm4ad.task.science_discovery.{task}', '{split}')
+'''
+
+# the packages are imported before the timer, so only the cost of loading the dataset is measured
+MEASURE = '''
+import resource, time
+import numpy, pandas, llm4ad.task
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024)
+'''
+
+
+def run(code: str, cold: bool):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if cold:
+            env['PYTHONPYCACHEPREFIX'] = cache_dir
+        out = subprocess.run([sys.executable, '-c', MEASURE.format(code=code)],
+                             env=env, capture_output=True, text=True, check=True).stdout
+    elapsed, max_rss = out.split()
+    return float(elapsed), float(max_rss)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--tasks', nargs='+', default=['bactgrow', 'oscillator1', 'oscillator2', 'stresstrain'])
+    parser.add_argument('--split', default='train')
+    args = parser.parse_args()
+
+    BinaryDataset.convert_all()
+    print(f'{"task":<14}{"setting":<16}{"time (s)":>10}{"extra RSS (MB)":>16}')
+    for task in args.tasks:
+        settings = [
+            ('literal, cold', LITERAL, True),
+            ('literal, warm', LITERAL, False),
+            ('binary (mmap)', BINARY, False),
+        ]
+        for name, template, cold in settings:
+            results = [run(template.format(task=task, split=args.split), cold) for _ in range(args.repeats)]
+            elapsed = min(r[0] for r in results)
+            max_rss = min(r[1] for r in results)
+            print(f'{task:<14}{name:<16}{elapsed:>10.3f}{max_rss:>16.1f}')
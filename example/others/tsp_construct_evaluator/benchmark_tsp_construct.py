@@ -0,0 +1,99 @@
+"""Evaluations per second of 'TSPEvaluation' (tsp_construct) before and after precomputing the neighborhood
+matrices, maintaining a visited mask, and vectorizing the tour cost. The 'before' implementation below is the
+previous 'TSPEvaluation.evaluate', it is also used to check that both implementations return the same score.
+
+Usage:
+    python benchmark_tsp_construct.py --problem_sizes 50 200 500 1000 --n_instance 16
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.tsp_construct import TSPEvaluation
+
+
+def select_next_node(current_node: int, destination_node: int, unvisited_nodes: np.ndarray, distance_matrix: np.ndarray) -> int:
+    """Nearest neighbor (the unvisited nodes are sorted by the distance to the current node)."""
+    return unvisited_nodes[0]
+
+
+def select_next_node_greedy(current_node: int, destination_node: int, unvisited_nodes: np.ndarray, distance_matrix: np.ndarray) -> int:
+    """Weighs the distance to the current node and to the destination."""
+    scores = distance_matrix[current_node][unvisited_nodes] - 0.3 * distance_matrix[destination_node][unvisited_nodes]
+    return unvisited_nodes[np.argmin(scores)]
+
+
+def evaluate_before(evaluation: TSPEvaluation, eva: callable) -> float:
+    def tour_cost(instance, solution, problem_size):
+        cost = 0
+        for j in range(problem_size - 1):
+            cost += np.linalg.norm(instance[int(solution[j])] - instance[int(solution[j + 1])])
+        cost += np.linalg.norm(instance[int(solution[-1])] - instance[int(solution[0])])
+        return cost
+
+    def generate_neighborhood_matrix(instance):
+        instance = np.array(instance)
+        n = len(instance)
+        neighborhood_matrix = np.zeros((n, n), dtype=int)
+        for i in range(n):
+            distances = np.linalg.norm(instance[i] - instance, axis=1)
+            neighborhood_matrix[i] = np.argsort(distances)
+        return neighborhood_matrix
+
+    problem_size = evaluation.problem_size
+    dis = np.ones(evaluation.n_instance)
+    n_ins = 0
+    for instance, distance_matrix in evaluation._datasets:
+        neighbor_matrix = generate_neighborhood_matrix(instance)
+        destination_node = 0
+        current_node = 0
+        route = np.zeros(problem_size)
+        for i in range(1, problem_size - 1):
+            near_nodes = neighbor_matrix[current_node][1:]
+            mask = ~np.isin(near_nodes, route[:i])
+            unvisited_near_nodes = near_nodes[mask]
+            next_node = eva(current_node, destination_node, unvisited_near_nodes, distance_matrix)
+            if next_node in route:
+                return None
+            current_node = next_node
+            route[i] = current_node
+        mask = ~np.isin(np.arange(problem_size), route[:problem_size - 1])
+        route[problem_size - 1] = np.arange(problem_size)[mask][0]
+        dis[n_ins] = tour_cost(instance, route, problem_size)
+        n_ins += 1
+        if n_ins == evaluation.n_instance:
+            break
+    return -np.average(dis)
+
+
+def measure(fn, min_seconds: float):
+    num, start = 0, time.perf_counter()
+    while True:
+        score = fn()
+        num += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return score, num / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--problem_sizes', type=int, nargs='+', default=[50, 200, 500, 1000])
+    parser.add_argument('--n_instance', type=int, default=16)
+    parser.add_argument('--min_seconds', type=float, default=3.)
+    args = parser.parse_args()
+
+    print(f'{"size":>6}{"heuristic":>12}{"before (eval/s)":>18}{"after (eval/s)":>17}{"speedup":>10}')
+    for problem_size in args.problem_sizes:
+        start = time.perf_counter()
+        evaluation = TSPEvaluation(n_instance=args.n_instance, problem_size=problem_size)
+        print(f'# problem size {problem_size}: construction (incl. neighborhood matrices) {time.perf_counter() - start:.2f}s')
+        for name, heuristic in [('nearest', select_next_node), ('greedy', select_next_node_greedy)]:
+            before_score, before = measure(lambda: evaluate_before(evaluation, heuristic), args.min_seconds)
+            after_score, after = measure(lambda: evaluation.evaluate(heuristic), args.min_seconds)
+            assert before_score == after_score, (before_score, after_score)
+            print(f'{problem_size:>6}{name:>12}{before:>18.3f}{after:>17.3f}{after / before:>9.1f}x')
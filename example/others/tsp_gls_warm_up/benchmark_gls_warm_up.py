@@ -0,0 +1,102 @@
+"""JIT overhead of the 'tsp_gls_2O' evaluation.
+
+1. Import time of 'gls.py' in a fresh process (after numba): the kernels are compiled (empty numba cache),
+   loaded from the numba cache, or taken from the ahead-of-time extension module ('LLM4AD_GLS_AOT=1').
+2. A program evaluated in a forked process (as 'SecureEvaluator' does), with and without the warm-up at
+   construction, and with the numba fast path of 'update_edge_distance'. The timing record of each evaluation
+   (JIT time, search time) is printed, and the scores of the fast path are checked to be identical.
+
+Usage:
+    python benchmark_gls_warm_up.py --n_instance 4
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.base import TextFunctionProgramConverter
+
+# 'gls.py' is imported from its path, since importing 'llm4ad.task' imports all tasks
+IMPORT_GLS = '''
+import importlib.util, sys, time
+import numba
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('gls', {path!r})
+gls = sys.modules['gls'] = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gls)
+assert gls.kernel_backend == {backend!r}
+print(time.perf_counter() - start)
+'''
+GLS_PATH = os.path.abspath('../../../llm4ad/task/optimization/tsp_gls_2O/gls.py')
+
+
+def import_time(env, aot=False):
+    code = IMPORT_GLS.format(path=GLS_PATH, backend='aot' if aot else 'jit')
+    out = subprocess.run([sys.executable, '-W', 'ignore', '-c', code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def evaluate_in_child(evaluation, program_str, queue):
+    namespace = {}
+    exec(program_str, namespace)
+    func = namespace[TextFunctionProgramConverter.text_to_function(program_str).name]
+    result = evaluation.evaluate_program(program_str, func)
+    queue.put((result, evaluation.timing_records[-1]))
+
+
+def forked_evaluation(evaluation, program_str):
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    process = ctx.Process(target=evaluate_in_child, args=(evaluation, program_str, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_instance', type=int, default=4, help='the number of TSP instances per evaluation.')
+    args = parser.parse_args()
+
+    # 1. import of the kernels in a fresh process
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+        compile_time = import_time(env)
+        cached_time = import_time(env)
+    from llm4ad.task.optimization.tsp_gls_2O import gls
+    start = time.perf_counter()
+    gls.load_aot_kernels(build=True)
+    build_time = time.perf_counter() - start
+    gls.use_jit_kernels()
+    aot_time = import_time(dict(os.environ, LLM4AD_GLS_AOT='1'), aot=True)
+    print(f'import of the kernels: compile {compile_time:.2f} s, numba cache {cached_time:.2f} s, '
+          f'AOT {aot_time:.2f} s (built once in {build_time:.2f} s)')
+
+    # 2. evaluations in forked processes
+    from llm4ad.task.optimization.tsp_gls_2O.evaluation import TSP_GLS_2O_Evaluation
+    print(f'{"setting":>22} {"construct (s)":>14} {"evaluate (s)":>13} {"jit (s)":>8} {"search (s)":>11} {"callback":>9}')
+    scores = {}
+    for name, kwargs in [('no warm-up', {'warm_up': False}),
+                         ('warm-up', {}),
+                         ('warm-up + AOT', {'aot_kernels': True}),
+                         ('warm-up + numba cb', {'numba_callback': True})]:
+        start = time.perf_counter()
+        evaluation = TSP_GLS_2O_Evaluation(**kwargs)
+        construct_time = time.perf_counter() - start
+        evaluation.n_instance = args.n_instance
+        evaluation._datasets = evaluation._datasets[:args.n_instance]
+        program_str = str(TextFunctionProgramConverter.text_to_program(evaluation.template_program))
+        result, record = forked_evaluation(evaluation, program_str)
+        gls.use_jit_kernels()
+        scores[name] = result
+        print(f'{name:>22} {construct_time:>14.2f} {record["evaluate_seconds"]:>13.2f} {record["jit_seconds"]:>8.2f} '
+              f'{record["search_seconds"]:>11.2f} {record["callback"]:>9}')
+    # the running time is part of the score, only the tour length has to be identical
+    costs = {name: r[0] for name, r in scores.items()}
+    assert len(set(costs.values())) == 1, f'the tour lengths are different: {costs}'
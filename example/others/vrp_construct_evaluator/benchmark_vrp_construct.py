@@ -0,0 +1,185 @@
+"""Evaluations per second of the constructive vehicle routing tasks (cvrp_construct, ovrp_construct and
+vrptw_construct) before and after the shared 'RouteConstruction' engine, which passes read-only views of the
+instance instead of deep copies to every call of the heuristic, and computes the feasible nodes with a mask.
+The 'before' implementations below are the previous construction loops, they are also used to check that both
+implementations return exactly the same score.
+
+Usage:
+    python benchmark_vrp_construct.py --problem_sizes 50 100 200 --n_instance 16
+"""
+import argparse
+import copy
+import sys
+import time
+
+import numpy as np
+
+sys.path.append('../../../')  # This is for finding all the modules
+
+from llm4ad.task.optimization.cvrp_construct import CVRPEvaluation
+from llm4ad.task.optimization.ovrp_construct import OVRPEvaluation
+from llm4ad.task.optimization.vrptw_construct import VRPTWEvaluation
+
+
+def cvrp_first(current_node, depot, unvisited_nodes, rest_capacity, demands, distance_matrix):
+    return unvisited_nodes[0]
+
+
+def cvrp_nearest(current_node, depot, unvisited_nodes, rest_capacity, demands, distance_matrix):
+    """Nearest feasible node, weighted by its demand."""
+    scores = distance_matrix[current_node][unvisited_nodes] / demands[unvisited_nodes]
+    return unvisited_nodes[np.argmin(scores)]
+
+
+def vrptw_first(current_node, depot, unvisited_nodes, rest_capacity, current_time, demands, distance_matrix, time_windows):
+    return unvisited_nodes[0] if len(unvisited_nodes) else depot
+
+
+def vrptw_earliest(current_node, depot, unvisited_nodes, rest_capacity, current_time, demands, distance_matrix, time_windows):
+    """The node whose service can start first (the template of the task loops over the nodes in Python)."""
+    best_node, best_start = depot, float('inf')
+    for node in unvisited_nodes:
+        if demands[node] <= rest_capacity:
+            start = max(current_time + distance_matrix[current_node, node], time_windows[node][0])
+            if start <= time_windows[node][1] and start < best_start:
+                best_node, best_start = node, start
+    return best_node
+
+
+def route_construct_before(problem_size, distance_matrix, demands, vehicle_capacity, heuristic):
+    route = []
+    current_load = 0
+    current_node = 0
+    route.append(current_node)
+    unvisited_nodes = set(range(1, problem_size))
+    all_nodes = np.array(list(unvisited_nodes))
+    feasible_unvisited_nodes = all_nodes
+    while unvisited_nodes:
+        next_node = heuristic(current_node, 0, feasible_unvisited_nodes, vehicle_capacity - current_load,
+                              copy.deepcopy(demands), copy.deepcopy(distance_matrix))
+        if next_node == 0:
+            route.append(next_node)
+            current_load = 0
+            current_node = 0
+        else:
+            route.append(next_node)
+            current_load += demands[next_node]
+            unvisited_nodes.remove(next_node)
+            current_node = next_node
+        feasible_nodes_capacity = np.array([node for node in all_nodes if current_load + demands[node] <= vehicle_capacity])
+        feasible_unvisited_nodes = np.intersect1d(feasible_nodes_capacity, list(unvisited_nodes))
+        if len(unvisited_nodes) > 0 and len(feasible_unvisited_nodes) < 1:
+            route.append(0)
+            current_load = 0
+            current_node = 0
+            feasible_unvisited_nodes = np.array(list(unvisited_nodes))
+    if len(set(route)) != problem_size:
+        return None
+    return route
+
+
+def evaluate_before(evaluation, heuristic, closed: bool) -> float:
+    dis = np.ones(evaluation.n_instance)
+    for n_ins, (instance, distance_matrix, demands, vehicle_capacity) in enumerate(evaluation._datasets[:evaluation.n_instance]):
+        route = route_construct_before(evaluation.problem_size, distance_matrix, demands, vehicle_capacity, heuristic)
+        cost = 0
+        for j in range(len(route) - 1):
+            cost += np.linalg.norm(instance[int(route[j])] - instance[int(route[j + 1])])
+        if closed:
+            cost += np.linalg.norm(instance[int(route[-1])] - instance[int(route[0])])
+        dis[n_ins] = cost
+    return -np.average(dis)
+
+
+def evaluate_vrptw_before(evaluation, heuristic) -> float:
+    dis = np.ones(evaluation.n_instance)
+    n_ins = 0
+    for instance, distance_matrix, demands, vehicle_capacity, time_service, time_windows in evaluation._datasets:
+        route = []
+        current_load = 0
+        current_node = 0
+        current_time = 0
+        route.append(current_node)
+        unvisited_nodes = set(range(1, evaluation.problem_size + 1))
+        all_nodes = np.array(list(unvisited_nodes))
+        feasible_unvisited_nodes = all_nodes
+        while unvisited_nodes:
+            next_node = heuristic(current_node, 0, feasible_unvisited_nodes, vehicle_capacity - current_load, current_time,
+                                  copy.deepcopy(demands), copy.deepcopy(distance_matrix), copy.deepcopy(time_windows))
+            if next_node == 0:
+                route.append(next_node)
+                current_load = 0
+                current_time = 0
+                current_node = 0
+            else:
+                travel_time = distance_matrix[current_node, next_node]
+                current_time += (travel_time)
+                current_time = max(current_time, time_windows[next_node][0])
+                current_time += time_service[next_node]
+                route.append(next_node)
+                current_load += demands[next_node]
+                unvisited_nodes.remove(next_node)
+                current_node = next_node
+            feasible_nodes_tw = np.array([node for node in all_nodes
+                                          if max(current_time + distance_matrix[current_node][node], time_windows[node][0]) < time_windows[node][1] - 0.0001
+                                          and max(current_time + distance_matrix[current_node][node], time_windows[node][0]) + time_service[node] + distance_matrix[node][0] < time_windows[0][1] - 0.0001])
+            feasible_nodes_capacity = np.array([node for node in all_nodes if current_load + demands[node] <= vehicle_capacity])
+            feasible_unvisited_nodes = np.intersect1d(np.intersect1d(feasible_nodes_tw, feasible_nodes_capacity), list(unvisited_nodes))
+            if len(unvisited_nodes) > 0 and len(feasible_unvisited_nodes) < 1:
+                route.append(0)
+                current_load = 0
+                current_time = 0
+                current_node = 0
+                feasible_unvisited_nodes = np.array(list(unvisited_nodes))
+        if len(set(route)) != evaluation.problem_size + 1:
+            return None
+        dis[n_ins] = evaluation.tour_cost(distance_matrix, route, time_service, time_windows)
+        n_ins += 1
+        if n_ins == evaluation.n_instance:
+            break
+    return -np.average(dis)
+
+
+def measure(fn, min_seconds: float):
+    num, start = 0, time.perf_counter()
+    while True:
+        score = fn()
+        num += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return score, num / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--problem_sizes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--n_instance', type=int, default=16)
+    parser.add_argument('--min_seconds', type=float, default=3.)
+    args = parser.parse_args()
+
+    print(f'{"task":>6}{"size":>6}{"heuristic":>10}{"before (eval/s)":>18}{"after (eval/s)":>17}{"speedup":>10}')
+    for problem_size in args.problem_sizes:
+        tasks = [
+            ('cvrp', CVRPEvaluation(n_instance=args.n_instance, problem_size=problem_size),
+             [('first', cvrp_first), ('nearest', cvrp_nearest)], lambda e, h: evaluate_before(e, h, closed=True)),
+            ('ovrp', OVRPEvaluation(n_instance=args.n_instance, problem_size=problem_size),
+             [('first', cvrp_first), ('nearest', cvrp_nearest)], lambda e, h: evaluate_before(e, h, closed=False)),
+            ('vrptw', VRPTWEvaluation(n_instance=args.n_instance, problem_size=problem_size),
+             [('first', vrptw_first), ('earliest', vrptw_earliest)], evaluate_vrptw_before),
+        ]
+        for task, evaluation, heuristics, before_fn in tasks:
+            for name, heuristic in heuristics:
+                before_score, before = measure(lambda: before_fn(evaluation, heuristic), args.min_seconds)
+                after_score, after = measure(lambda: evaluation.evaluate(heuristic), args.min_seconds)
+                assert before_score == after_score, (task, name, before_score, after_score)
+                print(f'{task:>6}{problem_size:>6}{name:>10}{before:>18.3f}{after:>17.3f}{after / before:>9.1f}x')
+
+    # the heuristic cannot modify the instance
+    def corrupt(current_node, depot, unvisited_nodes, rest_capacity, demands, distance_matrix):
+        demands[unvisited_nodes] = 0
+        return unvisited_nodes[0]
+
+    try:
+        CVRPEvaluation(n_instance=1).evaluate(corrupt)
+    except ValueError as e:
+        print(f'# a heuristic which writes to the demands fails: {e}')
@@ -0,0 +1,55 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/3/5
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+Lazy exports of a package: the classes are imported on first access (see 'llm4ad/registry.py').
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Dict
+
+
+def load_class(module_name: str, name: str):
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(f"'{name}' is defined in '{module_name}', which can not be imported: {e}") from e
+    return getattr(module, name)
+
+
+def lazy_exports(package_name: str, classes: Dict[str, str]):
+    """Returns '(__getattr__, __dir__)' of a package which exports 'classes' (name -> module) lazily.
+    A loaded class is stored in the package, so '__getattr__' is only called on first access.
+    """
+    package = sys.modules[package_name]
+
+    def __getattr__(name):
+        if name not in classes:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+        value = load_class(classes[name], name)
+        setattr(package, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(package)) | set(classes))
+
+    return __getattr__, __dir__
@@ -0,0 +1,198 @@
+# This file is generated by "python -m llm4ad.registry", do not edit it manually.
+# It lists the task and method classes of LLM4AD, see "llm4ad/registry.py".
+
+TASKS = [
+    {'name': 'acrobot', 'domain': 'machine_learning', 'path': 'machine_learning/acrobot', 'module': 'llm4ad.task.machine_learning.acrobot.evaluation', 'classes': ['_AcrobotEpisode', 'AcrobotEvaluation'], 'evaluation_class': 'AcrobotEvaluation'},
+    {'name': 'car_mountain', 'domain': 'machine_learning', 'path': 'machine_learning/car_mountain', 'module': 'llm4ad.task.machine_learning.car_mountain.evaluation', 'classes': ['CarMountainEvaluation'], 'evaluation_class': 'CarMountainEvaluation'},
+    {'name': 'car_mountain_continue', 'domain': 'machine_learning', 'path': 'machine_learning/car_mountain_continue', 'module': 'llm4ad.task.machine_learning.car_mountain_continue.evaluation', 'classes': ['CarMountainCEvaluation'], 'evaluation_class': 'CarMountainCEvaluation'},
+    {'name': 'car_racing', 'domain': 'machine_learning', 'path': 'machine_learning/car_racing', 'module': 'llm4ad.task.machine_learning.car_racing.evaluation', 'classes': ['RacingCarEvaluation'], 'evaluation_class': 'RacingCarEvaluation'},
+    {'name': 'moon_lander', 'domain': 'machine_learning', 'path': 'machine_learning/moon_lander', 'module': 'llm4ad.task.machine_learning.moon_lander.evaluation', 'classes': ['_MoonLanderEpisode', 'MoonLanderEvaluation'], 'evaluation_class': 'MoonLanderEvaluation'},
+    {'name': 'pendulum', 'domain': 'machine_learning', 'path': 'machine_learning/pendulum', 'module': 'llm4ad.task.machine_learning.pendulum.evaluation', 'classes': ['PendulumEvaluation'], 'evaluation_class': 'PendulumEvaluation'},
+    {'name': 'admissible_set', 'domain': 'optimization', 'path': 'optimization/admissible_set', 'module': 'llm4ad.task.optimization.admissible_set.evaluation', 'classes': ['_ExtantBits', 'ASPEvaluation'], 'evaluation_class': 'ASPEvaluation'},
+    {'name': 'bp_1d_construct', 'domain': 'optimization', 'path': 'optimization/bp_1d_construct', 'module': 'llm4ad.task.optimization.bp_1d_construct.evaluation', 'classes': ['BP1DEvaluation'], 'evaluation_class': 'BP1DEvaluation'},
+    {'name': 'bp_2d_construct', 'domain': 'optimization', 'path': 'optimization/bp_2d_construct', 'module': 'llm4ad.task.optimization.bp_2d_construct.evaluation', 'classes': ['BP2DEvaluation'], 'evaluation_class': 'BP2DEvaluation'},
+    {'name': 'cflp_construct', 'domain': 'optimization', 'path': 'optimization/cflp_construct', 'module': 'llm4ad.task.optimization.cflp_construct.evaluation', 'classes': ['CFLPEvaluation'], 'evaluation_class': 'CFLPEvaluation'},
+    {'name': 'aircraft_landing_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/aircraft_landing_co_bench', 'module': 'llm4ad.task.optimization.co_bench.aircraft_landing_co_bench.evaluation', 'classes': ['ALEvaluationCB'], 'evaluation_class': 'ALEvaluationCB'},
+    {'name': 'assignment_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/assignment_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.assignment_problem_co_bench.evaluation', 'classes': ['APEvaluationCB'], 'evaluation_class': 'APEvaluationCB'},
+    {'name': 'assortment_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/assortment_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.assortment_problem_co_bench.evaluation', 'classes': ['AssortPEvaluationCB'], 'evaluation_class': 'AssortPEvaluationCB'},
+    {'name': 'bp_1d_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/bp_1d_co_bench', 'module': 'llm4ad.task.optimization.co_bench.bp_1d_co_bench.evaluation', 'classes': ['BP1DEvaluationCB'], 'evaluation_class': 'BP1DEvaluationCB'},
+    {'name': 'capacitated_warehouse_location_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/capacitated_warehouse_location_co_bench', 'module': 'llm4ad.task.optimization.co_bench.capacitated_warehouse_location_co_bench.evaluation', 'classes': ['CWLEvaluationCB'], 'evaluation_class': 'CWLEvaluationCB'},
+    {'name': 'common_due_date_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/common_due_date_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.common_due_date_scheduling_co_bench.evaluation', 'classes': ['CDDSEvaluationCB'], 'evaluation_class': 'CDDSEvaluationCB'},
+    {'name': 'constrained_guillotine_cutting_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/constrained_guillotine_cutting_co_bench', 'module': 'llm4ad.task.optimization.co_bench.constrained_guillotine_cutting_co_bench.evaluation', 'classes': ['CGCEvaluationCB'], 'evaluation_class': 'CGCEvaluationCB'},
+    {'name': 'constrained_non_guillotine_cutting_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/constrained_non_guillotine_cutting_co_bench', 'module': 'llm4ad.task.optimization.co_bench.constrained_non_guillotine_cutting_co_bench.evaluation', 'classes': ['CNCEvaluationCB'], 'evaluation_class': 'CNCEvaluationCB'},
+    {'name': 'container_loading_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/container_loading_co_bench', 'module': 'llm4ad.task.optimization.co_bench.container_loading_co_bench.evaluation', 'classes': ['CLEvaluationCB'], 'evaluation_class': 'CLEvaluationCB'},
+    {'name': 'container_loading_with_weight_restrictions_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/container_loading_with_weight_restrictions_co_bench', 'module': 'llm4ad.task.optimization.co_bench.container_loading_with_weight_restrictions_co_bench.evaluation', 'classes': ['CLWREvaluationCB'], 'evaluation_class': 'CLWREvaluationCB'},
+    {'name': 'corporate_structuring_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/corporate_structuring_co_bench', 'module': 'llm4ad.task.optimization.co_bench.corporate_structuring_co_bench.evaluation', 'classes': ['CSEvaluationCB'], 'evaluation_class': 'CSEvaluationCB'},
+    {'name': 'crew_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/crew_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.crew_scheduling_co_bench.evaluation', 'classes': ['CSchedulingEvaluationCB'], 'evaluation_class': 'CSchedulingEvaluationCB'},
+    {'name': 'equitable_partitioning_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/equitable_partitioning_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.equitable_partitioning_problem_co_bench.evaluation', 'classes': ['EPPEvaluationCB'], 'evaluation_class': 'EPPEvaluationCB'},
+    {'name': 'euclidean_steiner_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/euclidean_steiner_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.euclidean_steiner_problem_co_bench.evaluation', 'classes': ['ESPEvaluationCB'], 'evaluation_class': 'ESPEvaluationCB'},
+    {'name': 'flow_shop_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/flow_shop_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.flow_shop_scheduling_co_bench.evaluation', 'classes': ['FSSEvaluationCB'], 'evaluation_class': 'FSSEvaluationCB'},
+    {'name': 'generalised_assignment_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/generalised_assignment_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.generalised_assignment_problem_co_bench.evaluation', 'classes': ['GAPEvaluationCB'], 'evaluation_class': 'GAPEvaluationCB'},
+    {'name': 'graph_colouring_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/graph_colouring_co_bench', 'module': 'llm4ad.task.optimization.co_bench.graph_colouring_co_bench.evaluation', 'classes': ['GCEvaluationCB'], 'evaluation_class': 'GCEvaluationCB'},
+    {'name': 'hybrid_reentrant_shop_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/hybrid_reentrant_shop_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.hybrid_reentrant_shop_scheduling_co_bench.evaluation', 'classes': ['HRSSEvaluationCB'], 'evaluation_class': 'HRSSEvaluationCB'},
+    {'name': 'job_shop_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/job_shop_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.job_shop_scheduling_co_bench.evaluation', 'classes': ['JSSEvaluationCB'], 'evaluation_class': 'JSSEvaluationCB'},
+    {'name': 'maximal_independent_set_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/maximal_independent_set_co_bench', 'module': 'llm4ad.task.optimization.co_bench.maximal_independent_set_co_bench.evaluation', 'classes': ['MISEvaluationCB'], 'evaluation_class': 'MISEvaluationCB'},
+    {'name': 'multi_demand_multidimensional_knapsack_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/multi_demand_multidimensional_knapsack_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.multi_demand_multidimensional_knapsack_problem_co_bench.evaluation', 'classes': ['MDMKPEvaluationCB'], 'evaluation_class': 'MDMKPEvaluationCB'},
+    {'name': 'multidimensional_knapsack_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/multidimensional_knapsack_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.multidimensional_knapsack_problem_co_bench.evaluation', 'classes': ['MKPEvaluationCB'], 'evaluation_class': 'MKPEvaluationCB'},
+    {'name': 'open_shop_scheduling_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/open_shop_scheduling_co_bench', 'module': 'llm4ad.task.optimization.co_bench.open_shop_scheduling_co_bench.evaluation', 'classes': ['OSSEvaluationCB'], 'evaluation_class': 'OSSEvaluationCB'},
+    {'name': 'p_median_capacitated_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/p_median_capacitated_co_bench', 'module': 'llm4ad.task.optimization.co_bench.p_median_capacitated_co_bench.evaluation', 'classes': ['PMCEvaluationCB'], 'evaluation_class': 'PMCEvaluationCB'},
+    {'name': 'p_median_uncapacitated_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/p_median_uncapacitated_co_bench', 'module': 'llm4ad.task.optimization.co_bench.p_median_uncapacitated_co_bench.evaluation', 'classes': ['PMUEvaluationCB'], 'evaluation_class': 'PMUEvaluationCB'},
+    {'name': 'packing_unequal_circles_area_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/packing_unequal_circles_area_co_bench', 'module': 'llm4ad.task.optimization.co_bench.packing_unequal_circles_area_co_bench.evaluation', 'classes': ['PUCAEvaluationCB'], 'evaluation_class': 'PUCAEvaluationCB'},
+    {'name': 'packing_unequal_circles_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/packing_unequal_circles_co_bench', 'module': 'llm4ad.task.optimization.co_bench.packing_unequal_circles_co_bench.evaluation', 'classes': ['PUCEvaluationCB'], 'evaluation_class': 'PUCEvaluationCB'},
+    {'name': 'packing_unequal_rectangles_and_squares_area_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/packing_unequal_rectangles_and_squares_area_co_bench', 'module': 'llm4ad.task.optimization.co_bench.packing_unequal_rectangles_and_squares_area_co_bench.evaluation', 'classes': ['PURSAEvaluationCB'], 'evaluation_class': 'PURSAEvaluationCB'},
+    {'name': 'packing_unequal_rectangles_and_squares_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/packing_unequal_rectangles_and_squares_co_bench', 'module': 'llm4ad.task.optimization.co_bench.packing_unequal_rectangles_and_squares_co_bench.evaluation', 'classes': ['PURSEvaluationCB'], 'evaluation_class': 'PURSEvaluationCB'},
+    {'name': 'resource_constrained_shortest_path_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/resource_constrained_shortest_path_co_bench', 'module': 'llm4ad.task.optimization.co_bench.resource_constrained_shortest_path_co_bench.evaluation', 'classes': ['RCSPEvaluationCB'], 'evaluation_class': 'RCSPEvaluationCB'},
+    {'name': 'set_covering_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/set_covering_co_bench', 'module': 'llm4ad.task.optimization.co_bench.set_covering_co_bench.evaluation', 'classes': ['SCEvaluationCB'], 'evaluation_class': 'SCEvaluationCB'},
+    {'name': 'set_partitioning_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/set_partitioning_co_bench', 'module': 'llm4ad.task.optimization.co_bench.set_partitioning_co_bench.evaluation', 'classes': ['SPEvaluationCB'], 'evaluation_class': 'SPEvaluationCB'},
+    {'name': 'travelling_salesman_problem_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/travelling_salesman_problem_co_bench', 'module': 'llm4ad.task.optimization.co_bench.travelling_salesman_problem_co_bench.evaluation', 'classes': ['TSPEvaluationCB'], 'evaluation_class': 'TSPEvaluationCB'},
+    {'name': 'uncapacitated_warehouse_location_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/uncapacitated_warehouse_location_co_bench', 'module': 'llm4ad.task.optimization.co_bench.uncapacitated_warehouse_location_co_bench.evaluation', 'classes': ['UWLEvaluationCB'], 'evaluation_class': 'UWLEvaluationCB'},
+    {'name': 'unconstrained_guillotine_cutting_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/unconstrained_guillotine_cutting_co_bench', 'module': 'llm4ad.task.optimization.co_bench.unconstrained_guillotine_cutting_co_bench.evaluation', 'classes': ['UGCEvaluationCB'], 'evaluation_class': 'UGCEvaluationCB'},
+    {'name': 'vehicle_routing_period_routing_co_bench', 'domain': 'optimization', 'path': 'optimization/co_bench/vehicle_routing_period_routing_co_bench', 'module': 'llm4ad.task.optimization.co_bench.vehicle_routing_period_routing_co_bench.evaluation', 'classes': ['VRPREvaluationCB'], 'evaluation_class': 'VRPREvaluationCB'},
+    {'name': 'cvrp_construct', 'domain': 'optimization', 'path': 'optimization/cvrp_construct', 'module': 'llm4ad.task.optimization.cvrp_construct.evaluation', 'classes': ['CVRPEvaluation'], 'evaluation_class': 'CVRPEvaluation'},
+    {'name': 'jssp_construct', 'domain': 'optimization', 'path': 'optimization/jssp_construct', 'module': 'llm4ad.task.optimization.jssp_construct.evaluation', 'classes': ['JSSPEvaluation'], 'evaluation_class': 'JSSPEvaluation'},
+    {'name': 'knapsack_construct', 'domain': 'optimization', 'path': 'optimization/knapsack_construct', 'module': 'llm4ad.task.optimization.knapsack_construct.evaluation', 'classes': ['KnapsackEvaluation'], 'evaluation_class': 'KnapsackEvaluation'},
+    {'name': 'online_bin_packing', 'domain': 'optimization', 'path': 'optimization/online_bin_packing', 'module': 'llm4ad.task.optimization.online_bin_packing.evaluation', 'classes': ['OBPEvaluation'], 'evaluation_class': 'OBPEvaluation'},
+    {'name': 'online_bin_packing_2O', 'domain': 'optimization', 'path': 'optimization/online_bin_packing_2O', 'module': 'llm4ad.task.optimization.online_bin_packing_2O.evaluation', 'classes': ['OBP_2O_Evaluation'], 'evaluation_class': 'OBP_2O_Evaluation'},
+    {'name': 'ovrp_construct', 'domain': 'optimization', 'path': 'optimization/ovrp_construct', 'module': 'llm4ad.task.optimization.ovrp_construct.evaluation', 'classes': ['OVRPEvaluation'], 'evaluation_class': 'OVRPEvaluation'},
+    {'name': 'pymoo_moead', 'domain': 'optimization', 'path': 'optimization/pymoo_moead', 'module': 'llm4ad.task.optimization.pymoo_moead.evaluation', 'classes': ['MOEAD_PYMOO_Evaluation'], 'evaluation_class': 'MOEAD_PYMOO_Evaluation'},
+    {'name': 'qap_construct', 'domain': 'optimization', 'path': 'optimization/qap_construct', 'module': 'llm4ad.task.optimization.qap_construct.evaluation', 'classes': ['QAPEvaluation'], 'evaluation_class': 'QAPEvaluation'},
+    {'name': 'set_cover_construct', 'domain': 'optimization', 'path': 'optimization/set_cover_construct', 'module': 'llm4ad.task.optimization.set_cover_construct.evaluation', 'classes': ['SCPEvaluation'], 'evaluation_class': 'SCPEvaluation'},
+    {'name': 'tsp_construct', 'domain': 'optimization', 'path': 'optimization/tsp_construct', 'module': 'llm4ad.task.optimization.tsp_construct.evaluation', 'classes': ['TSPEvaluation'], 'evaluation_class': 'TSPEvaluation'},
+    {'name': 'tsp_gls_2O', 'domain': 'optimization', 'path': 'optimization/tsp_gls_2O', 'module': 'llm4ad.task.optimization.tsp_gls_2O.evaluation', 'classes': ['TSP_GLS_2O_Evaluation'], 'evaluation_class': 'TSP_GLS_2O_Evaluation'},
+    {'name': 'vrptw_construct', 'domain': 'optimization', 'path': 'optimization/vrptw_construct', 'module': 'llm4ad.task.optimization.vrptw_construct.evaluation', 'classes': ['VRPTWEvaluation'], 'evaluation_class': 'VRPTWEvaluation'},
+    {'name': 'bactgrow', 'domain': 'science_discovery', 'path': 'science_discovery/bactgrow', 'module': 'llm4ad.task.science_discovery.bactgrow.evaluation', 'classes': ['BGEvaluation'], 'evaluation_class': 'BGEvaluation'},
+    {'name': 'feynman_srsd', 'domain': 'science_discovery', 'path': 'science_discovery/feynman_srsd', 'module': 'llm4ad.task.science_discovery.feynman_srsd.evaluation', 'classes': ['FeynmanEvaluation'], 'evaluation_class': 'FeynmanEvaluation'},
+    {'name': 'ode_1d', 'domain': 'science_discovery', 'path': 'science_discovery/ode_1d', 'module': 'llm4ad.task.science_discovery.ode_1d.evaluation', 'classes': ['ODEEvaluation'], 'evaluation_class': 'ODEEvaluation'},
+    {'name': 'oscillator1', 'domain': 'science_discovery', 'path': 'science_discovery/oscillator1', 'module': 'llm4ad.task.science_discovery.oscillator1.evaluation', 'classes': ['OscillatorEvaluation1'], 'evaluation_class': 'OscillatorEvaluation1'},
+    {'name': 'oscillator2', 'domain': 'science_discovery', 'path': 'science_discovery/oscillator2', 'module': 'llm4ad.task.science_discovery.oscillator2.evaluation', 'classes': ['OscillatorEvaluation2'], 'evaluation_class': 'OscillatorEvaluation2'},
+    {'name': 'stresstrain', 'domain': 'science_discovery', 'path': 'science_discovery/stresstrain', 'module': 'llm4ad.task.science_discovery.stresstrain.evaluation', 'classes': ['SSEvaluation'], 'evaluation_class': 'SSEvaluation'},
+]
+
+TASK_CLASSES = {
+    '_AcrobotEpisode': 'llm4ad.task.machine_learning.acrobot.evaluation',
+    'AcrobotEvaluation': 'llm4ad.task.machine_learning.acrobot.evaluation',
+    'CarMountainEvaluation': 'llm4ad.task.machine_learning.car_mountain.evaluation',
+    'CarMountainCEvaluation': 'llm4ad.task.machine_learning.car_mountain_continue.evaluation',
+    'RacingCarEvaluation': 'llm4ad.task.machine_learning.car_racing.evaluation',
+    '_MoonLanderEpisode': 'llm4ad.task.machine_learning.moon_lander.evaluation',
+    'MoonLanderEvaluation': 'llm4ad.task.machine_learning.moon_lander.evaluation',
+    'PendulumEvaluation': 'llm4ad.task.machine_learning.pendulum.evaluation',
+    '_ExtantBits': 'llm4ad.task.optimization.admissible_set.evaluation',
+    'ASPEvaluation': 'llm4ad.task.optimization.admissible_set.evaluation',
+    'BP1DEvaluation': 'llm4ad.task.optimization.bp_1d_construct.evaluation',
+    'BP2DEvaluation': 'llm4ad.task.optimization.bp_2d_construct.evaluation',
+    'CFLPEvaluation': 'llm4ad.task.optimization.cflp_construct.evaluation',
+    'ALEvaluationCB': 'llm4ad.task.optimization.co_bench.aircraft_landing_co_bench.evaluation',
+    'APEvaluationCB': 'llm4ad.task.optimization.co_bench.assignment_problem_co_bench.evaluation',
+    'AssortPEvaluationCB': 'llm4ad.task.optimization.co_bench.assortment_problem_co_bench.evaluation',
+    'BP1DEvaluationCB': 'llm4ad.task.optimization.co_bench.bp_1d_co_bench.evaluation',
+    'CWLEvaluationCB': 'llm4ad.task.optimization.co_bench.capacitated_warehouse_location_co_bench.evaluation',
+    'CDDSEvaluationCB': 'llm4ad.task.optimization.co_bench.common_due_date_scheduling_co_bench.evaluation',
+    'CGCEvaluationCB': 'llm4ad.task.optimization.co_bench.constrained_guillotine_cutting_co_bench.evaluation',
+    'CNCEvaluationCB': 'llm4ad.task.optimization.co_bench.constrained_non_guillotine_cutting_co_bench.evaluation',
+    'CLEvaluationCB': 'llm4ad.task.optimization.co_bench.container_loading_co_bench.evaluation',
+    'CLWREvaluationCB': 'llm4ad.task.optimization.co_bench.container_loading_with_weight_restrictions_co_bench.evaluation',
+    'CSEvaluationCB': 'llm4ad.task.optimization.co_bench.corporate_structuring_co_bench.evaluation',
+    'CSchedulingEvaluationCB': 'llm4ad.task.optimization.co_bench.crew_scheduling_co_bench.evaluation',
+    'EPPEvaluationCB': 'llm4ad.task.optimization.co_bench.equitable_partitioning_problem_co_bench.evaluation',
+    'ESPEvaluationCB': 'llm4ad.task.optimization.co_bench.euclidean_steiner_problem_co_bench.evaluation',
+    'FSSEvaluationCB': 'llm4ad.task.optimization.co_bench.flow_shop_scheduling_co_bench.evaluation',
+    'GAPEvaluationCB': 'llm4ad.task.optimization.co_bench.generalised_assignment_problem_co_bench.evaluation',
+    'GCEvaluationCB': 'llm4ad.task.optimization.co_bench.graph_colouring_co_bench.evaluation',
+    'HRSSEvaluationCB': 'llm4ad.task.optimization.co_bench.hybrid_reentrant_shop_scheduling_co_bench.evaluation',
+    'JSSEvaluationCB': 'llm4ad.task.optimization.co_bench.job_shop_scheduling_co_bench.evaluation',
+    'MISEvaluationCB': 'llm4ad.task.optimization.co_bench.maximal_independent_set_co_bench.evaluation',
+    'MDMKPEvaluationCB': 'llm4ad.task.optimization.co_bench.multi_demand_multidimensional_knapsack_problem_co_bench.evaluation',
+    'MKPEvaluationCB': 'llm4ad.task.optimization.co_bench.multidimensional_knapsack_problem_co_bench.evaluation',
+    'OSSEvaluationCB': 'llm4ad.task.optimization.co_bench.open_shop_scheduling_co_bench.evaluation',
+    'PMCEvaluationCB': 'llm4ad.task.optimization.co_bench.p_median_capacitated_co_bench.evaluation',
+    'PMUEvaluationCB': 'llm4ad.task.optimization.co_bench.p_median_uncapacitated_co_bench.evaluation',
+    'PUCAEvaluationCB': 'llm4ad.task.optimization.co_bench.packing_unequal_circles_area_co_bench.evaluation',
+    'PUCEvaluationCB': 'llm4ad.task.optimization.co_bench.packing_unequal_circles_co_bench.evaluation',
+    'PURSAEvaluationCB': 'llm4ad.task.optimization.co_bench.packing_unequal_rectangles_and_squares_area_co_bench.evaluation',
+    'PURSEvaluationCB': 'llm4ad.task.optimization.co_bench.packing_unequal_rectangles_and_squares_co_bench.evaluation',
+    'RCSPEvaluationCB': 'llm4ad.task.optimization.co_bench.resource_constrained_shortest_path_co_bench.evaluation',
+    'SCEvaluationCB': 'llm4ad.task.optimization.co_bench.set_covering_co_bench.evaluation',
+    'SPEvaluationCB': 'llm4ad.task.optimization.co_bench.set_partitioning_co_bench.evaluation',
+    'TSPEvaluationCB': 'llm4ad.task.optimization.co_bench.travelling_salesman_problem_co_bench.evaluation',
+    'UWLEvaluationCB': 'llm4ad.task.optimization.co_bench.uncapacitated_warehouse_location_co_bench.evaluation',
+    'UGCEvaluationCB': 'llm4ad.task.optimization.co_bench.unconstrained_guillotine_cutting_co_bench.evaluation',
+    'VRPREvaluationCB': 'llm4ad.task.optimization.co_bench.vehicle_routing_period_routing_co_bench.evaluation',
+    'CVRPEvaluation': 'llm4ad.task.optimization.cvrp_construct.evaluation',
+    'JSSPEvaluation': 'llm4ad.task.optimization.jssp_construct.evaluation',
+    'KnapsackEvaluation': 'llm4ad.task.optimization.knapsack_construct.evaluation',
+    'OBPEvaluation': 'llm4ad.task.optimization.online_bin_packing.evaluation',
+    'OBP_2O_Evaluation': 'llm4ad.task.optimization.online_bin_packing_2O.evaluation',
+    'OVRPEvaluation': 'llm4ad.task.optimization.ovrp_construct.evaluation',
+    'MOEAD_PYMOO_Evaluation': 'llm4ad.task.optimization.pymoo_moead.evaluation',
+    'QAPEvaluation': 'llm4ad.task.optimization.qap_construct.evaluation',
+    'SCPEvaluation': 'llm4ad.task.optimization.set_cover_construct.evaluation',
+    'TSPEvaluation': 'llm4ad.task.optimization.tsp_construct.evaluation',
+    'TSP_GLS_2O_Evaluation': 'llm4ad.task.optimization.tsp_gls_2O.evaluation',
+    'VRPTWEvaluation': 'llm4ad.task.optimization.vrptw_construct.evaluation',
+    'BGEvaluation': 'llm4ad.task.science_discovery.bactgrow.evaluation',
+    'FeynmanEvaluation': 'llm4ad.task.science_discovery.feynman_srsd.evaluation',
+    'ODEEvaluation': 'llm4ad.task.science_discovery.ode_1d.evaluation',
+    'OscillatorEvaluation1': 'llm4ad.task.science_discovery.oscillator1.evaluation',
+    'OscillatorEvaluation2': 'llm4ad.task.science_discovery.oscillator2.evaluation',
+    'SSEvaluation': 'llm4ad.task.science_discovery.stresstrain.evaluation',
+}
+
+METHODS = [
+    {'name': 'eoh', 'module': 'llm4ad.method.eoh', 'classes': ['EoH', 'EoHProfiler', 'EoHTensorboardProfiler', 'EoHWandbProfiler']},
+    {'name': 'funsearch', 'module': 'llm4ad.method.funsearch', 'classes': ['ProgramsDatabaseConfig', 'FunSearch', 'ShardedFunSearch', 'FunSearchTensorboardProfiler', 'FunSearchWandbProfiler']},
+    {'name': 'hillclimb', 'module': 'llm4ad.method.hillclimb', 'classes': ['HillClimb']},
+    {'name': 'lhns', 'module': 'llm4ad.method.lhns', 'classes': ['LHNS', 'LHNSProfiler', 'LHNSTensorboardProfiler', 'LHNSWandbProfiler']},
+    {'name': 'llamea', 'module': 'llm4ad.method.llamea', 'classes': ['LLaMEA']},
+    {'name': 'mcts_ahd', 'module': 'llm4ad.method.mcts_ahd', 'classes': ['MCTS_AHD', 'MAProfiler', 'MATensorboardProfiler', 'MAWandbProfiler']},
+    {'name': 'meoh', 'module': 'llm4ad.method.meoh', 'classes': ['MEoH', 'MEoHProfiler', 'MEoHTensorboardProfiler', 'MEoHWandbProfiler']},
+    {'name': 'mles', 'module': 'llm4ad.method.mles', 'classes': ['MLES', 'MLESProfiler', 'EoHTensorboardProfiler', 'EoHWandbProfiler']},
+    {'name': 'moead', 'module': 'llm4ad.method.moead', 'classes': ['MOEAD', 'MOEADProfiler', 'MOEADTensorboardProfiler', 'MOEADWandbProfiler']},
+    {'name': 'nsga2', 'module': 'llm4ad.method.nsga2', 'classes': ['NSGA2', 'NSGA2Profiler', 'NSGA2TensorboardProfiler', 'NSGA2WandbProfiler']},
+    {'name': 'partevo', 'module': 'llm4ad.method.partevo', 'classes': ['PartEvo', 'PartEvoProfiler', 'EoHTensorboardProfiler', 'EoHWandbProfiler']},
+    {'name': 'randsample', 'module': 'llm4ad.method.randsample', 'classes': ['RandSample']},
+    {'name': 'reevo', 'module': 'llm4ad.method.reevo', 'classes': ['ReEvo', 'ReEvoProfiler', 'ReEvoTensorboardProfiler', 'ReEvoWandbProfiler']},
+]
+
+METHOD_CLASSES = {
+    'EoH': 'llm4ad.method.eoh',
+    'EoHProfiler': 'llm4ad.method.eoh',
+    'EoHTensorboardProfiler': 'llm4ad.method.eoh',
+    'EoHWandbProfiler': 'llm4ad.method.eoh',
+    'ProgramsDatabaseConfig': 'llm4ad.method.funsearch',
+    'FunSearch': 'llm4ad.method.funsearch',
+    'ShardedFunSearch': 'llm4ad.method.funsearch',
+    'FunSearchTensorboardProfiler': 'llm4ad.method.funsearch',
+    'FunSearchWandbProfiler': 'llm4ad.method.funsearch',
+    'HillClimb': 'llm4ad.method.hillclimb',
+    'LHNS': 'llm4ad.method.lhns',
+    'LHNSProfiler': 'llm4ad.method.lhns',
+    'LHNSTensorboardProfiler': 'llm4ad.method.lhns',
+    'LHNSWandbProfiler': 'llm4ad.method.lhns',
+    'LLaMEA': 'llm4ad.method.llamea',
+    'MCTS_AHD': 'llm4ad.method.mcts_ahd',
+    'MAProfiler': 'llm4ad.method.mcts_ahd',
+    'MATensorboardProfiler': 'llm4ad.method.mcts_ahd',
+    'MAWandbProfiler': 'llm4ad.method.mcts_ahd',
+    'MEoH': 'llm4ad.method.meoh',
+    'MEoHProfiler': 'llm4ad.method.meoh',
+    'MEoHTensorboardProfiler': 'llm4ad.method.meoh',
+    'MEoHWandbProfiler': 'llm4ad.method.meoh',
+    'MLES': 'llm4ad.method.mles',
+    'MLESProfiler': 'llm4ad.method.mles',
+    'MOEAD': 'llm4ad.method.moead',
+    'MOEADProfiler': 'llm4ad.method.moead',
+    'MOEADTensorboardProfiler': 'llm4ad.method.moead',
+    'MOEADWandbProfiler': 'llm4ad.method.moead',
+    'NSGA2': 'llm4ad.method.nsga2',
+    'NSGA2Profiler': 'llm4ad.method.nsga2',
+    'NSGA2TensorboardProfiler': 'llm4ad.method.nsga2',
+    'NSGA2WandbProfiler': 'llm4ad.method.nsga2',
+    'PartEvo': 'llm4ad.method.partevo',
+    'PartEvoProfiler': 'llm4ad.method.partevo',
+    'RandSample': 'llm4ad.method.randsample',
+    'ReEvo': 'llm4ad.method.reevo',
+    'ReEvoProfiler': 'llm4ad.method.reevo',
+    'ReEvoTensorboardProfiler': 'llm4ad.method.reevo',
+    'ReEvoWandbProfiler': 'llm4ad.method.reevo',
+}
@@ -1,9 +1,14 @@
-from . import code, evaluate, sample, modify_code
+from . import code, code_similarity, evaluate, evaluate_cache, fingerprint, sample, modify_code, pareto, pipeline
 from .code import (
     Function,
     Program,
     TextFunctionProgramConverter
 )
-from .evaluate import Evaluation, SecureEvaluator
+from .code_similarity import CodeSimilarity
+from .evaluate import Evaluation, SecureEvaluator, EvaluationWorkerPool
+from .evaluate_cache import EvaluationCache
+from .fingerprint import CodeFingerprint
 from .modify_code import ModifyCode
+from .pareto import ParetoArchive
+from .pipeline import SampleEvaluatePipeline
 from .sample import LLM, SampleTrimmer
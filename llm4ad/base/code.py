@@ -52,6 +52,8 @@ import copy
 import dataclasses
 from typing import Any, List, Callable
 
+from .fingerprint import CodeFingerprint
+
 
 @dataclasses.dataclass
 class Function:
@@ -90,6 +92,9 @@ class Function:
             if '"""' in value:
                 value = value.strip()
                 value = value.replace('"""', '')
+        # Invalidate the cached fingerprints if the code is changed.
+        if name in ('name', 'args', 'body', 'return_type'):
+            self.__dict__.pop('_fingerprints', None)
         super().__setattr__(name, value)
 
     def __eq__(self, other: Function):
@@ -106,6 +111,17 @@ class Function:
         function += self.body + '\n\n'
         return function
 
+    def fingerprint(self, alpha_equivalence: bool = False) -> str:
+        """Return the canonical fingerprint of the function, which ignores docstrings, comments and whitespace.
+        The fingerprint is computed once and cached. Please refer to 'llm4ad.base.fingerprint' for details.
+        """
+        cache = self.__dict__.setdefault('_fingerprints', {})
+        if alpha_equivalence not in cache:
+            cache[alpha_equivalence] = CodeFingerprint.fingerprint(
+                self.to_code_without_docstring(), alpha_equivalence=alpha_equivalence
+            )
+        return cache[alpha_equivalence]
+
 
 @dataclasses.dataclass(frozen=True)
 class Program:
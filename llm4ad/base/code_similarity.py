@@ -0,0 +1,317 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+A cached similarity service for the methods that compare programs (e.g., PartEvo clustering, MEoH selection).
+'codebleu.calc_codebleu' parses both programs of a pair with tree-sitter and extracts their data-flow graphs,
+so a pairwise matrix of n programs costs O(n^2) parses. Here, each program is parsed once, its subtrees and
+normalized data-flow items are kept as counts (keyed by the digest of the code), and the syntax / dataflow match
+of all pairs are computed from the counts with numpy. The scores are identical to 'calc_syntax_match' and
+'calc_dataflow_match' (reference = row, candidate = column).
+--------------------------------------------------------------------------------------------
+similarity = CodeSimilarity(num_workers=4)
+syntax = similarity.syntax_match_matrix(codes)      # only the rows / columns of new codes are computed
+dataflow = similarity.dataflow_match_matrix(codes)
+embeddings = similarity.embeddings(codes)           # BERT [CLS] embeddings, computed in batches
+similarity.retain(codes)                            # forget the programs that are no longer needed
+--------------------------------------------------------------------------------------------
+'codebleu' (and 'transformers' for the embeddings) are only imported when they are used.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import os
+import threading
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# the tree-sitter parser of each process, parsers can not be pickled to the workers
+_parser = None
+
+
+def _get_parser():
+    global _parser
+    if _parser is None:
+        from tree_sitter import Parser
+        from codebleu.utils import get_tree_sitter_language
+        _parser = Parser()
+        _parser.language = get_tree_sitter_language('python')
+    return _parser
+
+
+def _program_features(code: str) -> Tuple[Dict[str, int], Dict[tuple, int]]:
+    """Returns the counts of the subtrees and of the normalized data-flow items of a program,
+    which are the units matched by 'codebleu.syntax_match' and 'codebleu.dataflow_match'.
+    A program that fails to parse gets empty counts, so it only zeroes its own rows and columns.
+    """
+    from codebleu.parser import DFG_python, remove_comments_and_docstrings
+    from codebleu.dataflow_match import get_data_flow, normalize_dataflow
+
+    try:
+        code = remove_comments_and_docstrings(code, 'python')
+    except Exception:
+        pass
+    parser = _get_parser()
+
+    try:
+        # all subtrees with children, in the same way as 'corpus_syntax_match'
+        subtrees = Counter()
+        node_stack = [parser.parse(bytes(code, 'utf8')).root_node]
+        while node_stack:
+            node = node_stack.pop()
+            subtrees[str(node)] += 1
+            node_stack.extend(child for child in node.children if len(child.children) != 0)
+
+        dataflow = Counter(
+            (var, relationship, tuple(par_vars))
+            for var, relationship, par_vars in normalize_dataflow(get_data_flow(code, [parser, DFG_python]))
+        )
+    except Exception:
+        return {}, {}
+    return dict(subtrees), dict(dataflow)
+
+
+def _grow(matrix: np.ndarray, size: int) -> np.ndarray:
+    # doubles the capacity of a square matrix
+    if size <= matrix.shape[0]:
+        return matrix
+    capacity = max(size, 2 * matrix.shape[0], 16)
+    grown = np.zeros((capacity, capacity), dtype=matrix.dtype)
+    n = matrix.shape[0]
+    grown[:n, :n] = matrix
+    return grown
+
+
+class CodeSimilarity:
+    # (tokenizer, model) of each BERT path, shared by all instances of a process
+    _bert_models = {}
+    _bert_lock = threading.Lock()
+
+    def __init__(self,
+                 num_workers: int = 1,
+                 *,
+                 bert_model_path: str | None = None,
+                 embedding_batch_size: int = 16,
+                 mp_context: str | None = None):
+        """
+        Args:
+            num_workers         : the number of processes that parse new programs. Pass 1 to parse in this process.
+            bert_model_path     : a local path to a BERT model for 'embeddings', defaults to 'bert-base-uncased'.
+            embedding_batch_size: the number of texts embedded in one forward pass.
+            mp_context          : the start method of the worker processes, such as 'fork' or 'spawn'.
+        """
+        assert num_workers >= 1
+        self._num_workers = num_workers
+        self._bert_model_path = bert_model_path
+        self._embedding_batch_size = embedding_batch_size
+        self._mp_context = mp_context
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        self._lock = threading.RLock()
+
+        # digest -> row (and column) of the program in the matrices
+        self._index: Dict[str, int] = {}
+        self._subtrees: List[Dict[str, int]] = []
+        self._dataflows: List[Dict[tuple, int]] = []
+        # the match of each pair of programs, rows are references and columns are candidates
+        self._syntax = np.zeros((0, 0), dtype=np.float64)
+        self._dataflow = np.zeros((0, 0), dtype=np.float64)
+        # digest -> embedding
+        self._embeddings: Dict[str, np.ndarray] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._index)
+
+    @classmethod
+    def digest(cls, code: str) -> str:
+        # tree-sitter keeps parentheses and other details that 'CodeFingerprint' normalizes away,
+        # so the features are keyed by the exact code to give the same scores as CodeBLEU
+        return hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+
+    # ------------------------------------------------------------ code match
+
+    def _parse(self, codes: List[str]) -> List[Tuple[Dict[str, int], Dict[tuple, int]]]:
+        if self._num_workers == 1 or len(codes) < 2:
+            return [_program_features(code) for code in codes]
+        if self._executor is None:
+            import multiprocessing
+            context = multiprocessing.get_context(self._mp_context) if self._mp_context else None
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self._num_workers, mp_context=context)
+        chunksize = max(1, len(codes) // (4 * self._num_workers))
+        return list(self._executor.map(_program_features, codes, chunksize=chunksize))
+
+    def _rows(self, codes: Sequence[str]) -> np.ndarray:
+        """Adds the new programs, fills the rows and columns of the new programs, and returns the rows of the codes.
+        """
+        digests = [self.digest(code) for code in codes]
+        new_codes = {}
+        for d, code in zip(digests, codes):
+            if d not in self._index and d not in new_codes:
+                new_codes[d] = code
+        if new_codes:
+            features = self._parse(list(new_codes.values()))
+            start = len(self._index)
+            for d, (subtrees, dataflow) in zip(new_codes, features):
+                self._index[d] = len(self._index)
+                self._subtrees.append(subtrees)
+                self._dataflows.append(dataflow)
+            self._update_matrices(start)
+        return np.array([self._index[d] for d in digests], dtype=np.int64)
+
+    @classmethod
+    def _count_matrix(cls, counts: List[dict]) -> np.ndarray:
+        vocabulary = {}
+        for c in counts:
+            for key in c:
+                vocabulary.setdefault(key, len(vocabulary))
+        matrix = np.zeros((len(counts), len(vocabulary)), dtype=np.int64)
+        for i, c in enumerate(counts):
+            if c:
+                matrix[i, [vocabulary[key] for key in c]] = list(c.values())
+        return matrix
+
+    def _update_matrices(self, start: int):
+        # only the rows and the columns of the programs in [start, n) are computed
+        n = len(self._index)
+        self._syntax = _grow(self._syntax, n)
+        self._dataflow = _grow(self._dataflow, n)
+
+        # syntax match: the number of reference subtrees which appear in the candidate / the number of reference subtrees
+        # 0 if the reference has no subtrees (a program that failed to parse)
+        counts = self._count_matrix(self._subtrees)
+        present = (counts > 0).astype(np.int64)
+        totals = np.maximum(counts.sum(axis=1), 1)
+        self._syntax[start:n, :n] = (counts[start:] @ present.T) / totals[start:, None]
+        self._syntax[:start, start:n] = (counts[:start] @ present[start:].T) / totals[:start, None]
+
+        # dataflow match: the multiset intersection of the data-flow items / the number of reference items,
+        # 0 if the reference has no data-flow
+        counts = self._count_matrix(self._dataflows)
+        totals = counts.sum(axis=1)
+        for i in range(n):
+            columns = slice(0, n) if i >= start else slice(start, n)
+            if totals[i] == 0:
+                self._dataflow[i, columns] = 0.
+            else:
+                self._dataflow[i, columns] = np.minimum(counts[i], counts[columns]).sum(axis=1) / totals[i]
+
+    def syntax_match_matrix(self, codes: Sequence[str]) -> np.ndarray:
+        """Returns 'S', where 'S[i, j] == calc_syntax_match([codes[i]], codes[j], "python")'.
+        """
+        with self._lock:
+            rows = self._rows(codes)
+            return self._syntax[np.ix_(rows, rows)]
+
+    def dataflow_match_matrix(self, codes: Sequence[str]) -> np.ndarray:
+        """Returns 'D', where 'D[i, j] == calc_dataflow_match([codes[i]], codes[j], "python")'.
+        """
+        with self._lock:
+            rows = self._rows(codes)
+            return self._dataflow[np.ix_(rows, rows)]
+
+    def retain(self, codes: Sequence[str]):
+        """Forgets the parsed programs (and their embeddings) that are not in 'codes'.
+        """
+        with self._lock:
+            keep = {self.digest(code) for code in codes}
+            rows = [i for d, i in self._index.items() if d in keep]
+            if len(rows) == len(self._index):
+                return
+            self._index = {d: k for k, d in enumerate(d for d in self._index if d in keep)}
+            self._subtrees = [self._subtrees[i] for i in rows]
+            self._dataflows = [self._dataflows[i] for i in rows]
+            self._syntax = self._syntax[np.ix_(rows, rows)]
+            self._dataflow = self._dataflow[np.ix_(rows, rows)]
+            self._embeddings = {d: e for d, e in self._embeddings.items() if d in keep}
+
+    # ------------------------------------------------------------ embeddings
+
+    @classmethod
+    def _load_bert(cls, model_path: str | None):
+        target_path = model_path if model_path and os.path.exists(model_path) else 'bert-base-uncased'
+        with cls._bert_lock:
+            if target_path not in cls._bert_models:
+                from transformers import BertTokenizer, BertModel
+                tokenizer = BertTokenizer.from_pretrained(target_path)
+                model = BertModel.from_pretrained(target_path)
+                model.eval()
+                cls._bert_models[target_path] = (tokenizer, model)
+            return cls._bert_models[target_path]
+
+    @classmethod
+    def _embed(cls, tokenizer, model, texts: List[str]) -> np.ndarray:
+        import torch
+        inputs = tokenizer(texts, return_tensors='pt', truncation=True, padding=True, max_length=512)
+        with torch.no_grad():
+            # use the CLS token (index 0) as the sentence-level representation
+            return model(**inputs).last_hidden_state[:, 0, :].numpy()
+
+    def embeddings(self, texts: Sequence[str]) -> np.ndarray:
+        """Returns the BERT [CLS] embeddings of the texts, an array of shape (len(texts), 768).
+        Only the texts that have not been embedded are passed to the model, in batches of 'embedding_batch_size'.
+        If the model can not be loaded (or a text fails), random embeddings are returned (and not cached).
+        """
+        try:
+            tokenizer, model = self._load_bert(self._bert_model_path)
+        except Exception as e:
+            print(f'❌ [Error] Failed to load BERT from {self._bert_model_path or "bert-base-uncased"}: {e}')
+            return np.random.rand(len(texts), 768)
+
+        digests = [self.digest(text) for text in texts]
+        with self._lock:
+            new_texts = {d: t for d, t in zip(digests, texts) if d not in self._embeddings}
+        new_items = list(new_texts.items())
+        failed = {}
+        for b in range(0, len(new_items), self._embedding_batch_size):
+            batch = new_items[b:b + self._embedding_batch_size]
+            try:
+                cls_embeddings = self._embed(tokenizer, model, [t for _, t in batch])
+            except Exception:
+                # embed the texts of the failed batch one by one
+                cls_embeddings = []
+                for d, t in batch:
+                    try:
+                        cls_embeddings.append(self._embed(tokenizer, model, [t])[0])
+                    except Exception:
+                        failed[d] = np.random.rand(768)
+                        cls_embeddings.append(None)
+            with self._lock:
+                for (d, _), e in zip(batch, cls_embeddings):
+                    if e is not None:
+                        self._embeddings[d] = np.asarray(e)
+        with self._lock:
+            return np.array([failed[d] if d in failed else self._embeddings[d] for d in digests])
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -20,12 +20,16 @@
 from __future__ import annotations
 
 import multiprocessing
+import multiprocessing.connection
 import sys
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any, Literal
 
 from .code import TextFunctionProgramConverter, Program
+from .evaluate_cache import EvaluationCache
 from .modify_code import ModifyCode
 import traceback
 
@@ -137,7 +141,28 @@ class SecureEvaluator:
     def __init__(self,
                  evaluator: Evaluation,
                  debug_mode=False,
+                 *,
+                 use_worker_pool: bool = False,
+                 num_pool_workers: int = 1,
+                 max_tasks_per_worker: int | None = None,
+                 eval_cache: EvaluationCache | None = None,
                  **kwargs):
+        """Evaluate programs in a sandbox process with timeout protection.
+        Args:
+            evaluator           : an instance of 'llm4ad.base.Evaluation'.
+            debug_mode          : if set to True, we will print detailed information.
+            use_worker_pool     : if set to True (and evaluator.safe_evaluate=True), a fixed pool of long-lived
+                sandbox processes receives program strings, exec()s them, and returns scores, instead of creating
+                a new process for each program. A worker that exceeds the timeout (or crashes) is killed and
+                replaced, while the remaining workers are kept alive.
+            num_pool_workers    : number of worker processes in the pool. Set it to the number of evaluator
+                threads/processes of the method (e.g., 'num_evaluators'), more workers are useless.
+            max_tasks_per_worker: recycle a worker after evaluating 'max_tasks_per_worker' programs. This limits the
+                side effects (global states, leaked memory, ...) a program can leave to later programs.
+                Pass 'None' to keep workers alive until they time out.
+            eval_cache          : an instance of 'llm4ad.base.EvaluationCache'. If provided, a program that is identical to
+                a cached one (ignoring docstrings, comments and formatting) is not evaluated again, its cached result is returned.
+        """
         self._evaluator = evaluator
         self._debug_mode = debug_mode
         fork_proc = self._evaluator.fork_proc
@@ -152,6 +177,47 @@ class SecureEvaluator:
             elif fork_proc is False:
                 multiprocessing.set_start_method('spawn', force=True)
 
+        self._use_worker_pool = use_worker_pool and self._evaluator.safe_evaluate
+        self._num_pool_workers = num_pool_workers
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._worker_pool: EvaluationWorkerPool | None = None
+        self._worker_pool_lock = threading.Lock()
+        self._eval_cache = eval_cache
+
+    def __getstate__(self):
+        # the worker pool (processes, pipes, locks) can not be pickled,
+        # each process creates its own pool when it is needed
+        state = self.__dict__.copy()
+        state['_worker_pool'] = None
+        state['_worker_pool_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._worker_pool_lock = threading.Lock()
+
+    def _get_worker_pool(self) -> EvaluationWorkerPool:
+        with self._worker_pool_lock:
+            if self._worker_pool is None:
+                self._worker_pool = EvaluationWorkerPool(
+                    self,
+                    num_workers=self._num_pool_workers,
+                    max_tasks_per_worker=self._max_tasks_per_worker,
+                    daemon=self._evaluator.daemon_eval_process,
+                    debug_mode=self._debug_mode
+                )
+                # shutdown the workers when the evaluator is garbage collected or the interpreter exits
+                weakref.finalize(self, self._worker_pool.shutdown)
+            return self._worker_pool
+
+    def close(self):
+        """Shutdown the worker pool (if it is used).
+        """
+        with self._worker_pool_lock:
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
+
     def _modify_program_code(self, program_str: str) -> str:
         function_name = TextFunctionProgramConverter.text_to_function(program_str).name
         if self._evaluator.use_numba_accelerate:
@@ -168,7 +234,32 @@ class SecureEvaluator:
             )
         return program_str
 
+    @property
+    def eval_cache(self) -> EvaluationCache | None:
+        return self._eval_cache
+
     def evaluate_program(self, program: str | Program, **kwargs):
+        if self._eval_cache is None:
+            return self._evaluate_program(program, **kwargs)
+
+        program_str = str(program)
+        try:
+            key, evaluator_class = self._eval_cache.make_key(program_str, self._evaluator, **kwargs)
+        except Exception:
+            if self._debug_mode:
+                traceback.print_exc()
+            return self._evaluate_program(program_str, **kwargs)
+
+        hit, result = self._eval_cache.get(key)
+        if hit:
+            if self._debug_mode:
+                print(f'DEBUG: evaluation cache hit ({key}).')
+            return result
+        result = self._evaluate_program(program_str, **kwargs)
+        self._eval_cache.put(key, result, evaluator_class)
+        return result
+
+    def _evaluate_program(self, program: str | Program, **kwargs):
         try:
             program_str = str(program)
             # record function name BEFORE modifying program code
@@ -178,6 +269,12 @@ class SecureEvaluator:
             if self._debug_mode:
                 print(f'DEBUG: evaluated program:\n{program_str}\n')
 
+            # safe evaluate using long-lived worker processes
+            if self._use_worker_pool:
+                return self._get_worker_pool().evaluate(
+                    program_str, function_name, self._evaluator.timeout_seconds, **kwargs
+                )
+
             # safe evaluate
             if self._evaluator.safe_evaluate:
                 result_queue = multiprocessing.Queue()
@@ -271,3 +368,177 @@ class SecureEvaluator:
                 print("DEBUG: Exception occurred in evaluate_program:")
                 traceback.print_exc()  # 这将打印完整红色报错信息
             return None
+
+
+def _evaluation_worker_loop(secure_evaluator: SecureEvaluator, conn: multiprocessing.connection.Connection):
+    """The main loop of a long-lived sandbox process.
+    Receives (program_str, function_name, kwargs) from the pipe, and sends the score back.
+    A 'None' message terminates the loop.
+    """
+    # notify the main process that the worker is ready (imports are finished in 'spawn' mode)
+    conn.send(True)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        program_str, function_name, kwargs = task
+        res = secure_evaluator._evaluate(program_str, function_name, **kwargs)
+        try:
+            conn.send(res)
+        except (EOFError, OSError):
+            break
+        except Exception:
+            # the result can not be pickled
+            if secure_evaluator._debug_mode:
+                traceback.print_exc()
+            conn.send(None)
+    conn.close()
+
+
+class _EvaluationWorker:
+    def __init__(self, secure_evaluator: SecureEvaluator, daemon: bool):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_evaluation_worker_loop,
+            args=(secure_evaluator, child_conn),
+            daemon=daemon
+        )
+        self.process.start()
+        child_conn.close()
+        self.num_tasks = 0
+        self._ready = False
+
+    def _wait_until_ready(self):
+        # the start-up time of the worker is not counted in the evaluation time
+        ready = multiprocessing.connection.wait([self.conn, self.process.sentinel])
+        if self.conn not in ready:
+            raise EOFError
+        self._ready = self.conn.recv()
+
+    def evaluate(self, program_str: str, function_name: str, timeout_seconds: int | float | None, **kwargs):
+        """Send the program to the worker and wait for the result.
+        Raises TimeoutError if the result is not available in timeout seconds,
+        and EOFError if the worker process is dead.
+        """
+        if not self._ready:
+            self._wait_until_ready()
+        self.num_tasks += 1
+        self.conn.send((program_str, function_name, kwargs))
+        # also wait on the process sentinel, so that a crashed worker is detected immediately
+        ready = multiprocessing.connection.wait([self.conn, self.process.sentinel], timeout=timeout_seconds)
+        if not ready:
+            raise TimeoutError
+        if self.conn not in ready:
+            raise EOFError
+        return self.conn.recv()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (EOFError, OSError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class EvaluationWorkerPool:
+    def __init__(self,
+                 secure_evaluator: SecureEvaluator,
+                 num_workers: int = 1,
+                 max_tasks_per_worker: int | None = None,
+                 daemon: bool = False,
+                 debug_mode: bool = False):
+        """A fixed pool of pre-forked, long-lived sandbox processes used by 'SecureEvaluator'.
+        Each worker evaluates one program at a time. If a worker exceeds the timeout or crashes,
+        only this worker is killed, and a new one is forked to replace it.
+        Args:
+            secure_evaluator    : the 'SecureEvaluator' instance that holds the evaluation.
+            num_workers         : number of worker processes.
+            max_tasks_per_worker: recycle a worker after evaluating 'max_tasks_per_worker' programs.
+            daemon              : set the worker processes as daemon processes.
+            debug_mode          : if set to True, we will print detailed information.
+        """
+        assert num_workers >= 1
+        self._secure_evaluator = secure_evaluator
+        self._num_workers = num_workers
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._daemon = daemon
+        self._debug_mode = debug_mode
+
+        self._idle_workers: list[_EvaluationWorker] = []
+        self._num_alive_workers = 0
+        self._shutdown = False
+        self._cond = threading.Condition()
+
+        # pre-fork all workers
+        with self._cond:
+            for _ in range(num_workers):
+                self._idle_workers.append(self._new_worker())
+
+    def _new_worker(self) -> _EvaluationWorker:
+        self._num_alive_workers += 1
+        return _EvaluationWorker(self._secure_evaluator, self._daemon)
+
+    def _acquire_worker(self) -> _EvaluationWorker:
+        with self._cond:
+            while True:
+                if self._shutdown:
+                    raise RuntimeError('The evaluation worker pool has been shutdown.')
+                if self._idle_workers:
+                    return self._idle_workers.pop()
+                if self._num_alive_workers < self._num_workers:
+                    return self._new_worker()
+                self._cond.wait()
+
+    def _release_worker(self, worker: _EvaluationWorker, discard: bool):
+        recycle = (self._max_tasks_per_worker is not None
+                   and worker.num_tasks >= self._max_tasks_per_worker)
+        if discard:
+            worker.kill()
+        elif recycle or self._shutdown:
+            worker.stop()
+        with self._cond:
+            if discard or recycle or self._shutdown:
+                self._num_alive_workers -= 1
+            else:
+                self._idle_workers.append(worker)
+            self._cond.notify()
+
+    def evaluate(self, program_str: str, function_name: str, timeout_seconds: int | float | None, **kwargs):
+        worker = self._acquire_worker()
+        discard = False
+        try:
+            return worker.evaluate(program_str, function_name, timeout_seconds, **kwargs)
+        except TimeoutError:
+            if self._debug_mode:
+                print(f'DEBUG: the evaluation time exceeds {timeout_seconds}s.')
+            discard = True
+            return None
+        except (EOFError, OSError):
+            if self._debug_mode:
+                print('DEBUG: the evaluation worker process exits unexpectedly.')
+            discard = True
+            return None
+        finally:
+            self._release_worker(worker, discard)
+
+    def shutdown(self):
+        with self._cond:
+            self._shutdown = True
+            idle_workers, self._idle_workers = self._idle_workers, []
+            self._num_alive_workers -= len(idle_workers)
+            self._cond.notify_all()
+        for worker in idle_workers:
+            worker.stop()
@@ -0,0 +1,337 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+A content-addressed cache of evaluation results. A result is stored under the key
+
+    (program fingerprint, evaluator class, evaluator config digest, random_seed, namespace, kwargs)
+
+so that programs which only differ in docstrings, comments and formatting (or, optionally, in the names of
+local variables) are evaluated only once. The cache has an in-memory LRU tier and an optional SQLite tier,
+the latter is shared by all processes and by later runs of the same task.
+
+- Pass the cache to 'llm4ad.base.SecureEvaluator' (or to any method, which forwards it to the SecureEvaluator):
+--------------------------------------------------------------------------------------------
+cache = EvaluationCache(max_size=4096, db_path='logs/eval_cache.sqlite')
+method = EoH(llm=llm, evaluation=OBPEvaluation(), ..., eval_cache=cache)
+method.run()
+print(cache.stats())
+--------------------------------------------------------------------------------------------
+- The config digest covers the public attributes of the 'Evaluation' instance and its datasets ('_datasets' or
+'_instances', including numpy arrays, nested containers, and objects with a 'content_digest()' method such as
+'CoBenchInstances'), so a changed parameter or dataset leads to different keys. Other objects (e.g., environments)
+only contribute their type. If the evaluation reads its data lazily (e.g., from files), bump 'namespace' or call
+'invalidate()' after the data changes.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+import numpy as np
+
+from .fingerprint import CodeFingerprint
+
+
+class EvaluationCache:
+    _MISSING = object()
+    # the private attributes in which the tasks keep their instances, they are part of the config digest
+    _DATASET_ATTRIBUTES = ('_datasets', '_instances')
+
+    def __init__(self,
+                 max_size: int = 1024,
+                 db_path: str | None = None,
+                 *,
+                 namespace: str = '',
+                 alpha_equivalence: bool = False,
+                 cache_failures: bool = False,
+                 debug_mode: bool = False):
+        """
+        Args:
+            max_size         : the maximum number of results in the in-memory LRU tier. Pass 0 to disable the tier.
+            db_path          : path to a SQLite database file for the on-disk tier. Pass 'None' to disable the tier.
+            namespace        : a user-defined version string which is part of every key (e.g., a dataset version).
+            alpha_equivalence: if set to True, programs that only differ in the names of local variables share results.
+            cache_failures   : if set to True, 'None' results (invalid programs, timeouts) are also cached.
+                Timeouts may depend on the machine load, so failures are not cached by default.
+            debug_mode       : if set to True, we will print detailed information.
+        """
+        assert max_size >= 0
+        self._max_size = max_size
+        self._db_path = db_path
+        self._namespace = namespace
+        self._alpha_equivalence = alpha_equivalence
+        self._cache_failures = cache_failures
+        self._debug_mode = debug_mode
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_conn: sqlite3.Connection | None = None
+        self._db_pid = None
+        self._config_digests = {}  # id(evaluator) -> (evaluator, digest)
+
+        # metrics
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._puts = 0
+
+        if db_path is not None:
+            db_dir = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(db_dir, exist_ok=True)
+            self._get_db()
+
+    def __getstate__(self):
+        # the connection and the lock can not be pickled, each process opens its own connection,
+        # and the in-memory tier of a process is not shared with others
+        state = self.__dict__.copy()
+        state['_memory'] = OrderedDict()
+        state['_lock'] = None
+        state['_db_conn'] = None
+        state['_db_pid'] = None
+        state['_config_digests'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ keys
+
+    @classmethod
+    def _digest_value(cls, obj, hasher, depth: int = 0):
+        if depth > 8:
+            hasher.update(b'<deep>')
+        elif obj is None or isinstance(obj, (bool, int, float, complex, str)):
+            hasher.update(repr(obj).encode('utf-8'))
+        elif isinstance(obj, (bytes, bytearray)):
+            hasher.update(bytes(obj))
+        elif isinstance(obj, np.ndarray):
+            hasher.update(f'ndarray{obj.dtype.str}{obj.shape}'.encode('utf-8'))
+            if obj.dtype.hasobject:
+                cls._digest_value(obj.tolist(), hasher, depth + 1)
+            else:
+                hasher.update(np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, np.generic):
+            hasher.update(repr(obj.item()).encode('utf-8'))
+        elif isinstance(obj, (list, tuple)):
+            hasher.update(f'{type(obj).__name__}{len(obj)}['.encode('utf-8'))
+            for item in obj:
+                cls._digest_value(item, hasher, depth + 1)
+            hasher.update(b']')
+        elif isinstance(obj, (set, frozenset)):
+            cls._digest_value(sorted(obj, key=repr), hasher, depth + 1)
+        elif isinstance(obj, dict):
+            hasher.update(f'dict{len(obj)}{{'.encode('utf-8'))
+            for k in sorted(obj, key=repr):
+                cls._digest_value(k, hasher, depth + 1)
+                cls._digest_value(obj[k], hasher, depth + 1)
+            hasher.update(b'}')
+        elif callable(getattr(obj, 'content_digest', None)):
+            # datasets which digest their own contents (e.g., 'CoBenchInstances')
+            hasher.update(f'<{type(obj).__qualname__}:{obj.content_digest()}>'.encode('utf-8'))
+        else:
+            # objects such as environments or solvers, only the type is considered
+            hasher.update(f'<{type(obj).__module__}.{type(obj).__qualname__}>'.encode('utf-8'))
+
+    @classmethod
+    def config_digest(cls, evaluator) -> str:
+        """Returns a digest of the public attributes and the datasets ('_datasets', '_instances') of an evaluator
+        ('llm4ad.base.Evaluation'). 'template_program' and 'task_description' do not affect the score,
+        so they are excluded.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        for name in sorted(vars(evaluator)):
+            if name in ('template_program', 'task_description'):
+                continue
+            if name.startswith('_') and name not in cls._DATASET_ATTRIBUTES:
+                continue
+            value = getattr(evaluator, name)
+            if callable(value) and not isinstance(value, np.ndarray):
+                continue
+            hasher.update(name.encode('utf-8'))
+            cls._digest_value(value, hasher)
+        return hasher.hexdigest()
+
+    def _evaluator_config_digest(self, evaluator) -> str:
+        # the digest of an evaluator is computed once, since hashing large datasets is not free
+        with self._lock:
+            item = self._config_digests.get(id(evaluator))
+        if item is not None and item[0] is evaluator:
+            return item[1]
+        digest = self.config_digest(evaluator)
+        with self._lock:
+            self._config_digests[id(evaluator)] = (evaluator, digest)
+        return digest
+
+    def make_key(self, program_str: str, evaluator, **kwargs) -> Tuple[str, str]:
+        """Returns '(key, evaluator_class)' of a program evaluated by an evaluator ('llm4ad.base.Evaluation').
+        """
+        evaluator_class = f'{type(evaluator).__module__}.{type(evaluator).__qualname__}'
+        fingerprint = CodeFingerprint.fingerprint(program_str, alpha_equivalence=self._alpha_equivalence)
+        hasher = hashlib.blake2b(digest_size=20)
+        for part in (fingerprint,
+                     evaluator_class,
+                     self._evaluator_config_digest(evaluator),
+                     repr(getattr(evaluator, 'random_seed', None)),
+                     self._namespace):
+            hasher.update(part.encode('utf-8'))
+            hasher.update(b'\0')
+        self._digest_value(kwargs, hasher)
+        return hasher.hexdigest(), evaluator_class
+
+    # ----------------------------------------------------------------- tiers
+
+    def _get_db(self) -> sqlite3.Connection | None:
+        if self._db_path is None:
+            return None
+        # a connection must not be shared with forked children
+        if self._db_conn is None or self._db_pid != os.getpid():
+            conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, evaluator_class TEXT, namespace TEXT, value BLOB, created REAL)'
+            )
+            self._db_conn, self._db_pid = conn, os.getpid()
+        return self._db_conn
+
+    def _memory_put(self, key: str, value):
+        if self._max_size == 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns '(hit, result)'. The result is a copy, so it can be safely modified by the caller.
+        """
+        with self._lock:
+            value = self._memory.get(key, self._MISSING)
+            if value is not self._MISSING:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return True, copy.deepcopy(value)
+
+            conn = self._get_db()
+            if conn is not None:
+                try:
+                    row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                    if self._debug_mode:
+                        print(f'DEBUG: failed to query the evaluation cache {self._db_path}.')
+                if row is not None:
+                    value = pickle.loads(row[0])
+                    self._memory_put(key, value)
+                    self._disk_hits += 1
+                    return True, copy.deepcopy(value)
+
+            self._misses += 1
+            return False, None
+
+    def put(self, key: str, value, evaluator_class: str = ''):
+        if value is None and not self._cache_failures:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._memory_put(key, value)
+            self._puts += 1
+            conn = self._get_db()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                        (key, evaluator_class, self._namespace, pickle.dumps(value), time.time())
+                    )
+                except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+                    if self._debug_mode:
+                        print(f'DEBUG: failed to write the evaluation cache {self._db_path}.')
+
+    def invalidate(self, evaluator_class: str | type | None = None, namespace: str | None = None):
+        """Remove cached results, e.g., after the dataset of a task has changed.
+        Args:
+            evaluator_class: only remove the results of this evaluator class (a class or its 'module.qualname').
+            namespace      : only remove the results of this namespace.
+        If both are 'None', all results are removed. The in-memory tier is always cleared.
+        """
+        if isinstance(evaluator_class, type):
+            evaluator_class = f'{evaluator_class.__module__}.{evaluator_class.__qualname__}'
+        with self._lock:
+            self._memory.clear()
+            self._config_digests.clear()
+            conn = self._get_db()
+            if conn is None:
+                return
+            conditions, params = [], []
+            if evaluator_class is not None:
+                conditions.append('evaluator_class = ?')
+                params.append(evaluator_class)
+            if namespace is not None:
+                conditions.append('namespace = ?')
+                params.append(namespace)
+            where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+            conn.execute(f'DELETE FROM results{where}', params)
+
+    def clear(self):
+        self.invalidate()
+
+    # --------------------------------------------------------------- metrics
+
+    @property
+    def hits(self) -> int:
+        return self._memory_hits + self._disk_hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self._misses
+        return self.hits / total if total else 0.
+
+    def stats(self) -> dict:
+        """Returns the hit/miss metrics of this process.
+        """
+        return {
+            'hits': self.hits,
+            'memory_hits': self._memory_hits,
+            'disk_hits': self._disk_hits,
+            'misses': self._misses,
+            'puts': self._puts,
+            'hit_rate': self.hit_rate,
+            'memory_size': len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db_conn is not None and self._db_pid == os.getpid():
+                self._db_conn.close()
+            self._db_conn = None
@@ -0,0 +1,140 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+Canonical fingerprints of code. Two functions have the same fingerprint if their normalized ASTs are identical,
+i.e., they only differ in docstrings, comments, whitespace and formatting.
+With 'alpha_equivalence=True', functions that only differ in the names of their local variables
+(e.g., 'tmp' -> 'temp') also share the same fingerprint.
+--------------------------------------------------------------------------------------------
+def f(a, b):                                def f(a, b):
+    \"\"\"Add two numbers.\"\"\"                       total = a + b  # sum
+    s = a + b                                   return (total)
+    return s
+--------------------------------------------------------------------------------------------
+The above two functions are alpha-equivalent. Argument names, global names and attributes are never renamed,
+since renaming them may change the behaviour of the program.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import re
+
+
+class _LocalNameCollector(ast.NodeVisitor):
+    """Collects the names bound inside functions (excluding arguments) in order of appearance."""
+
+    def __init__(self):
+        self.arg_names = set()
+        self.global_names = set()
+        self.local_names = {}  # dict keeps the order of the first appearance
+
+    def _visit_function(self, node):
+        for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+            self.arg_names.add(arg.arg)
+        if node.args.vararg:
+            self.arg_names.add(node.args.vararg.arg)
+        if node.args.kwarg:
+            self.arg_names.add(node.args.kwarg.arg)
+        self.generic_visit(node)
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    visit_Lambda = _visit_function
+
+    def visit_Global(self, node):
+        self.global_names.update(node.names)
+
+    visit_Nonlocal = visit_Global
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.local_names.setdefault(node.id, None)
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.local_names.setdefault(node.name, None)
+        self.generic_visit(node)
+
+    def renaming(self) -> dict[str, str]:
+        names = [n for n in self.local_names if n not in self.arg_names and n not in self.global_names]
+        return {name: f'_v{i}' for i, name in enumerate(names)}
+
+
+class _LocalNameRenamer(ast.NodeTransformer):
+    def __init__(self, renaming: dict[str, str]):
+        self._renaming = renaming
+
+    def visit_Name(self, node):
+        if node.id in self._renaming:
+            node.id = self._renaming[node.id]
+        return node
+
+    def visit_ExceptHandler(self, node):
+        if node.name in self._renaming:
+            node.name = self._renaming[node.name]
+        self.generic_visit(node)
+        return node
+
+
+class _DocstringRemover(ast.NodeTransformer):
+    def _remove_docstring(self, node):
+        body = node.body
+        if (body and isinstance(body[0], ast.Expr)
+                and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str)):
+            node.body = body[1:] or [ast.Pass()]
+        self.generic_visit(node)
+        return node
+
+    visit_Module = _remove_docstring
+    visit_ClassDef = _remove_docstring
+    visit_FunctionDef = _remove_docstring
+    visit_AsyncFunctionDef = _remove_docstring
+
+
+class CodeFingerprint:
+
+    @classmethod
+    def canonical_code(cls, code: str, alpha_equivalence: bool = False) -> str:
+        """Returns a canonical representation of the code (a dump of the normalized AST).
+        If the code cannot be parsed, the code with normalized whitespace and without comments is returned.
+        Args:
+            code             : the code of a function or program.
+            alpha_equivalence: if set to True, local variables are renamed by the order of their first appearance.
+        """
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            lines = [re.sub(r'\s+', ' ', line.split('#', 1)[0]).strip() for line in code.splitlines()]
+            return '\n'.join(line for line in lines if line)
+        tree = _DocstringRemover().visit(tree)
+        if alpha_equivalence:
+            collector = _LocalNameCollector()
+            collector.visit(tree)
+            tree = _LocalNameRenamer(collector.renaming()).visit(tree)
+        return ast.dump(tree, annotate_fields=False, include_attributes=False)
+
+    @classmethod
+    def fingerprint(cls, code: str, alpha_equivalence: bool = False) -> str:
+        """Returns the hex digest of the canonical code. The digest is stable across processes and runs.
+        """
+        canonical = cls.canonical_code(code, alpha_equivalence=alpha_equivalence)
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
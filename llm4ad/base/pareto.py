@@ -0,0 +1,111 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+Pareto dominance utilities for the multi-objective methods (NSGA-II, MEoH, MOEA/D). All objectives are maximized,
+which is the convention of 'Function.score' in LLM4AD.
+
+- 'ParetoArchive' keeps the non-dominated items seen so far. Inserting an item only compares it with the archive
+(instead of sorting the population and the archive again), and the dominated members are removed.
+--------------------------------------------------------------------------------------------
+archive = ParetoArchive()
+for func in new_functions:
+    archive.insert(func, func.score)
+elitist = archive.items
+--------------------------------------------------------------------------------------------
+- 'ParetoArchive.dominance_matrix(scores)' returns the pairwise 'weakly dominates' relation of a score matrix.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Sequence
+
+import numpy as np
+
+
+class ParetoArchive:
+    def __init__(self, items: Iterable[Any] | None = None, *, unique_scores: bool = False):
+        """An archive of mutually non-dominated items.
+        Args:
+            items        : initial items, each item must have a 'score' attribute.
+            unique_scores: if set to True, an item with the same scores as a member is rejected,
+                otherwise both are kept. The same object is never inserted twice.
+        """
+        self._unique_scores = unique_scores
+        self._items: List[Any] = []
+        self._ids = set()
+        self._scores = np.empty((0, 0), dtype=np.float64)
+        for item in items or []:
+            self.insert(item, item.score)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, item):
+        return id(item) in self._ids
+
+    @property
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._scores
+
+    def insert(self, item, score: Sequence[float]) -> bool:
+        """Inserts the item if it is not dominated by any member. Returns True if the item is inserted.
+        """
+        if id(item) in self._ids:
+            return False
+        score = np.asarray(score, dtype=np.float64).reshape(1, -1)
+        if self._items:
+            archive_ge = (self._scores >= score).all(axis=1)
+            # a member dominates the item
+            if (archive_ge & (self._scores > score).any(axis=1)).any():
+                return False
+            if self._unique_scores and (archive_ge & (self._scores <= score).all(axis=1)).any():
+                return False
+            # remove the members dominated by the item
+            dominated = (score >= self._scores).all(axis=1) & (score > self._scores).any(axis=1)
+            if dominated.any():
+                for i in np.flatnonzero(dominated):
+                    self._ids.discard(id(self._items[i]))
+                self._items = [it for it, d in zip(self._items, dominated) if not d]
+                self._scores = self._scores[~dominated]
+            self._scores = np.vstack([self._scores, score])
+        else:
+            self._scores = score
+        self._items.append(item)
+        self._ids.add(id(item))
+        return True
+
+    def update(self, items: Iterable[Any]) -> int:
+        """Inserts the items (by their 'score' attribute). Returns the number of inserted items.
+        """
+        return sum(self.insert(item, item.score) for item in items)
+
+    @classmethod
+    def dominance_matrix(cls, scores: np.ndarray) -> np.ndarray:
+        """Returns a boolean matrix 'D', where 'D[i, j]' is True if 'scores[i] >= scores[j]' in all objectives.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        return (scores[:, None, :] >= scores[None, :, :]).all(axis=-1)
@@ -0,0 +1,184 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import threading
+import time
+import traceback
+from typing import Any, Callable
+
+from .code import Function, Program
+from .evaluate import SecureEvaluator
+
+
+class SampleEvaluatePipeline:
+    def __init__(self,
+                 evaluator: SecureEvaluator,
+                 executor: concurrent.futures.Executor,
+                 register_fn: Callable[..., Any],
+                 *,
+                 max_sample_nums: int | None = None,
+                 initial_sample_nums: int = 0,
+                 max_pending: int = 1,
+                 num_workers: int | None = None,
+                 debug_mode: bool = False):
+        """A producer/consumer pipeline between samplers (LLM) and evaluators.
+        Sampler threads submit sampled functions and return immediately, evaluators drain the pending
+        programs, and each evaluated function is registered by 'register_fn' as soon as its result arrives.
+        Args:
+            evaluator          : an instance of 'llm4ad.base.SecureEvaluator'.
+            executor           : the thread/process pool executor used for evaluation.
+            register_fn        : called as 'register_fn(func, program, score, eval_time, **payload)'
+                                 after each evaluation. It may be invoked from evaluator threads, so it must be thread-safe.
+            max_sample_nums    : the pipeline accepts at most 'max_sample_nums' submissions (including 'initial_sample_nums'),
+                                 pass 'None' to disable this limit.
+            initial_sample_nums: the number of samples that have been evaluated before (e.g., in resume mode).
+            max_pending        : the maximum number of submitted but not yet registered programs.
+                                 'submit()' blocks when the limit is reached (backpressure to samplers).
+            num_workers        : the number of evaluator workers of 'executor', used to report the evaluator utilization in 'stats()'.
+            debug_mode         : if set to True, we will print detailed information.
+        """
+        assert max_pending >= 1
+        self._evaluator = evaluator
+        self._executor = executor
+        self._register_fn = register_fn
+        self._max_sample_nums = max_sample_nums
+        self._num_workers = num_workers
+        self._debug_mode = debug_mode
+
+        self._num_samples = initial_sample_nums
+        self._num_pending = 0
+        self._num_finished = 0
+        self._pending_slots = threading.BoundedSemaphore(max_pending)
+        self._cond = threading.Condition()
+
+        # metrics
+        self._start_time = time.time()
+        self._eval_busy_time = 0.
+        self._submit_blocked_time = 0.
+
+    @property
+    def lock(self) -> threading.Condition:
+        """The lock of the pipeline counters, 'register_fn' can hold it to update its own counters."""
+        return self._cond
+
+    @property
+    def num_samples(self) -> int:
+        """Number of accepted samples (evaluated + pending)."""
+        return self._num_samples
+
+    @property
+    def num_pending(self) -> int:
+        return self._num_pending
+
+    @property
+    def num_finished(self) -> int:
+        return self._num_finished
+
+    def budget_exhausted(self) -> bool:
+        return self._max_sample_nums is not None and self._num_samples >= self._max_sample_nums
+
+    def submit(self, func: Function, program: Program | str, **payload) -> concurrent.futures.Future | None:
+        """Submit a sampled function for evaluation. Returns a future which is done after the
+        function is registered (its result is the score), or 'None' if 'max_sample_nums' is reached.
+        """
+        acquire_start = time.time()
+        self._pending_slots.acquire()
+        with self._cond:
+            self._submit_blocked_time += time.time() - acquire_start
+            if self.budget_exhausted():
+                self._pending_slots.release()
+                return None
+            self._num_samples += 1
+            self._num_pending += 1
+
+        registered = concurrent.futures.Future()
+        try:
+            eval_future = self._executor.submit(self._evaluator.evaluate_program_record_time, program)
+        except RuntimeError:
+            # the executor has been shutdown
+            self._finish(accepted=False)
+            registered.cancel()
+            return registered
+        eval_future.add_done_callback(
+            functools.partial(self._on_evaluated, func, program, payload, registered)
+        )
+        return registered
+
+    def _on_evaluated(self, func, program, payload, registered: concurrent.futures.Future, eval_future):
+        if eval_future.cancelled():
+            self._finish(accepted=False)
+            registered.cancel()
+            return
+        try:
+            score, eval_time = eval_future.result()
+        except Exception:
+            if self._debug_mode:
+                traceback.print_exc()
+            score, eval_time = None, None
+        if eval_time is not None:
+            with self._cond:
+                self._eval_busy_time += eval_time
+        try:
+            self._register_fn(func, program, score, eval_time, **payload)
+        except Exception:
+            if self._debug_mode:
+                traceback.print_exc()
+        finally:
+            self._finish(accepted=True)
+            registered.set_result(score)
+
+    def _finish(self, accepted: bool):
+        with self._cond:
+            self._num_pending -= 1
+            if accepted:
+                self._num_finished += 1
+            else:
+                self._num_samples -= 1
+            self._cond.notify_all()
+        self._pending_slots.release()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until all submitted programs are evaluated and registered.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._num_pending == 0, timeout=timeout)
+
+    def stats(self) -> dict:
+        """Returns the throughput metrics of the pipeline since its creation.
+        - eval_busy_time       : the total evaluation time of the finished programs (summed over all workers).
+        - evaluator_utilization: 'eval_busy_time' / ('num_workers' * 'wall_time'), only reported if 'num_workers' is given.
+        - submit_blocked_time  : the total time samplers spent blocked in 'submit()' due to backpressure.
+        """
+        with self._cond:
+            wall_time = time.time() - self._start_time
+            stats = {
+                'wall_time': wall_time,
+                'num_samples': self._num_samples,
+                'num_pending': self._num_pending,
+                'num_finished': self._num_finished,
+                'eval_busy_time': self._eval_busy_time,
+                'submit_blocked_time': self._submit_blocked_time,
+            }
+        if self._num_workers:
+            stats['evaluator_utilization'] = min(1., self._eval_busy_time / max(self._num_workers * wall_time, 1e-9))
+        return stats
@@ -26,13 +26,19 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pytz
 import inspect
 import llm4ad
+from llm4ad import registry
 
 
-# Dynamically import all usable classes from the 'llm4ad' package
-for module in [llm4ad.tools.llm, llm4ad.tools.profiler, llm4ad.task, llm4ad.method]:
+# Dynamically import all usable classes from the 'llm4ad' package,
+# the task and method classes are imported on demand by 'registry.resolve'
+for module in [llm4ad.tools.llm, llm4ad.tools.profiler]:
     globals().update({name: obj for name, obj in vars(module).items() if inspect.isclass(obj)})
 
 
+def _get_class(name: str):
+    return globals()[name] if name in globals() else registry.resolve(name)
+
+
 def main_gui(llm: dict,
              method: dict,
              evaluation: dict,
@@ -81,10 +87,10 @@ def main_gui(llm: dict,
         main_gui(llm_config, method_config, evaluation_config, profiler_config)
         """
 
-    profiler_case = globals()[profiler['name']]
-    llm_case = globals()[llm['name']]
-    method_case = globals()[method['name']]
-    eval_case = globals()[evaluation['name']]
+    profiler_case = _get_class(profiler['name'])
+    llm_case = _get_class(llm['name'])
+    method_case = _get_class(method['name'])
+    eval_case = _get_class(evaluation['name'])
 
     profiler = profiler_case(evaluation_name=evaluation['name'],
                              method_name=method['name'],
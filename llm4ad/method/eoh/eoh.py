@@ -36,7 +36,7 @@ from .profiler import EoHProfiler
 from .prompt import EoHPrompt
 from .sampler import EoHSampler
 from ...base import (
-    Evaluation, LLM, Function, Program, TextFunctionProgramConverter, SecureEvaluator
+    Evaluation, LLM, Function, Program, TextFunctionProgramConverter, SecureEvaluator, SampleEvaluatePipeline
 )
 from ...tools.profiler import ProfilerBase
 
@@ -59,6 +59,9 @@ class EoH:
                  resume_mode: bool = False,
                  debug_mode: bool = False,
                  multi_thread_or_process_eval: Literal['thread', 'process'] = 'thread',
+                 alpha_equivalence_dedup: bool = False,
+                 async_evaluation: bool = False,
+                 max_pending_evaluations: Optional[int] = None,
                  **kwargs):
         """Evolutionary of Heuristics.
         Args:
@@ -81,6 +84,14 @@ class EoH:
                 setting this parameter to 'process' will faster than 'thread'. However, I do not sure if this happens on all platform so I set the default to 'thread'.
                 Please note that there is one case that cannot utilize multi-core CPU: if you set 'safe_evaluate' argument in 'evaluator' to 'False',
                 and you set this argument to 'thread'.
+            async_evaluation: if set to True, sampler threads do not wait for the evaluation of their samples. Samples are
+                submitted to a bounded queue which is drained by the evaluators, and the results are registered to the population
+                and the profiler as soon as they are available. This keeps all evaluators busy when 'num_evaluators' > 'num_samplers'.
+                Defaults to False (same as in 'FunSearch'), a sampler waits for the evaluation of its sample.
+            max_pending_evaluations: the maximum number of sampled but not yet evaluated functions in async mode, samplers block
+                when the limit is reached. Defaults to 2 * 'num_evaluators'.
+            alpha_equivalence_dedup: if set to True, functions that only differ in the names of local variables are
+                treated as duplicates of functions in the population (by default, only docstrings, comments and formatting are ignored).
             **kwargs                    : some args pass to 'llm4ad.base.SecureEvaluator'. Such as 'fork_proc'.
         """
         self._template_program_str = evaluation.template_program
@@ -100,6 +111,9 @@ class EoH:
         self._debug_mode = debug_mode
         llm.debug_mode = debug_mode
         self._multi_thread_or_process_eval = multi_thread_or_process_eval
+        self._alpha_equivalence_dedup = alpha_equivalence_dedup
+        self._async_evaluation = async_evaluation
+        self._max_pending_evaluations = max_pending_evaluations or 2 * num_evaluators
 
         # function to be evolved
         self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(self._template_program_str)
@@ -110,13 +124,14 @@ class EoH:
         self._adjust_pop_size()
 
         # population, sampler, and evaluator
-        self._population = Population(pop_size=self._pop_size)
+        self._population = Population(pop_size=self._pop_size, alpha_equivalence=self._alpha_equivalence_dedup)
         self._sampler = EoHSampler(llm, self._template_program_str)
         self._evaluator = SecureEvaluator(evaluation, debug_mode=debug_mode, **kwargs)
         self._profiler = profiler
 
         # statistics
         self._tot_sample_nums = 0
+        self._pipeline: SampleEvaluatePipeline | None = None
 
         # reset _initial_sample_nums_max
         self._initial_sample_nums_max = min(
@@ -169,8 +184,8 @@ class EoH:
     def _sample_evaluate_register(self, prompt):
         """Perform following steps:
         1. Sample an algorithm using the given prompt.
-        2. Evaluate it by submitting to the process/thread pool, and get the results.
-        3. Add the function to the population and register it to the profiler.
+        2. Evaluate it by submitting to the process/thread pool. In async mode, return without waiting for the result.
+        3. Add the function to the population and register it to the profiler (see self._register_evaluated_function).
         """
         sample_start = time.time()
         thought, func = self._sampler.get_thought_and_function(prompt)
@@ -182,10 +197,14 @@ class EoH:
         if program is None:
             return
         # evaluate
-        score, eval_time = self._evaluation_executor.submit(
-            self._evaluator.evaluate_program_record_time,
-            program
-        ).result()
+        future = self._pipeline.submit(func, program, thought=thought, sample_time=sample_time)
+        if future is not None and not self._async_evaluation:
+            try:
+                future.result()
+            except concurrent.futures.CancelledError:
+                pass
+
+    def _register_evaluated_function(self, func: Function, program: Program, score, eval_time, *, thought, sample_time):
         # register to profiler
         func.score = score
         func.evaluate_time = eval_time
@@ -195,6 +214,8 @@ class EoH:
             self._profiler.register_function(func, program=str(program))
             if isinstance(self._profiler, EoHProfiler):
                 self._profiler.register_population(self._population)
+        # evaluator threads register concurrently
+        with self._pipeline.lock:
             self._tot_sample_nums += 1
 
         # register to the population
@@ -206,10 +227,10 @@ class EoH:
         elif self._max_generations is not None and self._max_sample_nums is None:
             return self._population.generation < self._max_generations
         elif self._max_generations is None and self._max_sample_nums is not None:
-            return self._tot_sample_nums < self._max_sample_nums
+            return not self._pipeline.budget_exhausted()
         else:
             return (self._population.generation < self._max_generations
-                    and self._tot_sample_nums < self._max_sample_nums)
+                    and not self._pipeline.budget_exhausted())
 
     def _iteratively_use_eoh_operator(self):
         while self._continue_loop():
@@ -260,12 +281,6 @@ class EoH:
                     exit()
                 continue
 
-        # shutdown evaluation_executor
-        try:
-            self._evaluation_executor.shutdown(cancel_futures=True)
-        except:
-            pass
-
     def _iteratively_init_population(self):
         """Let a thread repeat {sample -> evaluate -> register to population}
         to initialize a population.
@@ -275,7 +290,7 @@ class EoH:
                 # get a new func using i1
                 prompt = EoHPrompt.get_prompt_i1(self._task_description_str, self._function_to_evolve)
                 self._sample_evaluate_register(prompt)
-                if self._tot_sample_nums >= self._initial_sample_nums_max:
+                if self._pipeline.num_samples >= self._initial_sample_nums_max:
                     # print(f'Warning: Initialization not accomplished in {self._initial_sample_nums_max} samples !!!')
                     print(
                         f'Note: During initialization, EoH gets {len(self._population) + len(self._population._next_gen_pop)} algorithms '
@@ -302,9 +317,21 @@ class EoH:
             t.join()
 
     def run(self):
+        self._pipeline = SampleEvaluatePipeline(
+            self._evaluator,
+            self._evaluation_executor,
+            self._register_evaluated_function,
+            max_sample_nums=self._max_sample_nums,
+            initial_sample_nums=self._tot_sample_nums,
+            max_pending=self._max_pending_evaluations if self._async_evaluation else self._num_samplers,
+            debug_mode=self._debug_mode
+        )
+
         if not self._resume_mode:
             # do initialization
             self._multi_threaded_sampling(self._iteratively_init_population)
+            # wait for the pending evaluations
+            self._pipeline.join()
             self._population.survival()
             # terminate searching if
             if len(self._population) < self._selection_num:
@@ -316,6 +343,13 @@ class EoH:
 
         # evolutionary search
         self._multi_threaded_sampling(self._iteratively_use_eoh_operator)
+        self._pipeline.join()
+
+        # shutdown evaluation_executor
+        try:
+            self._evaluation_executor.shutdown(cancel_futures=True)
+        except:
+            pass
 
         # finish
         if self._profiler is not None:
@@ -9,7 +9,12 @@ from ...base import *
 
 
 class Population:
-    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None):
+    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None, alpha_equivalence: bool = False):
+        """
+        Args:
+            alpha_equivalence: if set to True, functions that only differ in the names of local variables
+                               are also considered duplicates.
+        """
         if pop is None:
             self._population = []
         elif isinstance(pop, list):
@@ -21,6 +26,14 @@ class Population:
         self._lock = Lock()
         self._next_gen_pop = []
         self._generation = generation
+        # a private random generator (seeded from the global one), so that selection in sampler threads
+        # never holds the lock of the global numpy generator while an evaluator process is forked
+        self._rng = np.random.RandomState(np.random.randint(2 ** 31))
+        # fingerprints and scores of the functions in '_population' and '_next_gen_pop', for O(1) duplicate checks
+        self._alpha_equivalence = alpha_equivalence
+        self._fingerprints = set()
+        self._scores = set()
+        self._rebuild_index()
 
     def __len__(self):
         return len(self._population)
@@ -30,6 +43,7 @@ class Population:
 
     def __setitem__(self, key, value):
         self._population[key] = value
+        self._rebuild_index()
 
     @property
     def population(self):
@@ -39,12 +53,30 @@ class Population:
     def generation(self):
         return self._generation
 
+    @property
+    def alpha_equivalence(self):
+        return self._alpha_equivalence
+
+    def _fingerprint(self, func: Function) -> str:
+        return func.fingerprint(alpha_equivalence=self._alpha_equivalence)
+
+    def _add_to_index(self, func: Function):
+        self._fingerprints.add(self._fingerprint(func))
+        self._scores.add(func.score)
+
+    def _rebuild_index(self):
+        self._fingerprints.clear()
+        self._scores.clear()
+        for f in self._population + self._next_gen_pop:
+            self._add_to_index(f)
+
     def survival(self):
         pop = self._population + self._next_gen_pop
         pop = sorted(pop, key=lambda f: f.score, reverse=True)
         self._population = pop[:self._pop_size]
         self._next_gen_pop = []
         self._generation += 1
+        self._rebuild_index()
 
     def register_function(self, func: Function):
         # in population initialization, we only accept valid functions
@@ -60,6 +92,7 @@ class Population:
                 func.score = float('-inf')
             # register to next_gen
             self._next_gen_pop.append(func)
+            self._add_to_index(func)
             # update: perform survival if reach the pop size
             if len(self._next_gen_pop) >= self._pop_size:
                 self.survival()
@@ -68,14 +101,8 @@ class Population:
         finally:
             self._lock.release()
 
-    def has_duplicate_function(self, func: str | Function) -> bool:
-        for f in self._population:
-            if str(f) == str(func) or func.score == f.score:
-                return True
-        for f in self._next_gen_pop:
-            if str(f) == str(func) or func.score == f.score:
-                return True
-        return False
+    def has_duplicate_function(self, func: Function) -> bool:
+        return self._fingerprint(func) in self._fingerprints or func.score in self._scores
 
     def selection(self) -> Function:
         funcs = [f for f in self._population if not math.isinf(f.score)]
@@ -83,4 +110,4 @@ class Population:
         p = [1 / (r + len(func)) for r in range(len(func))]
         p = np.array(p)
         p = p / np.sum(p)
-        return np.random.choice(func, p=p)
+        return self._rng.choice(func, p=p)
@@ -6,11 +6,6 @@ from abc import ABC, abstractmethod
 from threading import Lock
 from typing import List, Dict, Optional
 
-try:
-    import wandb
-except:
-    pass
-
 from .population import Population
 from ...base import Function
 from ...tools.profiler import TensorboardProfiler, ProfilerBase, WandBProfiler
@@ -80,6 +75,8 @@ class EoHProfiler(ProfilerBase):
         sample_order = self._num_samples
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'algorithm': function.algorithm,  # Added when recording
             'function': str(function),
             'score': function.score,
@@ -93,18 +90,7 @@ class EoHProfiler(ProfilerBase):
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
-
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+        self._append_sample_record(filename, content)
 
 
 class EoHTensorboardProfiler(TensorboardProfiler, EoHProfiler):
@@ -137,10 +123,6 @@ class EoHTensorboardProfiler(TensorboardProfiler, EoHProfiler):
             **kwargs
         )
 
-    def finish(self):
-        if self._log_dir:
-            self._writer.close()
-
 
 class EoHWandbProfiler(WandBProfiler, EoHProfiler):
 
@@ -179,6 +161,3 @@ class EoHWandbProfiler(WandBProfiler, EoHProfiler):
         if self._log_dir:
             self._ckpt_dir = os.path.join(self._log_dir, 'population')
             os.makedirs(self._ckpt_dir, exist_ok=True)
-
-    def finish(self):
-        wandb.finish()
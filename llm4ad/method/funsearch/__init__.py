@@ -1,3 +1,4 @@
 from .config import ProgramsDatabaseConfig
 from .funsearch import FunSearch
+from .sharded import ShardedFunSearch
 from .profiler import FunSearchTensorboardProfiler, FunSearchWandbProfiler
@@ -26,6 +26,8 @@
 from __future__ import annotations
 
 import concurrent.futures
+import queue
+import threading
 import time
 from threading import Thread
 import traceback
@@ -51,6 +53,9 @@ class FunSearch:
                  resume_mode: bool = False,
                  debug_mode: bool = False,
                  multi_thread_or_process_eval: Literal['thread', 'process'] = 'thread',
+                 async_evaluation: bool = False,
+                 max_pending_evaluations: Optional[int] = None,
+                 num_prefetch_prompts: Optional[int] = None,
                  **kwargs):
         """Function Search.
         Args:
@@ -67,6 +72,15 @@ class FunSearch:
                 setting this parameter to 'process' will faster than 'thread'. However, I do not sure if this happens on all platform so I set the default to 'thread'.
                 Please note that there is one case that cannot utilize multi-core CPU: if you set 'safe_evaluate' argument in 'evaluator' to 'False',
                 and you set this argument to 'thread'.
+            async_evaluation: if set to True, sampler threads do not wait for the evaluation of their samples. Each sample is
+                submitted to the evaluators as soon as it is drawn, and the results are registered to the programs database
+                (out of order) as soon as they are available, so a slow program does not stall the other samples of its prompt.
+                If set to False (the default, same as in 'EoH'), a sampler waits for all samples of a prompt before
+                requesting the next prompt.
+            max_pending_evaluations: the maximum number of sampled but not yet evaluated functions in async mode, samplers block
+                when the limit is reached. Defaults to 2 * 'num_evaluators'.
+            num_prefetch_prompts: the number of prompts generated ahead of time (from 'ProgramsDatabase.get_prompt()') in async mode.
+                Defaults to 'num_samplers'. Pass 0 to generate each prompt on demand.
             **kwargs        : some args pass to 'llm4ad.base.SecureEvaluator'. Such as 'fork_proc'.
         """
         # arguments and keywords
@@ -77,6 +91,9 @@ class FunSearch:
         self._samples_per_prompt = samples_per_prompt
         self._debug_mode = debug_mode
         self._resume_mode = resume_mode
+        self._async_evaluation = async_evaluation
+        self._max_pending_evaluations = max_pending_evaluations or 2 * num_evaluators
+        self._num_prefetch_prompts = num_samplers if num_prefetch_prompts is None else num_prefetch_prompts
 
         # function to be evolved
         self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(self._template_program_str)
@@ -97,6 +114,14 @@ class FunSearch:
 
         # statistics
         self._tot_sample_nums = 0
+        self._pipeline: SampleEvaluatePipeline | None = None
+        self._prompt_queue: queue.Queue | None = None
+        self._prefetch_thread: Thread | None = None
+        self._stop_event = threading.Event()
+        self._metrics_lock = threading.Lock()
+        self._llm_busy_time = 0.
+        self._prompt_wait_time = 0.
+        self._sampling_wall_time = 0.
 
         # multi-thread executor for evaluation
         assert multi_thread_or_process_eval in ['thread', 'process']
@@ -118,11 +143,44 @@ class FunSearch:
         if profiler is not None:
             self._profiler.record_parameters(llm, evaluation, self)  # ZL: necessary
 
+    def _prefetch_prompts(self):
+        """Keep the prompt queue filled, so that samplers do not wait for 'ProgramsDatabase.get_prompt()'.
+        """
+        while not self._stop_event.is_set():
+            try:
+                prompt = self._database.get_prompt()
+            except Exception:
+                if self._debug_mode:
+                    traceback.print_exc()
+                time.sleep(0.1)
+                continue
+            while not self._stop_event.is_set():
+                try:
+                    self._prompt_queue.put(prompt, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _get_prompt(self) -> programs_database.Prompt:
+        wait_start = time.time()
+        prompt = None
+        if self._prompt_queue is not None:
+            while prompt is None and self._prefetch_thread.is_alive():
+                try:
+                    prompt = self._prompt_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        if prompt is None:
+            prompt = self._database.get_prompt()
+        with self._metrics_lock:
+            self._prompt_wait_time += time.time() - wait_start
+        return prompt
+
     def _sample_evaluate_register(self):
-        while (self._max_sample_nums is None) or (self._tot_sample_nums < self._max_sample_nums):
+        while not self._pipeline.budget_exhausted():
             try:
                 # get prompt
-                prompt = self._database.get_prompt()
+                prompt = self._get_prompt()
                 prompt_contents = [prompt.code for _ in range(self._samples_per_prompt)]
 
                 # do sample
@@ -130,49 +188,32 @@ class FunSearch:
                 sampled_funcs = self._sampler.draw_samples(prompt_contents)
                 draw_sample_times = time.time() - draw_sample_start
                 avg_time_for_each_sample = draw_sample_times / len(sampled_funcs)
+                with self._metrics_lock:
+                    self._llm_busy_time += draw_sample_times
 
-                # convert samples to program instances
-                programs_to_be_eval = []
+                # convert samples to program instances and submit them to the evaluators,
+                # the results are registered in self._register_evaluated_function
+                futures = []
                 for func in sampled_funcs:
                     program = SampleTrimmer.sample_to_program(func, self._template_program)
                     # if sample to program success
-                    if program is not None:
-                        programs_to_be_eval.append(program)
-
-                # submit tasks to the thread pool and evaluate
-                futures = []
-                for program in programs_to_be_eval:
-                    future = self._evaluation_executor.submit(self._evaluator.evaluate_program_record_time, program)
-                    futures.append(future)
-                # get evaluate scores and evaluate times
-                scores_times = [f.result() for f in futures]
-                scores, times = [i[0] for i in scores_times], [i[1] for i in scores_times]
-
-                # register to program database and profiler
-                island_id = prompt.island_id
-                for program, score, eval_time in zip(programs_to_be_eval, scores, times):
-                    # update
-                    self._tot_sample_nums += 1
-                    # convert to Function instance
-                    function = TextFunctionProgramConverter.program_to_function(program)
-                    # check if the function has converted to Function instance successfully
-                    if function is None:
+                    if program is None:
                         continue
-                    # register to program database
-                    if score is not None:
-                        self._database.register_function(
-                            function=function,
-                            island_id=island_id,
-                            score=score
-                        )
-                    # register to profiler
-                    if self._profiler is not None:
-                        function.score = score
-                        function.sample_time = avg_time_for_each_sample
-                        function.evaluate_time = eval_time
-                        self._profiler.register_function(function, program=str(program))
-                        if isinstance(self._profiler, FunSearchProfiler):
-                            self._profiler.register_program_db(self._database)
+                    function = TextFunctionProgramConverter.program_to_function(program)
+                    future = self._pipeline.submit(
+                        function, program, island_id=prompt.island_id, sample_time=avg_time_for_each_sample
+                    )
+                    if future is None:
+                        break
+                    futures.append(future)
+
+                # in sync mode, wait for all samples of this prompt before requesting the next prompt
+                if not self._async_evaluation:
+                    for future in futures:
+                        try:
+                            future.result()
+                        except concurrent.futures.CancelledError:
+                            pass
             except KeyboardInterrupt:
                 break
             except Exception as e:
@@ -181,11 +222,50 @@ class FunSearch:
                     exit()
                 continue
 
-        # shutdown evaluation_executor
-        try:
-            self._evaluation_executor.shutdown(cancel_futures=True)
-        except:
-            pass
+    def _register_evaluated_function(self, function: Function | None, program: Program, score, eval_time, *,
+                                     island_id: int, sample_time: float):
+        # evaluator threads register concurrently
+        with self._pipeline.lock:
+            self._tot_sample_nums += 1
+        # check if the function has converted to Function instance successfully
+        if function is None:
+            return
+        # register to program database
+        if score is not None:
+            self._database.register_function(
+                function=function,
+                island_id=island_id,
+                score=score
+            )
+        # register to profiler
+        if self._profiler is not None:
+            function.score = score
+            function.sample_time = sample_time
+            function.evaluate_time = eval_time
+            self._profiler.register_function(function, program=str(program))
+            if isinstance(self._profiler, FunSearchProfiler):
+                with self._database.lock:
+                    self._profiler.register_program_db(self._database)
+
+    def metrics(self) -> dict:
+        """Returns the utilization metrics of the sampling/evaluation loop.
+        - evaluator_utilization: the fraction of the evaluator time spent on evaluating programs.
+        - llm_idle_time        : the total time sampler threads did not query the LLM (waiting for prompts or
+                                 blocked by pending evaluations), 'llm_idle_ratio' is the fraction of the sampling time.
+        - prompt_wait_time     : the total time sampler threads waited for prompts.
+        - submit_blocked_time  : the total time sampler threads were blocked by 'max_pending_evaluations'.
+        """
+        metrics = self._pipeline.stats() if self._pipeline is not None else {}
+        with self._metrics_lock:
+            sampling_time = self._sampling_wall_time * self._num_samplers
+            llm_idle_time = max(sampling_time - self._llm_busy_time, 0.)
+            metrics.update({
+                'llm_busy_time': self._llm_busy_time,
+                'llm_idle_time': llm_idle_time,
+                'llm_idle_ratio': llm_idle_time / sampling_time if sampling_time > 0 else 0.,
+                'prompt_wait_time': self._prompt_wait_time,
+            })
+        return metrics
 
     def run(self):
         if not self._resume_mode:
@@ -201,13 +281,47 @@ class FunSearch:
                 self._function_to_evolve.evaluate_time = eval_time
                 self._profiler.register_function(self._function_to_evolve, program=str(self._template_program))
 
+        self._pipeline = SampleEvaluatePipeline(
+            self._evaluator,
+            self._evaluation_executor,
+            self._register_evaluated_function,
+            max_sample_nums=self._max_sample_nums,
+            initial_sample_nums=self._tot_sample_nums,
+            max_pending=self._max_pending_evaluations if self._async_evaluation else self._num_samplers * self._samples_per_prompt,
+            num_workers=self._num_evaluators,
+            debug_mode=self._debug_mode
+        )
+
+        # generate prompts ahead of time
+        if self._async_evaluation and self._num_prefetch_prompts > 0:
+            self._prompt_queue = queue.Queue(maxsize=self._num_prefetch_prompts)
+            self._prefetch_thread = Thread(target=self._prefetch_prompts, daemon=True)
+            self._prefetch_thread.start()
+
         # start sampling using multiple threads
+        sampling_start = time.time()
         for t in self._sampler_threads:
             t.start()
 
         # join all threads to the main thread
         for t in self._sampler_threads:
             t.join()
+        self._sampling_wall_time = time.time() - sampling_start
+
+        # stop prefetching, and wait for the pending evaluations
+        self._stop_event.set()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+        self._pipeline.join()
+
+        # shutdown evaluation_executor
+        try:
+            self._evaluation_executor.shutdown(cancel_futures=True)
+        except:
+            pass
+
+        if self._debug_mode:
+            print(f'FunSearch metrics: {self.metrics()}')
 
         if self._profiler is not None:
             self._profiler.finish()
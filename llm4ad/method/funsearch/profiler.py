@@ -46,27 +46,21 @@ class FunSearchProfiler(ProfilerBase):
             [{...}, {...}],
         ]
         """
-        try:
-            if (self._num_samples == 0 or
-                    self._num_samples % self._intv != 0):
-                return
-            self._db_lock.acquire()
-            self._prog_db_order += 1
-            isld_list = []
-            for island in program_db.islands:
-                clus_list = []
-                for k, v in island.clusters.items():
-                    funcs = [str(f) for f in v.programs]
-                    func_dic = {'score': k, 'functions': funcs}
-                    clus_list.append(func_dic)
-                isld_list.append(clus_list)
+        if (self._num_samples == 0 or
+                self._num_samples % self._intv != 0):
+            return
+        self.save_program_db(program_db.snapshot())
 
+    def save_program_db(self, isld_list: list):
+        """Save a snapshot of the ProgramDB (see 'ProgramsDatabase.snapshot()') to 'prog_db/db_{order}.json'.
+        """
+        if not self._log_dir:
+            return
+        with self._db_lock:
+            self._prog_db_order += 1
             path = os.path.join(self._prog_db_path, f'db_{self._prog_db_order}.json')
             with open(path, 'w') as f:
                 json.dump(isld_list, f)
-        finally:
-            if self._db_lock.locked():
-                self._db_lock.release()
 
 
 class FunSearchTensorboardProfiler(TensorboardProfiler, FunSearchProfiler):
@@ -16,8 +16,8 @@
 """A programs database that implements the evolutionary algorithm."""
 from __future__ import annotations
 
-import copy
 import dataclasses
+import threading
 import time
 from collections.abc import Sequence
 from typing import Any
@@ -89,17 +89,25 @@ class ProgramsDatabase:
         self._best_program_per_island: list[Function | None] = ([None] * config.num_islands)
         self._best_scores_per_test_per_island: list[Any | None] = ([None] * config.num_islands)
         self._last_reset_time: float = time.time()
+        # prompts are generated and results are registered from different threads
+        self._lock = threading.RLock()
 
     def get_prompt(self) -> Prompt:
         """Returns a prompt containing implementations from one chosen island."""
-        island_id = np.random.randint(len(self._islands))
-        code, version_generated = self._islands[island_id].get_prompt()
+        with self._lock:
+            island_id = np.random.randint(len(self._islands))
+            code, version_generated = self._islands[island_id].get_prompt()
         return Prompt(code, version_generated, island_id)
 
     @property
     def islands(self):
         return self._islands
 
+    @property
+    def lock(self) -> threading.RLock:
+        """Hold this lock while reading the islands from another thread."""
+        return self._lock
+
     def _register_function_in_island(
             self,
             function: Function,
@@ -123,28 +131,38 @@ class ProgramsDatabase:
         # In an asynchronous funsearch_impl we should consider the possibility of
         # registering a program on an island that had been reset after the prompt
         # was generated. Leaving that out here for simplicity.
-        if island_id is None:
-            # This is a program added at the beginning, so adding it to all islands.
-            for island_id in range(len(self._islands)):
+        with self._lock:
+            if island_id is None:
+                # This is a program added at the beginning, so adding it to all islands.
+                for island_id in range(len(self._islands)):
+                    self._register_function_in_island(function, island_id, score)
+            else:
                 self._register_function_in_island(function, island_id, score)
-        else:
-            self._register_function_in_island(function, island_id, score)
 
-        # Check whether it is time to reset an island.
-        if time.time() - self._last_reset_time > self._config.reset_period:
-            self._last_reset_time = time.time()
-            self.reset_islands()
+            # Check whether it is time to reset an island.
+            if time.time() - self._last_reset_time > self._config.reset_period:
+                self._last_reset_time = time.time()
+                self.reset_islands()
 
     def reset_islands(self) -> None:
         """Resets the weaker half of islands."""
-        # We sort best scores after adding minor noise to break ties.
-        indices_sorted_by_score: np.ndarray = np.argsort(
-            self._best_score_per_island +
-            np.random.randn(len(self._best_score_per_island)) * 1e-6)
-        num_islands_to_reset = self._config.num_islands // 2
-        reset_islands_ids = indices_sorted_by_score[:num_islands_to_reset]
-        keep_islands_ids = indices_sorted_by_score[num_islands_to_reset:]
-        for island_id in reset_islands_ids:
+        with self._lock:
+            # We sort best scores after adding minor noise to break ties.
+            indices_sorted_by_score: np.ndarray = np.argsort(
+                self._best_score_per_island +
+                np.random.randn(len(self._best_score_per_island)) * 1e-6)
+            num_islands_to_reset = self._config.num_islands // 2
+            reset_islands_ids = indices_sorted_by_score[:num_islands_to_reset]
+            keep_islands_ids = indices_sorted_by_score[num_islands_to_reset:]
+            for island_id in reset_islands_ids:
+                founder_island_id = np.random.choice(keep_islands_ids)
+                founder = self._best_program_per_island[founder_island_id]
+                founder_scores = self._best_scores_per_test_per_island[founder_island_id]
+                self.reset_island(island_id, founder, founder_scores)
+
+    def reset_island(self, island_id: int, founder: Function, founder_score: Any) -> None:
+        """Replaces the island with a new island that only contains `founder`."""
+        with self._lock:
             self._islands[island_id] = Island(
                 self._template,
                 self._function_to_evolve,
@@ -152,10 +170,35 @@ class ProgramsDatabase:
                 self._config.cluster_sampling_temperature_init,
                 self._config.cluster_sampling_temperature_period)
             self._best_score_per_island[island_id] = -float('inf')
-            founder_island_id = np.random.choice(keep_islands_ids)
-            founder = self._best_program_per_island[founder_island_id]
-            founder_scores = self._best_scores_per_test_per_island[founder_island_id]
-            self._register_function_in_island(founder, island_id, founder_scores)
+            self._register_function_in_island(founder, island_id, founder_score)
+
+    def best_per_island(self) -> list[tuple[Any, Function | None]]:
+        """Returns the (best score, best program) of each island."""
+        with self._lock:
+            return list(zip(self._best_score_per_island, self._best_program_per_island))
+
+    def snapshot(self) -> list[list[dict]]:
+        """Returns the programs of each island, grouped by cluster, in the format of the saved program databases.
+        [
+            [{'score': -300, 'functions': [xxx, xxx, xxx, ...]}, {'score': -200, 'functions': [xxx, xxx, xxx, ...]}, {...}],
+            [{...}, {...}],
+        ]
+        """
+        with self._lock:
+            return [
+                [{'score': k, 'functions': [str(f) for f in v.programs]} for k, v in island.clusters.items()]
+                for island in self._islands
+            ]
+
+
+def _append_to_buffer(buffer: np.ndarray, size: int, value) -> np.ndarray:
+    """Writes `value` to `buffer[size]`, doubling the capacity of `buffer` if it is full."""
+    if size == len(buffer):
+        grown = np.empty(max(2 * len(buffer), 8), dtype=buffer.dtype)
+        grown[:size] = buffer
+        buffer = grown
+    buffer[size] = value
+    return buffer
 
 
 class Island:
@@ -176,6 +219,14 @@ class Island:
         self._cluster_sampling_temperature_period = (cluster_sampling_temperature_period)
         self._clusters: dict[Any, Cluster] = {}
         self._num_programs: int = 0
+        # The scores of the clusters are kept in an array (in the insertion order of `_clusters`),
+        # which is updated when a cluster is created, instead of being rebuilt for every prompt.
+        self._cluster_list: list[Cluster] = []
+        self._cluster_scores: np.ndarray = np.empty(8, dtype=np.float64)
+        self._max_abs_score: float = 0.
+        # The sampling probabilities only change with the number of clusters and the temperature.
+        self._probabilities_key: tuple[int, float] | None = None
+        self._probabilities: np.ndarray | None = None
 
     @property
     def clusters(self):
@@ -194,42 +245,47 @@ class Island:
         """Stores a program on this island, in its appropriate cluster."""
         signature = score
         if signature not in self._clusters:
-            self._clusters[signature] = Cluster(score, function)
+            cluster = Cluster(score, function)
+            self._clusters[signature] = cluster
+            self._cluster_scores = _append_to_buffer(self._cluster_scores, len(self._cluster_list), score)
+            self._cluster_list.append(cluster)
+            self._max_abs_score = max(self._max_abs_score, abs(float(score)))
         else:
             self._clusters[signature].register_program(function)
         self._num_programs += 1
 
-    def get_prompt(self) -> tuple[str, int]:
-        """Constructs a prompt containing functions from this island."""
-        signatures = list(self._clusters.keys())
-        cluster_scores = np.array(
-            [self._clusters[signature].score for signature in signatures])
-
-        # ------------------------------------------------------------------------------
-        # Normalized the score
-        # ------------------------------------------------------------------------------
-        max_abs_score = float(np.abs(cluster_scores).max())
-        if max_abs_score > 1:
-            cluster_scores = cluster_scores.astype(float) / max_abs_score
-        # ------------------------------------------------------------------------------
-
-        # Convert scores to probabilities using softmax with temperature schedule.
+    def _cluster_probabilities(self) -> np.ndarray:
+        """Returns the probabilities of sampling each cluster, using softmax with temperature schedule."""
         period = self._cluster_sampling_temperature_period
         temperature = self._cluster_sampling_temperature_init * (
                 1 - (self._num_programs % period) / period)
-        probabilities = _softmax(cluster_scores, temperature)
+        key = (len(self._cluster_list), temperature)
+        if key != self._probabilities_key:
+            cluster_scores = self._cluster_scores[:len(self._cluster_list)]
+            # ------------------------------------------------------------------------------
+            # Normalized the score
+            # ------------------------------------------------------------------------------
+            if self._max_abs_score > 1:
+                cluster_scores = cluster_scores / self._max_abs_score
+            # ------------------------------------------------------------------------------
+            self._probabilities = _softmax(cluster_scores, temperature)
+            self._probabilities_key = key
+        return self._probabilities
+
+    def get_prompt(self) -> tuple[str, int]:
+        """Constructs a prompt containing functions from this island."""
+        probabilities = self._cluster_probabilities()
 
         # At the beginning of an experiment when we have few clusters, place fewer
         # programs into the prompt.
         functions_per_prompt = min(len(self._clusters), self._functions_per_prompt)
 
         idx = np.random.choice(
-            len(signatures), size=functions_per_prompt, p=probabilities)
-        chosen_signatures = [signatures[i] for i in idx]
+            len(self._cluster_list), size=functions_per_prompt, p=probabilities)
         implementations = []
         scores = []
-        for signature in chosen_signatures:
-            cluster = self._clusters[signature]
+        for i in idx:
+            cluster = self._cluster_list[i]
             implementations.append(cluster.sample_program())
             scores.append(cluster.score)
 
@@ -240,23 +296,23 @@ class Island:
 
     def _generate_prompt(self, implementations: Sequence[Function]) -> str:
         """Creates a prompt containing a sequence of function `implementations`."""
-        implementations = copy.deepcopy(implementations)  # We will mutate these.
-
         # Format the names and docstrings of functions to be included in the prompt.
+        # The implementations are stored in the clusters, so renamed copies are made instead of mutating them.
         versioned_functions: list[Function] = []
         for i, implementation in enumerate(implementations):
             new_function_name = f'{self._function_to_evolve}_v{i}'
-            implementation.name = new_function_name
             # Update the docstring for all subsequent functions after `_v0`.
+            docstring = implementation.docstring
             if i >= 1:
-                implementation.docstring = (
-                    f'Improved version of `{self._function_to_evolve}_v{i - 1}`.')
+                docstring = f'Improved version of `{self._function_to_evolve}_v{i - 1}`.'
+            versioned = dataclasses.replace(implementation, name=new_function_name, docstring=docstring)
             # If the function is recursive, replace calls to itself with its new name.
-            implementation = ModifyCode.rename_function(
-                str(implementation), self._function_to_evolve, new_function_name)
-            versioned_functions.append(
-                TextFunctionProgramConverter.text_to_function(implementation)
-            )
+            # The round trip through the parser is also needed for docstrings with escape sequences.
+            if self._function_to_evolve in versioned.body or (docstring and '\\' in docstring):
+                versioned = TextFunctionProgramConverter.text_to_function(
+                    ModifyCode.rename_function(str(versioned), self._function_to_evolve, new_function_name)
+                )
+            versioned_functions.append(versioned)
 
         # Create the header of the function to be generated by the LLM.
         next_version = len(implementations)
@@ -281,7 +337,12 @@ class Cluster:
     def __init__(self, score: float, implementation: Function):
         self._score = score
         self._programs: list[Function] = [implementation]
-        self._lengths: list[int] = [len(str(implementation))]
+        # The lengths are kept in an array, the sampling probabilities are cached until a program is added.
+        length = len(str(implementation))
+        self._lengths: np.ndarray = np.array([length], dtype=np.int64)
+        self._min_length: int = length
+        self._max_length: int = length
+        self._probabilities: np.ndarray | None = None
 
     @property
     def score(self) -> float:
@@ -294,12 +355,17 @@ class Cluster:
 
     def register_program(self, program: Function) -> None:
         """Adds `program` to the cluster."""
+        length = len(str(program))
+        self._lengths = _append_to_buffer(self._lengths, len(self._programs), length)
         self._programs.append(program)
-        self._lengths.append(len(str(program)))
+        self._min_length = min(self._min_length, length)
+        self._max_length = max(self._max_length, length)
+        self._probabilities = None
 
     def sample_program(self) -> Function:
         """Samples a program, giving higher probability to shorther programs."""
-        normalized_lengths = (np.array(self._lengths) - min(self._lengths)) / (
-                max(self._lengths) + 1e-6)
-        probabilities = _softmax(-normalized_lengths, temperature=1.0)
-        return np.random.choice(self._programs, p=probabilities)  # noqa
+        if self._probabilities is None:
+            normalized_lengths = (self._lengths[:len(self._programs)] - self._min_length) / (
+                    self._max_length + 1e-6)
+            self._probabilities = _softmax(-normalized_lengths, temperature=1.0)
+        return self._programs[np.random.choice(len(self._programs), p=self._probabilities)]
@@ -0,0 +1,455 @@
+# Module Name: ShardedFunSearch
+# Last Revision: 2025/2/16
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Description: FunSearch with the islands of the programs database sharded over several worker processes.
+#   Each shard is an ordinary 'FunSearch' (with its own samplers and evaluators) which holds a group of islands,
+#   so that prompt construction, sample parsing and registration of different shards are not serialized by the GIL.
+#   A lightweight coordinator in the main process talks to the shards over multiprocessing pipes. It
+#       - resets the weaker half of all islands every 'reset_period' seconds (founders may come from other shards),
+#       - broadcasts the best program to the shards every 'migration_period' seconds,
+#       - registers all samples to the profiler, and checkpoints the islands to 'prog_db/db_{order}.json'.
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import multiprocessing
+import multiprocessing.connection
+import random
+import threading
+import time
+import traceback
+from typing import Optional, Literal, List
+
+import numpy as np
+
+from . import programs_database
+from .config import ProgramsDatabaseConfig
+from .funsearch import FunSearch
+from .profiler import FunSearchProfiler
+from ...base import *
+from ...tools.profiler import ProfilerBase
+
+
+class _FunSearchShard(FunSearch):
+    """A FunSearch instance which holds a group of islands and reports to the coordinator through 'conn'.
+    """
+
+    def __init__(self, conn, shard_id: int, db_config: ProgramsDatabaseConfig, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._conn = conn
+        self._conn_lock = threading.Lock()
+        self._shard_id = shard_id
+        self._stopped = threading.Event()
+        # islands are only reset by the coordinator
+        self.db_config = dataclasses.replace(db_config, reset_period=float('inf'))
+        self._database = programs_database.ProgramsDatabase(
+            self.db_config,
+            self._template_program,
+            self._function_to_evolve_name
+        )
+
+    def _send(self, message):
+        with self._conn_lock:
+            self._conn.send(message)
+
+    def _register_evaluated_function(self, function: Function | None, program: Program, score, eval_time, *,
+                                     island_id: int, sample_time: float):
+        super()._register_evaluated_function(
+            function, program, score, eval_time, island_id=island_id, sample_time=sample_time
+        )
+        self._send(('sample', {
+            'function': None if function is None else str(function),
+            'program': str(program),
+            'score': score,
+            'island_id': island_id,
+            'sample_time': sample_time,
+            'evaluate_time': eval_time,
+        }))
+
+    def _serve(self):
+        """Handle the requests of the coordinator until it sends 'stop'.
+        """
+        while True:
+            try:
+                command, *args = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if command == 'best':
+                best = [(score, None if func is None else str(func))
+                        for score, func in self._database.best_per_island()]
+                self._send(('reply', best))
+            elif command == 'snapshot':
+                self._send(('reply', self._database.snapshot()))
+            elif command == 'reset':
+                for island_id, founder, founder_score in args[0]:
+                    founder = TextFunctionProgramConverter.text_to_function(founder)
+                    self._database.reset_island(island_id, founder, founder_score)
+            elif command == 'migrate':
+                function, score = args
+                function = TextFunctionProgramConverter.text_to_function(function)
+                # the migrant joins the weakest island of this shard
+                best_scores = [s for s, _ in self._database.best_per_island()]
+                self._database.register_function(function, int(np.argmin(best_scores)), score)
+            elif command == 'stop':
+                break
+        self._stopped.set()
+
+    def run_shard(self, template_score):
+        server = threading.Thread(target=self._serve, daemon=True)
+        server.start()
+        try:
+            # the template is evaluated once by the coordinator
+            self._database.register_function(function=self._function_to_evolve, island_id=None, score=template_score)
+            self.run()
+        except Exception:
+            traceback.print_exc()
+        self._send(('done', self.metrics()))
+        # keep serving snapshots until the coordinator has finished
+        self._stopped.wait()
+
+
+def _shard_main(conn, shard_id: int, db_config: ProgramsDatabaseConfig, template_score, fs_args: tuple, fs_kwargs: dict):
+    # forked shards inherit the random state of the coordinator
+    np.random.seed(None)
+    random.seed()
+    shard = _FunSearchShard(conn, shard_id, db_config, *fs_args, **fs_kwargs)
+    shard.run_shard(template_score)
+
+
+class ShardedFunSearch:
+    # the seconds the shards get to exit after 'stop' (they may still be sampling after an interrupt)
+    _SHUTDOWN_TIMEOUT = 30.
+
+    def __init__(self,
+                 llm: LLM,
+                 evaluation: Evaluation,
+                 profiler: ProfilerBase = None,
+                 num_shards: int = 2,
+                 num_samplers: int = 4,
+                 num_evaluators: int = 4,
+                 samples_per_prompt: int = 4,
+                 max_sample_nums: Optional[int] = 20,
+                 *,
+                 db_config: ProgramsDatabaseConfig | None = None,
+                 migration_period: float = 10 * 60,
+                 checkpoint_interval: int = 100,
+                 debug_mode: bool = False,
+                 multi_thread_or_process_eval: Literal['thread', 'process'] = 'thread',
+                 mp_context: str | None = None,
+                 **kwargs):
+        """Function Search with the islands sharded over 'num_shards' worker processes.
+        Args:
+            llm               : an instance of 'llm4ad.base.LLM', which must be picklable if 'mp_context' is not 'fork'.
+            evaluation        : an instance of 'llm4ad.base.Evaluator', which defines the way to calculate the score of a generated function.
+            profiler          : an instance of 'llm4ad.method.funsearch.FunSearchProfiler'. If you do not want to use it, you can pass a 'None'.
+            num_shards        : number of worker processes, the islands ('db_config.num_islands') are split evenly between them.
+            num_samplers      : number of independent Samplers in each shard.
+            num_evaluators    : number of independent program Evaluators in each shard.
+            max_sample_nums   : terminate after evaluating max_sample_nums functions in total, the budget is split evenly between shards.
+            db_config         : the configuration of the programs database, 'reset_period' is handled by the coordinator.
+            migration_period  : broadcast the best program to the other shards every 'migration_period' seconds,
+                                pass 'None' to disable the migration.
+            checkpoint_interval: save the islands of all shards to the profiler every 'checkpoint_interval' samples.
+            debug_mode        : if set to True, we will print detailed information.
+            multi_thread_or_process_eval: the evaluation executor of each shard, please refer to 'FunSearch'.
+            mp_context        : the start method of the worker processes ('fork', 'spawn', 'forkserver'), 'None' for the default.
+            **kwargs          : other args pass to 'FunSearch' of each shard (e.g., 'async_evaluation') and to 'llm4ad.base.SecureEvaluator'.
+        """
+        self._db_config = db_config or ProgramsDatabaseConfig()
+        assert 1 <= num_shards <= self._db_config.num_islands, 'each shard must hold at least one island'
+        self._llm = llm
+        self._evaluation = evaluation
+        self._profiler = profiler
+        self._num_shards = num_shards
+        self._max_sample_nums = max_sample_nums
+        self._migration_period = migration_period
+        self._checkpoint_interval = checkpoint_interval
+        self._debug_mode = debug_mode
+        self._mp_context = multiprocessing.get_context(mp_context)
+        self._fs_kwargs = dict(
+            num_samplers=num_samplers,
+            num_evaluators=num_evaluators,
+            samples_per_prompt=samples_per_prompt,
+            resume_mode=True,
+            debug_mode=debug_mode,
+            multi_thread_or_process_eval=multi_thread_or_process_eval,
+            **kwargs
+        )
+
+        self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(evaluation.template_program)
+        self._template_program: Program = TextFunctionProgramConverter.text_to_program(evaluation.template_program)
+        # the template is evaluated by the coordinator, other kwargs of 'FunSearch' are not for the evaluator
+        fs_params = inspect.signature(FunSearch.__init__).parameters
+        self._evaluator = SecureEvaluator(evaluation, debug_mode=debug_mode, **{
+            k: v for k, v in kwargs.items() if k not in fs_params
+        })
+
+        # islands [self._island_offsets[i], self._island_offsets[i + 1]) are held by shard i
+        self._island_offsets = np.linspace(0, self._db_config.num_islands, num_shards + 1).astype(int).tolist()
+
+        # statistics
+        self._tot_sample_nums = 0
+        self._samples_per_shard = [0] * num_shards
+        self._num_resets = 0
+        self._num_migrations = 0
+        self._shard_metrics: List[dict | None] = [None] * num_shards
+        self._conns = []
+        self._processes = []
+        self._running = set()
+        self._dead = set()
+
+        if profiler is not None:
+            self._profiler.record_parameters(llm, evaluation, self)  # ZL: necessary
+
+    def _shard_budget(self, shard_id: int) -> Optional[int]:
+        if self._max_sample_nums is None:
+            return None
+        return self._max_sample_nums // self._num_shards + (shard_id < self._max_sample_nums % self._num_shards)
+
+    # ------------------------------------------------------------------ messages
+
+    def _handle(self, shard_id: int, message):
+        kind, payload = message
+        if kind == 'sample':
+            self._tot_sample_nums += 1
+            self._samples_per_shard[shard_id] += 1
+            if self._profiler is not None and payload['function'] is not None:
+                function = TextFunctionProgramConverter.text_to_function(payload['function'])
+                function.score = payload['score']
+                function.sample_time = payload['sample_time']
+                function.evaluate_time = payload['evaluate_time']
+                self._profiler.register_function(function, program=payload['program'])
+        elif kind == 'done':
+            self._shard_metrics[shard_id] = payload
+            self._running.discard(shard_id)
+
+    def _shard_died(self, shard_id: int):
+        if shard_id not in self._dead:
+            print(f'ShardedFunSearch: shard {shard_id} exited unexpectedly.')
+        self._dead.add(shard_id)
+        self._running.discard(shard_id)
+
+    def _send(self, shard_id: int, *command) -> bool:
+        """Send a command to a shard, returns False if the shard is dead.
+        """
+        if shard_id in self._dead:
+            return False
+        try:
+            self._conns[shard_id].send(command)
+            return True
+        except (BrokenPipeError, OSError):
+            self._shard_died(shard_id)
+            return False
+
+    def _request(self, shard_id: int, *command):
+        """Send a command to a shard and wait for its reply, the samples received meanwhile are handled as usual.
+        Returns None if the shard is dead.
+        """
+        if not self._send(shard_id, *command):
+            return None
+        conn = self._conns[shard_id]
+        while True:
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                self._shard_died(shard_id)
+                return None
+            if kind == 'reply':
+                return payload
+            self._handle(shard_id, (kind, payload))
+
+    def _best_per_island(self) -> list[tuple[float, str | None, int, int]]:
+        """Returns (best score, best program, shard id, local island id) of the islands of all live shards."""
+        best = []
+        for shard_id in range(self._num_shards):
+            for island_id, (score, func) in enumerate(self._request(shard_id, 'best') or []):
+                best.append((score, func, shard_id, island_id))
+        return best
+
+    # ------------------------------------------------------------------ coordination
+
+    def reset_islands(self):
+        """Resets the weaker half of all islands, the founders are the best programs of the kept islands.
+        """
+        best = self._best_per_island()
+        if not best:
+            return
+        scores = np.array([b[0] for b in best], dtype=float)
+        # We sort best scores after adding minor noise to break ties.
+        indices_sorted_by_score = np.argsort(scores + np.random.randn(len(scores)) * 1e-6)
+        num_islands_to_reset = len(best) // 2
+        keep_islands_ids = indices_sorted_by_score[num_islands_to_reset:]
+        resets = [[] for _ in range(self._num_shards)]
+        for i in indices_sorted_by_score[:num_islands_to_reset]:
+            founder_score, founder, _, _ = best[np.random.choice(keep_islands_ids)]
+            if founder is None:
+                continue
+            _, _, shard_id, island_id = best[i]
+            resets[shard_id].append((island_id, founder, founder_score))
+        for shard_id, shard_resets in enumerate(resets):
+            if shard_resets:
+                self._send(shard_id, 'reset', shard_resets)
+        self._num_resets += 1
+
+    def broadcast_best(self):
+        """Sends the best program to the shards which do not hold it.
+        """
+        best = self._best_per_island()
+        if not best:
+            return
+        best_score, best_func, best_shard, _ = max(best, key=lambda b: b[0])
+        if best_func is None:
+            return
+        for shard_id in range(self._num_shards):
+            shard_best = max(b[0] for b in best if b[2] == shard_id)
+            if shard_id != best_shard and shard_best < best_score:
+                self._send(shard_id, 'migrate', best_func, best_score)
+        self._num_migrations += 1
+
+    def checkpoint(self):
+        """Saves the islands of all live shards (in the global island order) to the profiler.
+        """
+        if not isinstance(self._profiler, FunSearchProfiler):
+            return
+        isld_list = []
+        for shard_id in range(self._num_shards):
+            isld_list.extend(self._request(shard_id, 'snapshot') or [])
+        self._profiler.save_program_db(isld_list)
+
+    def metrics(self) -> dict:
+        """Returns the number of samples of each shard, and the metrics of each shard (see 'FunSearch.metrics()').
+        """
+        return {
+            'num_samples': self._tot_sample_nums,
+            'samples_per_shard': list(self._samples_per_shard),
+            'num_resets': self._num_resets,
+            'num_migrations': self._num_migrations,
+            'shards': list(self._shard_metrics),
+        }
+
+    def _stop_shards(self):
+        """Sends 'stop' to the shards, and keeps reading their pipes until they exit, since a shard which is still
+        sampling (e.g., after an interrupt) blocks on a full pipe. Shards which do not exit in time are terminated.
+        """
+        for shard_id in range(self._num_shards):
+            self._send(shard_id, 'stop')
+        deadline = time.time() + self._SHUTDOWN_TIMEOUT
+        open_conns = {shard_id for shard_id in range(self._num_shards) if shard_id not in self._dead}
+        while time.time() < deadline and any(p.is_alive() for p in self._processes):
+            if not open_conns:
+                time.sleep(0.1)
+                continue
+            for conn in multiprocessing.connection.wait([self._conns[i] for i in open_conns], timeout=0.1):
+                shard_id = self._conns.index(conn)
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    open_conns.discard(shard_id)
+                    continue
+                if message[0] != 'reply':
+                    try:
+                        self._handle(shard_id, message)
+                    except Exception:
+                        if self._debug_mode:
+                            traceback.print_exc()
+        for shard_id, process in enumerate(self._processes):
+            if process.is_alive():
+                print(f'ShardedFunSearch: shard {shard_id} did not stop in time, terminating it.')
+                process.terminate()
+            process.join()
+
+    def run(self):
+        # evaluate the template program once, make sure the score of which is not 'None'
+        score, eval_time = self._evaluator.evaluate_program_record_time(program=self._template_program)
+        if score is None:
+            raise RuntimeError('The score of the template function must not be "None".')
+        if self._profiler:
+            self._function_to_evolve.score = score
+            self._function_to_evolve.evaluate_time = eval_time
+            self._profiler.register_function(self._function_to_evolve, program=str(self._template_program))
+
+        # start the shards
+        for shard_id in range(self._num_shards):
+            parent_conn, child_conn = self._mp_context.Pipe()
+            db_config = dataclasses.replace(
+                self._db_config,
+                num_islands=self._island_offsets[shard_id + 1] - self._island_offsets[shard_id]
+            )
+            fs_kwargs = dict(self._fs_kwargs, max_sample_nums=self._shard_budget(shard_id))
+            process = self._mp_context.Process(
+                target=_shard_main,
+                args=(child_conn, shard_id, db_config, score, (self._llm, self._evaluation), fs_kwargs),
+                daemon=False
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        # coordinate until all shards are done
+        self._running = set(range(self._num_shards))
+        last_reset = last_migration = time.time()
+        last_checkpoint = 0
+        try:
+            while self._running:
+                ready = multiprocessing.connection.wait([self._conns[i] for i in self._running], timeout=0.5)
+                for conn in ready:
+                    shard_id = self._conns.index(conn)
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):
+                        self._shard_died(shard_id)
+                        continue
+                    self._handle(shard_id, message)
+                if not self._running:
+                    break
+
+                now = time.time()
+                if now - last_reset > self._db_config.reset_period:
+                    last_reset = now
+                    self.reset_islands()
+                if self._migration_period is not None and now - last_migration > self._migration_period:
+                    last_migration = now
+                    self.broadcast_best()
+                if self._tot_sample_nums - last_checkpoint >= self._checkpoint_interval:
+                    last_checkpoint = self._tot_sample_nums
+                    self.checkpoint()
+        except KeyboardInterrupt:
+            pass
+        except Exception:
+            if self._debug_mode:
+                traceback.print_exc()
+
+        # save the final islands and stop the shards
+        try:
+            self.checkpoint()
+        except (EOFError, OSError):
+            if self._debug_mode:
+                traceback.print_exc()
+        self._stop_shards()
+
+        if self._debug_mode:
+            print(f'ShardedFunSearch metrics: {self.metrics()}')
+
+        if self._profiler is not None:
+            self._profiler.finish()
+
+        self._llm.close()
@@ -6,11 +6,6 @@ from abc import ABC, abstractmethod
 from threading import Lock
 from typing import List, Dict, Optional
 
-try:
-    import wandb
-except:
-    pass
-
 from .elite_set import EliteSet
 from .func_ruin import LHNSFunction
 from ...tools.profiler import TensorboardProfiler, ProfilerBase, WandBProfiler
@@ -63,6 +58,8 @@ class LHNSProfiler(ProfilerBase):
         sample_order = getattr(self.__class__, '_num_samples', 0)
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'algorithm': function.algorithm,  # Added when recording
             'function': str(function),
             'features': function.features,
@@ -76,18 +73,7 @@ class LHNSProfiler(ProfilerBase):
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
-
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+        self._append_sample_record(filename, content)
 
 
 class LHNSTensorboardProfiler(TensorboardProfiler, LHNSProfiler):
@@ -128,10 +114,6 @@ class LHNSTensorboardProfiler(TensorboardProfiler, LHNSProfiler):
             **kwargs
         )
 
-    def finish(self):
-        if self._log_dir:
-            self._writer.close()
-
         filename = 'end.json'
         path = os.path.join(os.path.join(self._log_dir, 'population'), filename)
 
@@ -187,7 +169,7 @@ class LHNSWandbProfiler(WandBProfiler, LHNSProfiler):
             os.makedirs(self._ckpt_dir, exist_ok=True)
 
     def finish(self):
-        wandb.finish()
+        super().finish()
         filename = 'end.json'
         path = os.path.join(os.path.join(self._log_dir, 'population'), filename)
 
@@ -23,7 +23,9 @@
 # --------------------------------------------------------------------------
 
 from __future__ import annotations
+import bisect
 import math
+import threading
 
 
 class MCTSNode:
@@ -40,6 +42,10 @@ class MCTSNode:
         self.raw_info = raw_info
         self.Q = Q
         self.reward = -1 * obj
+        # number of workers currently in the subtree of this node (tree-parallel MCTS)
+        self.virtual_loss = 0
+        # number of workers currently expanding this node in the selection phase
+        self.pending_expansions = 0
 
     def add_child(self, child_node: MCTSNode):
         self.children.append(child_node)
@@ -54,7 +60,11 @@ class MCTS:
         self.discount_factor = 1  # constant as 1
         self.q_min = 0
         self.q_max = -10000
+        # sorted Q values of all nodes, the set is used for the membership check
         self.rank_list = []
+        self._rank_set = set()
+        # the tree is shared by the workers of tree-parallel MCTS
+        self.lock = threading.RLock()
 
         self.root = MCTSNode(algorithm=root_answer, code=root_answer, depth=0, obj=0, is_root=True)
 
@@ -65,26 +75,44 @@ class MCTS:
         self.selected_nodes = []
 
     def backpropagate(self, node: MCTSNode):
-        if node.Q not in self.rank_list:
-            self.rank_list.append(node.Q)
-            self.rank_list.sort()
-        self.q_min = min(self.q_min, node.Q)
-        self.q_max = max(self.q_max, node.Q)
-        parent = node.parent
-        while parent:
-            best_child_Q = max(child.Q for child in parent.children)
-            parent.Q = parent.Q * (1 - self.discount_factor) + best_child_Q * self.discount_factor
-            parent.visits += 1
-            if parent.code != 'Root' and parent.parent.code == 'Root':
-                parent.subtree.append(node)
-            parent = parent.parent
+        with self.lock:
+            if node.Q not in self._rank_set:
+                self._rank_set.add(node.Q)
+                bisect.insort(self.rank_list, node.Q)
+            self.q_min = min(self.q_min, node.Q)
+            self.q_max = max(self.q_max, node.Q)
+            parent = node.parent
+            while parent:
+                best_child_Q = max(child.Q for child in parent.children)
+                parent.Q = parent.Q * (1 - self.discount_factor) + best_child_Q * self.discount_factor
+                parent.visits += 1
+                if parent.code != 'Root' and parent.parent.code == 'Root':
+                    parent.subtree.append(node)
+                parent = parent.parent
 
     def uct(self, node: MCTSNode, eval_remain):
+        """The UCT score of the node. Each worker in the subtree of the node (virtual loss) counts
+        as a visit with the lowest reward, so that concurrent workers are spread over different subtrees.
+        """
         self.exploration_constant = (self.exploration_constant_0) * eval_remain
-        return (node.Q - self.q_min) / (self.q_max - self.q_min) + self.exploration_constant * math.sqrt(
-            math.log(node.parent.visits + 1) / node.visits
+        visits = node.visits + node.virtual_loss
+        exploitation = (node.Q - self.q_min) / (self.q_max - self.q_min)
+        if node.virtual_loss:
+            exploitation = exploitation * node.visits / visits
+        return exploitation + self.exploration_constant * math.sqrt(
+            math.log(node.parent.visits + 1) / visits
         )
 
+    def add_virtual_loss(self, path: list[MCTSNode]):
+        with self.lock:
+            for node in path:
+                node.virtual_loss += 1
+
+    def remove_virtual_loss(self, path: list[MCTSNode]):
+        with self.lock:
+            for node in path:
+                node.virtual_loss -= 1
+
     def is_fully_expanded(self, node: MCTSNode):
         return len(node.children) >= self.max_children or any(
             child.Q > node.Q for child in node.children
@@ -29,7 +29,7 @@ import copy
 import random
 import time
 import traceback
-from threading import Thread
+from threading import Thread, Lock
 from typing import Optional, Literal
 
 from .population import Population
@@ -72,6 +72,9 @@ class MCTS_AHD:
             init_size       : population size, if set to 'None', EoH will automatically adjust this parameter.
             pop_size        : population size, if set to 'None', EoH will automatically adjust this parameter.
             selection_num   : number of selected individuals while crossover.
+            num_samplers    : number of workers in the tree-parallel search. Workers select leaves concurrently (spread by
+                              virtual loss), and expand them (LLM call and evaluation) in parallel.
+            num_evaluators  : number of independent program Evaluators.
             alpha           : a parameter for the UCT formula, which is used to balance exploration and exploitation.
             lambda_0        : a parameter for the UCT formula, which is used to balance exploration and exploitation.
             resume_mode     : in resume_mode, randsample will not evaluate the template_program, and will skip the init process. TODO: More detailed usage.
@@ -116,6 +119,7 @@ class MCTS_AHD:
 
         # statistics
         self._tot_sample_nums = 0
+        self._tot_sample_nums_lock = Lock()
 
         # reset _initial_sample_nums_max
         self._initial_sample_nums_max = min(
@@ -194,6 +198,7 @@ class MCTS_AHD:
             self._profiler.register_function(func, program=str(program))
             if isinstance(self._profiler, MAProfiler):
                 self._profiler.register_population(self._population)
+        with self._tot_sample_nums_lock:
             self._tot_sample_nums += 1
         if func_only:
             return func
@@ -237,11 +242,12 @@ class MCTS_AHD:
     def expand(self, mcts: MCTS, node_set, cur_node: MCTSNode, option: str):
         is_valid_func = True
         if option == 's1':
+            # the individuals are not modified, so the path is not copied (copying a node copies the whole tree)
             path_set = []
-            now = copy.deepcopy(cur_node)
+            now = cur_node
             while now.algorithm != "Root":
                 path_set.append(now.individual)
-                now = copy.deepcopy(now.parent)
+                now = now.parent
             path_set = self.population_management_s1(path_set, len(path_set))
             if len(path_set) == 1:
                 return node_set
@@ -350,9 +356,10 @@ class MCTS_AHD:
                                 parent=cur_node, depth=1, visit=1, Q=func.score, raw_info=func)
             if option == 'e1':
                 now_node.subtree.append(now_node)
-            cur_node.add_child(now_node)
-            mcts.backpropagate(now_node)
-            node_set.append(now_node)
+            with mcts.lock:
+                cur_node.add_child(now_node)
+                mcts.backpropagate(now_node)
+                node_set.append(now_node)
         return node_set
 
     def _iteratively_init_population_root(self):
@@ -391,9 +398,72 @@ class MCTS_AHD:
                     exit()
                 continue
 
+    def _select(self, mcts: MCTS) -> list[MCTSNode]:
+        """Walk down the tree with UCT and return the path (excluding the root). Virtual loss is added to the nodes
+        on the path, so that other workers are steered to other subtrees. Nodes are widened (e1 for the root and e2 for
+        other nodes) on the way, expansions that are in progress in other workers are taken into account.
+        """
+        path = []
+        cur_node = mcts.root
+        while True:
+            with mcts.lock:
+                if not (len(cur_node.children) > 0 and cur_node.depth < mcts.max_depth):
+                    break
+                uct_scores = [mcts.uct(node, max(1 - self._tot_sample_nums / self._max_sample_nums, 0)) for node in
+                              cur_node.children]
+                selected_pair_idx = uct_scores.index(max(uct_scores))
+                widen = int((cur_node.visits) ** mcts.alpha) > len(cur_node.children) + cur_node.pending_expansions
+                if widen:
+                    cur_node.pending_expansions += 1
+            if widen:
+                try:
+                    if cur_node == mcts.root:
+                        op = 'e1'
+                        self.expand(mcts, mcts.root.children, cur_node, op)
+                    else:
+                        # i = random.randint(1, n_op - 1)
+                        op = 'e2'
+                        self.expand(mcts, cur_node.children, cur_node, op)
+                finally:
+                    with mcts.lock:
+                        cur_node.pending_expansions -= 1
+            cur_node = cur_node.children[selected_pair_idx]
+            mcts.add_virtual_loss([cur_node])
+            path.append(cur_node)
+        return path
+
+    def _iteratively_search(self, mcts: MCTS):
+        n_op = ['e1', 'e2', 'm1', 'm2', 's1']
+        op_weights = [0, 1, 2, 2, 1]
+        while self._continue_loop():
+            path = []
+            try:
+                node_set = []
+                print(f"Current performances of MCTS nodes: {mcts.rank_list}")
+                print(
+                    f"Current number of MCTS nodes in the subtree of each child of the root: {[len(node.subtree) for node in mcts.root.children]}")
+                path = self._select(mcts)
+                cur_node = path[-1] if path else mcts.root
+                for i in range(len(n_op)):
+                    op = n_op[i]
+                    print(f"Iter: {self._tot_sample_nums}/{self._max_sample_nums} OP: {op}", end="|")
+                    op_w = op_weights[i]
+                    for j in range(op_w):
+                        node_set = self.expand(mcts, node_set, cur_node, op)
+                self._population.survival()
+            except KeyboardInterrupt:
+                break
+            except Exception:
+                if self._debug_mode:
+                    traceback.print_exc()
+                    exit()
+                continue
+            finally:
+                mcts.remove_virtual_loss(path)
+
     def _multi_threaded_sampling(self, fn: callable, *args, **kwargs):
         """Execute `fn` using multithreading.
-        In MCTS_MA, `fn` can be `self._iteratively_use_eoh_operator`.
+        In MCTS_AHD, `fn` can be `self._iteratively_search`.
         """
         # threads for sampling
         sampler_threads = [
@@ -433,35 +503,8 @@ class MCTS_AHD:
                 f'Please also check your evaluation implementation and LLM implementation.')
             return
 
-        # evolutionary search
-        n_op = ['e1', 'e2', 'm1', 'm2', 's1']
-        op_weights = [0, 1, 2, 2, 1]
-        while self._continue_loop():
-            node_set = []
-            print(f"Current performances of MCTS nodes: {mcts.rank_list}")
-            print(
-                f"Current number of MCTS nodes in the subtree of each child of the root: {[len(node.subtree) for node in mcts.root.children]}")
-            cur_node = mcts.root
-            while len(cur_node.children) > 0 and cur_node.depth < mcts.max_depth:
-                uct_scores = [mcts.uct(node, max(1 - self._tot_sample_nums / self._max_sample_nums, 0)) for node in
-                              cur_node.children]
-                selected_pair_idx = uct_scores.index(max(uct_scores))
-                if int((cur_node.visits) ** mcts.alpha) > len(cur_node.children):
-                    if cur_node == mcts.root:
-                        op = 'e1'
-                        self.expand(mcts, mcts.root.children, cur_node, op)
-                    else:
-                        # i = random.randint(1, n_op - 1)
-                        op = 'e2'
-                        self.expand(mcts, cur_node.children, cur_node, op)
-                cur_node = cur_node.children[selected_pair_idx]
-            for i in range(len(n_op)):
-                op = n_op[i]
-                print(f"Iter: {self._tot_sample_nums}/{self._max_sample_nums} OP: {op}", end="|")
-                op_w = op_weights[i]
-                for j in range(op_w):
-                    node_set = self.expand(mcts, node_set, cur_node, op)
-            self._population.survival()
+        # evolutionary search (tree-parallel, each sampler thread runs its own selection-expansion-backpropagation loop)
+        self._multi_threaded_sampling(self._iteratively_search, mcts)
 
         # finish
         if self._profiler is not None:
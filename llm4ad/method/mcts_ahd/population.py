@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import math
 import random
-from threading import Lock
+from threading import RLock
 from typing import List
 import numpy as np
 
@@ -20,7 +20,7 @@ class Population:
 
         self._pop_size = pop_size
         self._init_pop_size = init_pop_size
-        self._lock = Lock()
+        self._lock = RLock()
         self._next_gen_pop = []
         self._generation = generation
 
@@ -49,39 +49,41 @@ class Population:
         if pop_size is None:
             pop_size = self._pop_size
 
-        pop = self._population + self._next_gen_pop
+        with self._lock:
+            pop = self._population + self._next_gen_pop
 
-        # keep unique algorithms
-        unique_pop = []
-        unique_objectives = []
-        for individual in pop:
-            if individual.score not in unique_objectives:
-                unique_pop.append(individual)
-                unique_objectives.append(individual.score)
+            # keep unique algorithms
+            unique_pop = []
+            unique_objectives = []
+            for individual in pop:
+                if individual.score not in unique_objectives:
+                    unique_pop.append(individual)
+                    unique_objectives.append(individual.score)
 
-        pop = sorted(unique_pop, key=lambda f: f.score, reverse=True)  # better sort
-        self._population = pop[:pop_size]
-        self._next_gen_pop = []
-        self._generation += 1
+            pop = sorted(unique_pop, key=lambda f: f.score, reverse=True)  # better sort
+            self._population = pop[:pop_size]
+            self._next_gen_pop = []
+            self._generation += 1
 
     def survival_s1(self, pop_size: int=None):
         if pop_size is None:
             pop_size = self._pop_size
 
-        pop = self._population + self._next_gen_pop
-
-        # keep unique algorithms
-        unique_pop = []
-        unique_objectives = []
-        for individual in pop:
-            if individual.score not in unique_objectives:
-                unique_pop.append(individual)
-                unique_objectives.append(individual.score)
-
-        pop = sorted(unique_pop, key=lambda f: f.score, reverse=False)  # worst sort
-        self._population = pop[:pop_size]
-        self._next_gen_pop = []
-        self._generation += 1
+        with self._lock:
+            pop = self._population + self._next_gen_pop
+
+            # keep unique algorithms
+            unique_pop = []
+            unique_objectives = []
+            for individual in pop:
+                if individual.score not in unique_objectives:
+                    unique_pop.append(individual)
+                    unique_objectives.append(individual.score)
+
+            pop = sorted(unique_pop, key=lambda f: f.score, reverse=False)  # worst sort
+            self._population = pop[:pop_size]
+            self._next_gen_pop = []
+            self._generation += 1
 
     def register_function(self, func: Function):
         # in population initialization, we only accept valid functions
@@ -37,7 +37,7 @@ from .profiler import MEoHProfiler
 from .prompt import MEoHPrompt
 from .sampler import MEoHSampler
 from ...base import (
-    Evaluation, LLM, Function, Program, TextFunctionProgramConverter, SecureEvaluator
+    Evaluation, LLM, Function, Program, TextFunctionProgramConverter, SecureEvaluator, CodeSimilarity
 )
 from ...tools.profiler import ProfilerBase
 
@@ -62,6 +62,8 @@ class MEoH:
                  initial_sample_num: int | None = None,
                  debug_mode: bool = False,
                  multi_thread_or_process_eval: str = 'thread',
+                 alpha_equivalence_dedup: bool = False,
+                 num_similarity_workers: int = 1,
                  **kwargs):
         """
         Args:
@@ -82,6 +84,9 @@ class MEoH:
                 setting this parameter to 'process' will faster than 'thread'. However, I do not sure if this happens on all platform so I set the default to 'thread'.
                 Please note that there is one case that cannot utilize multi-core CPU: if you set 'safe_evaluate' argument in 'evaluator' to 'False',
                 and you set this argument to 'thread'.
+            alpha_equivalence_dedup: if set to True, functions that only differ in the names of local variables are
+                treated as duplicates of functions in the population (by default, only docstrings, comments and formatting are ignored).
+            num_similarity_workers: the number of processes that parse new functions for the syntax match in the selection.
             **kwargs        : some args pass to 'llm4ad.base.SecureEvaluator'. Such as 'fork_proc'.
         """
         self._template_program_str = evaluation.template_program
@@ -100,6 +105,8 @@ class MEoH:
         self._initial_sample_num = initial_sample_num
         self._debug_mode = debug_mode
         self._multi_thread_or_process_eval = multi_thread_or_process_eval
+        self._alpha_equivalence_dedup = alpha_equivalence_dedup
+        self._similarity = CodeSimilarity(num_workers=num_similarity_workers)
 
         # function to be evolved
         self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(self._template_program_str)
@@ -107,7 +114,8 @@ class MEoH:
         self._template_program: Program = TextFunctionProgramConverter.text_to_program(self._template_program_str)
 
         # population, sampler, and evaluator
-        self._population = Population(pop_size=self._pop_size)
+        self._population = Population(pop_size=self._pop_size, alpha_equivalence=self._alpha_equivalence_dedup,
+                                      similarity=self._similarity)
         llm.debug_mode = debug_mode
         self._sampler = MEoHSampler(llm, self._template_program_str)
         self._evaluator = SecureEvaluator(evaluation, debug_mode=debug_mode, **kwargs)
@@ -302,7 +310,8 @@ class MEoH:
     def run(self):
         if not self._resume_mode:
             # do init
-            self._population = Population(pop_size=self._pop_size)
+            self._population = Population(pop_size=self._pop_size, alpha_equivalence=self._alpha_equivalence_dedup,
+                                          similarity=self._similarity)
             self._init_population()
             while len([f for f in self._population if not np.isinf(np.array(f.score)).any()]) < self._selection_num:
                 self._population._generation -= 1
@@ -311,6 +320,7 @@ class MEoH:
         self._do_sample()
 
         # finish
+        self._similarity.close()
         if self._profiler is not None:
             self._profiler.finish()
 
@@ -7,12 +7,18 @@ import numpy as np
 import traceback
 
 from ...base import *
-from codebleu.syntax_match import calc_syntax_match
-from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
 
 
 class Population:
-    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None):
+    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None, alpha_equivalence: bool = False,
+                 similarity: CodeSimilarity | None = None):
+        """
+        Args:
+            alpha_equivalence: if set to True, functions that only differ in the names of local variables
+                               are also considered duplicates.
+            similarity       : an instance of 'llm4ad.base.CodeSimilarity' which caches the parsed functions,
+                               it can be shared by the populations of a run.
+        """
         if pop is None:
             self._population = []
         elif isinstance(pop, list):
@@ -23,8 +29,17 @@ class Population:
         self._pop_size = pop_size
         self._lock = Lock()
         self._next_gen_pop = []
-        self._elitist = []
+        # the non-dominated functions found so far (with unique scores), updated incrementally
+        self._archive = ParetoArchive((f for f in self._population if f.score is not None), unique_scores=True)
         self._generation = generation
+        # each function is parsed once, only the syntax match of the pairs with new functions are computed
+        self._similarity = CodeSimilarity() if similarity is None else similarity
+        # the selectable functions and their selection probabilities, rebuilt when the population changes
+        self._selection_cache = None
+        # fingerprint -> positions ('in_next_gen', 'index') of the functions in '_population' and '_next_gen_pop'
+        self._alpha_equivalence = alpha_equivalence
+        self._fingerprint_index = {}
+        self._rebuild_index()
 
     def __len__(self):
         return len(self._population)
@@ -34,6 +49,10 @@ class Population:
 
     def __setitem__(self, key, value):
         self._population[key] = value
+        if value.score is not None:
+            self._archive.insert(value, value.score)
+        self._selection_cache = None
+        self._rebuild_index()
 
     @property
     def population(self):
@@ -41,12 +60,26 @@ class Population:
 
     @property
     def elitist(self):
-        return self._elitist
+        return self._archive.items
 
     @property
     def generation(self):
         return self._generation
 
+    @property
+    def alpha_equivalence(self):
+        return self._alpha_equivalence
+
+    def _fingerprint(self, func: Function) -> str:
+        return func.fingerprint(alpha_equivalence=self._alpha_equivalence)
+
+    def _rebuild_index(self):
+        self._fingerprint_index = {}
+        for i, f in enumerate(self._population):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((False, i))
+        for i, f in enumerate(self._next_gen_pop):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((True, i))
+
     def register_function(self, func: Function):
         # we only accept valid functions
         if func.score is None:
@@ -56,51 +89,23 @@ class Population:
             # register to next_gen
             if not self.has_duplicate_function(func):
                 self._next_gen_pop.append(func)
+                self._fingerprint_index.setdefault(self._fingerprint(func), []).append((True, len(self._next_gen_pop) - 1))
 
             # update: perform survival if reach the pop size
             if len(self._next_gen_pop) >= self._pop_size or (len(self._next_gen_pop) >= self._pop_size // 4 and self._generation == 0):
                 pop = self._population + self._next_gen_pop
 
-                pop_elitist = pop + self._elitist
-                # objs = [ind.score for ind in pop_elitist]
-                # objs_array = -np.array(objs)
-                # nondom_idx = NonDominatedSorting().do(objs_array, only_non_dominated_front=True)
-                # self._elitist = []
-                # for idx in nondom_idx.tolist():
-                #     self._elitist.append(pop_elitist[idx])
-                # Filter based on scores/objectives
-                unique_pop = []
-                seen_scores = set()
-
-                for ind in pop_elitist:
-                    # Convert score list/array to tuple so it can be hashed
-                    score_tuple = tuple(ind.score) 
-                    if score_tuple not in seen_scores:
-                        unique_pop.append(ind)
-                        seen_scores.add(score_tuple)
-
-                pop_elitist = unique_pop
-
-                objs = [ind.score for ind in pop_elitist]
-                objs_array = -np.array(objs)
-                nondom_idx = NonDominatedSorting().do(objs_array, only_non_dominated_front=True)
-
-                self._elitist = []
-                for idx in nondom_idx.tolist():
-                    self._elitist.append(pop_elitist[idx])
-
-                crt_pop_size = len(pop)
-                dominated_counts = np.zeros((crt_pop_size, crt_pop_size))
-                for i in range(crt_pop_size):
-                    for j in range(i + 1, crt_pop_size):
-                        if (np.array(pop[i].score) >= np.array(pop[j].score)).all():
-                            dominated_counts[i, j] = -calc_syntax_match([pop[i].entire_code], pop[j].entire_code, 'python')
-                        elif (np.array(pop[j].score) >= np.array(pop[i].score)).all():
-                            dominated_counts[j, i] = -calc_syntax_match([pop[j].entire_code], pop[i].entire_code, 'python')
-                dominated_counts_ = dominated_counts.sum(0)
+                # only the new functions are compared with the archive
+                self._archive.update(self._next_gen_pop)
+
+                dominated_counts_ = self._dominated_counts(pop)
                 self._population = [pop[i] for i in np.argsort(-dominated_counts_)[:self._pop_size]]  # minus for descending, //5 for keep the original pop_size
                 self._next_gen_pop = []
+                self._selection_cache = None
                 self._generation += 1
+                self._rebuild_index()
+                # forget the discarded functions
+                self._similarity.retain([f.entire_code for f in self._population])
 
         except Exception as e:
             # print(f"error in registering function to population: {e}")
@@ -109,46 +114,42 @@ class Population:
         finally:
             self._lock.release()
 
-    def has_duplicate_function(self, func: str | Function) -> bool:
+    def has_duplicate_function(self, func: Function) -> bool:
         if func.score is None:
             return True
 
-        for i in range(len(self._population)):
-            f = self._population[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._population[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._population[i] = func
-                    return True
-
-        for i in range(len(self._next_gen_pop)):
-            f = self._next_gen_pop[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._next_gen_pop[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._next_gen_pop[i] = func
-                    return True
+        # only the functions with the same fingerprint are compared
+        for in_next_gen, i in self._fingerprint_index.get(self._fingerprint(func), []):
+            pop = self._next_gen_pop if in_next_gen else self._population
+            f = pop[i]
+            if func.score[0] > f.score[0] or (func.score[0] == f.score[0] and func.score[1] > f.score[1]):
+                pop[i] = func
+                if not in_next_gen:
+                    self._archive.insert(func, func.score)
+                    self._selection_cache = None
+                return True
         return False
 
+    def _dominated_counts(self, funcs: List[Function]) -> np.ndarray:
+        """For each function, the sum of the negative syntax match with the functions that weakly dominate it.
+        If two functions weakly dominate each other (equal scores), only the later one is counted as dominated.
+        """
+        dominates = ParetoArchive.dominance_matrix([f.score for f in funcs])
+        counted = np.triu(dominates, k=1) | np.tril(dominates & ~dominates.T, k=-1)
+        syntax_match = self._similarity.syntax_match_matrix([f.entire_code for f in funcs])
+        dominated_counts = np.where(counted, -syntax_match, 0.)
+        return dominated_counts.sum(0)
+
     def selection(self) -> Function:
-        # funcs = [f for f in self._population if not math.isinf(f.score)]
-        funcs = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
-
-        # AST
-        if len(funcs) > 0:
-            crt_pop_size = len(funcs)
-            dominated_counts = np.zeros((crt_pop_size, crt_pop_size))
-            for i in range(crt_pop_size):
-                for j in range(i + 1, crt_pop_size):
-                    if (np.array(funcs[i].score) >= np.array(funcs[j].score)).all():
-                        dominated_counts[i, j] = -calc_syntax_match([funcs[i].entire_code], funcs[j].entire_code, 'python')
-                    elif (np.array(funcs[j].score) >= np.array(funcs[i].score)).all():
-                        dominated_counts[j, i] = -calc_syntax_match([funcs[j].entire_code], funcs[i].entire_code, 'python')
-            dominated_counts_ = dominated_counts.sum(0)
-            p = np.exp(dominated_counts_) / np.exp(dominated_counts_).sum()
-
-        return np.random.choice(funcs, p=p, replace=False)
+        if self._selection_cache is None:
+            # funcs = [f for f in self._population if not math.isinf(f.score)]
+            funcs = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
+
+            # AST
+            if len(funcs) > 0:
+                dominated_counts_ = self._dominated_counts(funcs)
+                p = np.exp(dominated_counts_) / np.exp(dominated_counts_).sum()
+            self._selection_cache = (funcs, p)
+        funcs, p = self._selection_cache
+
+        return funcs[np.random.choice(len(funcs), p=p, replace=False)]
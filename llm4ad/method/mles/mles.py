@@ -26,10 +26,11 @@
 from __future__ import annotations
 
 import concurrent.futures
+import math
 import time
 import traceback
-from threading import Thread
-from typing import Optional, Literal
+from threading import Thread, Lock
+from typing import Dict, List, Optional, Literal
 
 from .population import Population
 from .profiler import MLESProfiler
@@ -64,6 +65,8 @@ class MLES:
                  debug_mode: bool = False,
                  multi_thread_or_process_eval: Literal['thread', 'process'] = 'thread',
                  seed_path="",
+                 on_demand_feedback: bool = False,
+                 early_stopping: bool = False,
                  **kwargs):
         """Evolutionary of Heuristics.
         Args:
@@ -84,6 +87,14 @@ class MLES:
                 Please note that there is one case that cannot utilize multi-core CPU: if you set 'safe_evaluate' argument in 'evaluator' to 'False',
                 and you set this argument to 'thread'.
             initial_sample_nums_max     : maximum samples restriction during initialization.
+            on_demand_feedback          : if set to True, new programs are evaluated in the scoring-only mode of the task
+                (no rendering), and the image and observation of a program are only produced (by evaluating it again
+                with 'scoring_only=False') when it is selected as a parent. The evaluation must accept the 'scoring_only'
+                argument, such as 'MoonLanderEvaluation' and 'RacingCarEvaluation'.
+            early_stopping              : if set to True, once the population is full, the score of its worst member is passed
+                as 'threshold' to the evaluation, which may stop playing the remaining seeds of a program that can not reach it
+                (the program is then registered with the score of the played seeds). The evaluation must be created with an
+                early stopping rule, such as 'MoonLanderEvaluation(..., early_stopping="racing")'.
             **kwargs                    : some args pass to 'llm4ad.base.SecureEvaluator'. Such as 'fork_proc'.
         """
         # Core components for evaluation and task context
@@ -110,6 +121,12 @@ class MLES:
         self._debug_mode = debug_mode
         llm.debug_mode = debug_mode
         self._multi_thread_or_process_eval = multi_thread_or_process_eval
+        self._on_demand_feedback = on_demand_feedback
+        self._eval_kwargs = {'scoring_only': True} if on_demand_feedback else {}
+        self._early_stopping = early_stopping
+        # the in-flight rendering evaluations (id(function) -> future), so each function is rendered once
+        self._feedback_futures: Dict[int, concurrent.futures.Future] = {}
+        self._feedback_lock = Lock()
 
         # function to be evolved
         self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(self._template_program_str)
@@ -175,7 +192,8 @@ class MLES:
             # Evaluate the seed program and record performance
             score_images_dict, eval_time = self._evaluation_executor.submit(
                 self._evaluator.evaluate_program_record_time,
-                program
+                program,
+                **self._eval_kwargs
             ).result()
 
             # Metadata assignment and population registration
@@ -220,7 +238,8 @@ class MLES:
         # Synchronously wait for parallel evaluation result
         score_images_dict, eval_time = self._evaluation_executor.submit(
             self._evaluator.evaluate_program_record_time,
-            program
+            program,
+            **self._evaluation_kwargs()
         ).result()
 
         # Update function object with evaluation feedback and lineage
@@ -249,6 +268,62 @@ class MLES:
                 self._profiler.register_population(self._population)
             self._tot_sample_nums += 1
 
+    def _evaluation_kwargs(self) -> dict:
+        """The arguments of the evaluation of a new program. With 'early_stopping', the score of the worst member
+        of the full population is the threshold the program has to reach to survive.
+        """
+        kwargs = dict(self._eval_kwargs)
+        if self._early_stopping and self._population.generation > 0:
+            scores = [f.score for f in self._population.population if f.score is not None and not math.isinf(f.score)]
+            if len(scores) >= self._pop_size:
+                kwargs['threshold'] = min(scores)
+        return kwargs
+
+    def _selection(self, *args, **kwargs) -> List[Function]:
+        """Selects parents from the population. With 'on_demand_feedback', the image and observation
+        of the selected parents are produced here if they have not been produced yet.
+        """
+        indivs = self._population.selection(*args, **kwargs)
+        if self._on_demand_feedback:
+            for indiv in indivs:
+                self._ensure_feedback(indiv)
+        return indivs
+
+    def _ensure_feedback(self, func: Function):
+        # a function whose rendering evaluation failed is not retried ('feedback_failed')
+        if getattr(func, 'image64', None) is not None or getattr(func, 'feedback_failed', False):
+            return
+        with self._feedback_lock:
+            future = self._feedback_futures.get(id(func))
+            in_flight = future is not None
+            if not in_flight:
+                future = concurrent.futures.Future()
+                self._feedback_futures[id(func)] = future
+        if in_flight:
+            # another sampler thread is rendering this function
+            future.result()
+            return
+        try:
+            program = TextFunctionProgramConverter.function_to_program(func, self._template_program)
+            score_images_dict, _ = self._evaluation_executor.submit(
+                self._evaluator.evaluate_program_record_time,
+                program,
+                scoring_only=False
+            ).result()
+            if score_images_dict is not None:
+                func.image64 = score_images_dict['image']
+                func.observation = score_images_dict['observation']
+            else:
+                func.feedback_failed = True
+        except Exception:
+            if self._debug_mode:
+                traceback.print_exc()
+            func.feedback_failed = True
+        finally:
+            with self._feedback_lock:
+                del self._feedback_futures[id(func)]
+            future.set_result(None)
+
     def _continue_loop(self) -> bool:
         """Check if termination conditions (max generations or max samples) have been met."""
         if self._max_generations is None and self._max_sample_nums is None:
@@ -278,7 +353,7 @@ class MLES:
 
                 if operator == 'e1_advanced':
                     # get a new func using e1
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     messages = MLESPrompt.get_prompt_e1_advanced(self._task_description_str, indivs,
                                                                  self._function_to_evolve)
@@ -291,7 +366,7 @@ class MLES:
 
                 elif operator == 'e1':
                     # get a new func using e1
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     prompt = MLESPrompt.get_prompt_e1(self._task_description_str, indivs, self._function_to_evolve)
                     if self._debug_mode:
@@ -303,7 +378,7 @@ class MLES:
 
                 # get a new func using e2
                 elif operator == 'e2':
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     prompt = MLESPrompt.get_prompt_e2(self._task_description_str, indivs,
                                                        self._function_to_evolve)
@@ -316,7 +391,7 @@ class MLES:
 
                 # get a new func using e2
                 elif operator == 'e2_advanced':
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     messages = MLESPrompt.get_prompt_e2_advanced(self._task_description_str, indivs,
                                                                  self._function_to_evolve)
@@ -329,7 +404,7 @@ class MLES:
 
                 # get a new func using e2 Multimodal
                 elif operator == 'e2_M':
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     messages = MLESPrompt.get_prompt_e2_M(self._task_description_str, indivs,
                                                           self._function_to_evolve)
@@ -342,7 +417,7 @@ class MLES:
 
                 # get a new func using m1
                 elif operator == 'm1':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m1(self._task_description_str, indiv, self._function_to_evolve)
@@ -355,7 +430,7 @@ class MLES:
 
                 # get a new func using m2
                 elif operator == 'm2':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m2(self._task_description_str, indiv, self._function_to_evolve)
@@ -368,7 +443,7 @@ class MLES:
 
                 # get a new func using m1_Multimodal
                 elif operator == 'm1_M':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m1_M(self._task_description_str, indiv, self._function_to_evolve)
@@ -380,7 +455,7 @@ class MLES:
                         break
 
                 elif operator == 'm1_text':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m1_M_text_info(self._task_description_str, indiv,
@@ -395,7 +470,7 @@ class MLES:
                         break
 
                 elif operator == 'm2_M':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m2_M(self._task_description_str, indiv, self._function_to_evolve)
@@ -408,7 +483,7 @@ class MLES:
 
                 # no figure itself
                 elif operator == 'm1_only_imagedescribtion':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_image_description(self._task_description_str, indiv,
@@ -428,7 +503,7 @@ class MLES:
                         break
 
                 elif operator == 'm2_only_imagedescribtion':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_image_description(self._task_description_str, indiv,
@@ -448,7 +523,7 @@ class MLES:
                         break
 
                 elif operator == 'm1_only_image':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m1_M_only_image(self._task_description_str, indiv,
@@ -464,7 +539,7 @@ class MLES:
                 # --- ABLATION OPERATORS (nothought) ---
                 # Variants that without the "thought" of the algorithm during the algorithm generation.
                 elif operator == 'e1_nothought':
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     prompt = MLESPrompt.get_prompt_e1_nothought(self._task_description_str, indivs,
                                                                  self._function_to_evolve)
@@ -476,7 +551,7 @@ class MLES:
                         break
 
                 elif operator == 'e2_nothought':
-                    indivs = self._population.selection(number=self._selection_num)
+                    indivs = self._selection(number=self._selection_num)
                     parents_pop_register_number = [ind.pop_register_number for ind in indivs]
                     prompt = MLESPrompt.get_prompt_e2_nothought(self._task_description_str, indivs,
                                                                  self._function_to_evolve)
@@ -488,7 +563,7 @@ class MLES:
                         break
 
                 elif operator == 'm1_M_nothought':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m1_M_nothought(self._task_description_str, indiv,
@@ -501,7 +576,7 @@ class MLES:
                         break
 
                 elif operator == 'm2_M_nothought':
-                    indivs = self._population.selection()
+                    indivs = self._selection()
                     indiv = indivs[0]
                     parents_pop_register_number = [indiv.pop_register_number]
                     messages = MLESPrompt.get_prompt_m2_M_nothought(self._task_description_str, indiv,
@@ -30,11 +30,6 @@ import os
 from threading import Lock
 from typing import List, Dict, Optional
 
-try:
-    import wandb
-except:
-    pass
-
 from .population import Population
 from ...base import Function
 from ...tools.profiler import TensorboardProfiler, ProfilerBase, WandBProfiler
@@ -155,6 +150,8 @@ class MLESProfiler(ProfilerBase):
         sample_order = self._num_samples
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'generation': generation_num,
             'score': function.score,
             'operator': function.operator,
@@ -184,18 +181,7 @@ class MLESProfiler(ProfilerBase):
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
-
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+        self._append_sample_record(filename, content)
 
 
     def using_final(self, **kwargs):
@@ -235,10 +221,6 @@ class EoHTensorboardProfiler(TensorboardProfiler, MLESProfiler):
             **kwargs
         )
 
-    def finish(self):
-        if self._log_dir:
-            self._writer.close()
-
 
 class EoHWandbProfiler(WandBProfiler, MLESProfiler):
     def __init__(self,
@@ -276,6 +258,3 @@ class EoHWandbProfiler(WandBProfiler, MLESProfiler):
         if self._log_dir:
             self._ckpt_dir = os.path.join(self._log_dir, 'population')
             os.makedirs(self._ckpt_dir, exist_ok=True)
-
-    def finish(self):
-        wandb.finish()
@@ -12,7 +12,12 @@ from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
 
 
 class Population:
-    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None):
+    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None, alpha_equivalence: bool = False):
+        """
+        Args:
+            alpha_equivalence: if set to True, functions that only differ in the names of local variables
+                               are also considered duplicates.
+        """
         if pop is None:
             self._population = []
         elif isinstance(pop, list):
@@ -28,6 +33,10 @@ class Population:
         self._next_gen_pop = []
         self._elitist = []
         self._generation = generation
+        # fingerprint -> positions ('in_next_gen', 'index') of the functions in '_population' and '_next_gen_pop'
+        self._alpha_equivalence = alpha_equivalence
+        self._fingerprint_index = {}
+        self._rebuild_index()
 
     def __len__(self):
         return len(self._population)
@@ -37,6 +46,7 @@ class Population:
 
     def __setitem__(self, key, value):
         self._population[key] = value
+        self._rebuild_index()
 
     @property
     def population(self):
@@ -50,6 +60,20 @@ class Population:
     def generation(self):
         return self._generation
 
+    @property
+    def alpha_equivalence(self):
+        return self._alpha_equivalence
+
+    def _fingerprint(self, func: Function) -> str:
+        return func.fingerprint(alpha_equivalence=self._alpha_equivalence)
+
+    def _rebuild_index(self):
+        self._fingerprint_index = {}
+        for i, f in enumerate(self._population):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((False, i))
+        for i, f in enumerate(self._next_gen_pop):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((True, i))
+
     def register_function(self, func: Function):
         # we only accept valid functions
         if func.score is None:
@@ -59,6 +83,7 @@ class Population:
             # register to next_gen
             if not self.has_duplicate_function(func):
                 self._next_gen_pop.append(func)
+                self._fingerprint_index.setdefault(self._fingerprint(func), []).append((True, len(self._next_gen_pop) - 1))
 
             # update: perform survival if reach the pop size
             if len(self._next_gen_pop) >= self._pop_size or (len(self._next_gen_pop) >= self._pop_size//5 and self._generation == 0):
@@ -86,35 +111,27 @@ class Population:
                 self._population = [pop[i] for i in selected_idx_list]
                 self._next_gen_pop = []
                 self._generation += 1
+                self._rebuild_index()
         except Exception as e:
             traceback.print_exc()
             return
         finally:
             self._lock.release()
 
-    def has_duplicate_function(self, func: str | Function) -> bool:
+    def has_duplicate_function(self, func: Function) -> bool:
         if func.score is None:
             return True
 
-        for i in range(len(self._population)):
-            f = self._population[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._population[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._population[i] = func
-                    return True
-
-        for i in range(len(self._next_gen_pop)):
-            f = self._next_gen_pop[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._next_gen_pop[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._next_gen_pop[i] = func
-                    return True
+        # only the functions with the same fingerprint are compared
+        for in_next_gen, i in self._fingerprint_index.get(self._fingerprint(func), []):
+            pop = self._next_gen_pop if in_next_gen else self._population
+            f = pop[i]
+            if func.score[0] > f.score[0]:
+                pop[i] = func
+                return True
+            if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
+                pop[i] = func
+                return True
         return False
 
     def selection(self, pref: np.array) -> Function:
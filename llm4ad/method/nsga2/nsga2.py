@@ -62,6 +62,7 @@ class NSGA2:
                  initial_sample_num: int | None = None,
                  debug_mode: bool = False,
                  multi_thread_or_process_eval: str = 'thread',
+                 alpha_equivalence_dedup: bool = False,
                  **kwargs):
         """
         Args:
@@ -82,6 +83,8 @@ class NSGA2:
                 setting this parameter to 'process' will faster than 'thread'. However, I do not sure if this happens on all platform so I set the default to 'thread'.
                 Please note that there is one case that cannot utilize multi-core CPU: if you set 'safe_evaluate' argument in 'evaluator' to 'False',
                 and you set this argument to 'thread'.
+            alpha_equivalence_dedup: if set to True, functions that only differ in the names of local variables are
+                treated as duplicates of functions in the population (by default, only docstrings, comments and formatting are ignored).
             **kwargs        : some args pass to 'llm4ad.base.SecureEvaluator'. Such as 'fork_proc'.
         """
         self._template_program_str = evaluation.template_program
@@ -100,6 +103,7 @@ class NSGA2:
         self._initial_sample_num = initial_sample_num
         self._debug_mode = debug_mode
         self._multi_thread_or_process_eval = multi_thread_or_process_eval
+        self._alpha_equivalence_dedup = alpha_equivalence_dedup
 
         # function to be evolved
         self._function_to_evolve: Function = TextFunctionProgramConverter.text_to_function(self._template_program_str)
@@ -107,7 +111,7 @@ class NSGA2:
         self._template_program: Program = TextFunctionProgramConverter.text_to_program(self._template_program_str)
 
         # population, sampler, and evaluator
-        self._population = Population(pop_size=self._pop_size)
+        self._population = Population(pop_size=self._pop_size, alpha_equivalence=self._alpha_equivalence_dedup)
         llm.debug_mode = debug_mode
         self._sampler = NSGA2Sampler(llm, self._template_program_str)
         self._evaluator = SecureEvaluator(evaluation, debug_mode=debug_mode, **kwargs)
@@ -301,7 +305,7 @@ class NSGA2:
     def run(self):
         if not self._resume_mode:
             # do init
-            self._population = Population(pop_size=self._pop_size)
+            self._population = Population(pop_size=self._pop_size, alpha_equivalence=self._alpha_equivalence_dedup)
             self._init_population()
             while len([f for f in self._population if not np.isinf(np.array(f.score)).any()]) < self._selection_num:
                 self._population._generation -= 1
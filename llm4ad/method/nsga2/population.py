@@ -13,7 +13,12 @@ from ...base import *
 
 
 class Population:
-    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None):
+    def __init__(self, pop_size, generation=0, pop: List[Function] | Population | None = None, alpha_equivalence: bool = False):
+        """
+        Args:
+            alpha_equivalence: if set to True, functions that only differ in the names of local variables
+                               are also considered duplicates.
+        """
         if pop is None:
             self._population = []
         elif isinstance(pop, list):
@@ -24,8 +29,15 @@ class Population:
         self._pop_size = pop_size
         self._lock = Lock()
         self._next_gen_pop = []
-        self._elitist = []
+        # the non-dominated functions found so far, updated incrementally
+        self._archive = ParetoArchive(f for f in self._population if f.score is not None)
         self._generation = generation
+        # the functions that can be selected as parents (finite scores), rebuilt when the population changes
+        self._selectable: List[Function] | None = None
+        # fingerprint -> positions ('in_next_gen', 'index') of the functions in '_population' and '_next_gen_pop'
+        self._alpha_equivalence = alpha_equivalence
+        self._fingerprint_index = {}
+        self._rebuild_index()
 
     def __len__(self):
         return len(self._population)
@@ -35,6 +47,10 @@ class Population:
 
     def __setitem__(self, key, value):
         self._population[key] = value
+        if value.score is not None:
+            self._archive.insert(value, value.score)
+        self._selectable = None
+        self._rebuild_index()
 
     @property
     def population(self):
@@ -42,12 +58,26 @@ class Population:
 
     @property
     def elitist(self):
-        return self._elitist
+        return self._archive.items
 
     @property
     def generation(self):
         return self._generation
 
+    @property
+    def alpha_equivalence(self):
+        return self._alpha_equivalence
+
+    def _fingerprint(self, func: Function) -> str:
+        return func.fingerprint(alpha_equivalence=self._alpha_equivalence)
+
+    def _rebuild_index(self):
+        self._fingerprint_index = {}
+        for i, f in enumerate(self._population):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((False, i))
+        for i, f in enumerate(self._next_gen_pop):
+            self._fingerprint_index.setdefault(self._fingerprint(f), []).append((True, i))
+
     def register_function(self, func: Function):
         # we only accept valid functions
         if func.score is None:
@@ -57,18 +87,14 @@ class Population:
             # register to next_gen
             if not self.has_duplicate_function(func):
                 self._next_gen_pop.append(func)
+                self._fingerprint_index.setdefault(self._fingerprint(func), []).append((True, len(self._next_gen_pop) - 1))
 
             # update: perform survival if reach the pop size
             if len(self._next_gen_pop) >= self._pop_size or (len(self._next_gen_pop) >= self._pop_size//5 and self._generation == 0):
                 pop = self._population + self._next_gen_pop
 
-                pop_elitist = pop + self._elitist
-                objs = [ind.score for ind in pop_elitist]
-                objs_array = -np.array(objs)
-                nondom_idx = NonDominatedSorting().do(objs_array, only_non_dominated_front=True)
-                self._elitist = []
-                for idx in nondom_idx.tolist():
-                    self._elitist.append(pop_elitist[idx])
+                # only the new functions are compared with the archive
+                self._archive.update(self._next_gen_pop)
 
                 # modified from pymoo.algorithms.moo.nsga2
                 # get the objective space values and objects
@@ -120,43 +146,47 @@ class Population:
 
                 self._population = [pop[i] for i in survivors]
                 self._next_gen_pop = []
+                self._selectable = None
                 self._generation += 1
+                self._rebuild_index()
         except Exception as e:
             traceback.print_exc()
             return
         finally:
             self._lock.release()
 
-    def has_duplicate_function(self, func: str | Function) -> bool:
+    def has_duplicate_function(self, func: Function) -> bool:
         if func.score is None:
             return True
 
-        for i in range(len(self._population)):
-            f = self._population[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._population[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._population[i] = func
-                    return True
-
-        for i in range(len(self._next_gen_pop)):
-            f = self._next_gen_pop[i]
-            if str(f) == str(func):
-                if func.score[0] > f.score[0]:
-                    self._next_gen_pop[i] = func
-                    return True
-                if func.score[0] == f.score[0] and func.score[1] > f.score[1]:
-                    self._next_gen_pop[i] = func
-                    return True
+        # only the functions with the same fingerprint are compared
+        for in_next_gen, i in self._fingerprint_index.get(self._fingerprint(func), []):
+            pop = self._next_gen_pop if in_next_gen else self._population
+            f = pop[i]
+            if func.score[0] > f.score[0] or (func.score[0] == f.score[0] and func.score[1] > f.score[1]):
+                self._replace(in_next_gen, i, func)
+                return True
         return False
 
+    def _replace(self, in_next_gen: bool, i: int, func: Function):
+        if in_next_gen:
+            self._next_gen_pop[i] = func
+            return
+        # the replaced function inherits the rank and crowding distance until the next survival
+        old = self._population[i]
+        func.rank = getattr(old, 'rank', None)
+        func.crowding = getattr(old, 'crowding', None)
+        self._population[i] = func
+        self._archive.insert(func, func.score)
+        self._selectable = None
+
     def selection(self) -> Function:
-        # funcs = [f for f in self._population if not math.isinf(f.score)]
-        funcs = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
+        if self._selectable is None:
+            # funcs = [f for f in self._population if not math.isinf(f.score)]
+            self._selectable = [f for f in self._population if not np.isinf(np.array(f.score)).any()]
+        funcs = self._selectable
         if len(funcs) > 1:
-            parents = np.random.choice(funcs, size=2, replace=False)
+            parents = [funcs[i] for i in np.random.choice(len(funcs), size=2, replace=False)]
             if parents[0].rank < parents[1].rank:
                 return parents[0]
             elif parents[0].rank > parents[1].rank:
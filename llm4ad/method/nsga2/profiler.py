@@ -8,11 +8,6 @@ from typing import List, Dict
 
 import numpy as np
 
-try:
-    import wandb
-except:
-    pass
-
 from .population import Population
 from ...base import Function
 from ...tools.profiler import TensorboardProfiler, ProfilerBase, WandBProfiler
@@ -111,6 +106,8 @@ class NSGA2Profiler(ProfilerBase):
                 func_score = func_score.tolist()
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'algorithm': function.algorithm,  # Added when recording
             'function': str(function),
             'score': func_score,
@@ -124,17 +121,7 @@ class NSGA2Profiler(ProfilerBase):
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+        self._append_sample_record(filename, content)
 
 
 class NSGA2TensorboardProfiler(TensorboardProfiler, NSGA2Profiler):
@@ -153,10 +140,6 @@ class NSGA2TensorboardProfiler(TensorboardProfiler, NSGA2Profiler):
                                      log_style=log_style,
                                      **kwargs)
 
-    def finish(self):
-        if self._log_dir:
-            self._writer.close()
-
         filename = 'end.json'
         path = os.path.join(os.path.join(self._log_dir, 'population'), filename)
 
@@ -186,7 +169,7 @@ class NSGA2WandbProfiler(WandBProfiler, NSGA2Profiler):
             os.makedirs(self._ckpt_dir, exist_ok=True)
 
     def finish(self):
-        wandb.finish()
+        super().finish()
         filename = 'end.json'
         path = os.path.join(os.path.join(self._log_dir, 'population'), filename)
 
@@ -27,15 +27,13 @@ from __future__ import annotations
 import numpy as np
 import random
 import traceback
-import os
 from typing import List, Dict, Tuple, Any, Optional
 from threading import RLock
 
 from .clusterunit import ClusterUnit
 from .externalArchive import ExternalArchive
-from llm4ad.base import Function
+from llm4ad.base import Function, CodeSimilarity
 from .base import Evoind
-from codebleu import calc_codebleu
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
@@ -47,6 +45,7 @@ def get_bert_embeddings(texts: List[str], model_path: str = None) -> np.ndarray:
     """
     An optional algorithm feature mapping for algorithm clustering.
     Generates text embeddings using a BERT model for semantic analysis of algorithm descriptions (Thoughts).
+    The model is loaded once per process, and the texts are embedded in batches (see 'llm4ad.base.CodeSimilarity').
 
     Args:
         texts: A list of strings to be embedded.
@@ -54,41 +53,14 @@ def get_bert_embeddings(texts: List[str], model_path: str = None) -> np.ndarray:
 
     Returns:
         A numpy array of shape (len(texts), 768) containing the CLS token embeddings."""
-    try:
-        from transformers import BertTokenizer, BertModel
-        import torch
-    except ImportError as e:
-        print(f"⚠️ [Warning in clustermanager.py] Optional dependencies missing: {e}. Feature extraction might fail.")
-
-    target_path = model_path if model_path and os.path.exists(model_path) else 'bert-base-uncased'
-
-    try:
-        tokenizer = BertTokenizer.from_pretrained(target_path)
-        model = BertModel.from_pretrained(target_path)
-    except Exception as e:
-        print(f"❌ [Error] Failed to load BERT from {target_path}: {e}")
-        return np.random.rand(len(texts), 768)
-
-    embeddings = []
-    for text in texts:
-        try:
-            inputs = tokenizer(text, return_tensors='pt', truncation=True, padding=True, max_length=512)
-            with torch.no_grad():
-                outputs = model(**inputs)
-                hidden_states = outputs.last_hidden_state
-            # Use the CLS token (index 0) as the sentence-level representation
-            cls_embedding = hidden_states[0, 0, :].numpy()
-            embeddings.append(cls_embedding)
-        except Exception:
-            embeddings.append(np.random.rand(768))
-
-    return np.array(embeddings)
+    return CodeSimilarity(bert_model_path=model_path).embeddings(texts)
 
 
 def individual_feature(population: List[Evoind],
                        feature_type: Tuple[str, ...] = ('ast',),
                        save_path: str = '',
-                       bert_model_path: str = None):
+                       bert_model_path: str = None,
+                       similarity: Optional[CodeSimilarity] = None):
     """
     Calculates multi-modal features for the population to facilitate niching/clustering.
     Supported types:
@@ -96,6 +68,10 @@ def individual_feature(population: List[Evoind],
     - 'language': Semantic similarity via BERT.
     - 'random': Gaussian noise baseline.
     - 'objective': Performance-based features.
+
+    Args:
+        similarity: A 'CodeSimilarity' which caches the parsed programs and the embeddings across calls.
+            A temporary one is used if it is None.
     """
     if not population:
         return
@@ -103,26 +79,19 @@ def individual_feature(population: List[Evoind],
     print(f'[Feature Extraction] Processing feature types: {feature_type}')
     population_size = len(population)
     features = [[] for _ in range(population_size)]
+    if similarity is None:
+        similarity = CodeSimilarity(bert_model_path=bert_model_path)
 
     # 1. AST Structural Features (CodeBLEU)
     if 'ast' in feature_type:
-        AST = np.zeros((population_size, population_size))
-        codes = [ind.function.to_code_without_docstring() for ind in population]
-        for i in range(population_size):
-            for j in range(i, population_size):
-                if i == j:
-                    score = 1.0
-                else:
-                    try:
-                        cal_result = calc_codebleu([codes[i]], [codes[j]], lang='python',
-                                                   weights=(0.25, 0.25, 0.25, 0.25), tokenizer=None)
-                        # Hybrid score of syntax match and dataflow match
-                        score = 0.5 * cal_result['syntax_match_score'] + 0.5 * cal_result['dataflow_match_score']
-                    except Exception:
-                        score = 0.0
-
-                AST[i, j] = score
-                AST[j, i] = score
+        # 'calc_codebleu' strips the codes, the reference is codes[i] and the candidate is codes[j] (i < j)
+        codes = [ind.function.to_code_without_docstring().strip() for ind in population]
+        # Hybrid score of syntax match and dataflow match, a program that fails to parse only zeroes its own scores
+        hybrid = (0.5 * similarity.syntax_match_matrix(codes)
+                  + 0.5 * similarity.dataflow_match_matrix(codes))
+        AST = np.triu(hybrid, k=1)
+        AST = AST + AST.T
+        np.fill_diagonal(AST, 1.0)
 
         # Add AST as one of the used features
         for i in range(population_size):
@@ -131,7 +100,7 @@ def individual_feature(population: List[Evoind],
     # 2. Semantic Features (BERT)
     if 'language' in feature_type:
         texts = [ind.function.to_code_without_docstring() for ind in population]
-        embeddings = get_bert_embeddings(texts, model_path=bert_model_path)
+        embeddings = similarity.embeddings(texts)
         for i in range(population_size):
             features[i].extend(embeddings[i, :].tolist())
 
@@ -203,6 +172,7 @@ class ClusterManager:
                  feature_type: Tuple[str, ...] = ('ast',),
 
                  bert_model_path: str = None,
+                 similarity_workers: int = 1,
                  debug_flag: bool = False,
                  ):
         """
@@ -213,6 +183,7 @@ class ClusterManager:
             n_clusters: Number of niches/clusters to maintain.
             intra_operators: List of available evolutionary operators.
             use_resource_tilt: If True, high-performing clusters get more sampling opportunities.
+            similarity_workers: Number of processes that parse the programs for the 'ast' features.
         """
 
         self.debug_flag = debug_flag
@@ -220,6 +191,8 @@ class ClusterManager:
         self.generation = 0
         self.n_clusters = n_clusters
         self.bert_model_path = bert_model_path
+        # Parsed programs and embeddings are cached across (re)clustering
+        self.similarity = CodeSimilarity(num_workers=similarity_workers, bert_model_path=bert_model_path)
 
         self.feature_type = feature_type
 
@@ -276,7 +249,8 @@ class ClusterManager:
 
         save_path = "init_debug" if self.debug_flag else ""
         individual_feature(temp_evo_pop, feature_type=self.feature_type,
-                           save_path=save_path, bert_model_path=self.bert_model_path)
+                           save_path=save_path, bert_model_path=self.bert_model_path,
+                           similarity=self.similarity)
 
         features = []
         for ind in temp_evo_pop:
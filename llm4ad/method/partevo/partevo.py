@@ -72,6 +72,7 @@ class PartEvo:
 
                  use_resource_tilt: bool = False,
                  bert_model_path: str = '',
+                 num_similarity_workers: int = 1,
                  **kwargs):
 
         # Core components for evaluation and task context
@@ -120,6 +121,7 @@ class PartEvo:
                                     use_resource_tilt=self.use_resource_tilt,
                                     resource_tilt_alpha=2.0,
                                     bert_model_path=bert_model_path,
+                                    similarity_workers=num_similarity_workers,
                                     feature_type=self.feature_used,
                                     debug_flag=self._debug_mode)
 
@@ -479,6 +481,7 @@ class PartEvo:
         self._multi_threaded_sampling(self._partevo_multi_threaded_sampling)
 
         # Phase 3: Cleanup and Reporting
+        self._pool.similarity.close()
         if self._profiler is not None:
             self._profiler.finish()
 
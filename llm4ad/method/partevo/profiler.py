@@ -31,11 +31,6 @@ from abc import ABC, abstractmethod
 from threading import Lock
 from typing import List, Dict, Optional
 
-try:
-    import wandb
-except:
-    pass
-
 # from .population import Population
 from ...base import Function
 from ...tools.profiler import TensorboardProfiler, ProfilerBase, WandBProfiler
@@ -158,6 +153,8 @@ class PartEvoProfiler(ProfilerBase):
         sample_order = self._num_samples
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'generation': generation_num,
             'score': function.score,
             'operator': function.operator,
@@ -187,18 +184,7 @@ class PartEvoProfiler(ProfilerBase):
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
-
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+        self._append_sample_record(filename, content)
 
     def _record_and_print_verbose(self, function, program='', *, resume_mode=False):
         function_str = str(function).strip('\n')
@@ -309,10 +295,6 @@ class EoHTensorboardProfiler(TensorboardProfiler, PartEvoProfiler):
             **kwargs
         )
 
-    def finish(self):
-        if self._log_dir:
-            self._writer.close()
-
 
 class EoHWandbProfiler(WandBProfiler, PartEvoProfiler):
     def __init__(self,
@@ -350,6 +332,3 @@ class EoHWandbProfiler(WandBProfiler, PartEvoProfiler):
         if self._log_dir:
             self._ckpt_dir = os.path.join(self._log_dir, 'population')
             os.makedirs(self._ckpt_dir, exist_ok=True)
-
-    def finish(self):
-        wandb.finish()
@@ -0,0 +1,192 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/3/5
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+A lazy registry of the tasks (evaluation classes) and methods of LLM4AD. 'llm4ad.task' and 'llm4ad.method' export
+the classes listed in the static manifest '_registry_manifest.py', and a class is imported on first access
+(e.g., 'llm4ad.task.OBPEvaluation'), so 'import llm4ad' does not import gymnasium, pymoo, datasets, ...
+- Discover the tasks and methods without importing them:
+--------------------------------------------------------------------------------------------
+from llm4ad import registry
+for task in registry.list_tasks('optimization'):
+    print(task['name'], task['evaluation_class'])
+evaluation_class = registry.resolve('OBPEvaluation')
+--------------------------------------------------------------------------------------------
+- The manifest is generated from the sources (without importing them). Regenerate it after adding a task or
+a method, the '--check' option fails if it is out of date:
+--------------------------------------------------------------------------------------------
+python -m llm4ad.registry [--check]
+--------------------------------------------------------------------------------------------
+A task exports the classes defined in its 'evaluation.py', a method exports the classes its package imports from
+its own modules. If two packages export the same name, the first package in alphabetical order wins.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import sys
+from typing import Dict, List
+
+from . import _registry_manifest as _manifest
+from ._lazy_exports import load_class
+
+__all__ = ['list_tasks', 'list_methods', 'resolve', 'generate_manifest']
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_MANIFEST_PATH = os.path.join(_ROOT, '_registry_manifest.py')
+
+
+def list_tasks(domain: str | None = None) -> List[dict]:
+    """Returns the tasks (without importing them), optionally of a domain (e.g., 'optimization').
+    Each task is a dict with 'name', 'domain', 'path' (relative to 'llm4ad/task'), 'module', 'classes',
+    and 'evaluation_class' (the main evaluation class, 'None' if it is unknown).
+    """
+    return [dict(task, classes=list(task['classes'])) for task in _manifest.TASKS
+            if domain is None or task['domain'] == domain]
+
+
+def list_methods() -> List[dict]:
+    """Returns the methods (without importing them), each method is a dict with 'name', 'module' and 'classes'.
+    """
+    return [dict(method, classes=list(method['classes'])) for method in _manifest.METHODS]
+
+
+def resolve(name: str):
+    """Imports and returns a task or method class by its name (e.g., 'OBPEvaluation' or 'EoH').
+    """
+    if name in _manifest.TASK_CLASSES:
+        return load_class(_manifest.TASK_CLASSES[name], name)
+    if name in _manifest.METHOD_CLASSES:
+        return load_class(_manifest.METHOD_CLASSES[name], name)
+    raise KeyError(f'{name} is neither a task nor a method class of the registry.')
+
+
+# ---------------------------------------------------------------------------------------------- manifest generation
+
+def _module_classes(path: str) -> Dict[str, str | None]:
+    """Parses a module, and returns its top-level names: the defined classes map to None,
+    the names imported from a sibling module ('from .x import A') map to that module ('x').
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            names[node.name] = None
+        elif isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            for alias in node.names:
+                if alias.name != '*':
+                    names[alias.asname or alias.name] = node.module
+    return names
+
+
+def _defined_in_package(package_dir: str, module: str, name: str, depth: int = 0) -> bool:
+    """Returns True if the class 'name' is defined in 'module' of the package (following imports between its modules).
+    """
+    path = os.path.join(package_dir, *module.split('.')) + '.py'
+    if depth > 8 or not os.path.isfile(path):
+        return False
+    names = _module_classes(path)
+    if name not in names:
+        return False
+    return names[name] is None or _defined_in_package(package_dir, names[name], name, depth + 1)
+
+
+def _read_paras_name(task_dir: str) -> str | None:
+    # the 'name' of the evaluation class in 'paras.yaml' (also used by the GUI)
+    path = os.path.join(task_dir, 'paras.yaml')
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('name:'):
+                return line.split(':', 1)[1].strip() or None
+    return None
+
+
+def generate_manifest() -> dict:
+    """Scans the sources of 'llm4ad/task' and 'llm4ad/method', and returns the content of the manifest.
+    """
+    tasks, task_classes = [], {}
+    task_root = os.path.join(_ROOT, 'task')
+    for dirpath, dirnames, filenames in os.walk(task_root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        if 'evaluation.py' not in filenames:
+            continue
+        rel_path = os.path.relpath(dirpath, task_root)
+        module = 'llm4ad.task.' + ('evaluation' if rel_path == '.' else rel_path.replace(os.sep, '.') + '.evaluation')
+        classes = [n for n, m in _module_classes(os.path.join(dirpath, 'evaluation.py')).items() if m is None]
+        evaluation_class = _read_paras_name(dirpath)
+        if evaluation_class not in classes:
+            public = [c for c in classes if not c.startswith('_')]
+            evaluation_class = public[0] if len(public) == 1 else None
+        tasks.append({'name': os.path.basename(dirpath),
+                      'domain': rel_path.split(os.sep)[0],
+                      'path': rel_path.replace(os.sep, '/'),
+                      'module': module,
+                      'classes': classes,
+                      'evaluation_class': evaluation_class})
+        for c in classes:
+            task_classes.setdefault(c, module)
+
+    methods, method_classes = [], {}
+    method_root = os.path.join(_ROOT, 'method')
+    for name in sorted(os.listdir(method_root)):
+        package_dir = os.path.join(method_root, name)
+        if not os.path.isfile(os.path.join(package_dir, '__init__.py')):
+            continue
+        module = f'llm4ad.method.{name}'
+        classes = [n for n, m in _module_classes(os.path.join(package_dir, '__init__.py')).items()
+                   if m is not None and _defined_in_package(package_dir, m, n)]
+        methods.append({'name': name, 'module': module, 'classes': classes})
+        for c in classes:
+            method_classes.setdefault(c, module)
+
+    return {'TASKS': tasks, 'TASK_CLASSES': task_classes, 'METHODS': methods, 'METHOD_CLASSES': method_classes}
+
+
+def _manifest_source(manifest: dict) -> str:
+    lines = ['# This file is generated by "python -m llm4ad.registry", do not edit it manually.',
+             '# It lists the task and method classes of LLM4AD, see "llm4ad/registry.py".', '']
+    for key, value in manifest.items():
+        if isinstance(value, list):
+            lines += [f'{key} = ['] + [f'    {item!r},' for item in value] + [']', '']
+        else:
+            lines += [f'{key} = {{'] + [f'    {k!r}: {v!r},' for k, v in value.items()] + ['}', '']
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the manifest of the task and method registry.')
+    parser.add_argument('--check', action='store_true', help='only check that the manifest is up to date.')
+    args = parser.parse_args()
+
+    source = _manifest_source(generate_manifest())
+    with open(_MANIFEST_PATH, encoding='utf-8') as f:
+        up_to_date = f.read() == source
+    if args.check:
+        print('The manifest is up to date.' if up_to_date else 'The manifest is out of date, '
+                                                                'run "python -m llm4ad.registry".')
+        sys.exit(0 if up_to_date else 1)
+    if not up_to_date:
+        with open(_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            f.write(source)
+    print(f'The manifest {_MANIFEST_PATH} is {"up to date" if up_to_date else "updated"}.')
@@ -39,19 +39,29 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, List
 import gymnasium as gym
+import numpy as np
 
 from llm4ad.base import Evaluation
 from llm4ad.task.machine_learning.acrobot.template import template_program, task_description
+from llm4ad.task.machine_learning.vector_rollout import Episode, VectorRollout
 
 __all__ = ['AcrobotEvaluation']
 
 
-def evaluate(env: gym.Env, action_select: callable) -> float:
+def _fitness(observation, i: int, max_episode_steps: int) -> float:
+    fitness = observation[0] + (observation[0] * observation[2] - observation[1] * observation[3]) + 2
+    if fitness <= 1:
+        return -(i + 1) / max_episode_steps
+    else:
+        return -fitness
+
+
+def evaluate(env: gym.Env, action_select: callable, seed: int | None = None) -> float:
     """Evaluate heuristic function on car mountain problem."""
 
-    observation, _ = env.reset()  # initialization
+    observation, _ = env.reset(seed=seed)  # initialization
     action = 0  # initial action
 
     for i in range(env._max_episode_steps + 1):  # protect upper limits
@@ -66,11 +76,36 @@ def evaluate(env: gym.Env, action_select: callable) -> float:
 
         if done or truncated:
             # self.env.close()
-            fitness = observation[0] + (observation[0] * observation[2] - observation[1] * observation[3]) + 2
-            if fitness <= 1:
-                return -(i + 1) / env._max_episode_steps
-            else:
-                return -fitness
+            return _fitness(observation, i, env._max_episode_steps)
+
+
+class _AcrobotEpisode(Episode):
+    """The bookkeeping of 'evaluate' for 'VectorRollout'."""
+
+    def __init__(self, policy: callable, max_episode_steps: int):
+        super().__init__(policy)
+        self.max_episode_steps = max_episode_steps
+
+    def reset(self, observation):
+        self.observation = observation
+        self.action = 0
+        self.step = 0
+        self.fitness = None
+
+    def policy_args(self) -> tuple:
+        return (*self.observation[:6], self.action)
+
+    def set_action(self, action):
+        self.action = action
+        return action
+
+    def observe(self, observation, reward, terminated, truncated) -> bool:
+        self.observation = observation
+        if terminated or truncated:
+            self.fitness = _fitness(observation, self.step, self.max_episode_steps)
+            return True
+        self.step += 1
+        return self.step > self.max_episode_steps
 
 
 class AcrobotEvaluation(Evaluation):
@@ -80,6 +115,13 @@ class AcrobotEvaluation(Evaluation):
         """
             Args:
                 - 'max_steps' (int): Maximum number of steps allowed per episode in the MountainCar-v0 environment (default is 500).
+                - 'seeds' (list[int], in kwargs): if given, the score is the mean fitness of the episodes with these seeds,
+                  otherwise a single unseeded episode is evaluated (default).
+                - 'vectorization_mode' (str | None, in kwargs): 'sync' or 'async' runs the seeded episodes together
+                  in a gymnasium vector env (with 'num_envs' envs, default 16), None (default) runs them one by one
+                  in 'self.env'. It is not faster than the serial loop
+                  ('sync' steps the envs one by one, ~0.95x; 'async' ~0.25x), so it is only meant for 'batch_policy=True',
+                  which calls the policy once per step on arrays if it supports them.
                 - '**kwargs' (dict): Additional keyword arguments passed to the parent class initializer.
 
             Attributes:
@@ -97,5 +139,30 @@ class AcrobotEvaluation(Evaluation):
         self.env = gym.make('Acrobot-v1')
         self.env._max_episode_steps = max_steps
 
+        self.seeds = kwargs.get('seeds', None)
+        self.vectorization_mode = kwargs.get('vectorization_mode', None)
+        self._rollout = None
+        if self.seeds is not None and self.vectorization_mode is not None:
+            self._rollout = VectorRollout(self._make_env, num_envs=min(len(self.seeds), kwargs.get('num_envs', 16)),
+                                          mode=self.vectorization_mode, batch_policy=kwargs.get('batch_policy', False))
+            if self.vectorization_mode == 'sync':
+                # created before the evaluation processes are forked, so that they reuse the envs
+                self._rollout.warm_up()
+
+    def _make_env(self) -> gym.Env:
+        env = gym.make('Acrobot-v1')
+        env._max_episode_steps = self.env._max_episode_steps
+        return env
+
+    def evaluate_seeds(self, action_select: callable) -> List[float]:
+        """Returns the fitness of the episode of each seed in 'self.seeds'."""
+        if self._rollout is None:
+            return [evaluate(self.env, action_select, seed) for seed in self.seeds]
+        episodes = self._rollout.run([_AcrobotEpisode(action_select, self.env._max_episode_steps)
+                                      for _ in self.seeds], self.seeds)
+        return [ep.fitness for ep in episodes]
+
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
-        return evaluate(self.env, callable_func)
+        if self.seeds is None:
+            return evaluate(self.env, callable_func)
+        return float(np.mean(self.evaluate_seeds(callable_func)))
@@ -33,12 +33,13 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
-import copy
 import matplotlib.patches as patches
 from matplotlib.transforms import Affine2D
 import time
 
 from llm4ad.base import Evaluation
+from llm4ad.task.machine_learning.early_stopping import EarlyStopping
+from llm4ad.task.machine_learning.episode_cache import EpisodeCache
 # =========================================================================
 # 🛠️ USER DEFINED: Import your custom template and task description here
 # =========================================================================
@@ -58,6 +59,9 @@ class RacingCarEvaluation(Evaluation):
             timeout_seconds=timeout_seconds
         )
         self.whocall = whocall
+        # skip the behavior plot (and its PNG/base64 encoding) when only the score is needed,
+        # MLES can still request the plot of a program by passing 'scoring_only=False' to 'evaluate_program'
+        self.scoring_only = kwargs.get('scoring_only', whocall != 'mles')
 
         # =========================================================================
         # 🛠️ USER DEFINED (i): Environment Configuration
@@ -69,6 +73,14 @@ class RacingCarEvaluation(Evaluation):
         self.final_objective_score = objective_value
         self.env_mode = kwargs.get("env_mode", 'rgb_array')
 
+        # Early termination against the 'threshold' passed by the method (the score is the mean track coverage,
+        # so an episode scores at most 100), and the (policy, seed) episode cache of the scoring-only mode
+        early_stopping = kwargs.get('early_stopping', None)
+        if not isinstance(early_stopping, EarlyStopping):
+            early_stopping = EarlyStopping(early_stopping, episode_score_bound=100)
+        self.early_stopping = early_stopping
+        self._episode_cache: EpisodeCache | None = kwargs.get('episode_cache', None)
+
         # =========================================================================
         # 🔒 BOILERPLATE - DO NOT MODIFY
         # Instance set and mode handling for the evaluation pipeline.
@@ -87,12 +99,19 @@ class RacingCarEvaluation(Evaluation):
         if self._mode == 'Combined' and (not self.instance_set or not self.ins_to_be_solve_set):
             raise ValueError("Missing Training or Testing instance set.")
 
-    def evaluate(self, action_select: callable, ins_to_be_evaluated_id: Set | List | None = None, training_mode=True) -> \
-            Optional[dict]:
+    def evaluate(self, action_select: callable, ins_to_be_evaluated_id: Set | List | None = None, training_mode=True,
+                 scoring_only: bool | None = None, threshold: float | None = None,
+                 program_str: str | None = None) -> Optional[dict]:
         """
         🔒 MOSTLY BOILERPLATE: Aggregates results across instances.
         🛠️ Users only need to modify the final return dictionary if they want to track extra custom data.
+        In scoring-only mode (defaults to 'self.scoring_only'), no plot is drawn and the 'image' of the MLES result is None.
+        With 'self.early_stopping' and a 'threshold' (the mean track coverage to reach), the remaining seeds are skipped
+        once the policy can not reach the threshold, and the result is computed from the played episodes ('early_stopped').
+        With 'self._episode_cache' and 'program_str', the cached episodes of the program are reused (scoring-only).
         """
+        if scoring_only is None:
+            scoring_only = self.scoring_only
         ins_to_be_evaluated_set = self.instance_set
         if not training_mode:
             ins_to_be_evaluated_set = self.ins_to_be_solve_set
@@ -106,9 +125,37 @@ class RacingCarEvaluation(Evaluation):
         image64s = {}
         episodes_recorder = {}
 
+        # the cached episodes are counted first, the others are played in the given order,
+        # and the loop stops early once the policy can not reach 'threshold' (see 'EarlyStopping')
+        ins_to_be_evaluated_id = list(ins_to_be_evaluated_id)
+        policy_key = None
+        known_results = {}
+        if self._episode_cache is not None and program_str is not None:
+            policy_key = self._episode_cache.policy_key(program_str, self._env_config())
+            if scoring_only:
+                for ins_id in ins_to_be_evaluated_id:
+                    infos = self._episode_cache.get(policy_key, ins_to_be_evaluated_set[ins_id])
+                    if infos is not None:
+                        known_results[ins_id] = (infos, None)
+
+        def play_episodes(ins_ids):
+            results = []
+            for ins_id in ins_ids:
+                env_seed = ins_to_be_evaluated_set[ins_id]
+                result = self.evaluate_single(action_select, env_seed=env_seed, skip_frame=1, render=not scoring_only)
+                if policy_key is not None and result is not None:
+                    self._episode_cache.put(policy_key, env_seed, result[0])
+                results.append(result)
+            return results
+
+        evaluated_results, early_stopped = self.early_stopping.run(
+            ins_to_be_evaluated_id, play_episodes, lambda result: result[0]['track_coverage'],
+            threshold=threshold, known_results=known_results)
+
         for ins_id in ins_to_be_evaluated_id:
-            env_seed = ins_to_be_evaluated_set[ins_id]
-            each_evaluate_result = self.evaluate_single(action_select, env_seed=env_seed, skip_frame=1)
+            if ins_id not in evaluated_results:
+                continue
+            each_evaluate_result = evaluated_results[ins_id]
 
             if each_evaluate_result is not None:
                 infos, img_base64 = each_evaluate_result
@@ -150,7 +197,9 @@ class RacingCarEvaluation(Evaluation):
                     'Test result': episodes_recorder,
                     'observation': None,
                     'all_ins_performance': instance_performance,
-                    'list_performance': list_performance
+                    'list_performance': list_performance,
+                    'early_stopped': early_stopped,
+                    'num_evaluated': len(evaluated_results)
                     }
         elif self.whocall == 'dyca':
             return {'all_ins_performance': instance_performance,
@@ -158,13 +207,14 @@ class RacingCarEvaluation(Evaluation):
         else:
             return mean_reward
 
-    def evaluate_single(self, action_select: callable, env_seed=42, skip_frame=1):
+    def evaluate_single(self, action_select: callable, env_seed=42, skip_frame=1, render=True):
         """
         # =========================================================================
         # 🛠️ USER DEFINED (ii): Single Episode Evaluation & Image Generation
         # This is the core logic. You must run your environment, collect rewards,
         # generate a plot/image demonstrating the behavior, and return it as base64.
         # =========================================================================
+        If 'render' is False, the trajectory is not recorded and no plot is drawn (the returned image is None).
         """
         env = gym.make(self.env_name, render_mode=self.env_mode, domain_randomize=False, continuous=True)  # 'rgb_array'
         observation, _ = env.reset(seed=env_seed)  # initialization
@@ -179,7 +229,7 @@ class RacingCarEvaluation(Evaluation):
         view_rectangles = []
         done = False
 
-        pre_observation = copy.deepcopy(observation)
+        pre_observation = observation.copy()
         observation, reward, done, truncated, info = env.step(action)
         episode_reward += reward
         step = 0
@@ -195,11 +245,15 @@ class RacingCarEvaluation(Evaluation):
                                    speed,
                                    action,
                                    pre_observation)
-            pre_observation = copy.deepcopy(observation)
+            pre_observation = observation.copy()
 
             for _ in range(skip_frame):
                 observation, reward, done, truncated, info = env.step(action)
                 step += 1
+                episode_reward += reward
+                episode_max_reward = max(episode_max_reward, episode_reward)
+                if not render:
+                    continue
 
                 # Track data specifically needed for generating the behavior evidence plot
                 car_pos = env.unwrapped.car.hull.position
@@ -212,9 +266,34 @@ class RacingCarEvaluation(Evaluation):
 
                 view_rectangles.append((view_center_x, view_center_y, corrected_angle, 38.0, 46.0))
 
-                episode_reward += reward
-                episode_max_reward = max(episode_max_reward, episode_reward)
+        track_coverage = env.unwrapped.tile_visited_count / len(env.unwrapped.track) * 100
+        img_base64 = self._behavior_plot(env, trajectory, car_angles, view_rectangles, track_coverage) if render else None
+
+        # Cleanup
+        env.close()
+        end_time = time.time()
+
+        # Compile final info dictionary to pass back
+        infos = {'done': done,
+                 'truncated': truncated,
+                 'episode_reward': episode_reward,
+                 'track_coverage': track_coverage,
+                 'episode_max_reward': episode_max_reward,
+                'evaluate_time': end_time - start_time}
 
+        # Must return the dictionary of metrics AND the base64 image string
+        return infos, img_base64
+
+    def _env_config(self) -> dict:
+        """Everything (other than the seed) the rewards of an episode depend on, see 'EpisodeCache'."""
+        return {'env_name': self.env_name,
+                'max_steps': self.env_max_episode_steps,
+                'domain_randomize': False,
+                'continuous': True,
+                'skip_frame': 1}
+
+    def _behavior_plot(self, env, trajectory, car_angles, view_rectangles, track_coverage) -> str:
+        """Draws the track, the trajectory and the view areas of an episode, and returns the PNG as base64."""
         # --- GENERATE BEHAVIORAL EVIDENCE (BE) PLOT ---
         # The MLLM needs to *see* why the policy succeeded or failed.
         plt.figure(figsize=(9, 8))
@@ -293,8 +372,6 @@ class RacingCarEvaluation(Evaluation):
                 seen_labels.add(label)
                 unique_handles.append(handle)
 
-        track_coverage = env.unwrapped.tile_visited_count / len(env.unwrapped.track) * 100
-
         plt.title(
             f"Track with Car Trajectory and Corresponding Dynamic View Areas\n"
             f"Track Completion Rate: {track_coverage:.1f} %")
@@ -310,21 +387,8 @@ class RacingCarEvaluation(Evaluation):
         buffer.seek(0)
         img_base64 = base64.b64encode(buffer.read()).decode("utf-8")
 
-        # Cleanup
         plt.close()
-        env.close()
-        end_time = time.time()
-
-        # Compile final info dictionary to pass back
-        infos = {'done': done,
-                 'truncated': truncated,
-                 'episode_reward': episode_reward,
-                 'track_coverage': track_coverage,
-                 'episode_max_reward': episode_max_reward,
-                'evaluate_time': end_time - start_time}
-
-        # Must return the dictionary of metrics AND the base64 image string
-        return infos, img_base64
+        return img_base64
 
     # =========================================================================
     # 🔒 BOILERPLATE - DO NOT MODIFY
@@ -333,4 +397,6 @@ class RacingCarEvaluation(Evaluation):
     def evaluate_program(self, program_str: str, callable_func: callable, **kwargs) -> Any | None:
         ins_to_be_evaluated_id = kwargs.get('ins_to_be_evaluated_id', None)
         training_mode = kwargs.get('training_mode', True)
-        return self.evaluate(callable_func, ins_to_be_evaluated_id, training_mode)
+        scoring_only = kwargs.get('scoring_only', None)
+        threshold = kwargs.get('threshold', None)
+        return self.evaluate(callable_func, ins_to_be_evaluated_id, training_mode, scoring_only, threshold, program_str)
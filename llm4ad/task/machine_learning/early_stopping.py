@@ -0,0 +1,110 @@
+# Module Name: early_stopping
+# Last Revision: 2025/3/5
+# Description: Stops the evaluation of a control policy on a set of seeds once it can (or very likely will) not
+#              reach a threshold passed by the search method, e.g., the score of the worst member of a full
+#              population. The seeds are played in order (the cached episodes first), in chunks of 'interval'
+#              episodes, and the rule is checked before each chunk. The score of the task must be (or be bounded
+#              by) the mean of per-episode scores, and scores are maximized.
+#              - 'bound'  : stops if the mean score is below the threshold even if all remaining episodes reach
+#                           'episode_score_bound'. A stopped policy can never have reached the threshold
+#                           (as long as the bound holds).
+#              - 'racing' : stops if 'mean + confidence * standard error' of the played episodes is below the
+#                           threshold (after at least 'min_episodes' episodes), or if the 'bound' rule stops.
+#              This module is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Usage:
+#    early_stopping = EarlyStopping(rule='racing', min_episodes=4, interval=4, episode_score_bound=100)
+#    results, stopped = early_stopping.run(seeds, play_episodes, episode_score, threshold=-0.5)
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ['EarlyStopping']
+
+
+class EarlyStopping:
+    def __init__(self, rule: str | None = None, min_episodes: int = 3, interval: int = 4, confidence: float = 2.0,
+                 episode_score_bound: float | None = None):
+        """
+        Args:
+            rule               : 'bound', 'racing', or None (all seeds are played, the default).
+            min_episodes       : the 'racing' rule is only checked after this number of episodes.
+            interval           : the number of episodes played between two checks (e.g., the number of envs of
+                a vectorized rollout).
+            confidence         : the 'racing' rule stops if 'mean + confidence * std / sqrt(n)' < threshold.
+            episode_score_bound: the maximum score of an episode, the 'bound' rule is disabled if it is None.
+        """
+        assert rule in (None, 'bound', 'racing')
+        assert interval >= 1
+        self.rule = rule
+        self.min_episodes = min_episodes
+        self.interval = interval
+        self.confidence = confidence
+        self.episode_score_bound = episode_score_bound
+
+    def should_stop(self, episode_scores: Sequence[float], num_episodes: int, threshold: float | None) -> bool:
+        """Returns True if the policy should not play the remaining episodes.
+        Args:
+            episode_scores: the scores of the played episodes.
+            num_episodes  : the number of all episodes (played and remaining).
+            threshold     : the score the policy has to reach, or None (never stops).
+        """
+        n = len(episode_scores)
+        if self.rule is None or threshold is None or n == 0 or n >= num_episodes:
+            return False
+        total = float(np.sum(episode_scores))
+        if self.episode_score_bound is not None:
+            if (total + (num_episodes - n) * self.episode_score_bound) / num_episodes < threshold:
+                return True
+        if self.rule == 'racing' and n >= max(self.min_episodes, 2):
+            std_err = float(np.std(episode_scores, ddof=1)) / math.sqrt(n)
+            if total / n + self.confidence * std_err < threshold:
+                return True
+        return False
+
+    def run(self,
+            ids: Sequence[Any],
+            play_episodes: Callable[[List[Any]], List[Any]],
+            episode_score: Callable[[Any], float],
+            threshold: float | None = None,
+            known_results: Dict[Any, Any] | None = None) -> Tuple[Dict[Any, Any], bool]:
+        """Plays the episodes of 'ids' in order until the rule stops.
+        Args:
+            ids          : the ids of all episodes (e.g., instance ids).
+            play_episodes: plays a list of ids, and returns their results (None if an episode failed).
+            episode_score: returns the score of a (not None) result.
+            threshold    : see 'should_stop'.
+            known_results: results which do not have to be played (e.g., cached episodes), they are counted first.
+        Returns:
+            '(results, stopped)', where 'results' maps the played (and known) ids to their results.
+        """
+        results = {i: known_results[i] for i in ids if known_results and i in known_results}
+        pending = [i for i in ids if i not in results]
+        interval = self.interval if self.rule is not None and threshold is not None else max(len(pending), 1)
+        for start in range(0, len(pending), interval):
+            scores = [episode_score(r) for r in results.values() if r is not None]
+            if self.should_stop(scores, len(ids), threshold):
+                return results, True
+            chunk = pending[start:start + interval]
+            results.update(zip(chunk, play_episodes(chunk)))
+        return results, False
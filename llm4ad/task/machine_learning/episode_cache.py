@@ -0,0 +1,90 @@
+# Module Name: episode_cache
+# Last Revision: 2025/3/5
+# Description: Caches the result of each (policy, seed) episode of a control task, so that re-evaluating a
+#              program (e.g., on a superset of the seeds, or in a later run) only plays the new episodes.
+#              A policy is identified by the fingerprint of its program (docstrings, comments and formatting
+#              are ignored, see 'llm4ad.base.CodeFingerprint') and the configuration of the environment.
+#              The storage is an 'llm4ad.base.EvaluationCache', i.e., an in-memory LRU tier and an optional
+#              SQLite tier, which is shared by the evaluation processes and by later runs.
+#              This module is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Usage:
+#    cache = EpisodeCache(db_path='logs/episode_cache.sqlite')
+#    task = MoonLanderEvaluation(instance_set=..., ins_to_be_solve_set=..., episode_cache=cache)
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict
+
+from llm4ad.base import CodeFingerprint, EvaluationCache
+
+__all__ = ['EpisodeCache']
+
+
+class EpisodeCache:
+    def __init__(self,
+                 max_size: int = 4096,
+                 db_path: str | None = None,
+                 *,
+                 namespace: str = '',
+                 alpha_equivalence: bool = False,
+                 debug_mode: bool = False):
+        """
+        Args:
+            max_size         : the maximum number of episodes in the in-memory LRU tier.
+            db_path          : path to a SQLite database file for the on-disk tier. Without it, the episodes are only
+                shared within a process (the evaluation processes of 'SecureEvaluator' do not share them).
+            namespace        : a user-defined version string which is part of every key (e.g., a gymnasium version).
+            alpha_equivalence: if set to True, programs that only differ in the names of local variables share episodes.
+            debug_mode       : if set to True, we will print detailed information.
+        """
+        self._alpha_equivalence = alpha_equivalence
+        self._cache = EvaluationCache(max_size, db_path, namespace=namespace, debug_mode=debug_mode)
+
+    def policy_key(self, program_str: str, env_config: Dict[str, Any]) -> str:
+        """Returns the key of a policy, 'env_config' contains everything (other than the seed) the rewards depend on,
+        such as the name, the physics and the step limit of the environment.
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(CodeFingerprint.fingerprint(program_str, alpha_equivalence=self._alpha_equivalence).encode('utf-8'))
+        hasher.update(b'\0')
+        hasher.update(repr(sorted(env_config.items())).encode('utf-8'))
+        return hasher.hexdigest()
+
+    @classmethod
+    def _episode_key(cls, policy_key: str, seed) -> str:
+        return f'{policy_key}:{seed!r}'
+
+    def get(self, policy_key: str, seed) -> dict | None:
+        """Returns the cached infos of the episode, or None."""
+        hit, infos = self._cache.get(self._episode_key(policy_key, seed))
+        return infos if hit else None
+
+    def put(self, policy_key: str, seed, infos: dict):
+        self._cache.put(self._episode_key(policy_key, seed), infos, evaluator_class='episode')
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    def close(self):
+        self._cache.close()
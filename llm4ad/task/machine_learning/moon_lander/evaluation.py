@@ -36,11 +36,13 @@ matplotlib.use('Agg')  # Non-interactive backend for server-side plotting
 import matplotlib.pyplot as plt
 import io
 import base64
-import copy
 import warnings
 import time
 
 from llm4ad.base import Evaluation
+from llm4ad.task.machine_learning.early_stopping import EarlyStopping
+from llm4ad.task.machine_learning.episode_cache import EpisodeCache
+from llm4ad.task.machine_learning.vector_rollout import Episode, VectorRollout
 # =========================================================================
 # 🛠️ USER DEFINED: Import your custom template and task description here
 # =========================================================================
@@ -49,6 +51,48 @@ from llm4ad.task.machine_learning.moon_lander.template import template_program,
 
 __all__ = ['MoonLanderEvaluation']
 
+
+class _MoonLanderEpisode(Episode):
+    """The bookkeeping of 'MoonLanderEvaluation.evaluate_single' (without rendering) for 'VectorRollout'."""
+
+    def __init__(self, policy: callable, max_steps: int):
+        super().__init__(policy)
+        self.max_steps = max_steps
+
+    def reset(self, observation):
+        self.observation = observation
+        self.pre_observation = observation.copy()
+        self.action = 0
+        self.warming_up = True  # the first step always takes the action 0
+        self.step = 0
+        self.episode_reward = 0
+        self.episode_fuel = 0
+        self.done = self.truncated = False
+
+    def fixed_action(self):
+        return 0 if self.warming_up else None
+
+    def policy_args(self) -> tuple:
+        return self.observation, self.action, self.pre_observation
+
+    def set_action(self, action):
+        self.action = action
+        self.pre_observation = self.observation.copy()
+        return action
+
+    def observe(self, observation, reward, terminated, truncated) -> bool:
+        self.observation = observation
+        if self.warming_up:
+            self.warming_up = False
+            return False
+        self.episode_reward += reward
+        if self.action in [1, 2, 3]:
+            self.episode_fuel += 1
+        self.done, self.truncated = terminated, truncated
+        finished = terminated or truncated or self.step == self.max_steps
+        self.step += 1
+        return finished
+
 class MoonLanderEvaluation(Evaluation):
     """Evaluator for the Lunar Lander control problem."""
 
@@ -56,6 +100,18 @@ class MoonLanderEvaluation(Evaluation):
         """
             Args:
                 - 'max_steps' (int): Maximum number of steps allowed per episode in the MountainCar-v0 environment (default is 500).
+                - 'vectorization_mode' (str | None, in kwargs): 'sync' or 'async' runs the seeds of a scoring-only
+                  evaluation together in a reused gymnasium vector env (with 'num_envs' envs, default 16), None (default)
+                  runs them one by one. It is not faster than the serial loop
+                  ('sync' steps the envs one by one, ~0.95x; 'async' ~0.25x), so it is only meant for 'batch_policy=True',
+                  which calls the policy once per step on arrays if it supports them.
+                - 'scoring_only' (bool, in kwargs): skip rendering, canvas blending, PNG/base64 encoding and observation strings.
+                  Defaults to True unless 'whocall' is 'mles'. MLES can still request the rich output of a program
+                  by passing 'scoring_only=False' to 'evaluate_program'.
+                - 'early_stopping' (str | EarlyStopping | None, in kwargs): 'bound' or 'racing' stops the evaluation of a program
+                  once it can not reach the 'threshold' passed to 'evaluate_program' (e.g., by MLES with 'early_stopping=True').
+                  The 'bound' rule assumes that no episode reward exceeds 'episode_reward_bound' (default 320).
+                - 'episode_cache' (EpisodeCache, in kwargs): reuses the finished (program, seed) episodes in scoring-only mode.
                 - '**kwargs' (dict): Additional keyword arguments passed to the parent class initializer.
 
             Attributes:
@@ -69,6 +125,7 @@ class MoonLanderEvaluation(Evaluation):
             timeout_seconds=timeout_seconds
         )
         self.whocall = whocall
+        self.scoring_only = kwargs.get('scoring_only', whocall != 'mles')
 
         # =========================================================================
         # 🛠️ USER DEFINED (i): Environment Configuration
@@ -86,6 +143,25 @@ class MoonLanderEvaluation(Evaluation):
         self.wind_power = kwargs.get('wind_power', 15.0)
         self.turbulence_power = kwargs.get('turbulence_power', 1.5)
 
+        # Scoring-only evaluations can run all seeds together in a reused vector env ('sync' or 'async'),
+        # by default the seeds are run one by one as in the rich (rendering) mode
+        self.vectorization_mode = kwargs.get('vectorization_mode', None)
+        self._rollout = None
+        if self.vectorization_mode is not None:
+            self._rollout = VectorRollout(self._make_env, num_envs=kwargs.get('num_envs', 16),
+                                          mode=self.vectorization_mode, batch_policy=kwargs.get('batch_policy', False))
+            if self.vectorization_mode == 'sync' and self.scoring_only:
+                # created before the evaluation processes are forked, so that they reuse the envs
+                self._rollout.warm_up()
+
+        # Early termination against the 'threshold' passed by the method, and the (policy, seed) episode cache
+        early_stopping = kwargs.get('early_stopping', None)
+        if not isinstance(early_stopping, EarlyStopping):
+            early_stopping = EarlyStopping(early_stopping, episode_score_bound=self._episode_score(
+                {'episode_reward': kwargs.get('episode_reward_bound', 320), 'episode_fuel': 0}))
+        self.early_stopping = early_stopping
+        self._episode_cache: EpisodeCache | None = kwargs.get('episode_cache', None)
+
         # =========================================================================
         # 🔒 BOILERPLATE - DO NOT MODIFY
         # Instance set and mode handling for the evaluation pipeline.
@@ -110,11 +186,19 @@ class MoonLanderEvaluation(Evaluation):
         self.to_be_solve_ins_feature = {}
         self._generate_instance_features()  # If you have
 
-    def evaluate(self, action_select: callable, ins_to_be_evaluated_id: Set | List | None = None, training_mode=True) -> \
-            Optional[dict]:
+    def evaluate(self, action_select: callable, ins_to_be_evaluated_id: Set | List | None = None, training_mode=True,
+                 scoring_only: bool | None = None, threshold: float | None = None,
+                 program_str: str | None = None) -> Optional[dict]:
         """
         🔒 MOSTLY BOILERPLATE: Aggregates results across instances.
+        In scoring-only mode (defaults to 'self.scoring_only'), the episodes are not rendered,
+        and the 'image' and 'observation' of the MLES result are None.
+        With 'self.early_stopping' and a 'threshold' (the NWS to reach), the remaining seeds are skipped once the
+        policy can not reach the threshold, and the result is computed from the played episodes ('early_stopped').
+        With 'self._episode_cache' and 'program_str', the cached episodes of the program are reused (scoring-only).
         """
+        if scoring_only is None:
+            scoring_only = self.scoring_only
         ins_to_be_evaluated_set = self.instance_set
         if not training_mode:
             ins_to_be_evaluated_set = self.ins_to_be_solve_set
@@ -127,18 +211,48 @@ class MoonLanderEvaluation(Evaluation):
         total_rewards = {}
         image64s = {}
         observations = {}
-        num_episodes = len(ins_to_be_evaluated_id)
         episodes_recorder = {}
 
         total_fuel = 0
         success_count = 0
 
-        # --- Serial Evaluation Loop ---
+        # --- Evaluation Loop (serial, or all seeds together in a vector env) ---
+        # the cached episodes are counted first, the others are played in the given order,
+        # and the loop stops early once the policy can not reach 'threshold' (see 'EarlyStopping')
+        ins_to_be_evaluated_id = list(ins_to_be_evaluated_id)
+        policy_key = None
+        known_results = {}
+        if self._episode_cache is not None and program_str is not None:
+            policy_key = self._episode_cache.policy_key(program_str, self._env_config())
+            if scoring_only:
+                for ins_id in ins_to_be_evaluated_id:
+                    infos = self._episode_cache.get(policy_key, ins_to_be_evaluated_set[ins_id])
+                    if infos is not None:
+                        known_results[ins_id] = ({**infos, 'observations': []}, None)
+
+        def play_episodes(ins_ids):
+            env_seeds = [ins_to_be_evaluated_set[ins_id] for ins_id in ins_ids]
+            if scoring_only and self.vectorization_mode is not None:
+                results = self.evaluate_vectorized(action_select, env_seeds)
+            else:
+                results = [self.evaluate_single(action_select, env_seed, render=not scoring_only)
+                           for env_seed in env_seeds]
+            if policy_key is not None:
+                for env_seed, result in zip(env_seeds, results):
+                    if result is not None:
+                        self._episode_cache.put(policy_key, env_seed,
+                                                {k: v for k, v in result[0].items() if k != 'observations'})
+            return results
+
+        evaluated_results, early_stopped = self.early_stopping.run(
+            ins_to_be_evaluated_id, play_episodes, lambda result: self._episode_score(result[0]),
+            threshold=threshold, known_results=known_results)
+        num_episodes = len(evaluated_results)
 
         for ins_id in ins_to_be_evaluated_id:
-            env_seed = ins_to_be_evaluated_set[ins_id]
-            each_evaluate_result = self.evaluate_single(action_select, env_seed)
-
+            if ins_id not in evaluated_results:
+                continue
+            each_evaluate_result = evaluated_results[ins_id]
             if each_evaluate_result is not None:
                 infos, img_canvas = each_evaluate_result
                 total_rewards[ins_id] = infos['episode_reward']
@@ -183,8 +297,11 @@ class MoonLanderEvaluation(Evaluation):
         # =========================================================================
         if self.whocall == 'mles':
             # Create base64 representation of the canvas here
-            encoded_base64 = self.create_base64(chosen_image, nws, episodes_recorder, min_reward_id)
-            observation_chosen_str = str(observation_chosen)
+            if scoring_only:
+                encoded_base64, observation_chosen_str = None, None
+            else:
+                encoded_base64 = self.create_base64(chosen_image, nws, episodes_recorder, min_reward_id)
+                observation_chosen_str = str(observation_chosen)
             test_result = {
                 'Mean Reward': mean_reward,
                 'Mean Fuel': mean_fuel,
@@ -200,7 +317,9 @@ class MoonLanderEvaluation(Evaluation):
                     'observation': observation_chosen_str,
                     'Test result': test_result,
                     'all_ins_performance': instance_performance,
-                    'list_performance': list_performance
+                    'list_performance': list_performance,
+                    'early_stopped': early_stopped,
+                    'num_evaluated': num_episodes
                     }
 
         elif self.whocall == 'dyca':
@@ -209,15 +328,17 @@ class MoonLanderEvaluation(Evaluation):
         else:
             return nws
 
-    def evaluate_single(self, action_select: callable, env_seed=42):
+    def evaluate_single(self, action_select: callable, env_seed=42, render=True):
         """
         # =========================================================================
         # 🛠️ USER DEFINED (ii): Single Episode Evaluation & Image Generation
         # Run the environment, track fuel/rewards, and generate the image canvas.
         # =========================================================================
+        If 'render' is False, the environment is created without a renderer, and no canvas or
+        observation strings are produced (the returned canvas is None). The rewards are the same.
         """
         start_time = time.time()
-        env = gym.make(self.env_name, render_mode='rgb_array',
+        env = gym.make(self.env_name, render_mode='rgb_array' if render else None,
                        gravity=self.gravity,
                        enable_wind=self.enable_wind,
                        wind_power=self.wind_power,
@@ -228,10 +349,10 @@ class MoonLanderEvaluation(Evaluation):
         episode_fuel = 0
 
         # Create a blank canvas to overlay trajectory frames
-        canvas = np.zeros((400, 600, 3), dtype=np.float32)
+        canvas = np.zeros((400, 600, 3), dtype=np.float32) if render else None
         observations = []
 
-        pre_observation = copy.deepcopy(observation)
+        pre_observation = observation.copy()
         observation, reward, done, truncated, info = env.step(action)
 
         flash_calculator = 0
@@ -239,7 +360,7 @@ class MoonLanderEvaluation(Evaluation):
             action = action_select(observation,
                                    action,
                                    pre_observation)
-            pre_observation = copy.deepcopy(observation)
+            pre_observation = observation.copy()
             observation, reward, done, truncated, info = env.step(action)
             episode_reward += reward
 
@@ -248,27 +369,15 @@ class MoonLanderEvaluation(Evaluation):
                 episode_fuel += 1
 
             # Render frame and create transparent overlay for trajectory history
-            if flash_calculator >= 10:
-                img = env.render()
-                mask = np.any(img != [0, 0, 0], axis=-1)
-                alpha = min(i / self.env_max_episode_steps, 1.0)
-
-                canvas[mask] = canvas[mask] * (1 - alpha) + img[mask] * alpha
-
-                observation_str = ', '.join([f"{x:.3f}" for x in observation])
-                observations.append(f"[{observation_str}]")
+            if render and flash_calculator >= 10:
+                self._overlay_frame(env, canvas, observations, observation, i)
                 flash_calculator = 0
 
             flash_calculator += 1
 
             if done or truncated or i == self.env_max_episode_steps:
-                img = env.render()
-                mask = np.any(img != [0, 0, 0], axis=-1)
-                alpha = i / self.env_max_episode_steps  # 假设最大步数为200，可以根据实际情况调整
-                alpha = min(alpha, 1.0)  # 确保透明度不超过1
-                canvas[mask] = canvas[mask] * (1 - alpha) + img[mask] * alpha
-                observation_str = ', '.join([f"{x:.3f}" for x in observation])
-                observations.append(f"[{observation_str}]")
+                if render:
+                    self._overlay_frame(env, canvas, observations, observation, i)
                 # fitness = abs(observation[0]) + abs(yv[-2]) - (observation[6] + observation[7])
                 env.close()
                 end_time = time.time()
@@ -282,6 +391,54 @@ class MoonLanderEvaluation(Evaluation):
                 # Return the custom metrics and the raw numpy canvas
                 return infos, canvas
 
+    def evaluate_vectorized(self, action_select: callable, env_seeds: List[int]):
+        """Runs the (scoring-only) episodes of all seeds together in the reused vector env.
+        Returns the same '(infos, None)' as 'evaluate_single(..., render=False)' for each seed,
+        the 'evaluate_time' of each episode is the wall time of all episodes divided by the number of episodes.
+        """
+        start_time = time.time()
+        episodes = self._rollout.run([_MoonLanderEpisode(action_select, self.env_max_episode_steps)
+                                      for _ in env_seeds], env_seeds)
+        evaluate_time = (time.time() - start_time) / max(len(env_seeds), 1)
+        return [({'done': ep.done,
+                  'truncated': ep.truncated,
+                  'episode_fuel': ep.episode_fuel,
+                  'episode_reward': ep.episode_reward,
+                  'observations': [],
+                  'evaluate_time': evaluate_time}, None) for ep in episodes]
+
+    def _env_config(self) -> dict:
+        """Everything (other than the seed) the rewards of an episode depend on, see 'EpisodeCache'."""
+        return {'env_name': self.env_name,
+                'max_steps': self.env_max_episode_steps,
+                'gravity': self.gravity,
+                'enable_wind': self.enable_wind,
+                'wind_power': self.wind_power,
+                'turbulence_power': self.turbulence_power}
+
+    @classmethod
+    def _episode_score(cls, infos: dict) -> float:
+        """The NWS of a single episode. The mean over episodes is an upper bound of the NWS of 'evaluate'
+        (equal to it if no episode uses more than 100 fuel)."""
+        return ((infos['episode_reward'] / 200) * 0.6 + (1 - min(infos['episode_fuel'] / 100, 1)) * 0.2
+                + (infos['episode_reward'] >= 200) * 0.2)
+
+    def _make_env(self):
+        return gym.make(self.env_name,
+                        gravity=self.gravity,
+                        enable_wind=self.enable_wind,
+                        wind_power=self.wind_power,
+                        turbulence_power=self.turbulence_power)
+
+    def _overlay_frame(self, env, canvas, observations, observation, step):
+        """Blends the current frame into the canvas and records the observation as a string."""
+        img = env.render()
+        mask = np.any(img != [0, 0, 0], axis=-1)
+        alpha = min(step / self.env_max_episode_steps, 1.0)  # 确保透明度不超过1
+        canvas[mask] = canvas[mask] * (1 - alpha) + img[mask] * alpha
+        observation_str = ', '.join([f"{x:.3f}" for x in observation])
+        observations.append(f"[{observation_str}]")
+
     # =========================================================================
     # 🔒 BOILERPLATE - DO NOT MODIFY
     # Wrapper function for the evaluation engine.
@@ -289,7 +446,9 @@ class MoonLanderEvaluation(Evaluation):
     def evaluate_program(self, program_str: str, callable_func: callable, **kwargs) -> Any | None:
         ins_to_be_evaluated_id = kwargs.get('ins_to_be_evaluated_id', None)
         training_mode = kwargs.get('training_mode', True)
-        return self.evaluate(callable_func, ins_to_be_evaluated_id, training_mode)
+        scoring_only = kwargs.get('scoring_only', None)
+        threshold = kwargs.get('threshold', None)
+        return self.evaluate(callable_func, ins_to_be_evaluated_id, training_mode, scoring_only, threshold, program_str)
 
     # =========================================================================
     # 🛠️ USER DEFINED (iv): Custom Task-Specific Methods
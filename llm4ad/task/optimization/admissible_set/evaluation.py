@@ -34,7 +34,7 @@
 from __future__ import annotations
 
 import itertools
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Tuple
 import numpy as np
 
 from llm4ad.base import Evaluation
@@ -42,6 +42,106 @@ from llm4ad.task.optimization.admissible_set.template import template_program, t
 
 __all__ = ['ASPEvaluation']
 
+_TRIPLES = np.array([(0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 1, 2), (0, 2, 1), (1, 1, 1), (2, 2, 2)], dtype=np.int8)
+_INT_TO_WEIGHT = np.array([0, 1, 1, 2, 2, 3, 3], dtype=np.int8)
+_BAD_TRIPLES = {(0, 0, 0), (0, 1, 1), (0, 2, 2), (0, 3, 3), (0, 4, 4), (0, 5, 5), (0, 6, 6), (1, 1, 1),
+                (1, 1, 2),
+                (1, 2, 2), (1, 2, 3), (1, 2, 4), (1, 3, 3), (1, 4, 4), (1, 5, 5), (1, 6, 6), (2, 2, 2),
+                (2, 3, 3),
+                (2, 4, 4), (2, 5, 5), (2, 6, 6), (3, 3, 3), (3, 3, 4), (3, 4, 4), (3, 4, 5), (3, 4, 6),
+                (3, 5, 5),
+                (3, 6, 6), (4, 4, 4), (4, 5, 5), (4, 6, 6), (5, 5, 5), (5, 5, 6), (5, 6, 6), (6, 6, 6)}
+# _BAD[x, y, z] is True if the sorted (x, y, z) is a bad triple
+_BAD = np.zeros((7, 7, 7), dtype=bool)
+for _x, _y, _z in itertools.product(range(7), repeat=3):
+    _BAD[_x, _y, _z] = tuple(sorted((_x, _y, _z))) in _BAD_TRIPLES
+
+# the tables of the valid children of each (dimension, weight), shared by the evaluators of a process
+_CHILD_TABLES: Dict[Tuple[int, int], dict] = {}
+
+
+def _child_tables(dimension: int, weight: int) -> dict:
+    """Returns the lookup tables of I(dimension, weight), they are computed once per (dimension, weight).
+    - 'children'     : the valid (weight w) children, in the order of 'itertools.product(range(7), repeat=n // 3)'.
+    - 'weight_codes' : the weights of the groups of each child, as a number in base 4.
+    - 'code_weights' : the weights of the groups of each code, 'code_weights[weight_codes[k]]' are the weights of
+                       the k-th child.
+    - 'elements'     : the vector of each child (the concatenated triples), i.e., the input of the priority.
+    - 'num_expanded' : the number of elements of the admissible set each child expands to.
+    """
+    key = (dimension, weight)
+    if key not in _CHILD_TABLES:
+        num_groups = dimension // 3
+        children = np.indices((7,) * num_groups, dtype=np.int8).reshape(num_groups, -1).T
+        children = children[_INT_TO_WEIGHT[children].sum(axis=1) == weight]
+        # the triples (0, 0, 0), (1, 1, 1) and (2, 2, 2) have one rotation, the others have three
+        num_rotations = np.where((_TRIPLES == _TRIPLES[:, :1]).all(axis=1), 1, 3)
+        _CHILD_TABLES[key] = {
+            'children': children,
+            'weight_codes': _weight_codes(_INT_TO_WEIGHT[children]),
+            'code_weights': _code_weights(num_groups),
+            'elements': _TRIPLES[children].reshape(len(children), 3 * num_groups),
+            'num_expanded': np.prod(num_rotations[children], axis=1, dtype=np.int64),
+        }
+    return _CHILD_TABLES[key]
+
+
+def _code_weights(num_groups: int) -> np.ndarray:
+    return np.indices((4,) * num_groups, dtype=np.int8).reshape(num_groups, -1).T
+
+
+def _weight_codes(weights: np.ndarray) -> np.ndarray:
+    # the weights are at most 3, the first group is the most significant digit (as in 'np.indices')
+    return weights.astype(np.int64) @ (4 ** np.arange(weights.shape[1] - 1, -1, -1, dtype=np.int64))
+
+
+class _ExtantBits:
+    """The extant elements as bitsets, bit k of 'bits[i, v]' is set if the k-th element has the value v in group i."""
+
+    def __init__(self, num_groups: int, num_words: int = 16):
+        self.bits = np.zeros((num_groups, 7, num_words), dtype=np.uint64)
+        self.size = 0
+
+    def add(self, element: np.ndarray):
+        word, bit = divmod(self.size, 64)
+        if word == self.bits.shape[2]:
+            self.bits = np.concatenate([self.bits, np.zeros_like(self.bits)], axis=2)
+        self.bits[np.arange(len(element)), element, word] |= np.uint64(1 << bit)
+        self.size += 1
+
+    def surviving_mask(self, new_element: np.ndarray, indices: np.ndarray, tables: dict,
+                       chunk_size: int = 8192) -> np.ndarray:
+        """Returns the mask of the children 'tables["children"][indices]' that remain valid after adding
+        'new_element' to the extant elements.
+        """
+        children = tables['children']
+        # Invalidate based on 2 elements from 'new_element' and 1 element from a potential child,
+        # and based on 1 element from 'new_element' and 2 elements from a potential child
+        # (computed once per combination of weights).
+        new_weights = _INT_TO_WEIGHT[new_element]
+        code_weights = tables['code_weights']
+        valid_codes = (new_weights > code_weights).any(axis=1) & (new_weights < code_weights).any(axis=1)
+        mask = valid_codes[tables['weight_codes'][indices]]
+        num_words = (self.size + 63) // 64
+        if num_words == 0:
+            return mask
+        # Invalidate based on 1 element from the extant elements, 1 element from 'new_element', and 1 element
+        # from a potential child: 'covered[i, z]' are the extant elements e for which (e[i], new_element[i], z)
+        # is a bad triple, a child is invalid if an extant element is covered in all the groups.
+        bad = _BAD[:, new_element, :].transpose(1, 0, 2)  # [group, e[i], z]
+        covered = np.bitwise_or.reduce(
+            np.where(bad[..., None], self.bits[:, :, None, :num_words], np.uint64(0)), axis=1)
+        candidates = np.flatnonzero(mask)
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            group_values = children[indices[chunk]]
+            invalid = covered[0, group_values[:, 0]]
+            for i in range(1, children.shape[1]):
+                invalid &= covered[i, group_values[:, i]]
+            mask[chunk[invalid.any(axis=1)]] = False
+        return mask
+
+
 class ASPEvaluation(Evaluation):
     """Evaluator for online bin packing problem."""
 
@@ -50,6 +150,10 @@ class ASPEvaluation(Evaluation):
             Args:
                 - 'dimension' (int): The dimension of tested case (default is 15).
                 - 'weight' (int): The wight of tested case (default is 10).
+                - 'batch_priority' (bool, in kwargs): if set to True, the priority is first called once with the
+                  vectors of all the valid children stacked along the last axis (e.g., 'el[0]' is the first entry
+                  of all vectors). The result is checked against per-vector calls on a sample of the vectors,
+                  and the priorities are computed per vector if they differ or if the priority fails on arrays.
         """
 
         super().__init__(
@@ -61,6 +165,7 @@ class ASPEvaluation(Evaluation):
 
         self.dimension = dimension
         self.weight = weight
+        self.batch_priority = kwargs.get('batch_priority', False)
 
         
         self.TRIPLES = [(0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 1, 2), (0, 2, 1), (1, 1, 1), (2, 2, 2)]
@@ -72,6 +177,11 @@ class ASPEvaluation(Evaluation):
             "n24w17": 237984
         }
 
+        # the valid children and lookup tables are computed once here (instead of in every evaluation),
+        # so that they are inherited by the forked evaluation processes
+        assert self.dimension % 3 == 0
+        self._tables = _child_tables(self.dimension, self.weight)
+
 
     def expand_admissible_set(self, pre_admissible_set: List[Tuple[int, ...]]) -> List[Tuple[int, ...]]:
         """Expands a pre-admissible set into an admissible set."""
@@ -93,40 +203,39 @@ class ASPEvaluation(Evaluation):
 
     def get_surviving_children(self, extant_elements, new_element, valid_children):
         """Returns the indices of `valid_children` that remain valid after adding `new_element` to `extant_elements`."""
-        bad_triples = {(0, 0, 0), (0, 1, 1), (0, 2, 2), (0, 3, 3), (0, 4, 4), (0, 5, 5), (0, 6, 6), (1, 1, 1),
-                    (1, 1, 2),
-                    (1, 2, 2), (1, 2, 3), (1, 2, 4), (1, 3, 3), (1, 4, 4), (1, 5, 5), (1, 6, 6), (2, 2, 2),
-                    (2, 3, 3),
-                    (2, 4, 4), (2, 5, 5), (2, 6, 6), (3, 3, 3), (3, 3, 4), (3, 4, 4), (3, 4, 5), (3, 4, 6),
-                    (3, 5, 5),
-                    (3, 6, 6), (4, 4, 4), (4, 5, 5), (4, 6, 6), (5, 5, 5), (5, 5, 6), (5, 6, 6), (6, 6, 6)}
-
-        # Compute.
-        valid_indices = []
-        for index, child in enumerate(valid_children):
-            # Invalidate based on 2 elements from `new_element` and 1 element from a
-            # potential child.
-            if all(self.INT_TO_WEIGHT[x] <= self.INT_TO_WEIGHT[y]
-                for x, y in zip(new_element, child)):
-                continue
-            # Invalidate based on 1 element from `new_element` and 2 elements from a
-            # potential child.
-            if all(self.INT_TO_WEIGHT[x] >= self.INT_TO_WEIGHT[y]
-                for x, y in zip(new_element, child)):
-                continue
-            # Invalidate based on 1 element from `extant_elements`, 1 element from
-            # `new_element`, and 1 element from a potential child.
-            is_invalid = False
-            for extant_element in extant_elements:
-                if all(tuple(sorted((x, y, z))) in bad_triples
-                    for x, y, z in zip(extant_element, new_element, child)):
-                    is_invalid = True
-                    break
-            if is_invalid:
-                continue
-
-            valid_indices.append(index)
-        return valid_indices
+        extant_bits = _ExtantBits(len(new_element))
+        for extant_element in np.asarray(extant_elements, dtype=np.int8).reshape(-1, len(new_element)):
+            extant_bits.add(extant_element)
+        children = np.asarray(valid_children, dtype=np.int8).reshape(-1, len(new_element))
+        tables = {'children': children,
+                  'weight_codes': _weight_codes(_INT_TO_WEIGHT[children]),
+                  'code_weights': _code_weights(len(new_element))}
+        mask = extant_bits.surviving_mask(np.asarray(new_element, dtype=np.int8), np.arange(len(children)), tables)
+        return np.flatnonzero(mask).tolist()
+
+
+    def _scores(self, priority: callable) -> np.ndarray:
+        """Scores all the valid children in one pass."""
+        elements = self._tables['elements']
+        if self.batch_priority:
+            scores = self._batched_scores(priority, elements)
+            if scores is not None:
+                return scores
+        return np.array([priority(el, self.dimension, self.weight) for el in map(tuple, elements.tolist())])
+
+    def _batched_scores(self, priority: callable, elements: np.ndarray, sample_size: int = 64) -> np.ndarray | None:
+        try:
+            scores = np.broadcast_to(np.asarray(priority(elements.T.astype(np.int64), self.dimension, self.weight)),
+                                     (len(elements),))
+        except Exception:
+            return None
+        # a priority that runs on arrays may still treat them differently (e.g., 'np.sum(el)')
+        sample = np.unique(np.linspace(0, len(elements) - 1, min(sample_size, len(elements))).astype(int))
+        try:
+            expected = np.array([priority(tuple(elements[k].tolist()), self.dimension, self.weight) for k in sample])
+        except Exception:
+            return None
+        return np.array(scores) if np.array_equal(scores[sample], expected) else None
 
 
     def evaluate(self, priority: callable) -> int:
@@ -136,29 +245,27 @@ class ASPEvaluation(Evaluation):
         assert 3 * num_groups == self.dimension
 
         # Compute the scores of all valid (weight w) children.
-        valid_children = []
-        for child in itertools.product(range(7), repeat=num_groups):
-            weight = sum(self.INT_TO_WEIGHT[x] for x in child)
-            if weight == self.weight:
-                valid_children.append(np.array(child, dtype=np.int32))
-
-        valid_scores = np.array([
-            priority(sum([self.TRIPLES[x] for x in xs], ()), self.dimension, self.weight) for xs in valid_children])
+        children = self._tables['children']
+        valid_indices = np.arange(len(children))
+        valid_scores = self._scores(priority)
 
         # Greedy search guided by the scores.
-        pre_admissible_set = np.empty((0, num_groups), dtype=np.int32)
-        while valid_children:
-            max_index = np.argmax(valid_scores)
-            max_child = valid_children[max_index]
-            surviving_indices = self.get_surviving_children(pre_admissible_set, max_child, valid_children)
-            valid_children = [valid_children[i] for i in surviving_indices]
-            valid_scores = valid_scores[surviving_indices]
+        extant_bits = _ExtantBits(num_groups)
+        pre_admissible_indices = []
+        while len(valid_indices):
+            max_index = valid_indices[np.argmax(valid_scores)]
+            max_child = children[max_index]
+            surviving = extant_bits.surviving_mask(max_child, valid_indices, self._tables)
+            valid_indices = valid_indices[surviving]
+            valid_scores = valid_scores[surviving]
 
-            pre_admissible_set = np.concatenate([pre_admissible_set, max_child[None]], axis=0)
+            extant_bits.add(max_child)
+            pre_admissible_indices.append(max_index)
 
-        admissible_set = np.array(self.expand_admissible_set(pre_admissible_set))
+        # the size of the expanded admissible set (see 'expand_admissible_set')
+        admissible_set_length = int(self._tables['num_expanded'][pre_admissible_indices].sum())
 
-        return (len(admissible_set) - self.Optimal_Set_Length[f"n{self.dimension}w{self.weight}"])
+        return (admissible_set_length - self.Optimal_Set_Length[f"n{self.dimension}w{self.weight}"])
 
 
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
@@ -24,7 +24,7 @@ from __future__ import annotations
 from typing import Any
 import numpy as np
 from llm4ad.base import Evaluation
-from llm4ad.task.optimization.co_bench.utils import load_subdir_as_text
+from llm4ad.task.optimization.co_bench.utils import CoBenchInstances
 from llm4ad.task.optimization.co_bench.aircraft_landing_co_bench.template import template_program, task_description
 
 __all__ = ['ALEvaluationCB']
@@ -52,15 +52,11 @@ class ALEvaluationCB(Evaluation):
             timeout_seconds=timeout_seconds
         )
 
-        # Load datasets from Hugging Face
-        dataset = load_subdir_as_text("CO-Bench/CO-Bench", "Aircraft landing")
-        self._datasets = {}
-        for i in range(1, 14):  # airland1 to airland13
-            filename = f"airland{i}.txt"
-            if filename in dataset:
-                # Join all text rows into a single string
-                text_content = '\n'.join([row['text'] for row in dataset[filename]])
-                self._datasets[filename] = text_content
+        # Load datasets from Hugging Face (or a local copy), each instance file is parsed only once
+        self._instances = CoBenchInstances("Aircraft landing", self.load_data,
+                                           filenames=[f"airland{i}.txt" for i in range(1, 14)],  # airland1 to airland13
+                                           data_dir=kwargs.get('data_dir'), revision=kwargs.get('revision'),
+                                           cache_dir=kwargs.get('cache_dir'))
 
     def evaluate_program(self, program_str: str, callable_func: callable, **kwargs) -> Any | None:
         return self.evaluate(callable_func)
@@ -83,8 +79,8 @@ class ALEvaluationCB(Evaluation):
                          [1, 2, 3, 4, 5],
                          [1, 2, 3, 4, 5]]
         
-        for case_id, ins in enumerate(self._datasets.values()):
-            base_case = self.load_data(ins)
+        # a fresh copy of the instances, which are parsed only once
+        for case_id, base_case in enumerate(self._instances.parsed()):
             # Create variations with different runway configurations
             for num_runways in runway_configs[case_id]:
                 case_with_runways = base_case.copy()
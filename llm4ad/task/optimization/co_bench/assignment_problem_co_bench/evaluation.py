@@ -24,7 +24,7 @@ from __future__ import annotations
 from typing import Any
 import numpy as np
 from llm4ad.base import Evaluation
-from llm4ad.task.optimization.co_bench.utils import load_subdir_as_text
+from llm4ad.task.optimization.co_bench.utils import CoBenchInstances
 from llm4ad.task.optimization.co_bench.assignment_problem_co_bench.template import template_program, task_description
 
 __all__ = ['APEvaluationCB']
@@ -52,21 +52,17 @@ class APEvaluationCB(Evaluation):
             timeout_seconds=timeout_seconds
         )
 
-        # Load datasets from Hugging Face
-        dataset = load_subdir_as_text("CO-Bench/CO-Bench", "Assignment problem")
-        self._datasets = {}
-        for filename in dataset:
-            # Join all text rows into a single string
-            text_content = '\n'.join([row['text'] for row in dataset[filename]])
-            self._datasets[filename] = text_content
+        # Load datasets from Hugging Face (or a local copy), each instance file is parsed only once
+        self._instances = CoBenchInstances("Assignment problem", self.load_data,
+                                           data_dir=kwargs.get('data_dir'), revision=kwargs.get('revision'),
+                                           cache_dir=kwargs.get('cache_dir'))
 
     def evaluate_program(self, program_str: str, callable_func: callable, **kwargs) -> Any | None:
         return self.evaluate(callable_func)
 
     def evaluate(self, eva: callable) -> float | None:
-        ins_cases = []
-        for case_id, ins in enumerate(self._datasets.values()):
-            ins_cases.append(self.load_data(ins))
+        # a fresh copy of the instances, which are parsed only once
+        ins_cases = self._instances.parsed()
 
         fitness_list = []
         try:
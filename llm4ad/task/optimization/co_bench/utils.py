@@ -1,11 +1,21 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import pickle
+import re
 from pathlib import PurePosixPath
-from huggingface_hub import list_repo_files
-from datasets import load_dataset
+from typing import Callable, List
 import time
-import httpx
-import httpcore
+
+CO_BENCH_REPO_ID = "CO-Bench/CO-Bench"
+
 
 def robust_request(func, *args, **kwargs):
+    import httpx
+    import httpcore
+
     while True:
         try:
             return func(*args, **kwargs)
@@ -19,7 +29,8 @@ def robust_request(func, *args, **kwargs):
             else:
                 raise e
 
-def load_subdir_as_text(repo_id: str, subdir: str, *, skip_ext: tuple[str, ...] = (".py",), streaming: bool = False):
+def load_subdir_as_text(repo_id: str, subdir: str, *, skip_ext: tuple[str, ...] = (".py",), streaming: bool = False,
+                        revision: str | None = None):
     """
     Load files from a subdirectory in a Hugging Face dataset as text format.
     
@@ -28,6 +39,7 @@ def load_subdir_as_text(repo_id: str, subdir: str, *, skip_ext: tuple[str, ...]
         subdir: The subdirectory path within the dataset
         skip_ext: File extensions to skip (default: (".py",))
         streaming: Whether to use streaming mode
+        revision: A branch, tag or commit of the dataset, defaults to the main branch
         
     Returns:
         A dict where keys are original filenames and values are loaded datasets
@@ -36,8 +48,11 @@ def load_subdir_as_text(repo_id: str, subdir: str, *, skip_ext: tuple[str, ...]
         ds = load_subdir_as_text("CO-Bench/CO-Bench", "Aircraft landing")
         # Returns: {"airland1.txt": Dataset(...), "airland2.txt": Dataset(...), ...}
     """
+    from huggingface_hub import list_repo_files
+    from datasets import load_dataset
+
     prefix = subdir.rstrip("/") + "/"
-    all_files = robust_request(list_repo_files, repo_id, repo_type="dataset")
+    all_files = robust_request(list_repo_files, repo_id, repo_type="dataset", revision=revision)
     files = [
         f for f in all_files
         if f.startswith(prefix) and not f.endswith(skip_ext)
@@ -68,6 +83,7 @@ def load_subdir_as_text(repo_id: str, subdir: str, *, skip_ext: tuple[str, ...]
         repo_id,
         data_files=data_files,
         streaming=streaming,
+        revision=revision,
     )
     
     # Return a dict with original filenames as keys
@@ -97,8 +113,9 @@ def load_subdir_as_pickle(repo_id: str, subdir: str, *, include_subdirs: tuple[s
                                      include_subdirs=("er_test", "er_large_test"))
         # Returns: {"er_test": {"file1.gpickle": graph1, ...}, "er_large_test": {...}}
     """
-    import pickle
-    from huggingface_hub import hf_hub_download
+    import httpx
+    import httpcore
+    from huggingface_hub import list_repo_files, hf_hub_download
     
     prefix = subdir.rstrip("/") + "/"
     all_files = robust_request(list_repo_files, repo_id, repo_type="dataset")
@@ -151,4 +168,192 @@ def load_subdir_as_pickle(repo_id: str, subdir: str, *, include_subdirs: tuple[s
                         print(f"Warning: Failed to load {file_path}: {e}")
                         break # Non-network error, skip file
     
-    return subdirs 
\ No newline at end of file
+    return subdirs 
+
+def default_cache_dir() -> str:
+    """The folder of the parsed instance cache, set 'LLM4AD_CO_BENCH_CACHE' to change it."""
+    return os.environ.get(
+        "LLM4AD_CO_BENCH_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "llm4ad", "co_bench")
+    )
+
+
+def local_task_dir(subdir: str, data_dir: str | None = None) -> str | None:
+    """Returns the (resolved) folder of the task in the local copy of the dataset, or None if there is none.
+    'data_dir' defaults to the 'LLM4AD_CO_BENCH_DIR' environment variable.
+    """
+    data_dir = data_dir or os.environ.get("LLM4AD_CO_BENCH_DIR")
+    if data_dir and os.path.isdir(os.path.join(data_dir, subdir)):
+        return os.path.realpath(os.path.join(data_dir, subdir))
+    return None
+
+
+def _local_instance_files(task_dir: str) -> List[str]:
+    return [filename for filename in sorted(os.listdir(task_dir))
+            if os.path.isfile(os.path.join(task_dir, filename)) and not filename.endswith(".py")]
+
+
+def data_source_key(subdir: str, *, repo_id: str = CO_BENCH_REPO_ID, data_dir: str | None = None,
+                    revision: str | None = None) -> tuple:
+    """Identifies the data 'load_subdir_text_files' loads (without loading it): the resolved local folder
+    with the name, size and modification time of each file, or the Hugging Face repository and revision.
+    """
+    task_dir = local_task_dir(subdir, data_dir)
+    if task_dir is not None:
+        files = []
+        for filename in _local_instance_files(task_dir):
+            stat = os.stat(os.path.join(task_dir, filename))
+            files.append((filename, stat.st_size, stat.st_mtime_ns))
+        return 'local', task_dir, tuple(files)
+    return 'huggingface', repo_id, revision or 'main'
+
+
+def load_subdir_text_files(subdir: str, *, repo_id: str = CO_BENCH_REPO_ID, data_dir: str | None = None,
+                           revision: str | None = None):
+    """
+    Load the instance files of a CO-Bench task as strings.
+
+    Args:
+        subdir: The subdirectory path within the dataset (e.g., "Job shop scheduling")
+        repo_id: The repository ID on Hugging Face
+        data_dir: A local copy of the dataset, i.e., a folder containing '<subdir>/<filename>'.
+            Defaults to the 'LLM4AD_CO_BENCH_DIR' environment variable. If the folder of the task
+            does not exist, the files are loaded from Hugging Face.
+        revision: A branch, tag or commit of the dataset on Hugging Face, defaults to the main branch
+
+    Returns:
+        A dict where keys are original filenames and values are the text contents
+    """
+    task_dir = local_task_dir(subdir, data_dir)
+    if task_dir is not None:
+        result = {}
+        for filename in _local_instance_files(task_dir):
+            with open(os.path.join(task_dir, filename), "r") as f:
+                # same as joining the rows of the 'text' dataset
+                result[filename] = '\n'.join(f.read().splitlines())
+        return result
+
+    dataset = load_subdir_as_text(repo_id, subdir, revision=revision)
+    return {filename: '\n'.join([row['text'] for row in dataset[filename]]) for filename in dataset}
+
+
+class CoBenchInstances:
+    def __init__(self,
+                 subdir: str,
+                 parse_fn: Callable[[str], object],
+                 *,
+                 filenames: List[str] | None = None,
+                 repo_id: str = CO_BENCH_REPO_ID,
+                 data_dir: str | None = None,
+                 revision: str | None = None,
+                 cache_dir: str | None = None,
+                 use_cache: bool = True):
+        """Instances of a CO-Bench task, each instance file is parsed only once.
+        The parsed instances are persisted in 'cache_dir', so later constructions (also in other runs)
+        neither download nor parse the dataset, and can be done offline. The cache is keyed by the parser,
+        the selected files, and the data source (the local folder and the size and modification time of its
+        files, or the Hugging Face repository and revision), and it is only written after a complete parse.
+        Args:
+            subdir   : the subdirectory of the task in the dataset (e.g., "Job shop scheduling").
+            parse_fn : parses the text of an instance file, e.g., the 'load_data' method of the evaluation.
+                The cache is invalidated when the source code of 'parse_fn' changes.
+            filenames: only keep these files (in this order), pass 'None' to keep all files.
+            repo_id  : the repository ID on Hugging Face.
+            data_dir : a local copy of the dataset, please refer to 'load_subdir_text_files'.
+            revision : a branch, tag or commit of the dataset on Hugging Face, defaults to the main branch.
+            cache_dir: the folder of the parsed instance cache, defaults to 'default_cache_dir()'.
+            use_cache: if set to False, the parsed instance cache is neither read nor written.
+        """
+        self._subdir = subdir
+        self._data_source = data_source_key(subdir, repo_id=repo_id, data_dir=data_dir, revision=revision)
+        self._cache_path = os.path.join(
+            cache_dir or default_cache_dir(),
+            f"{re.sub(r'[^a-zA-Z0-9._]', '_', subdir)}-{self._cache_key(parse_fn, filenames, self._data_source)}.pkl"
+        )
+
+        start = time.perf_counter()
+        cached = self._read_cache() if use_cache else None
+        if cached is not None:
+            self._names, self._blob = cached
+            self.source = 'cache'
+        else:
+            texts = load_subdir_text_files(subdir, repo_id=repo_id, data_dir=data_dir, revision=revision)
+            complete = len(texts) > 0
+            if filenames is not None:
+                complete = complete and all(name in texts for name in filenames)
+                texts = {name: texts[name] for name in filenames if name in texts}
+            self._names = list(texts.keys())
+            self._blob = pickle.dumps([parse_fn(text) for text in texts.values()], protocol=pickle.HIGHEST_PROTOCOL)
+            self.source = 'text'
+            # a partial dataset (e.g., an interrupted download) is used, but not cached
+            if use_cache and complete:
+                self._write_cache()
+        self.load_seconds = time.perf_counter() - start
+        self.num_parsed = 0
+        self.parsed_seconds = 0.
+        self._content_digest = None
+
+    @classmethod
+    def _cache_key(cls, parse_fn, filenames, data_source) -> str:
+        try:
+            source = inspect.getsource(parse_fn)
+        except (OSError, TypeError):
+            source = getattr(parse_fn, '__qualname__', repr(parse_fn))
+        return hashlib.blake2b(f'{source}{filenames}{data_source!r}'.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _read_cache(self):
+        try:
+            with open(self._cache_path, 'rb') as f:
+                data = pickle.load(f)
+            return data['names'], data['parsed']
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+            return None
+
+    def _write_cache(self):
+        tmp_path = f'{self._cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'names': self._names, 'parsed': self._blob}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    @property
+    def cache_path(self) -> str:
+        return self._cache_path
+
+    def content_digest(self) -> str:
+        """Returns a stable digest of the instances (the subdir, the data source, the file names and the
+        parsed instances), e.g., for the config digest of 'llm4ad.base.EvaluationCache'.
+        """
+        if self._content_digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(f'{self._subdir}{self._data_source!r}{self._names!r}'.encode('utf-8'))
+            hasher.update(self._blob)
+            self._content_digest = hasher.hexdigest()
+        return self._content_digest
+
+    def __len__(self):
+        return len(self._names)
+
+    def parsed(self) -> list:
+        """Returns the parsed instances (the results of 'parse_fn', in the order of 'names').
+        Each call returns a fresh copy, so the evaluated programs can not modify the shared instances.
+        Unpickling is much faster than parsing the text again.
+        """
+        start = time.perf_counter()
+        result = pickle.loads(self._blob)
+        self.parsed_seconds += time.perf_counter() - start
+        self.num_parsed += 1
+        return result
+
+    def summary(self) -> str:
+        avg = self.parsed_seconds / self.num_parsed if self.num_parsed else 0.
+        return (f'{self._subdir}: {len(self)} files loaded from {self.source} in {self.load_seconds:.3f}s, '
+                f'{avg * 1000:.2f}ms per evaluation to copy the parsed instances.')
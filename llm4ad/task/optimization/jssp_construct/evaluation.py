@@ -34,6 +34,7 @@
 
 
 from __future__ import annotations
+import operator
 from typing import Any, List, Tuple, Callable
 import numpy as np
 import matplotlib.pyplot as plt
@@ -114,6 +115,16 @@ class JSSPEvaluation(Evaluation):
         plt.tight_layout()
         plt.show()
 
+    @staticmethod
+    def _unscheduled_index(operation, operations: list, unscheduled: np.ndarray) -> Tuple[int, int]:
+        """Returns the (job_id, machine_id) of 'operation', raises a ValueError if it is not unscheduled."""
+        n_jobs, n_machines = unscheduled.shape
+        job_id, machine_id = operator.index(operation[0]), operator.index(operation[1])
+        if not (0 <= job_id < n_jobs and 0 <= machine_id < n_machines and unscheduled[job_id, machine_id]
+                and operations[job_id * n_machines + machine_id] == operation):
+            raise ValueError(f'{operation} is not an unscheduled operation.')
+        return job_id, machine_id
+
     def schedule_jobs(self, processing_times, n_jobs, n_machines, eva):
         """
         Schedule jobs on machines using a greedy constructive heuristic.
@@ -131,23 +142,23 @@ class JSSPEvaluation(Evaluation):
         job_status = [0] * n_jobs  # Time each job is available
         operation_sequence = [[] for _ in range(n_jobs)]  # Sequence of operations for each job
 
-        # Initialize the list of all operations
-        all_operations = []
-        for job_id in range(n_jobs):
-            for machine_id in range(n_machines):
-                all_operations.append((job_id, machine_id, processing_times[job_id][machine_id]))
+        # All operations in job-major order, the operation of job j on machine m is operations[j * n_machines + m]
+        operations = [(job_id, machine_id, processing_times[job_id][machine_id])
+                      for job_id in range(n_jobs) for machine_id in range(n_machines)]
+        operation_array = np.empty(len(operations), dtype=object)  # the same tuples, to select them with a mask
+        for k, operation in enumerate(operations):
+            operation_array[k] = operation
+        unscheduled = np.ones((n_jobs, n_machines), dtype=bool)
 
         # Schedule operations until all are completed
-        while all_operations:
-            # Determine feasible operations
-            feasible_operations = []
-            for operation in all_operations:
-                job_id, machine_id, processing_time = operation
-                if job_status[job_id] <= machine_status[machine_id]:
-                    feasible_operations.append(operation)
+        for _ in range(len(operations)):
+            # Determine feasible operations (in the order of all operations), the status lists are read
+            # in every step since they are passed to (and could be modified by) the heuristic
+            feasible = unscheduled & (np.array(job_status)[:, None] <= np.array(machine_status))
+            feasible_operations = operation_array[feasible.ravel()].tolist()
 
             if len(feasible_operations) == 0:
-                next_operation = all_operations[0]
+                next_operation = operations[int(np.argmax(unscheduled))]
             else:
                 # Determine the next operation to schedule
                 next_operation = eva({'machine_status': machine_status, 'job_status': job_status}, feasible_operations)
@@ -160,8 +171,8 @@ class JSSPEvaluation(Evaluation):
             job_status[job_id] = end_time
             operation_sequence[job_id].append((machine_id, start_time, end_time))
 
-            # Remove the scheduled operation from the list of all operations
-            all_operations.remove(next_operation)
+            # Mark the scheduled operation, which has to be one of the unscheduled operations
+            unscheduled[self._unscheduled_index(next_operation, operations, unscheduled)] = False
 
         # Calculate the makespan (total time required to complete all jobs)
         makespan = max(job_status)
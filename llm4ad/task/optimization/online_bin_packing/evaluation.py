@@ -41,6 +41,7 @@ import matplotlib.pyplot as plt
 from llm4ad.base import Evaluation
 from llm4ad.task.optimization.online_bin_packing.template import template_program, task_description
 from llm4ad.task.optimization.online_bin_packing.generate_weibull_instances import generate_weibull_dataset
+from llm4ad.task.optimization.online_bin_packing.frontier import PACKING_ENGINES, online_binpack_frontier, verify_frontier
 
 __all__ = ['OBPEvaluation']
 
@@ -57,6 +58,11 @@ class OBPEvaluation(Evaluation):
         Args:
             - 'data_file' (str): The data file to load (default is 'weibull_5k_train.pkl').
             - 'data_key' (str): The key of the data to load (default is 'data_key').
+            - 'packing_engine' (str, in kwargs): 'full' (default) scores all the bins which fit an item, including
+              the empty ones. 'frontier' only scores the open bins and one empty bin (see 'frontier.py'), which gives
+              the same score for heuristics whose priorities do not depend on the positions of the bins, and makes
+              large instances (e.g., 'n_items=100000') feasible. 'verify' runs both and returns the 'full' score
+              (with a warning) if they differ.
 
         Raises:
             AttributeError: If the data key does not exist.
@@ -74,6 +80,9 @@ class OBPEvaluation(Evaluation):
         self.n_items = n_items
         self.capacity = capacity
 
+        self.packing_engine = kwargs.get('packing_engine', 'full')
+        assert self.packing_engine in PACKING_ENGINES
+
         self._datasets = generate_weibull_dataset(self.n_instances, self.n_items, self.capacity)
 
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
@@ -190,8 +199,8 @@ class OBPEvaluation(Evaluation):
         packing = [bin_items for bin_items in packing if bin_items]
         return packing, bins
 
-    def evaluate(self, priority: callable) -> float:
-        """Evaluate heuristic function on a set of online binpacking instances."""
+    def count_bins(self, priority: callable, engine: str = 'full') -> np.ndarray:
+        """Returns the number of bins used for each instance, packed by the 'full' or the 'frontier' engine."""
         # List storing number of bins used for each instance.
         num_bins = []
         # Perform online binpacking for each instance.
@@ -199,16 +208,29 @@ class OBPEvaluation(Evaluation):
             instance = self._datasets[name]
             capacity = instance['capacity']
             items = instance['items']
-            # Create num_items bins so there will always be space for all items,
-            # regardless of packing order. Array has shape (num_items,).
-            bins = np.array([capacity for _ in range(instance['num_items'])])
-            # Pack items into bins and return remaining capacity in bins_packed, which
-            # has shape (num_items,).
-            _, bins_packed = self.online_binpack(items, bins, priority)
+            if engine == 'frontier':
+                # Only the opened bins are returned.
+                _, bins_packed = online_binpack_frontier(items, capacity, priority, instance['num_items'])
+            else:
+                # Create num_items bins so there will always be space for all items,
+                # regardless of packing order. Array has shape (num_items,).
+                bins = np.array([capacity for _ in range(instance['num_items'])])
+                # Pack items into bins and return remaining capacity in bins_packed, which
+                # has shape (num_items,).
+                _, bins_packed = self.online_binpack(items, bins, priority)
 
             # If remaining capacity in a bin is equal to initial capacity, then it is
             # unused. Count number of used bins.
             num_bins.append((bins_packed != capacity).sum())
+        return np.array(num_bins)
+
+    def evaluate(self, priority: callable) -> float:
+        """Evaluate heuristic function on a set of online binpacking instances."""
+        if self.packing_engine == 'verify':
+            num_bins = self.count_bins(priority, 'full')
+            verify_frontier(self.count_bins(priority, 'frontier'), num_bins)
+        else:
+            num_bins = self.count_bins(priority, self.packing_engine)
         # Score of heuristic function is negative of average number of bins used
         # across instances (as we want to minimize number of bins).
         return -np.mean(num_bins)
@@ -0,0 +1,120 @@
+# Module Name: frontier
+# Last Revision: 2025/3/5
+# Description: An open-bin frontier engine for the evaluation of online bin packing heuristics.
+#              The reference evaluation ('online_binpack') allocates one bin per item, and scores every bin which
+#              fits the item, including all the (identical) empty bins, which makes an evaluation O(n^2).
+#              The frontier engine only scores the open bins which fit the item, followed by a single empty bin
+#              which represents all the empty bins, and it skips the blocks of open bins which can not fit the
+#              item. If the priority of a bin only depends on the item and its remaining capacity (and not on
+#              its position or the other bins), the first maximal priority is the same bin in both evaluations:
+#              the open bins are exactly the bins before the first empty bin, in the same order. So the packing
+#              and the number of bins are the same.
+#              'verify_frontier' runs both evaluations, and falls back to the reference result (with a warning)
+#              if the heuristic is not position-independent.
+#              This module is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Usage:
+#    packing, bins = online_binpack_frontier(items, capacity, priority)
+#    num_bins = (bins != capacity).sum()
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+
+__all__ = ['PACKING_ENGINES', 'online_binpack_frontier', 'verify_frontier']
+
+# 'full': the reference evaluation, 'frontier': the open-bin frontier, 'verify': both (see 'verify_frontier')
+PACKING_ENGINES = ('full', 'frontier', 'verify')
+
+
+def online_binpack_frontier(items: tuple[float, ...] | np.ndarray,
+                            capacity,
+                            priority: callable,
+                            num_bins: int | None = None,
+                            block_size: int = 128) -> tuple[list[list[float, ...], ...], np.ndarray]:
+    """Performs online binpacking of 'items' into at most 'num_bins' bins (default: one bin per item).
+    Args:
+        items     : the sizes of the items, in the order they arrive.
+        capacity  : the capacity of each bin.
+        priority  : 'priority(item, bins)' returns the priority of each bin in 'bins' (remaining capacities).
+        num_bins  : the number of available bins.
+        block_size: the open bins are split into blocks of 'block_size' bins, and only the blocks whose
+            largest remaining capacity fits the item are searched.
+    Returns:
+        '(packing, bins)', the items of each used bin, and the remaining capacity of each opened bin
+        (in the order they were opened).
+    """
+    items = np.asarray(items)
+    num_items = len(items)
+    num_bins = num_items if num_bins is None else num_bins
+    # same dtype as the bins of the reference evaluation, the open bins are bins[:num_opened]
+    bins = np.full(min(num_bins, num_items), capacity)
+    empty_bin = bins[:1].copy()
+    num_opened = 0
+    packing = []
+    # the largest remaining capacity of each block of open bins
+    block_max = np.zeros(len(bins) // block_size + 1, dtype=bins.dtype)
+    block_offsets = np.arange(block_size)
+
+    for item in items:
+        # Extract the open bins that have sufficient space to fit item (in the blocks which may fit it).
+        num_blocks = (num_opened + block_size - 1) // block_size
+        blocks = np.nonzero(block_max[:num_blocks] >= item)[0]
+        if len(blocks) == 0:
+            valid_bin_indices = blocks
+        elif len(blocks) == 1:
+            start = blocks[0] * block_size
+            valid_bin_indices = np.nonzero((bins[start:min(start + block_size, num_opened)] - item) >= 0)[0] + start
+        elif 2 * len(blocks) > num_blocks:
+            # most of the blocks, so all the open bins are searched
+            valid_bin_indices = np.nonzero((bins[:num_opened] - item) >= 0)[0]
+        else:
+            candidates = (blocks[:, None] * block_size + block_offsets).ravel()
+            candidates = candidates[candidates < num_opened]
+            valid_bin_indices = candidates[(bins[candidates] - item) >= 0]
+        valid_bins = bins[valid_bin_indices]
+        # The first empty bin represents all the empty bins.
+        if num_opened < num_bins:
+            valid_bins = np.concatenate((valid_bins, empty_bin))
+        # Score each bin based on heuristic, and add item to bin with highest priority.
+        best = np.argmax(priority(item, valid_bins))
+        if best == len(valid_bin_indices) and num_opened < num_bins:
+            best_bin = num_opened
+            num_opened += 1
+            packing.append([])
+        else:
+            best_bin = valid_bin_indices[best]
+        bins[best_bin] -= item
+        packing[best_bin].append(item)
+        block = best_bin // block_size
+        block_max[block] = bins[block * block_size:min((block + 1) * block_size, num_opened)].max()
+    return packing, bins[:num_opened]
+
+
+def verify_frontier(num_bins_frontier, num_bins_reference) -> bool:
+    """Returns True if both evaluations used the same number of bins on each instance,
+    otherwise warns that the heuristic is not position-independent.
+    """
+    if np.array_equal(num_bins_frontier, num_bins_reference):
+        return True
+    warnings.warn(f'The open-bin frontier used {list(num_bins_frontier)} bins instead of {list(num_bins_reference)}, '
+                  f'the heuristic depends on the positions (or the number) of the bins, the reference result is used.')
+    return False
@@ -13,6 +13,7 @@ import numpy as np
 from llm4ad.base import Evaluation
 from llm4ad.task.optimization.online_bin_packing.template import template_program, task_description
 from llm4ad.task.optimization.online_bin_packing.generate_weibull_instances import generate_weibull_dataset
+from llm4ad.task.optimization.online_bin_packing.frontier import PACKING_ENGINES, online_binpack_frontier, verify_frontier
 
 import time
 from typing import Tuple
@@ -46,33 +47,45 @@ def online_binpack(
     return packing, bins
 
 
-def evaluate(instances: dict, priority: callable) -> np.ndarray:
-    """Evaluate heuristic function on a set of online binpacking instances."""
+def count_bins(instances: dict, priority: callable, packing_engine: str = 'full') -> list:
+    """Returns the number of bins used for each instance, packed by the 'full' or the 'frontier' engine."""
     # List storing number of bins used for each instance.
     num_bins = []
-
-    start_time = time.time()
-
     # Perform online binpacking for each instance.
     for name in instances:
         instance = instances[name]
         capacity = instance['capacity']
         items = instance['items']
-        # Create num_items bins so there will always be space for all items,
-        # regardless of packing order. Array has shape (num_items,).
-        bins = np.array([capacity for _ in range(instance['num_items'])])
-        # Pack items into bins and return remaining capacity in bins_packed, which
-        # has shape (num_items,).
-        _, bins_packed = online_binpack(items, bins, priority)
+        if packing_engine == 'frontier':
+            # Only the opened bins are returned.
+            _, bins_packed = online_binpack_frontier(items, capacity, priority, instance['num_items'])
+        else:
+            # Create num_items bins so there will always be space for all items,
+            # regardless of packing order. Array has shape (num_items,).
+            bins = np.array([capacity for _ in range(instance['num_items'])])
+            # Pack items into bins and return remaining capacity in bins_packed, which
+            # has shape (num_items,).
+            _, bins_packed = online_binpack(items, bins, priority)
         # If remaining capacity in a bin is equal to initial capacity, then it is
         # unused. Count number of used bins.
         num_bins.append((bins_packed != capacity).sum())
+    return num_bins
+
+
+def evaluate(instances: dict, priority: callable, packing_engine: str = 'full') -> np.ndarray:
+    """Evaluate heuristic function on a set of online binpacking instances.
+    The running time is the time of the 'full' or the 'frontier' packing, so running times measured
+    with different engines are not comparable.
+    """
+    start_time = time.time()
+    num_bins = count_bins(instances, priority, 'full' if packing_engine == 'verify' else packing_engine)
+    running_time = time.time() - start_time
+    if packing_engine == 'verify':
+        verify_frontier(count_bins(instances, priority, 'frontier'), num_bins)
     # Score of heuristic function is negative of average number of bins used
     # across instances (as we want to minimize number of bins).
-    running_time = time.time() - start_time
     return np.array([-np.mean(num_bins), -running_time/len(instances)])
 
-
 class OBP_2O_Evaluation(Evaluation):
     """Evaluator for online bin packing problem."""
 
@@ -81,6 +94,9 @@ class OBP_2O_Evaluation(Evaluation):
         Args:
             - 'data_file' (str): The data file to load (default is 'weibull_5k_train.pkl').
             - 'data_key' (str): The key of the data to load (default is 'data_key').
+            - 'n_instances', 'n_items', 'capacity' (int, in kwargs): the Weibull instances (default is 5, 5000, 100).
+            - 'packing_engine' (str, in kwargs): 'full' (default), 'frontier' or 'verify',
+              see 'OBPEvaluation' and 'online_bin_packing/frontier.py'.
 
         Raises:
             AttributeError: If the data key does not exist.
@@ -94,10 +110,14 @@ class OBP_2O_Evaluation(Evaluation):
             timeout_seconds=timeout_seconds
         )
 
-        self._datasets = generate_weibull_dataset(5, 5000, 100)
+        self.packing_engine = kwargs.get('packing_engine', 'full')
+        assert self.packing_engine in PACKING_ENGINES
+
+        self._datasets = generate_weibull_dataset(kwargs.get('n_instances', 5), kwargs.get('n_items', 5000),
+                                                  kwargs.get('capacity', 100))
 
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
-        return evaluate(self._datasets, callable_func)
+        return evaluate(self._datasets, callable_func, self.packing_engine)
 
 
 if __name__ == '__main__':
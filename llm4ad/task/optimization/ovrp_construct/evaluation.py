@@ -35,7 +35,6 @@
 
 from __future__ import annotations
 
-import copy
 from typing import Any
 import numpy as np
 import matplotlib.pyplot as plt
@@ -43,6 +42,7 @@ import matplotlib.pyplot as plt
 from llm4ad.base import Evaluation
 from llm4ad.task.optimization.ovrp_construct.get_instance import GetData
 from llm4ad.task.optimization.ovrp_construct.template import template_program, task_description
+from llm4ad.task.optimization.route_construction import RouteConstruction
 
 
 class OVRPEvaluation(Evaluation):
@@ -63,6 +63,10 @@ class OVRPEvaluation(Evaluation):
 
         getData = GetData(self.n_instance, self.problem_size)
         self._datasets = getData.generate_instances()
+        # the heuristic gets read-only views of the instances (made once here, and inherited by the forked
+        # evaluation processes) instead of deep copies for every call
+        self._constructions = [RouteConstruction(distance_matrix, demands, vehicle_capacity)
+                               for _, distance_matrix, demands, vehicle_capacity in self._datasets]
 
     def plot_solution(self, instance: np.ndarray, route: list, demands: list, vehicle_capacity: int):
         """
@@ -132,63 +136,28 @@ class OVRPEvaluation(Evaluation):
         plt.show()
 
     def tour_cost(self, instance, solution):
-        cost = 0
-        for j in range(len(solution) - 1):
-            cost += np.linalg.norm(instance[int(solution[j])] - instance[int(solution[j + 1])])
-        return cost
+        solution = np.asarray(solution).astype(int)
+        edges = np.linalg.norm(instance[solution[:-1]] - instance[solution[1:]], axis=1)
+        # cumsum adds the edges one by one, which gives exactly the same cost as a loop over the edges
+        return np.cumsum(edges)[-1]
 
     def route_construct(self, distance_matrix, demands, vehicle_capacity, heuristic):
-        route = []
-        current_load = 0
-        current_node = 0
-        route.append(current_node)
-
-        unvisited_nodes = set(range(1, self.problem_size))  # Assuming node 0 is the depot
-        all_nodes = np.array(list(unvisited_nodes))
-        feasible_unvisited_nodes = all_nodes
-
-        while unvisited_nodes:
-            next_node = heuristic(current_node,
-                                  0,
-                                  feasible_unvisited_nodes,  # copy
-                                  vehicle_capacity - current_load,
-                                  copy.deepcopy(demands),  # copy
-                                  copy.deepcopy(distance_matrix))  # copy
-            if next_node == 0:
-                # Update route and load
-                route.append(next_node)
-                current_load = 0
-                current_node = 0
-            else:
-                # Update route and load
-                route.append(next_node)
-                current_load += demands[next_node]
-                unvisited_nodes.remove(next_node)
-                current_node = next_node
-
-            feasible_nodes_capacity = np.array([node for node in all_nodes if current_load + demands[node] <= vehicle_capacity])
-            # Determine feasible and unvisited nodes
-            feasible_unvisited_nodes = np.intersect1d(feasible_nodes_capacity, list(unvisited_nodes))
-
-            if len(unvisited_nodes) > 0 and len(feasible_unvisited_nodes) < 1:
-                route.append(0)
-                current_load = 0
-                current_node = 0
-                feasible_unvisited_nodes = np.array(list(unvisited_nodes))
-
-        # check if not all nodes have been visited 
+        route = RouteConstruction(distance_matrix, demands, vehicle_capacity).run(heuristic)
+        return self._checked_route(route)
+
+    def _checked_route(self, route):
+        # check if not all nodes have been visited
         independent_values = set(route)
         if len(independent_values) != self.problem_size:
             return None
-
         return route
 
     def evaluate(self, heuristic):
         dis = np.ones(self.n_instance)
         n_ins = 0
 
-        for instance, distance_matrix, demands, vehicle_capacity in self._datasets:
-            route = self.route_construct(distance_matrix, demands, vehicle_capacity, heuristic)
+        for (instance, _, _, _), construction in zip(self._datasets, self._constructions):
+            route = self._checked_route(construction.run(heuristic))
             LLM_dis = self.tour_cost(instance, route)
             dis[n_ins] = LLM_dis
             n_ins += 1
@@ -0,0 +1,171 @@
+# Module Name: route_construction
+# Last Revision: 2025/3/5
+# Description: The step-by-step route construction shared by the constructive vehicle routing tasks
+#              (cvrp_construct, ovrp_construct and vrptw_construct). A single vehicle leaves the depot (node 0),
+#              the heuristic selects the next node among the feasible unvisited nodes, and the vehicle returns
+#              to the depot when the heuristic selects it or when no unvisited node is feasible.
+#              - The instance arrays are passed to the heuristic as non-writeable views of private copies,
+#                so a heuristic can neither corrupt the instance nor make the views writeable again
+#                (instead of deep-copying the arrays for every call of the heuristic).
+#              - The unvisited nodes are a boolean mask, and the capacity and time window constraints are
+#                computed for all nodes at once, in the same floating point order as the per-node checks,
+#                so the routes (and the scores) are exactly the same as with the per-node loops.
+#              This module is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Usage:
+#    construction = RouteConstruction(distance_matrix, demands, vehicle_capacity)
+#    route = construction.run(select_next_node)  # [0, 3, 7, 0, 5, ...]
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import operator
+from typing import List
+
+import numpy as np
+
+__all__ = ['read_only', 'RouteConstruction']
+
+
+def read_only(array) -> np.ndarray:
+    """Returns a non-writeable view of 'array'. The data is copied first unless 'array' already owns
+    non-writeable data, since the view of a writeable base could be made writeable again.
+    """
+    array = np.asarray(array)
+    if array.flags.writeable or array.base is not None:
+        array = array.copy()
+        array.flags.writeable = False
+    return array.view()
+
+
+class RouteConstruction:
+    def __init__(self,
+                 distance_matrix: np.ndarray,
+                 demands: np.ndarray,
+                 vehicle_capacity,
+                 time_windows: np.ndarray | None = None,
+                 time_service: np.ndarray | None = None,
+                 time_tolerance: float = 0.0001,
+                 num_nodes: int | None = None):
+        """
+        Args:
+            distance_matrix : the distances (and travel times) between the nodes, node 0 is the depot.
+            demands         : the demand of each node.
+            vehicle_capacity: the capacity of the vehicle.
+            time_windows    : the '[earliest, latest]' time of each node (VRPTW), or None (no time windows).
+                The latest time of the depot is the time the vehicle has to be back.
+            time_service    : the service time of each node, required with 'time_windows'.
+            time_tolerance  : a node is only feasible if the vehicle starts serving it (and is back at the depot)
+                at least 'time_tolerance' before the latest time.
+            num_nodes       : only the nodes '0, ..., num_nodes - 1' are routed (all nodes by default), the heuristic
+                still gets the complete arrays.
+        """
+        self.distance_matrix = read_only(distance_matrix)
+        self.demands = read_only(demands)
+        self.vehicle_capacity = vehicle_capacity
+        self.num_nodes = len(self.demands) if num_nodes is None else num_nodes
+        self.time_windows = None if time_windows is None else read_only(time_windows)
+        # the constraints of the routed nodes
+        n = self.num_nodes
+        self._demands = self.demands[:n]
+        if self.time_windows is not None:
+            assert time_service is not None, 'the time windows require the service times.'
+            self._time_service = np.asarray(time_service)
+            self._service = self._time_service[:n].copy()
+            self._earliest = self.time_windows[:n, 0].copy()
+            self._latest = self.time_windows[:n, 1] - time_tolerance
+            self._to_depot = self.distance_matrix[:n, 0].copy()
+            self._depot_latest = self.time_windows[0][1] - time_tolerance
+
+    def _node_index(self, node, unvisited: np.ndarray) -> int:
+        # the same nodes are accepted as by 'set.remove' on the set of unvisited nodes
+        index = operator.index(node)
+        if not 0 < index < self.num_nodes or not unvisited[index]:
+            raise KeyError(node)
+        return index
+
+    def feasible_mask(self, unvisited: np.ndarray, current_node, current_load, current_time=0) -> np.ndarray:
+        """Returns the mask of the unvisited nodes which the vehicle can serve next."""
+        mask = unvisited & (current_load + self._demands <= self.vehicle_capacity)
+        if self.time_windows is not None:
+            start = np.maximum(current_time + self.distance_matrix[current_node, :self.num_nodes], self._earliest)
+            mask &= start < self._latest
+            mask &= start + self._service + self._to_depot < self._depot_latest
+        return mask
+
+    def run(self, heuristic: callable) -> List:
+        """Constructs the route with 'heuristic', and returns the visited nodes in order (including the depot visits).
+        A heuristic is called with '(current_node, depot, unvisited_nodes, rest_capacity, demands, distance_matrix)',
+        or with '(current_node, depot, unvisited_nodes, rest_capacity, current_time, demands, distance_matrix,
+        time_windows)' if there are time windows. Selecting a visited node or a non-node raises an exception.
+        """
+        route = []
+        current_load = 0
+        current_node = 0
+        current_time = 0
+        route.append(current_node)
+
+        unvisited = np.ones(self.num_nodes, dtype=bool)
+        unvisited[0] = False  # node 0 is the depot
+        num_unvisited = self.num_nodes - 1
+        feasible_unvisited_nodes = np.arange(1, self.num_nodes)
+
+        while num_unvisited:
+            if self.time_windows is None:
+                next_node = heuristic(current_node,
+                                      0,
+                                      feasible_unvisited_nodes,
+                                      self.vehicle_capacity - current_load,
+                                      self.demands,
+                                      self.distance_matrix)
+            else:
+                next_node = heuristic(current_node,
+                                      0,
+                                      feasible_unvisited_nodes,
+                                      self.vehicle_capacity - current_load,
+                                      current_time,
+                                      self.demands,
+                                      self.distance_matrix,
+                                      self.time_windows)
+            if next_node == 0:
+                route.append(next_node)
+                current_load = 0
+                current_time = 0
+                current_node = 0
+            else:
+                index = self._node_index(next_node, unvisited)
+                if self.time_windows is not None:
+                    current_time += self.distance_matrix[current_node, next_node]
+                    current_time = max(current_time, self.time_windows[next_node][0])
+                    current_time += self._time_service[next_node]
+                route.append(next_node)
+                current_load += self.demands[next_node]
+                unvisited[index] = False
+                num_unvisited -= 1
+                current_node = next_node
+
+            feasible_unvisited_nodes = np.flatnonzero(self.feasible_mask(unvisited, current_node, current_load, current_time))
+
+            if num_unvisited > 0 and len(feasible_unvisited_nodes) < 1:
+                route.append(0)
+                current_load = 0
+                current_time = 0
+                current_node = 0
+                feasible_unvisited_nodes = np.flatnonzero(unvisited)
+
+        return route
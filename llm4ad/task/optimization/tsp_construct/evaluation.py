@@ -70,28 +70,34 @@ class TSPEvaluation(Evaluation):
         self.problem_size = problem_size
         getData = GetData(self.n_instance, self.problem_size)
         self._datasets = getData.generate_instances()
+        # the neighborhood matrices are computed once here (instead of in every evaluation),
+        # so that they are inherited by the forked evaluation processes
+        self._neighbor_matrices = [self.generate_neighborhood_matrix(instance) for instance, _ in self._datasets]
 
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
         return self.evaluate(callable_func)
 
     def tour_cost(self, instance, solution, problem_size):
-        cost = 0
-        for j in range(problem_size - 1):
-            cost += np.linalg.norm(instance[int(solution[j])] - instance[int(solution[j + 1])])
-        cost += np.linalg.norm(instance[int(solution[-1])] - instance[int(solution[0])])
-        return cost
+        solution = np.asarray(solution[:problem_size]).astype(int)
+        edges = np.linalg.norm(instance[solution] - instance[np.roll(solution, -1)], axis=1)
+        # cumsum adds the edges one by one, which gives exactly the same cost as a loop over the edges
+        return np.cumsum(edges)[-1]
 
     def generate_neighborhood_matrix(self, instance):
         instance = np.array(instance)
-        n = len(instance)
-        neighborhood_matrix = np.zeros((n, n), dtype=int)
-
-        for i in range(n):
-            distances = np.linalg.norm(instance[i] - instance, axis=1)
-            sorted_indices = np.argsort(distances)  # sort indices based on distances
-            neighborhood_matrix[i] = sorted_indices
-
-        return neighborhood_matrix
+        distances = np.linalg.norm(instance[:, np.newaxis] - instance, axis=2)
+        return np.argsort(distances, axis=1)  # sort indices based on distances
+
+    @staticmethod
+    def _node_index(node, problem_size) -> int | None:
+        """Returns the index of the selected node, or 'None' if it is not (numerically) an index of a node."""
+        try:
+            index = int(node)
+            if index != node:
+                return None
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return index if 0 <= index < problem_size else None
 
     def evaluate(self, eva: callable) -> float:
 
@@ -99,38 +105,39 @@ class TSPEvaluation(Evaluation):
         dis = np.ones(self.n_instance)
         n_ins = 0
 
-        for instance, distance_matrix in self._datasets:
-
-            # get neighborhood matrix
-            neighbor_matrix = self.generate_neighborhood_matrix(instance)
+        for (instance, distance_matrix), neighbor_matrix in zip(self._datasets, self._neighbor_matrices):
 
             destination_node = 0
 
             current_node = 0
 
             route = np.zeros(self.problem_size)
+            # visited[k] is True if node k is in the route, the unfilled entries of 'route' are 0 (the depot)
+            visited = np.zeros(self.problem_size, dtype=bool)
+            visited[0] = True
             # print(">>> Step 0 : select node "+str(instance[0][0])+", "+str(instance[0][1]))
             for i in range(1, self.problem_size - 1):
 
                 near_nodes = neighbor_matrix[current_node][1:]
 
-                mask = ~np.isin(near_nodes, route[:i])
-
-                unvisited_near_nodes = near_nodes[mask]
+                unvisited_near_nodes = near_nodes[~visited[near_nodes]]
 
                 next_node = eva(current_node, destination_node, unvisited_near_nodes, distance_matrix)
 
-                if next_node in route:
-                    # print("wrong algorithm select duplicate node, retrying ...")
+                index = self._node_index(next_node, self.problem_size)
+                if index is not None:
+                    if visited[index]:
+                        # print("wrong algorithm select duplicate node, retrying ...")
+                        return None
+                    visited[index] = True
+                elif next_node in route:
                     return None
 
                 current_node = next_node
 
                 route[i] = current_node
 
-            mask = ~np.isin(np.arange(self.problem_size), route[:self.problem_size - 1])
-
-            last_node = np.arange(self.problem_size)[mask]
+            last_node = np.flatnonzero(~visited)
 
             current_node = last_node[0]
 
@@ -4,12 +4,16 @@
 # end
 from __future__ import annotations
 
+import json
+import os
+import time
 from typing import Tuple, Any
 import numpy as np
 from llm4ad.base import Evaluation
 from llm4ad.task.optimization.tsp_gls_2O.get_instance import GetData, TSPInstance
 from llm4ad.task.optimization.tsp_gls_2O.template import template_program, task_description
-from .gls import guided_local_search_with_time
+from . import gls
+from .gls import guided_local_search_with_time, CompileTimer, NumbaCallback
 
 __all__ = ['TSP_GLS_2O_Evaluation']
 
@@ -50,7 +54,15 @@ class TSP_GLS_2O_Evaluation(Evaluation):
 
         """
             Args:
-                None
+                - 'warm_up' (bool, in kwargs): run the GLS loop once on a tiny instance at construction (default True),
+                  so that the evaluation processes forked later do not compile or load the numba kernels.
+                - 'aot_kernels' (bool, in kwargs): use the kernels compiled ahead of time with 'numba.pycc'
+                  (see 'gls.load_aot_kernels'), they are built on first use if they do not exist (default False).
+                - 'numba_callback' (bool, in kwargs): compile a numba-compatible 'update_edge_distance' with numba
+                  (see 'gls.NumbaCallback'). The Python function is used if it can not be compiled or its result
+                  differs, the compile time is part of the evaluation (default False).
+                - 'timing_log' (str, in kwargs): a JSONL file, one record of the JIT time and the search time is
+                  appended per evaluation (the records of the current process are also kept in 'timing_records').
             Raises:
                 AttributeError: If the data key does not exist.
                 FileNotFoundError: If the specified data file is not found.
@@ -68,8 +80,35 @@ class TSP_GLS_2O_Evaluation(Evaluation):
         getData = GetData(self.n_instance, self.problem_size)
         self._datasets = getData.generate_instances()
 
+        self._numba_callback = kwargs.get('numba_callback', False)
+        self._timing_log = kwargs.get('timing_log', None)
+        self._timing_records = []
+        if kwargs.get('aot_kernels', False):
+            gls.load_aot_kernels(build=True)
+        self._warm_up_seconds = gls.warm_up(numba_callback=self._numba_callback) if kwargs.get('warm_up', True) else 0.0
+
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
-        return evaluate(self._datasets,self.n_instance,self.problem_size, callable_func)
+        callback = NumbaCallback(callable_func) if self._numba_callback else callable_func
+        start = time.perf_counter()
+        with CompileTimer() as timer:
+            result = evaluate(self._datasets, self.n_instance, self.problem_size, callback)
+        record = {'jit_seconds': timer.seconds,
+                  'search_seconds': -float(result[1]) * self.n_instance,
+                  'evaluate_seconds': time.perf_counter() - start,
+                  'warm_up_seconds': self._warm_up_seconds,
+                  'kernels': gls.kernel_backend,
+                  'callback': getattr(callback, 'backend', None) or 'python',
+                  'pid': os.getpid()}
+        self._timing_records.append(record)
+        if self._timing_log is not None:
+            with open(self._timing_log, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return result
+
+    @property
+    def timing_records(self) -> list:
+        """The timing records of the evaluations in the current process."""
+        return self._timing_records
     
 
 if __name__ == '__main__':
@@ -1,8 +1,15 @@
+from __future__ import annotations
+
+import importlib
+import os
+import sys
 import time
+import warnings
 
 import numpy as np
 import numpy.typing as npt
 import numba as nb
+import numba.core.event as nb_event
 import concurrent.futures
 from typing import Tuple
 
@@ -10,8 +17,41 @@ FloatArray = npt.NDArray[np.float64]
 IntArray = npt.NDArray[np.int_]
 usecache = True
 
+# The kernels compiled ahead of time (see 'load_aot_kernels') replace the JIT kernels already at import if the
+# environment variable 'LLM4AD_GLS_AOT' is '1', so a fresh process neither compiles nor loads them from the numba cache.
+AOT_MODULE_NAME = '_gls_aot'
+_KERNEL_SOURCES = {}  # name -> (Python function, signature), in order of definition (the callees first)
+_JIT_KERNELS = {}
+
+
+def _import_aot_module(output_dir: str | None = None):
+    output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    if output_dir not in sys.path:
+        sys.path.insert(0, output_dir)
+    try:
+        return importlib.import_module(AOT_MODULE_NAME)
+    except ImportError:
+        return None
+
+
+_aot_module = _import_aot_module() if os.environ.get('LLM4AD_GLS_AOT') == '1' else None
+kernel_backend = 'jit' if _aot_module is None else 'aot'
+
+
+def _kernel(signature):
+    """'nb.njit' with an explicit signature (compiled at import), or the AOT kernel of the same name."""
+
+    def decorator(func):
+        _KERNEL_SOURCES[func.__name__] = (func, signature)
+        if _aot_module is not None:
+            return getattr(_aot_module, func.__name__)
+        _JIT_KERNELS[func.__name__] = nb.njit(signature, nogil=True, cache=usecache)(func)
+        return _JIT_KERNELS[func.__name__]
+
+    return decorator
 
-@nb.njit(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16), nogil=True, cache = usecache)
+
+@_kernel(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16))
 def _two_opt_once(distmat, tour, fixed_i = 0):
     '''in-place operation'''
     n = tour.shape[0]
@@ -35,7 +75,7 @@ def _two_opt_once(distmat, tour, fixed_i = 0):
     else:
         return 0.0
 
-@nb.njit(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16), nogil=True, cache = usecache)
+@_kernel(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16))
 def _relocate_once(distmat, tour, fixed_i = 0):
     n = distmat.shape[0]
     delta = p = q = 0
@@ -64,14 +104,14 @@ def _relocate_once(distmat, tour, fixed_i = 0):
         tour[q:p+1] = np.roll(tour[q:p+1], 1)
     return delta
 
-@nb.njit(nb.float32(nb.float32[:,:], nb.uint16[:]), nogil=True, cache = usecache)
+@_kernel(nb.float32(nb.float32[:,:], nb.uint16[:]))
 def _calculate_cost(distmat, tour):
     cost = distmat[tour[-1], tour[0]]
     for i in range(len(tour) - 1):
         cost += distmat[tour[i], tour[i+1]]
     return cost
 
-@nb.njit(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16, nb.uint16), nogil=True, cache = usecache)
+@_kernel(nb.float32(nb.float32[:,:], nb.uint16[:], nb.uint16, nb.uint16))
 def _local_search(distmat, cur_tour, fixed_i = 0, count = 1000):
     sum_delta = 0.0
     delta = -1
@@ -110,7 +150,7 @@ def _perturbation(distmat, guide, penalty, cur_tour, update_edge_distance, pertu
             # if delta < 0:
             #     moves += 1
 
-@nb.njit(nb.uint16[:](nb.float32[:,:], nb.uint16), nogil=True, cache = usecache)
+@_kernel(nb.uint16[:](nb.float32[:,:], nb.uint16))
 def _init_nearest_neighbor(distmat, start):
     n = distmat.shape[0]
     tour = np.zeros(n, dtype=np.uint16)
@@ -223,4 +263,154 @@ def multi_start_guided_local_search(
         # Calculate costs and return the best tour
         costs = np.array([_calculate_cost(dist, tour) for tour in tours])
         best_tour = tours[np.argmin(costs)]
-        return best_tour
\ No newline at end of file
+        return best_tour
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Warm-up, ahead-of-time kernels and the numba fast path of 'update_edge_distance'.
+#
+# The kernels above have explicit signatures, so they are compiled (or loaded from the numba cache in '__pycache__')
+# when this module is imported. 'warm_up()' additionally runs the whole GLS loop once on a tiny instance, so that the
+# evaluation processes forked from the caller start with compiled kernels, an initialized LLVM and warm numpy paths.
+# 'load_aot_kernels()' replaces the kernels by an extension module compiled with 'numba.pycc' (built once with
+# 'build_aot_kernels()'), which is useful when the numba cache can not be written (the kernels are then compiled
+# in each fresh process). Set 'LLM4AD_GLS_AOT=1' to use them from the import of this module on.
+#
+# A numba-compatible 'update_edge_distance' (loops over numpy arrays, no Python objects) can be compiled with
+# 'NumbaCallback'. Its first call is compiled and checked against the Python function, and the Python function is
+# used if the compilation fails or the results differ. The JIT time is part of the evaluation, see 'CompileTimer'.
+# ---------------------------------------------------------------------------------------------------------------------
+
+class CompileTimer(nb_event.Listener):
+    """Measures the time spent in numba compilations (nested compilations are counted once).
+    --------------------------------------------------------------------------------
+    with CompileTimer() as timer:
+        ...
+    print(timer.seconds)
+    --------------------------------------------------------------------------------
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._depth = 0
+        self._start = 0.0
+
+    def on_start(self, event):
+        if self._depth == 0:
+            self._start = time.perf_counter()
+        self._depth += 1
+
+    def on_end(self, event):
+        self._depth -= 1
+        if self._depth == 0:
+            self.seconds += time.perf_counter() - self._start
+
+    def __enter__(self):
+        nb_event.register('numba:compile', self)
+        return self
+
+    def __exit__(self, *exc):
+        nb_event.unregister('numba:compile', self)
+
+
+class NumbaCallback:
+    """Wraps 'update_edge_distance', and calls its numba-compiled version if it is numba-compatible."""
+
+    def __init__(self, update_edge_distance):
+        self.py_func = update_edge_distance
+        self._func = None
+        self.backend = None  # 'numba' or 'python' after the first call
+
+    def __call__(self, distmat, cur_tour, penalty):
+        if self._func is None:
+            # the compiled trial runs on copies of the arguments, so an in-place update is only applied once
+            trial_args = (distmat.copy(), cur_tour.copy(), penalty.copy())
+            expected = self.py_func(distmat, cur_tour, penalty)
+            self._func, self.backend = self.py_func, 'python'
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    compiled = nb.njit(nogil=True)(self.py_func)
+                    result = compiled(*trial_args)
+                if np.array_equal(np.asarray(result), np.asarray(expected)) and \
+                        np.asarray(result).dtype == np.asarray(expected).dtype and \
+                        all(np.array_equal(a, b) for a, b in zip(trial_args, (distmat, cur_tour, penalty))):
+                    self._func, self.backend = compiled, 'numba'
+            except Exception:
+                pass
+            return expected
+        return self._func(distmat, cur_tour, penalty)
+
+
+def warm_up(num_nodes: int = 8, numba_callback: bool = False) -> float:
+    """Runs the GLS loop once on a random tiny instance, and returns the wall time in seconds.
+    If 'numba_callback' is set to True, a tiny 'update_edge_distance' is also compiled, so that the (one-time)
+    initialization of the numba compiler is not paid by the first program.
+    """
+    start = time.perf_counter()
+    coords = np.random.RandomState(0).rand(num_nodes, 2)
+    distmat = np.sqrt(((coords[:, None, :] - coords[None, :, :]) ** 2).sum(-1))
+
+    def update_edge_distance(edge_distance, local_opt_tour, edge_n_used):
+        return edge_distance + edge_n_used
+
+    callback = NumbaCallback(update_edge_distance) if numba_callback else update_edge_distance
+    guided_local_search_with_time(distmat, distmat.copy(), callback, perturbation_moves=2, iter_limit=2)
+    if numba_callback:
+        guided_local_search_with_time(distmat, distmat.copy(), callback, perturbation_moves=2, iter_limit=2)
+    return time.perf_counter() - start
+
+
+def build_aot_kernels(output_dir: str | None = None) -> str:
+    """Compiles the kernels into the extension module '_gls_aot' (requires a C compiler), returns its directory.
+    The module is tied to the Python, numpy and numba versions, so build it in the evaluation environment.
+    """
+    from numba.pycc import CC
+
+    use_jit_kernels()  # the kernels call each other, so they must be numba functions while compiling
+    output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc = CC(AOT_MODULE_NAME)
+    cc.output_dir = output_dir
+    cc.verbose = False
+    for name, (func, signature) in _KERNEL_SOURCES.items():
+        cc.export(name, signature)(func)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        cc.compile()
+    return output_dir
+
+
+def load_aot_kernels(build: bool = False, output_dir: str | None = None) -> bool:
+    """Replaces the JIT kernels of this module by the ones of the '_gls_aot' extension module.
+    Args:
+        build     : build the extension module if it can not be imported.
+        output_dir: the directory of the extension module, defaults to the directory of this file.
+    Returns:
+        True if the AOT kernels are used, otherwise the JIT kernels are kept.
+    """
+    global kernel_backend
+    module = _import_aot_module(output_dir)
+    if module is None and build:
+        try:
+            build_aot_kernels(output_dir)
+            importlib.invalidate_caches()
+            module = _import_aot_module(output_dir)
+        except Exception as e:
+            warnings.warn(f'Failed to build the AOT kernels of GLS ({e}), the JIT kernels are used.')
+    if module is None:
+        return False
+    globals().update({name: getattr(module, name) for name in _KERNEL_SOURCES})
+    kernel_backend = 'aot'
+    return True
+
+
+def use_jit_kernels():
+    """Restores the JIT kernels (e.g., after 'load_aot_kernels'), they are compiled if this module was imported
+    with the AOT kernels.
+    """
+    global kernel_backend
+    for name, (func, signature) in _KERNEL_SOURCES.items():
+        if name not in _JIT_KERNELS:
+            _JIT_KERNELS[name] = nb.njit(signature, nogil=True, cache=usecache)(func)
+        globals()[name] = _JIT_KERNELS[name]
+    kernel_backend = 'jit'
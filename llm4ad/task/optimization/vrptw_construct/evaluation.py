@@ -34,11 +34,11 @@
 from __future__ import annotations
 
 from typing import Any
-import copy
 import numpy as np
 from llm4ad.base import Evaluation
 from llm4ad.task.optimization.vrptw_construct.get_instance import GetData
 from llm4ad.task.optimization.vrptw_construct.template import template_program, task_description
+from llm4ad.task.optimization.route_construction import RouteConstruction
 
 
 class VRPTWEvaluation(Evaluation):
@@ -60,6 +60,11 @@ class VRPTWEvaluation(Evaluation):
 
         getData = GetData(self.n_instance, self.problem_size + 1)
         self._datasets = getData.generate_instances()
+        # the heuristic gets read-only views of the instances (made once here, and inherited by the forked
+        # evaluation processes) instead of deep copies for every call
+        self._constructions = [RouteConstruction(distance_matrix, demands, vehicle_capacity, time_windows, time_service,
+                                                 num_nodes=self.problem_size + 1)
+                               for _, distance_matrix, demands, vehicle_capacity, time_service, time_windows in self._datasets]
 
     def tour_cost(self, distance_matrix, solution, time_service, time_windows):
         cost = 0
@@ -89,66 +94,9 @@ class VRPTWEvaluation(Evaluation):
         dis = np.ones(self.n_instance)
         n_ins = 0
 
-        for instance, distance_matrix, demands, vehicle_capacity, time_service, time_windows in self._datasets:
-            route = []
-            current_load = 0
-            current_node = 0
-            current_time = 0
-            route.append(current_node)
-            unvisited_nodes = set(range(1, self.problem_size + 1))  # Assuming node 0 is the depot
-            all_nodes = np.array(list(unvisited_nodes))
-            feasible_unvisited_nodes = all_nodes
-
-            unvisited_nodes_depot = np.array(list(unvisited_nodes))
-
-            while unvisited_nodes:
-
-                next_node = heuristic(current_node,
-                                      0,
-                                      feasible_unvisited_nodes,
-                                      vehicle_capacity - current_load,
-                                      current_time,
-                                      copy.deepcopy(demands),
-                                      copy.deepcopy(distance_matrix),
-                                      copy.deepcopy(time_windows))
-                if next_node == 0:
-                    route.append(next_node)
-                    current_load = 0
-                    current_time = 0
-                    current_node = 0
-                    unvisited_nodes_depot = np.array(list(unvisited_nodes))
-                else:
-                    travel_time = distance_matrix[current_node, next_node]
-                    current_time += (travel_time)
-                    current_time = max(current_time, time_windows[next_node][0])
-                    current_time += time_service[next_node]
-                    # if current_time < time_windows[next_node][0]:
-                    #     current_time = time_windows[next_node][0]
-                    # if current_time > time_windows[next_node][1]:
-                    #     print(current_time)
-                    #     print(time_windows[next_node][1])
-                    #     return float('inf')  # Exceeds time window
-                    route.append(next_node)
-                    current_load += demands[next_node]
-                    unvisited_nodes.remove(next_node)
-                    current_node = next_node
-                    unvisited_nodes_depot = np.append(np.array(list(unvisited_nodes)), 0)
-
-                feasible_nodes_tw = np.array([node for node in all_nodes \
-                                              if max(current_time + distance_matrix[current_node][node], time_windows[node][0]) < time_windows[node][1] - 0.0001 \
-                                              and max(current_time + distance_matrix[current_node][node], time_windows[node][0]) + time_service[node] + distance_matrix[node][0] < time_windows[0][1] - 0.0001])
-                feasible_nodes_capacity = np.array([node for node in all_nodes if current_load + demands[node] <= vehicle_capacity])
-                # Determine feasible and unvisited nodes
-                feasible_unvisited_nodes = np.intersect1d(np.intersect1d(feasible_nodes_tw, feasible_nodes_capacity), list(unvisited_nodes))
-
-                if len(unvisited_nodes) > 0 and len(feasible_unvisited_nodes) < 1:
-                    route.append(0)
-                    current_load = 0
-                    current_time = 0
-                    current_node = 0
-                    feasible_unvisited_nodes = np.array(list(unvisited_nodes))
-
-            # print(set(route))
+        for (instance, distance_matrix, demands, vehicle_capacity, time_service, time_windows), construction in \
+                zip(self._datasets, self._constructions):
+            route = construction.run(heuristic)
 
             if len(set(route)) != self.problem_size + 1:
                 return None
@@ -159,7 +107,6 @@ class VRPTWEvaluation(Evaluation):
             n_ins += 1
             if n_ins == self.n_instance:
                 break
-        # print(dis)
         ave_dis = np.average(dis)
         return -ave_dis
 
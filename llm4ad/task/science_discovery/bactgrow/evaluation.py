@@ -38,12 +38,11 @@
 from __future__ import annotations
 
 from typing import Any
-import pandas as pd
 import numpy as np
 
 from llm4ad.base import Evaluation
 from llm4ad.task.science_discovery.bactgrow.template import template_program, task_description
-from llm4ad.task.science_discovery.bactgrow import train
+from llm4ad.task.science_discovery.binary_data import BinaryDataset
 
 __all__ = ['BGEvaluation']
 
@@ -89,8 +88,9 @@ class BGEvaluation(Evaluation):
 
         # read csv
         # df = pd.read_csv(os.path.join(os.path.dirname(__file__), './_data/train.csv'))
-        df = pd.DataFrame(train.data)
-        data = np.array(df)
+        # the dataset is converted once to '_data/train.npy' and memory-mapped afterwards,
+        # so that forked evaluator processes share the same pages
+        data = BinaryDataset.load_table('llm4ad.task.science_discovery.bactgrow', 'train')
         X = data[:, :-1]
         y = data[:, -1].reshape(-1)
         self._datasets = {'inputs': X, 'outputs': y}
@@ -0,0 +1,199 @@
+# Module Name: binary_data
+# Last Revision: 2025/3/5
+# Description: Compact on-disk datasets for the science discovery tasks. The datasets are shipped as Python
+#              literal modules (e.g., 'bactgrow/train.py'), which take seconds and a lot of memory to import.
+#              This module converts them once into '.npy' arrays (in the '_data' folder of each task), and
+#              memory-maps the arrays afterwards, so that forked evaluator processes share the same pages.
+#              This module is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+#
+# Usage:
+#    - Convert all datasets in advance (optional, datasets are also converted on first use):
+#          python -m llm4ad.task.science_discovery.binary_data [--overwrite]
+#    - Load a dataset in an evaluation:
+#          table = BinaryDataset.load_table('llm4ad.task.science_discovery.bactgrow', 'train')
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import os
+from typing import Dict, List
+
+import numpy as np
+
+__all__ = ['BinaryDataset']
+
+_PACKAGE = 'llm4ad.task.science_discovery'
+
+# (task, split) of the tabular datasets, each row is a dict of observations
+TABLES = [
+    (task, split)
+    for task in ['bactgrow', 'oscillator1', 'oscillator2', 'stresstrain']
+    for split in ['train', 'test_id', 'test_odd']
+]
+
+# (task, module) of the ODE datasets
+ODE_DATASETS = [('ode_1d', 'strogatz_extended')]
+
+
+class BinaryDataset:
+    # 'c' (copy-on-write): pages are shared between processes, and the evaluated programs
+    # can still modify their inputs in place without touching the file
+    mmap_mode = 'c'
+
+    @classmethod
+    def _module_path(cls, module_name: str) -> str:
+        spec = importlib.util.find_spec(module_name)
+        if spec is None or spec.origin is None:
+            raise ModuleNotFoundError(module_name)
+        return spec.origin
+
+    @classmethod
+    def _data_path(cls, module_name: str, suffix: str = '') -> str:
+        module_path = cls._module_path(module_name)
+        name = os.path.splitext(os.path.basename(module_path))[0]
+        return os.path.join(os.path.dirname(module_path), '_data', f'{name}{suffix}.npy')
+
+    @classmethod
+    def _is_fresh(cls, data_path: str, module_name: str) -> bool:
+        # the binary file is rebuilt if the literal module has been modified after the conversion
+        return (os.path.exists(data_path)
+                and os.path.getmtime(data_path) >= os.path.getmtime(cls._module_path(module_name)))
+
+    @classmethod
+    def _save(cls, path: str, array: np.ndarray) -> bool:
+        """Atomically save an array. Returns False if the folder is not writable (e.g., a read-only installation).
+        """
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    @classmethod
+    def _load(cls, path: str, mmap: bool) -> np.ndarray:
+        return np.load(path, mmap_mode=cls.mmap_mode if mmap else None)
+
+    @classmethod
+    def table_to_array(cls, records: List[dict]) -> np.ndarray:
+        """Converts a list of dicts (rows) to a 2D float64 array, the columns follow the key order of the first row.
+        This is the same array as 'np.array(pd.DataFrame(records))' for numeric records.
+        """
+        columns = list(records[0].keys())
+        return np.array([[r[c] for c in columns] for r in records], dtype=np.float64)
+
+    @classmethod
+    def load_table(cls, task_package: str, split: str, mmap: bool = True, convert: bool = True) -> np.ndarray:
+        """Loads the tabular dataset '<task_package>.<split>' as a 2D array (the last column is the output).
+        Args:
+            task_package: e.g., 'llm4ad.task.science_discovery.bactgrow'.
+            split       : e.g., 'train', 'test_id', 'test_odd'.
+            mmap        : memory-map the array (read-only pages, copy-on-write).
+            convert     : convert the literal module if the '.npy' file does not exist or is outdated.
+        """
+        module_name = f'{task_package}.{split}'
+        path = cls._data_path(module_name)
+        if cls._is_fresh(path, module_name):
+            return cls._load(path, mmap)
+        if not convert:
+            raise FileNotFoundError(path)
+        array = cls.table_to_array(importlib.import_module(module_name).data)
+        if cls._save(path, array):
+            return cls._load(path, mmap)
+        return array
+
+    @classmethod
+    def ode_to_arrays(cls, record: dict) -> Dict[str, np.ndarray]:
+        """Converts an ODE record to arrays: 'init' (n_init, dim), 't' (n_init, n_t), and 'y' (n_init, n_t).
+        Only the first solution and the first output are kept, as in 'ODEEvaluation'.
+        """
+        solutions = record['solutions'][0]
+        return {
+            'init': np.array(record['init'], dtype=np.float64),
+            't': np.array([s['t'] for s in solutions], dtype=np.float64),
+            'y': np.array([s['y'][0] for s in solutions], dtype=np.float64),
+        }
+
+    @classmethod
+    def load_ode(cls, task_package: str, module: str, index: int, mmap: bool = True, convert: bool = True) -> Dict[str, np.ndarray]:
+        """Loads the 'index'-th ODE of '<task_package>.<module>' as a dict with keys 'init', 't' and 'y'.
+        """
+        module_name = f'{task_package}.{module}'
+        keys = ['init', 't', 'y']
+        paths = {k: cls._data_path(module_name, f'_{index}_{k}') for k in keys}
+        if all(cls._is_fresh(p, module_name) for p in paths.values()):
+            return {k: cls._load(p, mmap) for k, p in paths.items()}
+        if not convert:
+            raise FileNotFoundError(paths['init'])
+        records = importlib.import_module(module_name).data
+        arrays = None
+        # convert all ODEs in the module at once, since the module has to be imported anyway
+        for i, record in enumerate(records):
+            converted = cls.ode_to_arrays(record)
+            for k in keys:
+                cls._save(cls._data_path(module_name, f'_{i}_{k}'), converted[k])
+            if i == index:
+                arrays = converted
+        if all(os.path.exists(p) for p in paths.values()):
+            return {k: cls._load(p, mmap) for k, p in paths.items()}
+        return arrays
+
+    @classmethod
+    def convert_all(cls, overwrite: bool = False) -> List[str]:
+        """Converts all science discovery datasets. Returns the paths of the converted files.
+        """
+        converted = []
+        for task, split in TABLES:
+            module_name = f'{_PACKAGE}.{task}.{split}'
+            if importlib.util.find_spec(module_name) is None:
+                continue
+            path = cls._data_path(module_name)
+            if overwrite and os.path.exists(path):
+                os.remove(path)
+            cls.load_table(f'{_PACKAGE}.{task}', split, mmap=False)
+            converted.append(path)
+        for task, module in ODE_DATASETS:
+            module_name = f'{_PACKAGE}.{task}.{module}'
+            num_records = len(importlib.import_module(module_name).data)
+            for i in range(num_records):
+                paths = [cls._data_path(module_name, f'_{i}_{k}') for k in ['init', 't', 'y']]
+                if overwrite:
+                    for p in paths:
+                        if os.path.exists(p):
+                            os.remove(p)
+                cls.load_ode(f'{_PACKAGE}.{task}', module, i, mmap=False)
+                converted.extend(paths)
+        return converted
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert the science discovery datasets to binary (.npy) files.')
+    parser.add_argument('--overwrite', action='store_true', help='reconvert the existing files.')
+    args = parser.parse_args()
+
+    for p in BinaryDataset.convert_all(overwrite=args.overwrite):
+        print(f'{p} ({os.path.getsize(p) / 1024:.1f} KB)')
@@ -40,7 +40,8 @@ import numpy as np
 
 from llm4ad.base import Evaluation
 from llm4ad.task.science_discovery.ode_1d.template import template_program, task_description
-from llm4ad.task.science_discovery.ode_1d import strogatz_extended, strogatz_equations
+from llm4ad.task.science_discovery.ode_1d import strogatz_equations
+from llm4ad.task.science_discovery.binary_data import BinaryDataset
 
 __all__ = ['ODEEvaluation']
 
@@ -143,16 +144,12 @@ class ODEEvaluation(Evaluation):
 
         # read files
         test_eq_dict = strogatz_equations.equations[test_id - 1]
-        dataset = strogatz_extended.data
-
-        dataset = dataset[test_id - 1]
-        xs = dataset['init']
-        t = [e['t'] for e in dataset['solutions'][0]]
-        ys = [e['y'][0] for e in dataset['solutions'][0]]  # for only 1 output
+        # the dataset is converted once to '_data/strogatz_extended_<i>_*.npy' and memory-mapped afterwards
+        dataset = BinaryDataset.load_ode('llm4ad.task.science_discovery.ode_1d', 'strogatz_extended', test_id - 1)
         self._datasets = {
-            'xs': xs,
-            'ys': ys,
-            't': t
+            'xs': dataset['init'],
+            'ys': dataset['y'],  # for only 1 output
+            't': dataset['t']
         }
 
     def evaluate_program(self, program_str: str, callable_func: callable) -> Any | None:
@@ -19,22 +19,53 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import http.client
 import json
+import random
+import threading
 import time
-from typing import Any
+from typing import Any, List
 import traceback
 from ...base import LLM
 
 
+class _RetryableHTTPError(Exception):
+    def __init__(self, status: int, reason: str, retry_after: float | None = None):
+        super().__init__(f'HTTP {status} {reason}')
+        self.status = status
+        self.retry_after = retry_after
+
+
 class HttpsApi(LLM):
-    def __init__(self, host, key, model, timeout=60, **kwargs):
+    def __init__(self, host, key, model, timeout=60,
+                 *,
+                 max_retries: int | None = 10,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 60.0,
+                 max_concurrent_requests: int = 8,
+                 use_https: bool = True,
+                 endpoint: str = '/v1/chat/completions',
+                 **kwargs):
         """Https API
         Args:
-            host   : host name. please note that the host name does not include 'https://'
+            host   : host name. please note that the host name does not include 'https://'.
+                     A port can be appended, e.g., 'localhost:8000'.
             key    : API key.
             model  : LLM model name.
             timeout: API timeout.
+            max_retries : the maximum number of retries of a request. A 'RuntimeError' is raised if all retries fail.
+                          Pass 'None' to retry forever.
+            backoff_base: the base delay (seconds) of the exponential backoff with full jitter between retries,
+                          i.e., the delay of the i-th retry is uniform(0, min(backoff_max, backoff_base * 2 ** i)).
+                          The 'Retry-After' header of a 429/503 response takes precedence.
+            backoff_max : the maximum delay (seconds) between retries.
+            max_concurrent_requests: the maximum number of in-flight requests in 'self.draw_samples()'.
+            use_https   : use 'https' or plain 'http' (e.g., a local deployed LLM or a test server).
+            endpoint    : the path of the chat completion API.
+        Each thread keeps its own keep-alive connection to the host, which is reused across requests
+        and re-established after errors (a stale connection, closed by the host while it was idle, is re-established
+        at once and does not count as a retry). Call 'self.close()' to close all connections.
         """
         super().__init__(**kwargs)
         self._host = host
@@ -43,6 +74,111 @@ class HttpsApi(LLM):
         self._timeout = timeout
         self._kwargs = kwargs
         self._cumulative_error = 0
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._max_concurrent_requests = max_concurrent_requests
+        self._use_https = use_https
+        self._endpoint = endpoint
+
+        # per-thread keep-alive connections
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._connections_lock = threading.Lock()
+        # long-lived request threads for self.draw_samples(), so that their connections are reused
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        del state['_connections']
+        del state['_connections_lock']
+        state['_executor'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if self._use_https else http.client.HTTPConnection
+            conn = conn_cls(self._host, timeout=self._timeout)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            with self._connections_lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def _backoff_seconds(self, num_retry: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self._backoff_max)
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * 2 ** num_retry))
+
+    @classmethod
+    def _parse_retry_after(cls, value: str | None) -> float | None:
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.)
+        except ValueError:
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.)
+        except Exception:
+            return None
+
+    def _request(self, messages) -> str:
+        # Prepare standard OpenAI-compatible payload
+        payload = json.dumps({
+            'max_tokens': self._kwargs.get('max_tokens', 8192),
+            'top_p': self._kwargs.get('top_p', None),
+            'temperature': self._kwargs.get('temperature', 1.0),
+            'model': self._model,
+            'messages': messages
+        })
+        headers = {
+            'Authorization': f'Bearer {self._key}',
+            'User-Agent': 'Apifox/1.0.0 (https://apifox.com)',
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
+        }
+        conn = self._get_connection()
+        # a connection which has been used before may have been closed by the host while it was idle
+        reused = conn.sock is not None
+        try:
+            conn.request('POST', self._endpoint, payload, headers)
+            res = conn.getresponse()
+        except (ConnectionResetError, BrokenPipeError):  # including http.client.RemoteDisconnected
+            if not reused:
+                raise
+            # the keep-alive connection is stale, reconnect once (this is not a failed request)
+            self._drop_connection()
+            conn = self._get_connection()
+            conn.request('POST', self._endpoint, payload, headers)
+            res = conn.getresponse()
+        # always read the whole body, so that the connection can be reused
+        data = res.read().decode('utf-8')
+        if res.status == 429 or res.status >= 500:
+            raise _RetryableHTTPError(res.status, res.reason, self._parse_retry_after(res.getheader('Retry-After')))
+        if res.getheader('Connection', '').lower() == 'close':
+            self._drop_connection()
+        data = json.loads(data)
+
+        # Extract content from the standard response format
+        return data['choices'][0]['message']['content']
 
     def draw_sample(self, prompt: str | Any, *args, **kwargs) -> str:
         """
@@ -99,30 +235,10 @@ class HttpsApi(LLM):
                 messages = [{'role': 'user', 'content': text_content}]
 
         # Retry loop for handling network or API transient errors
+        num_retry = 0
         while True:
             try:
-                conn = http.client.HTTPSConnection(self._host, timeout=self._timeout)
-
-                # Prepare standard OpenAI-compatible payload
-                payload = json.dumps({
-                    'max_tokens': self._kwargs.get('max_tokens', 8192),
-                    'top_p': self._kwargs.get('top_p', None),
-                    'temperature': self._kwargs.get('temperature', 1.0),
-                    'model': self._model,
-                    'messages': messages
-                })
-                headers = {
-                    'Authorization': f'Bearer {self._key}',
-                    'User-Agent': 'Apifox/1.0.0 (https://apifox.com)',
-                    'Content-Type': 'application/json'
-                }
-                conn.request('POST', '/v1/chat/completions', payload, headers)
-                res = conn.getresponse()
-                data = res.read().decode('utf-8')
-                data = json.loads(data)
-
-                # Extract content from the standard response format
-                response = data['choices'][0]['message']['content']
+                response = self._request(messages)
                 # Reset error counter on success
                 if self.debug_mode:
                     self._cumulative_error = 0
@@ -130,6 +246,13 @@ class HttpsApi(LLM):
 
             except Exception as e:
                 self._cumulative_error += 1
+                # the connection may be broken, re-establish it in the next try
+                if not isinstance(e, _RetryableHTTPError):
+                    self._drop_connection()
+
+                if self._max_retries is not None and num_retry >= self._max_retries:
+                    raise RuntimeError(f'{self.__class__.__name__} error: request failed after {num_retry} retries. '
+                                       f'{traceback.format_exc()}. You may check your API host and API key.')
 
                 # In debug mode, crash after consecutive failures to allow debugging
                 if self.debug_mode:
@@ -139,9 +262,41 @@ class HttpsApi(LLM):
                 else:
                     print(f'{self.__class__.__name__} error: {traceback.format_exc()}.'
                           f'You may check your API host and API key.')
-                    time.sleep(2)
+
+                retry_after = e.retry_after if isinstance(e, _RetryableHTTPError) else None
+                time.sleep(self._backoff_seconds(num_retry, retry_after))
+                num_retry += 1
                 continue
 
+    def draw_samples(self, prompts: List[str | Any], *args, **kwargs) -> List[str]:
+        """Send the requests concurrently (at most 'max_concurrent_requests' in-flight requests).
+        The responses are returned in the order of the prompts.
+        """
+        if len(prompts) <= 1 or self._max_concurrent_requests <= 1:
+            return super().draw_samples(prompts, *args, **kwargs)
+        with self._connections_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_concurrent_requests)
+        futures = [self._executor.submit(self.draw_sample, p, *args, **kwargs) for p in prompts]
+        return [f.result() for f in futures]
+
+    def close(self):
+        """Close all keep-alive connections.
+        """
+        # the in-flight requests need the lock to get or drop their connections, so it is released before waiting
+        with self._connections_lock:
+            executor, self._executor = self._executor, None
+            connections, self._connections = self._connections, []
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._connections_lock:
+            # the connections opened by the requests which were in flight
+            connections += self._connections
+            self._connections = []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
     # def draw_sample(self, prompt: str | Any, *args, **kwargs) -> str:
     #     """
     #     Handle message construction:
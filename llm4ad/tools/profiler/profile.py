@@ -20,18 +20,18 @@
 from __future__ import annotations
 
 import os
-import re
 import sys
+import weakref
 from typing import Literal, Optional, List, Tuple
 
 import numpy as np
 import pytz
-import json
 import logging
 from threading import Lock
 from datetime import datetime
 
-from ...base import Function
+from ...base import Function, TextFunctionProgramConverter
+from .sample_log import SampleLogWriter, SampleLogReader, SampleLogIndex
 
 
 class ProfilerBase:
@@ -43,12 +43,20 @@ class ProfilerBase:
                  log_style: Literal['simple', 'complex'] = 'complex',
                  create_random_path=True,
                  num_objs=1,
+                 log_format: Literal['json', 'jsonl'] = 'json',
+                 log_fsync: Literal['never', 'batch', 'always'] = 'never',
+                 log_flush_interval: float = 0.,
                  **kwargs):
         """Base profiler for recording experimental results.
         Args:
             log_dir            : the directory of current run
             initial_num_samples: the sample order start with `initial_num_samples`.
             create_random_path : create a random log_path according to evaluation_name, method_name, time, ...
+            log_format         : format of the sample logs. 'json' rewrites the whole 'samples_X~Y.json' file for each sample.
+                                 'jsonl' appends one line per sample to 'samples_X~Y.jsonl', which is much cheaper for long runs.
+                                 Both formats are written by a background thread. See 'llm4ad.tools.profiler.sample_log'.
+            log_fsync          : 'never', 'batch' (fsync after each batch of records), or 'always' (fsync after each record).
+            log_flush_interval : the background writer waits 'log_flush_interval' seconds between two batches.
         """
         assert log_style in ['simple', 'complex']
 
@@ -82,6 +90,10 @@ class ProfilerBase:
         # lock for multi-thread invoking self.register_function(...)
         self._register_function_lock = Lock()
 
+        # background writer of sample logs, flushed when the profiler is released or the interpreter exits
+        self._sample_log_writer = SampleLogWriter(log_format, fsync=log_fsync, flush_interval=log_flush_interval)
+        weakref.finalize(self, self._sample_log_writer.close)
+
     def record_parameters(self, llm, prob, method):
         self._parameters = [llm, prob, method]
         self._create_log_path()
@@ -109,7 +121,7 @@ class ProfilerBase:
                 self._register_function_lock.release()
 
     def finish(self):
-        pass
+        self._sample_log_writer.flush()
 
     def get_logger(self):
         pass
@@ -117,6 +129,39 @@ class ProfilerBase:
     def resume(self, *args, **kwargs):
         pass
 
+    def resume_from_index(self, index: SampleLogIndex):
+        """Restore the counters, the total times and the best-so-far function(s) from the sample log index,
+        without replaying (and re-parsing) every sample of the run.
+        """
+
+        def record_to_function(record):
+            func = TextFunctionProgramConverter.text_to_function(record['function'])
+            if func is not None:
+                func.score = record['score']
+                if 'algorithm' in record:
+                    func.algorithm = record['algorithm']
+            return func
+
+        with self._register_function_lock:
+            self._num_samples = index.max_sample_order
+            self._evaluate_success_program_num = index.num_valid
+            self._evaluate_failed_program_num = index.num_invalid
+            self._tot_sample_time = index.tot_sample_time
+            self._tot_evaluate_time = index.tot_evaluate_time
+            if self._num_objs < 2:
+                best = index.best()
+                if best is not None:
+                    self._cur_best_function = record_to_function(best)
+                    self._cur_best_program_score = best['score']
+                    self._cur_best_program_sample_order = best['sample_order']
+            else:
+                for i in range(self._num_objs):
+                    best = index.best(obj_idx=i)
+                    if best is not None:
+                        self._cur_best_function[i] = record_to_function(best)
+                        self._cur_best_program_score[i] = best['score'][i]
+                        self._cur_best_program_sample_order[i] = best['sample_order']
+
     def _write_json(self, function: Function, program: str, *, record_type: Literal['history', 'best'] = 'history',
                     record_sep=200):
         """Write function data to a JSON file.
@@ -131,6 +176,8 @@ class ProfilerBase:
         sample_order = self._num_samples
         content = {
             'sample_order': sample_order,
+            'sample_time': function.sample_time,
+            'evaluate_time': function.evaluate_time,
             'function': str(function),
             'score': function.score,
             'operator': function.operator,
@@ -144,18 +191,13 @@ class ProfilerBase:
         else:
             filename = 'samples_best.json'
 
-        path = os.path.join(self._samples_json_dir, filename)
-
-        try:
-            with open(path, 'r') as json_file:
-                data = json.load(json_file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = []
-
-        data.append(content)
+        self._append_sample_record(filename, content)
 
-        with open(path, 'w') as json_file:
-            json.dump(data, json_file, indent=4)
+    def _append_sample_record(self, filename: str, content: dict):
+        """Append a record to 'samples/filename' using the background writer.
+        The file extension is replaced according to the log format ('.json' or '.jsonl').
+        """
+        self._sample_log_writer.write(os.path.join(self._samples_json_dir, filename), content)
 
     def _record_and_print_verbose(self, function, program='', *, resume_mode=False):
         function_str = str(function).strip('\n')
@@ -283,45 +325,21 @@ class ProfilerBase:
 
     @classmethod
     def load_logfile(cls, logdir, valid_only=False) -> Tuple[List[str], List[float]]:
-        file_dir = os.path.join(logdir, 'samples')
-        # get all file directories
-        all_files = os.listdir(file_dir)
-        # filer `samples_*.json` files and ignore `samples_best.json`
-        sample_files = [f for f in all_files if f.startswith('samples_') and f != 'samples_best.json']
-
-        def extract_number(filename):
-            # match the first number of the filename
-            match = re.search(r'samples_(\d+)~', filename)
-            if match:
-                return int(match.group(1))
-            return 0
-
-        sorted_files = sorted(sample_files, key=extract_number)
-
+        """Load all functions and scores of a run. Both 'json' and 'jsonl' sample logs are supported.
+        """
         all_func = []
         all_score = []
-        all_algorithm = []
-
-        for file in sorted_files:
-            file_path = os.path.join(file_dir, file)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                try:
-                    samples = json.load(f)
-                except Exception as e:
-                    print(e)
-                    print(file_path)
-            for sample in samples:
-                func = sample['function']
-                acc = sample['score'] if sample['score'] else float('-inf')
-                if valid_only:
-                    if acc is None or np.isinf(acc):
-                        continue
-                    all_func.append(func)
-                    all_score.append(acc)
-                else:
-                    all_func.append(func)
-                    all_score.append(acc)
-                if 'algorithm' in sample:
-                    all_algorithm.append(sample['algorithm'])
+
+        for sample in SampleLogReader.iter_samples(logdir):
+            func = sample['function']
+            acc = sample['score'] if sample['score'] else float('-inf')
+            if valid_only:
+                if acc is None or np.isinf(acc):
+                    continue
+                all_func.append(func)
+                all_score.append(acc)
+            else:
+                all_func.append(func)
+                all_score.append(acc)
 
         return all_func, all_score
@@ -0,0 +1,508 @@
+# This file is part of the LLM4AD project (https://github.com/Optima-CityU/llm4ad).
+# Last Revision: 2025/2/16
+#
+# ------------------------------- Copyright --------------------------------
+# Copyright (c) 2025 Optima Group.
+#
+# Permission is granted to use the LLM4AD platform for research purposes.
+# All publications, software, or other works that utilize this platform
+# or any part of its codebase must acknowledge the use of "LLM4AD" and
+# cite the following reference:
+#
+# Fei Liu, Rui Zhang, Zhuoliang Xie, Rui Sun, Kai Li, Xi Lin, Zhenkun Wang,
+# Zhichao Lu, and Qingfu Zhang, "LLM4AD: A Platform for Algorithm Design
+# with Large Language Model," arXiv preprint arXiv:2412.17287 (2024).
+#
+# For inquiries regarding commercial use or licensing, please contact
+# http://www.llm4ad.com/contact.html
+# --------------------------------------------------------------------------
+
+"""
+Writer and reader of the sample logs ('<log_dir>/samples/samples_*.json[l]').
+
+- 'json' : each file is a JSON list of records (the original format), which is re-serialized on every write.
+- 'jsonl': each file has one JSON record per line, new records are appended to the end of the file.
+
+Both formats share the same file names (e.g., 'samples_1~200.json' and 'samples_1~200.jsonl'),
+and the reader accepts both of them (even mixed in one directory).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+import traceback
+from typing import Literal, Iterator, List, Dict, Any
+
+
+class SampleLogWriter:
+    _SAVE_INDEXES = ('save_indexes',)
+
+    def __init__(self,
+                 log_format: Literal['json', 'jsonl'] = 'json',
+                 *,
+                 fsync: Literal['never', 'batch', 'always'] = 'never',
+                 flush_interval: float = 0.,
+                 index_save_interval: float = 10.):
+        """Write sample records in a background thread, so that the disk I/O is not performed
+        while the profiler holds its register lock. The 'SampleLogIndex' of each run is updated with the
+        written records, so that resuming a run does not scan the sample logs.
+        Args:
+            log_format    : 'json' or 'jsonl'.
+            fsync         : 'never'  - let the OS decide when to write the data to the disk.
+                            'batch'  - call os.fsync() after each batch of records.
+                            'always' - call os.fsync() after each record ('jsonl' only, same as 'batch' for 'json').
+            flush_interval: the writer thread sleeps 'flush_interval' seconds after each batch,
+                            records arriving in the meantime are written together in the next batch.
+            index_save_interval: the index is saved at most every 'index_save_interval' seconds, and on 'flush()'.
+        """
+        assert log_format in ['json', 'jsonl']
+        assert fsync in ['never', 'batch', 'always']
+        self._log_format = log_format
+        self._fsync = fsync
+        self._flush_interval = flush_interval
+        self._index_save_interval = index_save_interval
+
+        # the index of each run (log_dir -> SampleLogIndex), and the time it was last saved
+        self._indexes: Dict[str, SampleLogIndex] = {}
+        self._index_save_time = time.time()
+        # the records of recently written 'json' files, so that they are not re-read from the disk
+        self._json_cache: Dict[str, List[Dict]] = {}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def log_format(self):
+        return self._log_format
+
+    def write(self, path: str, record: Dict[str, Any]):
+        """Append a record to the file (the extension of 'path' is decided by the log format).
+        """
+        if self._closed:
+            raise RuntimeError('The sample log writer has been closed.')
+        self._queue.put((self.log_path(path), record))
+
+    def log_path(self, path: str) -> str:
+        return os.path.splitext(path)[0] + f'.{self._log_format}'
+
+    def flush(self):
+        """Block until all records that have been written (and the indexes) are on the disk.
+        """
+        if not self._closed:
+            self._queue.put(self._SAVE_INDEXES)
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # gather all records in the queue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            save_indexes = stop or self._SAVE_INDEXES in batch
+            records_per_file: Dict[str, List[Dict]] = {}
+            for it in batch:
+                if it is not None and it is not self._SAVE_INDEXES:
+                    records_per_file.setdefault(it[0], []).append(it[1])
+            for path, records in records_per_file.items():
+                try:
+                    size_before = os.path.getsize(path) if os.path.exists(path) else 0
+                    if self._log_format == 'jsonl':
+                        positions = self._append_jsonl(path, records)
+                    else:
+                        positions = self._append_json(path, records)
+                    self._update_index(path, records, positions, size_before)
+                except Exception:
+                    traceback.print_exc()
+            if save_indexes or time.time() - self._index_save_time > self._index_save_interval:
+                self._save_indexes()
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+            if self._flush_interval:
+                threading.Event().wait(self._flush_interval)
+
+    def _update_index(self, path: str, records: List[Dict], positions: List[int], size_before: int):
+        name = os.path.basename(path)
+        if not name.startswith('samples_') or name.startswith('samples_best.'):
+            return
+        log_dir = os.path.dirname(os.path.dirname(path))
+        index = self._indexes.get(log_dir)
+        if index is None:
+            # the first write of this run, the index is loaded (and the new records are scanned) from the disk
+            self._indexes[log_dir] = SampleLogIndex.load(log_dir)
+        else:
+            index.add_written(path, records, positions, size_before)
+
+    def _save_indexes(self):
+        for index in self._indexes.values():
+            try:
+                index.save_if_modified()
+            except Exception:
+                traceback.print_exc()
+        self._index_save_time = time.time()
+
+    def _append_jsonl(self, path: str, records: List[Dict]) -> List[int]:
+        # returns the byte offsets of the records
+        positions = []
+        with open(path, 'ab') as f:
+            offset = f.tell()
+            for record in records:
+                line = (json.dumps(record) + '\n').encode('utf-8')
+                positions.append(offset)
+                offset += len(line)
+                f.write(line)
+                if self._fsync == 'always':
+                    f.flush()
+                    os.fsync(f.fileno())
+            if self._fsync == 'batch':
+                f.flush()
+                os.fsync(f.fileno())
+        return positions
+
+    def _append_json(self, path: str, records: List[Dict]) -> List[int]:
+        # returns the list indices of the records
+        data = self._json_cache.get(path)
+        if data is None:
+            try:
+                with open(path, 'r', encoding='utf-8') as json_file:
+                    data = json.load(json_file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = []
+            # only keep the files that are being written (the current chunk and 'samples_best.json')
+            if len(self._json_cache) >= 4:
+                self._json_cache.clear()
+            self._json_cache[path] = data
+        data.extend(records)
+        # write to a temporary file and replace, so that readers never see a half-written file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as json_file:
+            json.dump(data, json_file, indent=4)
+            if self._fsync != 'never':
+                json_file.flush()
+                os.fsync(json_file.fileno())
+        os.replace(tmp_path, path)
+        return list(range(len(data) - len(records), len(data)))
+
+
+class SampleLogReader:
+    """Read the sample logs written in 'json' and/or 'jsonl' format.
+    """
+
+    @classmethod
+    def _chunk_start(cls, filename: str) -> int:
+        # match the first number of the filename
+        match = re.search(r'samples_(\d+)~', filename)
+        if match:
+            return int(match.group(1))
+        return 0
+
+    @classmethod
+    def sample_files(cls, log_dir: str) -> List[str]:
+        """Returns the paths of 'samples_*.json[l]' files (excluding 'samples_best.json[l]') in the order of samples.
+        """
+        file_dir = os.path.join(log_dir, 'samples')
+        files = [f for f in os.listdir(file_dir)
+                 if f.startswith('samples_') and f.endswith(('.json', '.jsonl'))
+                 and not f.startswith('samples_best.')]
+        files = sorted(files, key=cls._chunk_start)
+        return [os.path.join(file_dir, f) for f in files]
+
+    @classmethod
+    def best_file(cls, log_dir: str) -> str | None:
+        for ext in ['jsonl', 'json']:
+            path = os.path.join(log_dir, 'samples', f'samples_best.{ext}')
+            if os.path.exists(path):
+                return path
+        return None
+
+    @classmethod
+    def read_file(cls, path: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the records in a 'json' or 'jsonl' file.
+        The last line of a 'jsonl' file is skipped if it is incomplete (e.g., the run is killed while writing).
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+            else:
+                yield from json.load(f)
+
+    @classmethod
+    def iter_samples(cls, log_dir: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over all sample records of a run in the order of samples.
+        """
+        for path in cls.sample_files(log_dir):
+            yield from cls.read_file(path)
+
+    @classmethod
+    def convert(cls, log_dir: str, log_format: Literal['json', 'jsonl'] = 'jsonl', remove_source=True):
+        """Convert all sample logs (including 'samples_best') of a run to 'log_format'.
+        """
+        assert log_format in ['json', 'jsonl']
+        paths = cls.sample_files(log_dir)
+        best = cls.best_file(log_dir)
+        if best is not None:
+            paths.append(best)
+        for path in paths:
+            target = os.path.splitext(path)[0] + f'.{log_format}'
+            if target == path:
+                continue
+            records = list(cls.read_file(path))
+            with open(target, 'w', encoding='utf-8') as f:
+                if log_format == 'jsonl':
+                    for record in records:
+                        f.write(json.dumps(record) + '\n')
+                else:
+                    json.dump(records, f, indent=4)
+            if remove_source:
+                os.remove(path)
+
+
+class SampleLogIndex:
+    _index_filename = 'index.json'
+    _version = 2
+
+    def __init__(self, log_dir: str):
+        """A small on-disk index of the sample logs ('<log_dir>/samples/index.json').
+        For each sample it stores the sample order, the file and the position of the record (byte offset for
+        'jsonl', list index for 'json'), the score, the operator, and the sample and evaluate times; together with
+        the best-so-far samples and per-operator counts. The index is updated incrementally: appended 'jsonl'
+        records are scanned from the last position, and a 'json' file is rescanned only if it has been modified.
+        'SampleLogWriter' also adds the records it writes, so the index of a run is usually up to date.
+        Use 'SampleLogIndex.load(log_dir)' to load (and update) the index.
+        """
+        self.log_dir = log_dir
+        self.files: List[Dict[str, Any]] = []  # [{'name', 'size', 'mtime', 'scanned'}, ...]
+        # [[sample_order, file_id, offset, score, operator, sample_time, evaluate_time], ...]
+        self.entries: List[List] = []
+        self.load_time = 0.
+        self.num_scanned = 0
+        self._modified = False
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.entries)
+
+    @property
+    def max_sample_order(self) -> int:
+        return max((e[0] for e in self.entries), default=0)
+
+    @property
+    def num_valid(self) -> int:
+        return sum(1 for e in self.entries if self._is_valid(e[3]))
+
+    @property
+    def num_invalid(self) -> int:
+        return self.num_samples - self.num_valid
+
+    @property
+    def tot_sample_time(self) -> float:
+        return sum(e[5] for e in self.entries if e[5] is not None)
+
+    @property
+    def tot_evaluate_time(self) -> float:
+        return sum(e[6] for e in self.entries if e[6])
+
+    @property
+    def operator_counts(self) -> Dict[str, int]:
+        counts = {}
+        for e in self.entries:
+            counts[str(e[4])] = counts.get(str(e[4]), 0) + 1
+        return counts
+
+    @classmethod
+    def _is_valid(cls, score) -> bool:
+        if score is None:
+            return False
+        if isinstance(score, list):
+            return all(s is not None and s != float('-inf') for s in score)
+        return score != float('-inf')
+
+    @classmethod
+    def load(cls, log_dir: str, rebuild=False) -> SampleLogIndex:
+        """Load the index of a run, scan the records that are not indexed yet, and save the updated index.
+        """
+        start = time.time()
+        index = cls(log_dir)
+        path = index._index_path()
+        if not rebuild and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == cls._version:
+                    index.files = data['files']
+                    index.entries = data['entries']
+            except (json.JSONDecodeError, KeyError):
+                pass
+        index._update()
+        index.load_time = time.time() - start
+        return index
+
+    def _index_path(self) -> str:
+        return os.path.join(self.log_dir, 'samples', self._index_filename)
+
+    def _update(self):
+        paths = SampleLogReader.sample_files(self.log_dir)
+        names = [os.path.basename(p) for p in paths]
+        indexed = [f['name'] for f in self.files]
+        # the existing files (and their order) must be kept, otherwise rebuild the index
+        if indexed != names[:len(indexed)]:
+            self.files, self.entries = [], []
+        modified = False
+        for file_id, name in enumerate(names):
+            path = os.path.join(self.log_dir, 'samples', name)
+            stat = os.stat(path)
+            if file_id < len(self.files):
+                info = self.files[file_id]
+                if info['size'] == stat.st_size and info['mtime'] == stat.st_mtime:
+                    continue
+            else:
+                info = {'name': name, 'size': 0, 'mtime': 0, 'scanned': 0}
+                self.files.append(info)
+            if name.endswith('.json'):
+                # a 'json' file is rewritten as a whole, rescan it
+                self.entries = [e for e in self.entries if e[1] != file_id]
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                for i, record in enumerate(records):
+                    self._add_entry(record, file_id, i)
+                info['scanned'] = len(records)
+            else:
+                with open(path, 'rb') as f:
+                    f.seek(info['scanned'])
+                    offset = info['scanned']
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            # incomplete record, it will be scanned in the next update
+                            break
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            record = None
+                        if record is not None:
+                            self._add_entry(record, file_id, offset)
+                        offset += len(line)
+                    info['scanned'] = offset
+            info['size'], info['mtime'] = stat.st_size, stat.st_mtime
+            modified = True
+        if modified:
+            self.entries.sort(key=lambda e: e[0])
+            self.save()
+
+    def _add_entry(self, record: Dict[str, Any], file_id: int, offset: int):
+        self.entries.append([record.get('sample_order'), file_id, offset, record.get('score'), record.get('operator'),
+                             record.get('sample_time'), record.get('evaluate_time')])
+        self.num_scanned += 1
+
+    def add_written(self, path: str, records: List[Dict[str, Any]], positions: List[int], size_before: int):
+        """Add the records which have just been written to 'path' at 'positions' (see 'SampleLogWriter').
+        If the index did not cover the file before the write ('size_before'), the logs are scanned instead.
+        """
+        name = os.path.basename(path)
+        names = [f['name'] for f in self.files]
+        if name in names:
+            file_id = names.index(name)
+            in_sync = self.files[file_id]['size'] == size_before
+        else:
+            # a new chunk must come after the indexed chunks
+            file_id = len(self.files)
+            in_sync = size_before == 0 and (
+                not names or SampleLogReader._chunk_start(name) > SampleLogReader._chunk_start(names[-1]))
+        if not in_sync:
+            self._update()
+            return
+        if file_id == len(self.files):
+            self.files.append({'name': name, 'size': 0, 'mtime': 0, 'scanned': 0})
+        info = self.files[file_id]
+        start = max(len(self.entries) - 1, 0)
+        for record, position in zip(records, positions):
+            self._add_entry(record, file_id, position)
+        tail = [e[0] for e in self.entries[start:]]
+        if tail != sorted(tail):
+            self.entries.sort(key=lambda e: e[0])
+        stat = os.stat(path)
+        info['scanned'] = stat.st_size if name.endswith('.jsonl') else info['scanned'] + len(records)
+        info['size'], info['mtime'] = stat.st_size, stat.st_mtime
+        self._modified = True
+
+    def save_if_modified(self):
+        if self._modified:
+            self.save()
+
+    def save(self):
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self._version, 'files': self.files, 'entries': self.entries}, f)
+        os.replace(tmp_path, self._index_path())
+        self._modified = False
+
+    def read(self, entry: List) -> Dict[str, Any]:
+        """Read the full record of an index entry.
+        """
+        path = os.path.join(self.log_dir, 'samples', self.files[entry[1]]['name'])
+        if path.endswith('.jsonl'):
+            with open(path, 'rb') as f:
+                f.seek(entry[2])
+                return json.loads(f.readline())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)[entry[2]]
+
+    def top_k(self, k: int, obj_idx: int | None = None) -> List[Dict[str, Any]]:
+        """Returns the full records of the 'k' best valid samples (objective 'obj_idx' for multi-objective scores).
+        """
+        valid = [e for e in self.entries if self._is_valid(e[3])]
+        key = (lambda e: e[3]) if obj_idx is None else (lambda e: e[3][obj_idx])
+        best = sorted(valid, key=key, reverse=True)[:k]
+        return [self.read(e) for e in best]
+
+    def best(self, obj_idx: int | None = None) -> Dict[str, Any] | None:
+        """Returns the full record of the best-so-far sample (the earliest one if there are ties).
+        """
+        best_entry = None
+        for e in self.entries:
+            if not self._is_valid(e[3]):
+                continue
+            score = e[3] if obj_idx is None else e[3][obj_idx]
+            if best_entry is None or score > (best_entry[3] if obj_idx is None else best_entry[3][obj_idx]):
+                best_entry = e
+        return None if best_entry is None else self.read(best_entry)
+
+    def summary(self) -> str:
+        return (f'{self.num_samples} samples ({self.num_valid} valid) indexed in {self.load_time:.2f}s, '
+                f'{self.num_scanned} new records scanned.')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert the sample logs of a run between json and jsonl.')
+    parser.add_argument('log_dir', help='the directory of the run (which contains the "samples" folder).')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='jsonl')
+    parser.add_argument('--keep_source', action='store_true')
+    args = parser.parse_args()
+    SampleLogReader.convert(args.log_dir, args.format, remove_source=not args.keep_source)
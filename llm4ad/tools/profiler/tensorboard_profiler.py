@@ -77,6 +77,8 @@ class TensorboardProfiler(ProfilerBase):
     def finish(self):
         if self._log_dir:
             self._writer.close()
+        # flush the sample logs
+        super().finish()
 
     def _write_tensorboard(self, *args, **kwargs):
         if not self._log_dir:
@@ -130,3 +130,5 @@ class WandBProfiler(ProfilerBase):
 
     def finish(self):
         wandb.finish()
+        # flush the sample logs
+        super().finish()